@@ -0,0 +1,123 @@
+"""
+Benchmark of the book resources fetch : blocking vs asynchronous.
+
+The book is served by a local HTTP server adding a fixed latency to each response (this simulates a remote web site).
+The NCC, all SMIL files and the text content files are fetched :
+
+    - sequentially with `Fetcher.fetch()` / `DtbSource.get()`
+    - concurrently with `AsyncFetcher.fetch()` / `DtbSource.aget_many()` (one event loop)
+
+The raw fetches show the I/O overlap. The `get()` figures include the documents parsing,
+which is CPU bound : it runs in the executor threads, but does not overlap.
+
+Usage :
+
+    python benchmarks/async_fetch.py [--latency 0.05] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import AsyncFetcher, DaisyBook, Fetcher, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+class LatencyRequestHandler(SimpleHTTPRequestHandler):
+    """A static file handler adding a fixed latency to each response."""
+
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(LatencyRequestHandler.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LatencyServer(ThreadingHTTPServer):
+    """A threaded HTTP server accepting many simultaneous connections (the default backlog is 5)."""
+
+    request_queue_size = 128
+
+
+def get_resource_names(path: str) -> List[str]:
+    """Get the names of the NCC, SMIL and text content files of a book."""
+    book = DaisyBook(FolderDtbSource(path))
+    names = ["ncc.html"] + [smil.reference.resource for smil in book.smils]
+    for smil in book.smils:
+        for section in smil.sections:
+            if section.text is not None and section.text.reference.resource not in names:
+                names.append(section.text.reference.resource)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder")
+    parser.add_argument("--latency", type=float, default=0.05, help="the latency added to each response, in seconds")
+    parser.add_argument("--concurrency", type=int, default=16, help="the maximum number of concurrent fetches")
+    args = parser.parse_args()
+
+    names = get_resource_names(args.path)
+
+    server = LatencyServer(("127.0.0.1", 0), partial(LatencyRequestHandler, directory=args.path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    LatencyRequestHandler.latency = args.latency
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    async def fetch_all(semaphore: asyncio.Semaphore):
+        async def fetch(name: str):
+            async with semaphore:
+                return await AsyncFetcher.fetch(f"{url}/{name}")
+
+        return await asyncio.gather(*[fetch(_) for _ in names])
+
+    try:
+        start = time.perf_counter()
+        for name in names:
+            Fetcher.fetch(f"{url}/{name}")
+        elapsed = time.perf_counter() - start
+        print(f"{'Fetcher.fetch() sequential':32s} | resources: {len(names):4d} | {elapsed:7.3f} s")
+
+        start = time.perf_counter()
+        asyncio.run(fetch_all(asyncio.Semaphore(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        print(f"{'AsyncFetcher.fetch() gathered':32s} | resources: {len(names):4d} | {elapsed:7.3f} s")
+
+        source = FolderDtbSource(url)
+        start = time.perf_counter()
+        for name in names:
+            source.get(name)
+        elapsed = time.perf_counter() - start
+        print(f"{'get() sequential':32s} | resources: {len(names):4d} | {elapsed:7.3f} s")
+
+        source = FolderDtbSource(url)
+        start = time.perf_counter()
+        asyncio.run(source.aget_many(names, max_concurrency=args.concurrency))
+        elapsed = time.perf_counter() - start
+        print(f"{f'aget_many() (concurrency={args.concurrency})':32s} | resources: {len(names):4d} | {elapsed:7.3f} s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
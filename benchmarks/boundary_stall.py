@@ -0,0 +1,126 @@
+"""
+Benchmark of the playback stall time at clip boundaries.
+
+A simulated player plays all clips of a book and measures, for each clip, the time it has to wait
+before the sound data is available (the "stall" time).
+
+Two strategies are compared :
+
+    - Nested navigation (`toc.next()` / `sections.next()` / `clips.next()`) with on demand `Audio.get_sound()`.
+    - The book-wide `PlaybackCursor` with a lookahead window.
+
+To make the comparison meaningful on a local book, a fixed latency is added to each audio fetch
+(this simulates a web location). Clip durations are divided by a speedup factor.
+
+Usage :
+
+    python benchmarks/boundary_stall.py [--latency 0.2] [--speedup 50] [--lookahead 5] [--entries 6]
+"""
+
+import argparse
+import os
+import sys
+import time
+from statistics import quantiles
+from typing import List
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import Audio, BookNavigator, DaisyBook, FolderDtbSource, LogLevel, PlaybackCursor
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+class SlowFolderDtbSource(FolderDtbSource):
+    """A `FolderDtbSource` adding a fixed latency to each uncached audio fetch."""
+
+    def __init__(self, base_path: str, latency: float, initial_cache_size=0) -> None:
+        super().__init__(base_path, initial_cache_size)
+        self.latency = latency
+
+    def get(self, resource_name: str):
+        if resource_name.endswith(".mp3") and self._cache.get(resource_name) is None:
+            time.sleep(self.latency)
+        return super().get(resource_name)
+
+
+def play(clip: Audio, speedup: float) -> None:
+    """Simulate the playback of a clip."""
+    time.sleep(clip.duration / speedup)
+
+
+def nested_navigation(book: DaisyBook, speedup: float, entries: int) -> List[float]:
+    """Play the book with the nested navigators. Returns the stall times."""
+    stalls = []
+    nav = BookNavigator(book)
+    entry = nav.toc.first()
+    for _ in range(entries):
+        if entry is None:
+            break
+        section = nav.sections.current()
+        while section is not None:
+            clip = nav.clips.current()
+            while clip is not None:
+                start = time.perf_counter()
+                clip.get_sound()
+                stalls.append(time.perf_counter() - start)
+                play(clip, speedup)
+                clip = nav.clips.next()
+            section = nav.sections.next()
+        entry = nav.toc.next()
+    return stalls
+
+
+def cursor_navigation(book: DaisyBook, speedup: float, entries: int, lookahead: int) -> List[float]:
+    """Play the book with a `PlaybackCursor`. Returns the stall times."""
+    stalls = []
+    last_entry = book.toc_entries[min(entries, len(book.toc_entries)) - 1]
+    with PlaybackCursor(book, lookahead=lookahead) as cursor:
+        clip = cursor.first()
+        while clip is not None:
+            start = time.perf_counter()
+            cursor.get_sound()
+            stalls.append(time.perf_counter() - start)
+            play(clip, speedup)
+            if cursor.context[0] is last_entry and cursor.context[1] is last_entry.sections[-1] and clip is cursor.context[1].clips[-1]:
+                break
+            clip = cursor.next()
+    return stalls
+
+
+def report(name: str, stalls: List[float]) -> None:
+    """Print the results. The first stall (startup) is not a boundary stall."""
+    startup, boundaries = stalls[0], stalls[1:] or [0.0]
+    p95 = quantiles(boundaries, n=20)[-1] if len(boundaries) > 1 else boundaries[0]
+    print(
+        f"{name:30s} | clips: {len(stalls):5d} | startup: {startup * 1000:8.2f} ms | worst boundary stall: {max(boundaries) * 1000:8.2f} ms | p95: {p95 * 1000:8.2f} ms | total: {sum(stalls):6.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder")
+    parser.add_argument("--latency", type=float, default=0.2, help="the latency added to each audio fetch, in seconds")
+    parser.add_argument("--speedup", type=float, default=50, help="the playback speedup factor")
+    parser.add_argument("--lookahead", type=int, default=5, help="the lookahead window size, in clips")
+    parser.add_argument("--entries", type=int, default=6, help="the number of TOC entries to play")
+    args = parser.parse_args()
+
+    # The cache holds the current audio file for the nested navigation
+    book = DaisyBook(SlowFolderDtbSource(args.path, args.latency, initial_cache_size=5))
+    report("Nested navigators", nested_navigation(book, args.speedup, args.entries))
+
+    book = DaisyBook(SlowFolderDtbSource(args.path, args.latency, initial_cache_size=5))
+    report(f"PlaybackCursor (lookahead={args.lookahead})", cursor_navigation(book, args.speedup, args.entries, args.lookahead))
+
+
+if __name__ == "__main__":
+    main()
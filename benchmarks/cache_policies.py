@@ -0,0 +1,121 @@
+"""
+Benchmark of the cache eviction policies, by trace replay.
+
+A trace of `DtbSource.get()` calls is recorded from navigation sessions on the sample book :
+- the full text traversal of `examples/navigation/full_text.py` (each navigation level)
+- listeners interleaved on a shared source, each one playing (text and audio of each section) from a random TOC entry
+
+The trace is then replayed on a `Cache` with each policy and several sizes (get, then add on a miss).
+The hit rate and the CPU time per operation are reported.
+
+Usage :
+
+    python benchmarks/cache_policies.py [--listeners 8] [--entries 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Iterator, List
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import ArcPolicy, BookNavigator, Cache, DaisyBook, FifoPolicy, FolderDtbSource, LfuPolicy, LogLevel, LruPolicy, TinyLfuPolicy
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+POLICIES = [FifoPolicy, LruPolicy, LfuPolicy, ArcPolicy, TinyLfuPolicy]
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+class TraceRecorder(FolderDtbSource):
+    """A source recording the requested resources (the audio data is not read : only its name matters)."""
+
+    def __init__(self, base_path: str) -> None:
+        super().__init__(base_path)
+        self.trace: List[str] = []
+
+    def get(self, resource_name: str):
+        self.trace.append(resource_name)
+        return b"" if resource_name.endswith(".mp3") else super().get(resource_name)
+
+
+def full_text(book: DaisyBook) -> Iterator[None]:
+    """The traversal of `full_text.py` : the texts of all sections, for each navigation level."""
+    nav = BookNavigator(book)
+    for _ in range(book.navigation_depth + 1):
+        toc_entry = nav.toc.first()
+        while toc_entry:
+            section = nav.sections.first()
+            while section:
+                section.text.content
+                yield
+                section = nav.sections.next()
+            toc_entry = nav.toc.next()
+        nav.toc.increase_nav_level()
+
+
+def listen(book: DaisyBook, start: int, entry_count: int) -> Iterator[None]:
+    """A listener playing the sections of some TOC entries."""
+    for entry in book.toc_entries[start : start + entry_count]:
+        for section in entry.sections:
+            section.text.content
+            for clip in section.clips:
+                clip.get_sound()
+            yield
+
+
+def record_trace(listeners: int, entries: int) -> List[str]:
+    """Record the trace of interleaved sessions."""
+    source = TraceRecorder(SAMPLE_DTB_PROJECT_PATH)
+    random.seed(1)
+    sessions = [full_text(DaisyBook(source))]
+    for _ in range(listeners):
+        book = DaisyBook(source)
+        sessions.append(listen(book, random.randrange(len(book.toc_entries)), entries))
+
+    # Round robin
+    while sessions:
+        for session in list(sessions):
+            if next(session, StopIteration) is StopIteration:
+                sessions.remove(session)
+    return source.trace
+
+
+def replay(policy, size: int, trace: List[str]) -> None:
+    """Replay the trace and print the hit rate and the CPU time per operation."""
+    cache = Cache(max_size=size, policy=policy)
+    hits = 0
+    start = time.process_time()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.add(key, key)
+        else:
+            hits += 1
+    duration = time.process_time() - start
+    print(f"{policy.__name__:15s} | size: {size:3d} | hit rate: {hits / len(trace):6.1%} | {duration / len(trace) * 1e6:6.2f} µs/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listeners", type=int, default=8, help="the number of listeners")
+    parser.add_argument("--entries", type=int, default=5, help="the number of TOC entries played by each listener")
+    args = parser.parse_args()
+
+    trace = record_trace(args.listeners, args.entries)
+    print(f"Trace : {len(trace)} requests, {len(set(trace))} resources.")
+    for size in (4, 8, 16):
+        for policy in POLICIES:
+            replay(policy, size, trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the cache statistics overhead : time per recorded event (hit or miss).
+
+The events are recorded for a number of distinct resources, with the time series disabled and enabled.
+The former list based bookkeeping (a linear search of the resource on each event) is measured for comparison.
+As a reference for the machine speed, an empty method call and an uncontended lock are measured too.
+
+Usage :
+
+    python benchmarks/cache_stats.py [--resources 1000] [--events 200000]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import CacheStats, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+class Reference:
+    """Reference costs : an empty method call, an uncontended lock."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def hit(self, resource_name: str) -> None:
+        pass
+
+    miss = hit
+
+    def locked_hit(self, resource_name: str) -> None:
+        with self._lock:
+            pass
+
+
+class ListStats:
+    """The former bookkeeping : one record per resource in a list, searched on each event."""
+
+    def __init__(self) -> None:
+        self._items = []
+
+    def hit(self, resource_name: str) -> None:
+        names = [_[0] for _ in self._items]
+        try:
+            item = self._items[names.index(resource_name)]
+            item[1] += 1
+            item[2] += 1
+        except ValueError:
+            self._items.append([resource_name, 1, 1])
+
+    miss = hit
+
+
+def measure(name: str, stats, names: list) -> None:
+    """Record the events and print the time per event."""
+    start = time.perf_counter()
+    for index, resource_name in enumerate(names):
+        if index % 4:
+            stats.hit(resource_name)
+        else:
+            stats.miss(resource_name)
+    duration = time.perf_counter() - start
+    print(f"{name:30s} | {duration / len(names) * 1e9:10.0f} ns/event")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resources", type=int, default=1000, help="the number of distinct resources")
+    parser.add_argument("--events", type=int, default=200000, help="the number of events")
+    args = parser.parse_args()
+
+    names = [f"resource_{index % args.resources:06d}.smil" for index in range(args.events)]
+
+    reference = Reference()
+    measure("Empty call (reference)", reference, names)
+    reference.hit = reference.miss = reference.locked_hit
+    measure("Uncontended lock (reference)", reference, names)
+    measure("CacheStats", CacheStats(), names)
+    stats = CacheStats()
+    stats.enable_samples(interval=0.01, count=100)
+    measure("CacheStats with samples", stats, names)
+    measure("List (former)", ListStats(), names[: max(args.events // 100, 1)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of the audio bytes moved per clip.
+
+For each clip of a book, the sound data is retrieved with :
+
+    - `Audio.get_sound()` : the whole audio file.
+    - `Audio.get_clip_bytes()` : the MP3 frames covering the clip only.
+
+The bytes delivered to the player and the bytes fetched from the source (`Fetcher` statistics) are reported.
+
+With a local book, `get_clip_bytes()` reads each audio file once to build its frame index, then reads the clip ranges.
+With a web book (`--path` is an URL), only HTTP range requests are issued.
+
+Usage :
+
+    python benchmarks/clip_bytes.py [--path https://.../book] [--entries 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import DaisyBook, Fetcher, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder or URL")
+    parser.add_argument("--entries", type=int, default=10, help="the number of TOC entries to process")
+    args = parser.parse_args()
+
+    book = DaisyBook(FolderDtbSource(args.path))
+    clips = [clip for entry in book.toc_entries[: args.entries] for section in entry.sections for clip in section.clips]
+
+    for name, method in [("get_sound()", "get_sound"), ("get_clip_bytes()", "get_clip_bytes")]:
+        fetched_bytes = Fetcher.get_stats()["fetched_bytes"]
+        delivered = 0
+        start = time.perf_counter()
+        for clip in clips:
+            data = getattr(clip, method)()
+            delivered += len(data) if data else 0
+        elapsed = time.perf_counter() - start
+        fetched = Fetcher.get_stats()["fetched_bytes"] - fetched_bytes
+        print(f"{name:18s} | clips: {len(clips):5d} | delivered: {delivered / len(clips):12.0f} bytes/clip | fetched: {fetched / len(clips):12.0f} bytes/clip | {elapsed / len(clips) * 1000:8.3f} ms/clip")
+
+
+if __name__ == "__main__":
+    main()
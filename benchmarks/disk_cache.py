@@ -0,0 +1,61 @@
+"""
+Benchmark of the disk cache : parsing a book with a cold and a warm `DiskCache`.
+
+A synthetic book is generated in a temporary folder (see `snapshot_reopen.py`).
+Each run uses a new source (as a new worker process would) : the NCC is parsed, then all sections and texts are accessed.
+
+Usage :
+
+    python benchmarks/disk_cache.py [--smils 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from snapshot_reopen import generate_book, walk
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import DaisyBook, DiskCache, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def run(name: str, folder: str, cache_path: str = None) -> None:
+    """Open the book with a new source, walk it and print the duration and the disk cache efficiency."""
+    start = time.perf_counter()
+    source = FolderDtbSource(folder)
+    if cache_path is not None:
+        source.disk_cache = DiskCache(cache_path, with_stats=True)
+    count = walk(DaisyBook(source))
+    duration = time.perf_counter() - start
+    stats = source.get_cache_stats()["disk"]
+    efficiency = f"{stats['cache_efficiency']:.0%}" if stats is not None else "-"
+    print(f"{name:25s} | {duration * 1000:10.1f} ms | sections: {count} | disk cache efficiency: {efficiency}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--smils", type=int, default=500, help="the number of SMIL files of the generated book")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        generate_book(folder, args.smils)
+        cache_path = os.path.join(folder, "cache")
+
+        run("No disk cache", folder)
+        run("Cold disk cache", folder, cache_path)
+        run("Warm disk cache", folder, cache_path)
+
+
+if __name__ == "__main__":
+    main()
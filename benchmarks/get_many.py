@@ -0,0 +1,83 @@
+"""
+Benchmark of the book warm-up : sequential `DtbSource.get()` vs thread-pool `DtbSource.get_many()`.
+
+The NCC, all SMIL files and the text content files are fetched from :
+
+    - a web `FolderDtbSource` (a local HTTP server adding a fixed latency to each response)
+    - a `ZipDtbSource` (a deflated archive of the book, built in a temporary folder)
+
+Usage :
+
+    python benchmarks/get_many.py [--latency 0.05] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from functools import partial
+from typing import List
+
+from async_fetch import LatencyRequestHandler, LatencyServer, get_resource_names
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import DtbSource, FolderDtbSource, LogLevel, ZipDtbSource
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def compare(name: str, create_source, names: List[str], workers: int) -> None:
+    """Warm a new source sequentially, then another one with `get_many()`."""
+    source: DtbSource = create_source()
+    start = time.perf_counter()
+    for resource_name in names:
+        source.get(resource_name)
+    sequential = time.perf_counter() - start
+
+    source = create_source()
+    start = time.perf_counter()
+    source.get_many(names, max_workers=workers)
+    parallel = time.perf_counter() - start
+
+    print(f"{name:20s} | resources: {len(names):4d} | get(): {sequential:7.3f} s | get_many(): {parallel:7.3f} s | speedup: {sequential / parallel:5.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder")
+    parser.add_argument("--latency", type=float, default=0.05, help="the latency added to each response, in seconds")
+    parser.add_argument("--workers", type=int, default=8, help="the number of threads")
+    args = parser.parse_args()
+
+    names = get_resource_names(args.path)
+
+    server = LatencyServer(("127.0.0.1", 0), partial(LatencyRequestHandler, directory=args.path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    LatencyRequestHandler.latency = args.latency
+    try:
+        compare("Web folder", lambda: FolderDtbSource(f"http://127.0.0.1:{server.server_port}"), names, args.workers)
+    finally:
+        server.shutdown()
+
+    with tempfile.TemporaryDirectory() as folder:
+        zip_path = os.path.join(folder, "book.zip")
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name in names:
+                archive.write(os.path.join(args.path, name), name)
+        compare("ZIP archive", lambda: ZipDtbSource(zip_path), names, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the debug logging overhead on the hot paths.
+
+The sample SMIL files are parsed (`Smil._parse()`) from a warm source cache, so that only the SMIL data extraction and the model building are measured.
+Three configurations are compared :
+- logging off (`LogLevel.set(LogLevel.NONE)`) : the debug messages are not formatted
+- logging off, but the debug messages formatted and dropped by loguru (the former behavior, the `logconfig.debug_enabled` flag forced to True)
+- logging on (`LogLevel.DEBUG`), the messages written to a discarding sink
+
+Usage :
+
+    python benchmarks/logging_overhead.py [--runs 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from loguru import logger
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import FolderDtbSource, LogLevel, Reference, Smil
+from daisy_dtb.utilities import logconfig
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+
+def parse_all(source: FolderDtbSource, names: list) -> int:
+    """Parse the SMIL files. Returns the number of sections."""
+    count = 0
+    for name in names:
+        smil = Smil(source, Reference(name, ""))
+        smil._parse()
+        count += len(smil._sections)
+    return count
+
+
+def measure(name: str, source: FolderDtbSource, names: list, runs: int) -> None:
+    """Print the best duration of `runs` parses of the SMIL files."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        count = parse_all(source, names)
+        durations.append(time.perf_counter() - start)
+    print(f"{name:50s} | {min(durations) * 1000:8.2f} ms | {count} sections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="the number of parses of the SMIL files (the best one is reported)")
+    args = parser.parse_args()
+
+    LogLevel.set(LogLevel.NONE)
+    names = sorted([_ for _ in os.listdir(SAMPLE_DTB_PROJECT_PATH) if _.startswith("hauy_") and _.endswith(".smil")])
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, len(names))
+    parse_all(source, names)  # Warm the source cache
+
+    measure("logging off", source, names, args.runs)
+
+    logconfig.debug_enabled = True
+    measure("logging off, messages formatted (former behavior)", source, names, args.runs)
+
+    LogLevel.set(LogLevel.NONE)
+    logger.add(lambda message: None, level="DEBUG")
+    logconfig.debug_enabled = True
+    measure("logging on (discarding sink)", source, names, args.runs)
+
+    LogLevel.set(LogLevel.NONE)
+
+
+if __name__ == "__main__":
+    main()
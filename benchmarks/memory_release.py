@@ -0,0 +1,73 @@
+"""
+Benchmark of the memory held by a book during a long listening session.
+
+A synthetic book is read from the first to the last TOC entry (all section texts are loaded).
+The memory held by the book (`DaisyBook.memory_report()`) is reported along the session :
+- without release
+- with a release (`DaisyBook.release()`) of the data outside a window around the current TOC entry at each move
+- with a parse window (`DaisyBook.set_parse_window()`), moved by the navigator
+
+Usage :
+
+    python benchmarks/memory_release.py [--headings 500] [--window 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import BookNavigator, DaisyBook, FolderDtbSource, LogLevel, ReleasePolicy
+from daisy_dtb.bench import BookSpec, generate_book
+
+# Clean the modules search path
+del sys.path[-1]
+
+
+def session(path: str, policy: ReleasePolicy, points: int, window: int = 0) -> None:
+    """Read the book, and print the memory report `points` times."""
+    book = DaisyBook(FolderDtbSource(path, 20))
+    book.set_parse_window(window)
+    navigator = BookNavigator(book)
+    count = len(book.toc_entries)
+    step = max(1, count // points)
+    for index in range(count):
+        navigator.toc.navigate_to(book.toc_entries[index].id)
+        for section in navigator.current_toc_entry.sections:
+            section.text.content
+        if policy is not None:
+            book.release(policy, index)
+        if (index + 1) % step == 0 or index == count - 1:
+            report = book.memory_report([navigator])
+            print(
+                f"{index + 1:6d} | {report['total'] / 1024:10.1f} kB | {report['smil_models'] / 1024:10.1f} kB | {report['texts'] / 1024:8.1f} kB | {report['text_maps'] / 1024:10.1f} kB | {report['cached_documents'] / 1024:10.1f} kB"
+            )
+    book.set_parse_window(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--headings", type=int, default=500, help="the number of TOC entries of the book")
+    parser.add_argument("--window", type=int, default=5, help="the number of TOC entries kept around the current one")
+    parser.add_argument("--points", type=int, default=5, help="the number of memory reports")
+    args = parser.parse_args()
+
+    LogLevel.set(LogLevel.NONE)
+    with tempfile.TemporaryDirectory() as folder:
+        path = generate_book(os.path.join(folder, "book"), BookSpec(headings=args.headings, audio=False))
+        runs = [
+            ("no release", None, 0),
+            (f"release (window {args.window})", ReleasePolicy(window=args.window), 0),
+            (f"parse window (size {2 * args.window + 1})", None, 2 * args.window + 1),
+        ]
+        for name, policy, window in runs:
+            print(f"\n{name}\n{'entries':>6s} | {'total':>13s} | {'SMIL models':>13s} | {'texts':>11s} | {'text maps':>13s} | {'cached docs':>13s}")
+            session(path, policy, args.points, window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark of the player position synchronization.
+
+A player reports its position as (audio file, offset) at a given rate (e.g. 50 Hz).
+The position has to be mapped back to the TOC entry, section and clip whose text should be highlighted.
+
+Two strategies are compared :
+
+    - A linear scan of all clips of all sections.
+    - The `AudioIndex` of the book (binary search), through `DaisyBook.locate()`.
+
+Usage :
+
+    python benchmarks/position_sync.py [--ticks 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import DaisyBook, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def linear_scan(book: DaisyBook, src: str, offset: float):
+    """Find the context with a linear scan."""
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            for clip in section.clips:
+                if clip.src == src and clip.begin <= offset <= clip.end:
+                    return (entry, section, clip)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder")
+    parser.add_argument("--ticks", type=int, default=100000, help="the number of position ticks")
+    args = parser.parse_args()
+
+    book = DaisyBook(FolderDtbSource(args.path))
+
+    # Build the index (and parse all SMILs)
+    start = time.perf_counter()
+    index = book.audio_index
+    print(f"Index build time : {(time.perf_counter() - start) * 1000:.2f} ms ({len(index.sources)} audio files)")
+
+    # Random player positions
+    random.seed(0)
+    clips = [clip for entry in book.toc_entries for section in entry.sections for clip in section.clips]
+    ticks = []
+    for _ in range(args.ticks):
+        clip = random.choice(clips)
+        ticks.append((clip.src, random.uniform(clip.begin, clip.end)))
+
+    for name, locate, count in [
+        ("Linear scan", lambda src, offset: linear_scan(book, src, offset), max(args.ticks // 100, 1)),
+        ("AudioIndex", book.locate, args.ticks),
+    ]:
+        start = time.perf_counter()
+        for src, offset in ticks[:count]:
+            assert locate(src, offset) is not None
+        elapsed = time.perf_counter() - start
+        print(f"{name:12s} | {count / elapsed:12.0f} ticks/s | {elapsed / count * 1e6:8.2f} µs/tick | {elapsed / count * 50 * 100:8.4f} % CPU at 50 Hz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of the per-session memory : `BookNavigator` vs `BookCursor`.
+
+Many listener sessions are opened on the same book, each one moved to a different position.
+The memory allocated for the sessions is measured with `tracemalloc` (the shared book is loaded beforehand).
+
+Usage :
+
+    python benchmarks/session_memory.py [--sessions 1000]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import BookCursor, BookModel, BookNavigator, DaisyBook, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def measure(name: str, create_session, count: int) -> None:
+    """Create the sessions and print the allocated memory per session."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [create_session(_) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{name:15s} | sessions: {len(sessions):6d} | {(after - before) / count:10.0f} bytes/session")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=SAMPLE_DTB_PROJECT_PATH, help="the book folder")
+    parser.add_argument("--sessions", type=int, default=1000, help="the number of sessions")
+    args = parser.parse_args()
+
+    book = DaisyBook(FolderDtbSource(args.path))
+    model = BookModel.create_from_book(book)
+    entry_count = len(book.toc_entries)
+
+    def create_navigator(index: int) -> BookNavigator:
+        navigator = BookNavigator(book)
+        for _ in range(index % entry_count):
+            navigator.toc.next()
+        navigator.sections.next()
+        return navigator
+
+    def create_cursor(index: int) -> BookCursor:
+        cursor = BookCursor(model)
+        for _ in range(index % entry_count):
+            cursor.next_entry()
+        cursor.next_section()
+        return cursor
+
+    measure("BookNavigator", create_navigator, args.sessions)
+    measure("BookCursor", create_cursor, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
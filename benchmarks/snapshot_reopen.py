@@ -0,0 +1,96 @@
+"""
+Benchmark of the book reopening : from the source vs from a compiled snapshot.
+
+A synthetic book is generated in a temporary folder : its NCC references `--smils` SMIL files, copies of the sample ones.
+The book is opened from its folder (all SMIL and text files parsed), compiled, then reopened from the snapshot.
+
+Usage :
+
+    python benchmarks/snapshot_reopen.py [--smils 500]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import DaisyBook, FolderDtbSource, LogLevel
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Source cache size (the text content file is shared by all SMIL files)
+CACHE_SIZE = 10
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def generate_book(folder: str, smil_count: int) -> None:
+    """Generate a book with `smil_count` SMIL files (copies of the sample ones) in a folder."""
+    samples = sorted([_ for _ in os.listdir(SAMPLE_DTB_PROJECT_PATH) if _.startswith("hauy_") and _.endswith(".smil")])
+    shutil.copy(os.path.join(SAMPLE_DTB_PROJECT_PATH, "valentinhauy.html"), folder)
+
+    with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, "ncc.html"), encoding="utf-8") as file:
+        ncc = file.read()
+
+    headings = []
+    for index in range(smil_count):
+        name = f"book_{index:05d}.smil"
+        with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, samples[index % len(samples)]), encoding="utf-8") as file:
+            smil = file.read()
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as file:
+            file.write(smil)
+        fragment = re.search(r'<text [^>]*id="([^"]+)"', smil).group(1)
+        headings.append(f'\t\t<h1 id="ncc_{index:05d}"><a href="{name}#{fragment}">Chapter {index + 1}</a></h1>')
+
+    ncc = re.sub(r"<body>.*</body>", "<body>\n" + "\n".join(headings) + "\n\t</body>", ncc, flags=re.DOTALL)
+    with open(os.path.join(folder, "ncc.html"), "w", encoding="utf-8") as file:
+        file.write(ncc)
+
+
+def walk(book: DaisyBook) -> int:
+    """Access all sections and texts of a book. Returns the number of sections."""
+    count = 0
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+            count += 1
+    return count
+
+
+def measure(name: str, function) -> None:
+    """Run a function and print its duration."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{name:40s} | {(time.perf_counter() - start) * 1000:10.1f} ms | {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--smils", type=int, default=500, help="the number of SMIL files of the generated book")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        generate_book(folder, args.smils)
+        path = os.path.join(folder, "book.snapshot")
+
+        measure("Open from source (NCC only)", lambda: len(DaisyBook(FolderDtbSource(folder, CACHE_SIZE)).toc_entries))
+        measure("Open from source + walk", lambda: walk(DaisyBook(FolderDtbSource(folder, CACHE_SIZE))))
+        measure("Compile", lambda: DaisyBook(FolderDtbSource(folder, CACHE_SIZE)).compile(path))
+        print(f"Snapshot size : {os.path.getsize(path) / 1024:.0f} KB")
+        measure("Open from snapshot", lambda: len(DaisyBook.load_compiled(path, FolderDtbSource(folder, CACHE_SIZE)).toc_entries))
+        measure("Open from snapshot + walk", lambda: walk(DaisyBook.load_compiled(path, FolderDtbSource(folder, CACHE_SIZE))))
+
+
+if __name__ == "__main__":
+    main()
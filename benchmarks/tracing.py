@@ -0,0 +1,97 @@
+"""
+Benchmark of the loading stages tracing.
+
+The sample book is opened and walked (all SMIL and text files parsed) with tracing disabled, then enabled.
+The time spent per stage (fetch, decode, parse, model build) is reported.
+The cost of a disabled span is compared with an empty function call.
+
+Usage :
+
+    python benchmarks/tracing.py [--runs 10] [--trace trace.json]
+"""
+
+import argparse
+import os
+import sys
+import time
+import timeit
+
+# Adapt the modules search path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Import daisy-dtb modules
+from daisy_dtb import ChromeTraceSink, DaisyBook, FolderDtbSource, LogLevel, Tracer
+
+# Clean the modules search path
+del sys.path[-1]
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../tests/samples/valentin_hauy")
+
+# Set logging level
+LogLevel.set(LogLevel.NONE)
+
+
+def load_and_walk() -> int:
+    """Open the sample book and access all sections and texts. Returns the number of sections."""
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 10))
+    count = 0
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+            count += 1
+    return count
+
+
+def measure(runs: int) -> float:
+    """Get the best duration of `runs` loads, in milliseconds."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        load_and_walk()
+        durations.append(time.perf_counter() - start)
+    return min(durations) * 1000
+
+
+def empty() -> None:
+    pass
+
+
+def disabled_span() -> None:
+    with Tracer.span("stage", "resource"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="the number of loads (the best one is reported)")
+    parser.add_argument("--trace", type=str, default="", help="export the trace of a load to this Chrome trace file")
+    args = parser.parse_args()
+
+    count = 1000000
+    print(f"{'empty function call':40s} | {timeit.timeit(empty, number=count) / count * 1e9:10.0f} ns")
+    print(f"{'disabled span':40s} | {timeit.timeit(disabled_span, number=count) / count * 1e9:10.0f} ns")
+    print()
+
+    print(f"{'load and walk, tracing disabled':40s} | {measure(args.runs):10.1f} ms")
+    sink = ChromeTraceSink()
+    Tracer.add_sink(sink)
+    try:
+        print(f"{'load and walk, tracing enabled':40s} | {measure(args.runs):10.1f} ms")
+        sink.clear()
+        load_and_walk()
+    finally:
+        Tracer.remove_sink(sink)
+
+    # Stages of the last load (the nested stages are included in the enclosing ones)
+    print()
+    print(f"{'stage':20s} | {'count':>6s} | {'bytes':>10s} | {'total':>10s} | {'max':>10s}")
+    for name, item in sorted(sink.get_summary().items(), key=lambda x: -x[1]["total"]):
+        print(f"{name:20s} | {item['count']:6d} | {item['bytes']:10d} | {item['total'] * 1000:7.1f} ms | {item['max'] * 1000:7.2f} ms")
+
+    if args.trace:
+        sink.export(args.trace)
+        print(f"\nTrace exported to {args.trace}.")
+
+
+if __name__ == "__main__":
+    main()
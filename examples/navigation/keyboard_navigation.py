@@ -123,7 +123,7 @@ def keyboard_navigation(book: DaisyBook) -> None:
                         # Check if clip already loaded in pygame
                         if clip.src != clip_source:
                             pygame.mixer.music.stop()
-                            pygame.mixer.music.load(clip.get_sound(as_bytes_io=True))
+                            pygame.mixer.music.load(clip.get_sound_path() or clip.get_sound(as_bytes_io=True))
                             clip_source = clip.src
 
                         # Play the clip
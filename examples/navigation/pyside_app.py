@@ -39,21 +39,24 @@ SAMPLE_DTB_PROJECT_PATH_2 = os.path.join(os.path.dirname(__file__), "../../tests
 BUFFER_FILE_PATH = f"{tempfile.gettempdir()}/_pyside_buffer_.tmp"
 
 
-def get_sound_as_temp_file(data: bytes) -> str:
-    """Create a temporary sound file.
+def get_sound_file(clip: Audio) -> str:
+    """Get a sound file name for a clip.
 
-    We do this because `python-vlc` cannot handle `BytesIO` as a media source.
-
-    This is not so nice, but allowed us to focus on GUI application.
+    `python-vlc` cannot handle `BytesIO` as a media source.
+    A local sound file is used directly, otherwise (web or ZIP source) a temporary sound file is created.
 
     Args:
-        data (bytes): the sound bytes.
+        clip (Audio): the clip.
 
     Returns:
         str: a file name.
     """
+    path = clip.get_sound_path()
+    if path is not None:
+        return path
+
     with open(BUFFER_FILE_PATH, "wb") as file:
-        file.write(data)
+        file.write(clip.get_sound())
         file_name = file.name
     return file_name
 
@@ -253,7 +256,7 @@ class MainWindow(QMainWindow):
             while clip:
                 self.set_status(f"{clip.src} : start={clip.begin}, end={clip.end}")
                 if current_source != clip.src:
-                    sound_file = get_sound_as_temp_file(clip.get_sound())
+                    sound_file = get_sound_file(clip)
                     current_source = clip.src
                     media = self.vlc_instance.media_new(sound_file)
                     self.vlc_player.set_media(media)
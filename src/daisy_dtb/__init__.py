@@ -1,35 +1,63 @@
 """This is the package file."""
 
-from .book import DaisyBook, DaisyBookException
-from .cache import Cache, CacheStats
-from .models import Audio, MetaData, Reference, Section, Smil
-from .navigators import BaseNavigator, BookNavigator, BookNavigatorException, ClipNavigator, SectionNavigator, TocNavigator
+from .book import AudioIndex, BookModel, BookSnapshot, DaisyBook, DaisyBookException, ParseWindow, ReleasePolicy, freeze_book_structures
+from .cache import ArcPolicy, Cache, CachePolicy, CacheStats, DiskCache, FifoPolicy, LfuPolicy, LruPolicy, PartitionedCache, TinyLfuPolicy
+from .models import Audio, MetaData, PlaybackSpan, Reference, Section, Smil
+from .navigators import BaseNavigator, BookCursor, BookNavigator, BookNavigatorException, ClipNavigator, PlaybackCursor, SectionNavigator, TocNavigator
 from .sources import DtbSource, FolderDtbSource, ZipDtbSource
-from .utilities import Document, DomFactory, Element, ElementList, Fetcher, LogLevel
+from .utilities import AsyncFetcher, Document, DomFactory, Element, ElementList, FetchEvent, FetchMetrics, FetchObserver, Fetcher, LogLevel, Mp3FrameIndex, CallbackTraceSink, ChromeTraceSink, MemoryTraceSink, TraceSink, TraceSpan, Tracer
 
 __all__ = [
+    "AudioIndex",
+    "BookModel",
+    "BookSnapshot",
     "DaisyBook",
     "DaisyBookException",
+    "ParseWindow",
+    "ReleasePolicy",
+    "freeze_book_structures",
     "Cache",
     "CacheStats",
+    "DiskCache",
+    "ArcPolicy",
+    "CachePolicy",
+    "FifoPolicy",
+    "LfuPolicy",
+    "LruPolicy",
+    "PartitionedCache",
+    "TinyLfuPolicy",
     "Audio",
     "MetaData",
+    "PlaybackSpan",
     "Reference",
     "Section",
     "Smil",
     "BaseNavigator",
+    "BookCursor",
     "BookNavigator",
     "BookNavigatorException",
     "ClipNavigator",
+    "PlaybackCursor",
     "SectionNavigator",
     "TocNavigator",
     "DtbSource",
     "FolderDtbSource",
     "ZipDtbSource",
+    "AsyncFetcher",
     "Document",
     "DomFactory",
     "Element",
     "ElementList",
+    "FetchEvent",
+    "FetchMetrics",
+    "FetchObserver",
     "Fetcher",
     "LogLevel",
+    "Mp3FrameIndex",
+    "CallbackTraceSink",
+    "ChromeTraceSink",
+    "MemoryTraceSink",
+    "TraceSink",
+    "TraceSpan",
+    "Tracer",
 ]
@@ -0,0 +1,8 @@
+from .gc_monitor import GcMonitor
+from .generator import BookSpec, generate_book
+from .load_test import LoadTest
+from .regression import RegressionGate, assert_no_regression, check_baseline, save_baseline
+from .server import BookServer
+from .suite import BenchmarkSuite
+
+__all__ = ["BookSpec", "generate_book", "BenchmarkSuite", "BookServer", "GcMonitor", "LoadTest", "RegressionGate", "save_baseline", "check_baseline", "assert_no_regression"]
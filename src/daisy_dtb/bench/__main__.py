@@ -0,0 +1,189 @@
+"""
+Benchmark suite entry point.
+
+Usage :
+
+    python -m daisy_dtb.bench generate PATH [--headings 100] [--smils 0] ...
+    python -m daisy_dtb.bench run [--book PATH] [--headings 100] ... [--runs 5] [--gc-freeze] [--output results.json] [--compare baseline.json]
+    python -m daisy_dtb.bench baseline PATH [--book PATH] [--headings 100] ... [--runs 5]
+    python -m daisy_dtb.bench check PATH [--tolerance 0.1] [--confidence 3] [--output results.json]
+    python -m daisy_dtb.bench load [--book PATH] [--headings 100] ... [--listeners 10] [--duration 10] [--latency 0.02] [--bandwidth 0]
+
+Without `--book`, a synthetic book is generated in a temporary folder.
+The `baseline` command saves traced results, the `check` command runs them again (same book and settings) and exits with 1 on a regression.
+The `load` command serves the book folder with a local HTTP server (unless `--book` is an URL) and runs concurrent listeners.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from dataclasses import fields
+
+from ..utilities.logconfig import LogLevel
+from .generator import BookSpec, generate_book
+from .load_test import MODES, LoadTest
+from .regression import RegressionGate, check_baseline, save_baseline
+from .server import BookServer
+from .suite import BenchmarkSuite
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add an option per `BookSpec` attribute."""
+    for item in fields(BookSpec):
+        name = f"--{item.name.replace('_', '-')}"
+        if item.type is bool:
+            parser.add_argument(name, action=argparse.BooleanOptionalAction, default=item.default, help=f"default: {item.default}")
+        else:
+            parser.add_argument(name, type=item.type, default=item.default, help=f"default: {item.default}")
+
+
+def get_spec(args: argparse.Namespace) -> BookSpec:
+    """Get the book description from the options."""
+    return BookSpec(**{item.name: getattr(args, item.name) for item in fields(BookSpec)})
+
+
+def create_suite(args: argparse.Namespace, folder: str) -> BenchmarkSuite:
+    """Create the suite from the options (the book is generated into the folder if needed)."""
+    spec = None
+    path = args.book
+    if path is None:
+        spec = get_spec(args)
+        path = generate_book(os.path.join(folder, "book.zip" if args.zip else "book"), spec)
+    return BenchmarkSuite(path, runs=args.runs, cache_size=args.cache_size, jumps=args.jumps, lookups=args.lookups, gc_freeze=args.gc_freeze, spec=spec)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the suite and print (and save, and compare) the results."""
+    with tempfile.TemporaryDirectory() as folder:
+        results = create_suite(args, folder).run(args.benchmarks.split(",") if args.benchmarks else None)
+
+    print(BenchmarkSuite.format_results(results))
+    if args.output:
+        BenchmarkSuite.save(results, args.output)
+        print(f"\nResults saved to {args.output}.")
+    if args.compare:
+        print()
+        print(BenchmarkSuite.format_comparison(BenchmarkSuite.compare(BenchmarkSuite.load(args.compare), results)))
+    return 0
+
+
+def baseline(args: argparse.Namespace) -> int:
+    """Run the suite with tracing and save the results as a baseline."""
+    with tempfile.TemporaryDirectory() as folder:
+        results = save_baseline(create_suite(args, folder), args.path, args.benchmarks.split(",") if args.benchmarks else None)
+
+    print(BenchmarkSuite.format_results(results))
+    print(f"\nBaseline saved to {args.path}.")
+    return 0
+
+
+def check(args: argparse.Namespace) -> int:
+    """Run the benchmarks of a baseline again and report the regressions."""
+    gate = RegressionGate(tolerance=args.tolerance, confidence=args.confidence)
+    with tempfile.TemporaryDirectory() as folder:
+        results, rows = check_baseline(args.path, folder, gate, args.benchmarks.split(",") if args.benchmarks else None)
+
+    print(RegressionGate.format_report(rows))
+    if args.output:
+        BenchmarkSuite.save(results, args.output)
+        print(f"\nResults saved to {args.output}.")
+    return 1 if RegressionGate.get_regressions(rows) else 0
+
+
+def load(args: argparse.Namespace) -> int:
+    """Serve the book, run the load test and print (and save) the report."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = args.book
+        if path is None:
+            path = generate_book(os.path.join(folder, "book"), get_spec(args))
+
+        server = None
+        if not path.startswith(("http://", "https://")):
+            server = BookServer(path, latency=args.latency, bandwidth=args.bandwidth)
+            path = server.start()
+        try:
+            test = LoadTest(
+                path,
+                listeners=args.listeners,
+                duration=args.duration,
+                modes=args.modes.split(","),
+                cache_size=args.cache_size,
+                shared_source=args.shared_source,
+                think_time=args.think_time,
+                skip_level=args.skip_level,
+            )
+            report = test.run()
+        finally:
+            if server is not None:
+                server.stop()
+
+    print(LoadTest.format_report(report))
+    if args.output:
+        BenchmarkSuite.save(report, args.output)
+        print(f"\nReport saved to {args.output}.")
+    return 0 if report["errors"] == 0 else 1
+
+
+def add_suite_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the suite options."""
+    parser.add_argument("--book", type=str, default=None, help="the book (a folder or a ZIP file), default: a generated book")
+    parser.add_argument("--zip", action="store_true", help="generate the book as a ZIP file")
+    parser.add_argument("--runs", type=int, default=5, help="the number of runs of each benchmark")
+    parser.add_argument("--cache-size", type=int, default=20, help="the resource cache size")
+    parser.add_argument("--jumps", type=int, default=50, help="the number of TOC jumps per run")
+    parser.add_argument("--lookups", type=int, default=100, help="the number of fragments searched per run")
+    parser.add_argument("--gc-freeze", action="store_true", help="freeze the objects of the opened book in the gc_pause runs")
+    parser.add_argument("--benchmarks", type=str, default="", help="the comma separated benchmarks to run, default: all")
+    add_spec_arguments(parser)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m daisy_dtb.bench", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="generate a synthetic book (a folder, or a ZIP file if PATH ends with .zip)")
+    generate.add_argument("path", type=str)
+    add_spec_arguments(generate)
+
+    suite = commands.add_parser("run", help="run the benchmark suite")
+    add_suite_arguments(suite)
+    suite.add_argument("--output", type=str, default="", help="save the results to this JSON file")
+    suite.add_argument("--compare", type=str, default="", help="compare the results with this JSON file")
+
+    save = commands.add_parser("baseline", help="run the benchmark suite with tracing and save the results as a baseline")
+    save.add_argument("path", type=str)
+    add_suite_arguments(save)
+
+    gate = commands.add_parser("check", help="run the benchmarks of a baseline again and report the regressions (exit code 1)")
+    gate.add_argument("path", type=str)
+    gate.add_argument("--tolerance", type=float, default=0.10, help="the minimum relative slowdown")
+    gate.add_argument("--confidence", type=float, default=3.0, help="the number of standard errors of the noise band")
+    gate.add_argument("--benchmarks", type=str, default="", help="the comma separated benchmarks to run, default: those of the baseline")
+    gate.add_argument("--output", type=str, default="", help="save the results to this JSON file")
+
+    load_test = commands.add_parser("load", help="run concurrent listeners against the book served over HTTP")
+    load_test.add_argument("--book", type=str, default=None, help="the book (a folder or an URL), default: a generated book")
+    load_test.add_argument("--listeners", type=int, default=10, help="the number of simultaneous listeners")
+    load_test.add_argument("--duration", type=float, default=10.0, help="the test duration in seconds")
+    load_test.add_argument("--modes", type=str, default=",".join(MODES), help=f"the comma separated listener modes, default: {','.join(MODES)}")
+    load_test.add_argument("--latency", type=float, default=0.0, help="the server latency in seconds")
+    load_test.add_argument("--bandwidth", type=int, default=0, help="the server bandwidth per response in bytes per second, default: no limit")
+    load_test.add_argument("--cache-size", type=int, default=100, help="the resource cache size")
+    load_test.add_argument("--shared-source", action=argparse.BooleanOptionalAction, default=True, help="share a single source between the listeners")
+    load_test.add_argument("--think-time", type=float, default=0.0, help="the pause of a listener between two operations, in seconds")
+    load_test.add_argument("--skip-level", type=int, default=1, help="the navigation level of the skip mode")
+    load_test.add_argument("--output", type=str, default="", help="save the report to this JSON file")
+    add_spec_arguments(load_test)
+
+    args = parser.parse_args()
+    LogLevel.set(LogLevel.NONE)
+
+    if args.command == "generate":
+        print(f"Book generated in {generate_book(args.path, get_spec(args))}.")
+        return 0
+    return {"run": run, "baseline": baseline, "check": check, "load": load}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Garbage collection pauses monitor"""
+
+import gc
+import time
+from typing import List, Tuple
+
+
+class GcMonitor:
+    """
+    This class measures the pauses of the garbage collections (through `gc.callbacks`) while it is started.
+
+    A collection stops the whole interpreter : the pauses of all threads are measured.
+
+    Usage:
+
+        with GcMonitor() as monitor:
+            ...
+        print(monitor.get_stats())
+    """
+
+    def __init__(self) -> None:
+        self._pauses: List[Tuple[int, float]] = []
+        self._collected = 0
+        self._start: float | None = None
+        self._running = False
+
+    def __enter__(self) -> "GcMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """Start the measures (the previous pauses are kept, see `reset`)."""
+        if not self._running:
+            gc.callbacks.append(self._on_collection)
+            self._running = True
+
+    def stop(self) -> None:
+        """Stop the measures."""
+        if self._running:
+            gc.callbacks.remove(self._on_collection)
+            self._running = False
+            self._start = None
+
+    def reset(self) -> None:
+        """Drop the measured pauses."""
+        self._pauses = []
+        self._collected = 0
+
+    def get_pauses(self) -> List[Tuple[int, float]]:
+        """Get the measured pauses.
+
+        Returns:
+            List[Tuple[int, float]]: the generation and the duration in seconds of each collection.
+        """
+        return list(self._pauses)
+
+    def get_stats(self) -> dict:
+        """Get the pauses statistics.
+
+        Returns:
+            dict: the number of "collections" (and per "generations"), the "total" and "max" pause in seconds, the "max_full" pause (generation 2) and the number of "collected" objects.
+        """
+        pauses = self.get_pauses()
+        durations = [_[1] for _ in pauses]
+        return {
+            "collections": len(pauses),
+            "generations": [len([_ for _ in pauses if _[0] == generation]) for generation in range(3)],
+            "total": sum(durations),
+            "max": max(durations, default=0.0),
+            "max_full": max([_[1] for _ in pauses if _[0] == 2], default=0.0),
+            "collected": self._collected,
+        }
+
+    def _on_collection(self, phase: str, info: dict) -> None:
+        """Garbage collector callback (the collections are not concurrent)."""
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self._pauses.append((info["generation"], time.perf_counter() - self._start))
+            self._collected += info["collected"]
+            self._start = None
@@ -0,0 +1,235 @@
+"""Synthetic Daisy 2.02 book generator"""
+
+import math
+import os
+import random
+import zipfile
+from dataclasses import asdict, dataclass
+from typing import Callable, List
+
+from loguru import logger
+
+# Words of the generated texts
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua "
+    "enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure in "
+    "reprehenderit voluptate velit esse cillum fugiat nulla pariatur excepteur sint occaecat cupidatat non proident sunt culpa"
+).split()
+
+# The frame of the generated audio files : MPEG 2 layer III, 8 kbps, 16000 Hz, mono (36 bytes, 36 ms), silent
+MP3_FRAME = b"\xff\xf3\x18\xc0" + bytes(32)
+MP3_FRAME_DURATION = 576 / 16000
+
+
+@dataclass
+class BookSpec:
+    """The description of a synthetic book.
+
+    Attributes:
+        title (str): the book title.
+        headings (int): the number of TOC entries (h1 ... h6 tags of the NCC).
+        depth (int): the navigation depth (the headings levels cycle from 1 to `depth`).
+        smils (int): the number of SMIL files (0 : one per heading). The headings are spread over the SMIL files.
+        pars_per_smil (int): the number of sections (par tags) per SMIL file.
+        clips_per_par (int): the number of audio clips per section.
+        clip_duration (float): the duration of an audio clip, in seconds.
+        text_size (int): the number of characters of a section text.
+        text_files (int): the number of text content files.
+        audio (bool): generate the audio files (silent MP3 frames, about 1 kB per second).
+        seed (int): the seed of the generated texts.
+    """
+
+    title: str = "Synthetic book"
+    headings: int = 100
+    depth: int = 3
+    smils: int = 0
+    pars_per_smil: int = 10
+    clips_per_par: int = 1
+    clip_duration: float = 5.0
+    text_size: int = 200
+    text_files: int = 1
+    audio: bool = True
+    seed: int = 0
+
+    @property
+    def smil_count(self) -> int:
+        return self.smils if self.smils > 0 else self.headings
+
+    def check(self) -> None:
+        """Check the consistency of the description.
+
+        Raises:
+            ValueError: if the description is not consistent.
+        """
+        if self.headings < 1 or not 1 <= self.depth <= 6:
+            raise ValueError("A book needs at least one heading and a depth between 1 and 6.")
+        if self.smil_count > self.headings:
+            raise ValueError("A SMIL file is referenced by at least one heading : there cannot be more SMIL files than headings.")
+        if self.pars_per_smil < math.ceil(self.headings / self.smil_count) or self.clips_per_par < 1 or self.clip_duration <= 0:
+            raise ValueError("Each heading of a SMIL file needs its own section, and each section at least one clip.")
+        if not 1 <= self.text_files <= self.smil_count:
+            raise ValueError("There must be between 1 and `smils` text content files.")
+
+
+def generate_book(path: str, spec: BookSpec = None) -> str:
+    """Generate a synthetic Daisy 2.02 book.
+
+    The book is made of :
+    - the NCC (ncc.html), with `headings` TOC entries
+    - the SMIL files (book_0001.smil, ...), one audio file each (book_0001.mp3, ...)
+    - the text content files (text_0001.html, ...)
+
+    Args:
+        path (str): the book folder (created if needed), or a ZIP file if the path ends with ".zip".
+        spec (BookSpec, optional): the book description. Defaults to BookSpec().
+
+    Raises:
+        ValueError: if the description is not consistent.
+
+    Returns:
+        str: the path.
+    """
+    spec = spec if spec is not None else BookSpec()
+    spec.check()
+
+    if path.lower().endswith(".zip"):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            _write_book(spec, archive.writestr)
+    else:
+        os.makedirs(path, exist_ok=True)
+
+        def write(name: str, data: bytes) -> None:
+            with open(os.path.join(path, name), "wb") as file:
+                file.write(data)
+
+        _write_book(spec, write)
+
+    logger.debug(f"Synthetic book generated in {path} : {asdict(spec)}.")
+    return path
+
+
+def _format_time(seconds: float) -> str:
+    """Format a duration as hh:mm:ss.sss."""
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
+
+
+def _write_book(spec: BookSpec, write: Callable[[str, bytes], None]) -> None:
+    """Write the book files.
+
+    Args:
+        spec (BookSpec): the book description.
+        write (Callable[[str, bytes], None]): the function writing a file (name, data).
+    """
+    rng = random.Random(spec.seed)
+    smil_count = spec.smil_count
+    smil_duration = spec.pars_per_smil * spec.clips_per_par * spec.clip_duration
+
+    # Headings per SMIL file : the k-th heading of a SMIL file references the first text of its k-th part
+    smil_headings: List[List[int]] = [[] for _ in range(smil_count)]
+    for heading in range(spec.headings):
+        smil_headings[heading * smil_count // spec.headings].append(heading)
+    anchors = {}
+    for smil, headings in enumerate(smil_headings):
+        for k, heading in enumerate(headings):
+            anchors[heading] = (smil, k * spec.pars_per_smil // len(headings))
+
+    # Text content files
+    texts: List[List[str]] = [[] for _ in range(spec.text_files)]
+    heading_of_par = {anchor: heading for heading, anchor in anchors.items()}
+    for smil in range(smil_count):
+        lines = texts[smil * spec.text_files // smil_count]
+        for par in range(spec.pars_per_smil):
+            words, size = [], 0
+            while size < spec.text_size:
+                words.append(rng.choice(WORDS))
+                size += len(words[-1]) + 1
+            text = " ".join(words)[: max(spec.text_size, 1)].rstrip()
+            span = f'<span class="sentence" id="cnt_{smil + 1:04d}_{par + 1:04d}">{text}</span>'
+            heading = heading_of_par.get((smil, par))
+            if heading is None:
+                lines.append(f"\t\t<p>{span}</p>")
+            else:
+                level = heading % spec.depth + 1
+                lines.append(f"\t\t<h{level}>{span}</h{level}>")
+
+    for index, lines in enumerate(texts):
+        body = "\n".join(lines)
+        write(f"text_{index + 1:04d}.html", _html(spec.title, body).encode("utf-8"))
+
+    # SMIL and audio files
+    for smil in range(smil_count):
+        name = f"book_{smil + 1:04d}"
+        text_file = f"text_{smil * spec.text_files // smil_count + 1:04d}.html"
+        pars = []
+        time = 0.0
+        for par in range(spec.pars_per_smil):
+            clips = []
+            for clip in range(spec.clips_per_par):
+                clips.append(
+                    f'\t\t\t\t\t<audio src="{name}.mp3" clip-begin="npt={time:.3f}s" clip-end="npt={time + spec.clip_duration:.3f}s" id="aud_{smil + 1:04d}_{par + 1:04d}_{clip + 1:02d}"/>'
+                )
+                time += spec.clip_duration
+            pars.append(
+                f'\t\t\t<par endsync="last" id="par_{smil + 1:04d}_{par + 1:04d}">\n'
+                f'\t\t\t\t<text src="{text_file}#cnt_{smil + 1:04d}_{par + 1:04d}" id="txt_{smil + 1:04d}_{par + 1:04d}"/>\n'
+                "\t\t\t\t<seq>\n" + "\n".join(clips) + "\n\t\t\t\t</seq>\n\t\t\t</par>"
+            )
+        write(f"{name}.smil", _smil(spec.title, smil * smil_duration, smil_duration, "\n".join(pars)).encode("utf-8"))
+
+        if spec.audio:
+            write(f"{name}.mp3", MP3_FRAME * math.ceil(smil_duration / MP3_FRAME_DURATION))
+
+    # NCC
+    headings = []
+    for heading in range(spec.headings):
+        smil, par = anchors[heading]
+        level = heading % spec.depth + 1
+        headings.append(f'\t\t<h{level} id="ncc_{heading + 1:04d}"><a href="book_{smil + 1:04d}.smil#txt_{smil + 1:04d}_{par + 1:04d}">Heading {heading + 1}</a></h{level}>')
+    metadata = {
+        "dc:title": spec.title,
+        "dc:creator": "daisy_dtb.bench",
+        "dc:identifier": f"synthetic-{spec.seed}",
+        "dc:language": "en",
+        "dc:format": "Daisy 2.02",
+        "ncc:generator": "daisy_dtb.bench",
+        "ncc:charset": "utf-8",
+        "ncc:depth": str(spec.depth),
+        "ncc:tocItems": str(spec.headings),
+        "ncc:multimediaType": "audioFullText" if spec.audio else "textNCC",
+        "ncc:totalTime": _format_time(smil_count * smil_duration),
+        "ncc:files": str(1 + smil_count * (2 if spec.audio else 1) + spec.text_files),
+    }
+    head = "\n".join([f'\t\t<meta name="{name}" content="{content}"/>' for name, content in metadata.items()])
+    write("ncc.html", _html(spec.title, "\n".join(headings), head).encode("utf-8"))
+
+
+def _html(title: str, body: str, head: str = "") -> str:
+    """Get an XHTML document."""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml">\n'
+        f"\t<head>\n\t\t<title>{title}</title>\n"
+        '\t\t<meta http-equiv="Content-type" content="text/html; charset=utf-8"/>\n'
+        f"{head}\n\t</head>\n\t<body>\n{body}\n\t</body>\n</html>\n"
+    )
+
+
+def _smil(title: str, elapsed: float, duration: float, body: str) -> str:
+    """Get a SMIL document."""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<!DOCTYPE smil PUBLIC "-//W3C//DTD SMIL 1.0//EN" "http://www.w3.org/TR/REC-smil/SMIL10.dtd">\n'
+        "<smil>\n\t<head>\n"
+        f'\t\t<meta name="dc:title" content="{title}"/>\n'
+        '\t\t<meta name="dc:format" content="Daisy 2.02"/>\n'
+        f'\t\t<meta name="ncc:totalElapsedTime" content="{_format_time(elapsed)}"/>\n'
+        f'\t\t<meta name="ncc:timeInThisSmil" content="{_format_time(duration)}"/>\n'
+        '\t\t<layout>\n\t\t\t<region id="txtView"/>\n\t\t</layout>\n'
+        "\t</head>\n\t<body>\n"
+        f'\t\t<seq dur="{duration:.3f}s">\n{body}\n\t\t</seq>\n'
+        "\t</body>\n</smil>\n"
+    )
@@ -0,0 +1,304 @@
+"""Concurrent listeners load test"""
+
+import math
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+from ..book import DaisyBook
+from ..navigators import BookNavigator
+from ..sources import DtbSource, FolderDtbSource
+from ..utilities.fetcher import Fetcher
+from .gc_monitor import GcMonitor
+from .suite import BenchmarkSuite
+
+# The listener behaviors
+MODES = ["sequential", "jumps", "skip"]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Get the nearest-rank percentile of sorted values.
+
+    Args:
+        values (List[float]): the sorted values.
+        p (float): the percentile (0 to 100).
+
+    Returns:
+        float: the percentile (0.0 if there are no values).
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def get_rss() -> Tuple[int | None, int | None]:
+    """Get the resident set size of the process.
+
+    Returns:
+        Tuple[int | None, int | None]: the current and the peak sizes in bytes (None if not available on the platform).
+    """
+    current = peak = None
+    try:
+        with open("/proc/self/statm") as file:
+            current = int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        pass
+    return (current, peak)
+
+
+@dataclass
+class _Listener:
+    """The measures of a simulated listener.
+
+    It is intended for internal use.
+    """
+
+    mode: str
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    first_error: str = ""
+
+    def record(self, operation: str, duration: float) -> None:
+        self.samples.setdefault(operation, []).append(duration)
+
+    def fail(self, operation: str, error: Exception) -> None:
+        self.errors[operation] = self.errors.get(operation, 0) + 1
+        self.first_error = self.first_error or f"{operation}: {error!r}"
+
+
+@dataclass
+class LoadTest:
+    """A load test : simulated listeners navigating concurrently in a book (usually served by a `BookServer`).
+
+    Each listener opens the book, then repeats an operation until the end of the test, according to its mode :
+    - "sequential" : the "play" operation reads the current clip data and section text, then moves to the next clip
+    - "jumps" : the "jump" operation navigates to a random TOC entry and reads its first clip data and section text
+    - "skip" : the "skip" operation moves to the next TOC entry of the `skip_level` level and reads its first clip data and section text
+
+    The modes are assigned to the listeners in turn.
+
+    Attributes:
+        url (str): the book location (an URL or a folder).
+        listeners (int): the number of simultaneous listeners.
+        duration (float): the test duration in seconds.
+        modes (List[str]): the listener modes.
+        cache_size (int): the resource cache size of the sources.
+        shared_source (bool): if True, all listeners use the same source (and cache), otherwise each has its own.
+        think_time (float): the pause of a listener between two operations, in seconds.
+        skip_level (int): the navigation level of the "skip" mode.
+        seed (int): the seed of the random TOC jumps.
+
+    Note:
+    - The fetcher metrics are global : they are reset when the test starts.
+    """
+
+    url: str
+    listeners: int = 10
+    duration: float = 10.0
+    modes: List[str] = field(default_factory=lambda: list(MODES))
+    cache_size: int = 100
+    shared_source: bool = True
+    think_time: float = 0.0
+    skip_level: int = 1
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        unknown = [_ for _ in self.modes if _ not in MODES]
+        if unknown or not self.modes:
+            raise ValueError(f"Invalid listener modes: {', '.join(unknown) or 'none'}.")
+        if self.listeners < 1 or self.duration <= 0:
+            raise ValueError("A load test needs at least one listener and a positive duration.")
+
+    def create_source(self) -> DtbSource:
+        """Create a new source of the book.
+
+        Returns:
+            DtbSource: the source.
+        """
+        source = FolderDtbSource(self.url, self.cache_size)
+        source.enable_stats(True)
+        return source
+
+    def run(self) -> dict:
+        """Run the test.
+
+        Returns:
+            dict: the report, with following keys:
+            - "settings" : the test attributes.
+            - "elapsed" : the test duration in seconds.
+            - "operations" and "errors" : the number of operations (including the book openings) and failed operations.
+            - "throughput" : the number of operations per second.
+            - "first_error" : the first failure message ("" if none).
+            - "latency_ms" : per operation ("open", "play", "jump", "skip"), the "count", "errors", "p50", "p95", "p99" and "max" latencies in milliseconds.
+            - "cache" : the resource cache "queries", "hits", "efficiency" and "evictions" (all sources).
+            - "fetcher" : the fetcher metrics per transport (see `Fetcher.get_metrics`).
+            - "rss" : the "current" and "peak" resident set sizes in bytes (None if not available).
+            - "gc" : the garbage collection pauses (see `GcMonitor.get_stats`).
+        """
+        Fetcher.reset_stats()
+        shared = self.create_source() if self.shared_source else None
+        sources: List[DtbSource] = [shared] if shared is not None else []
+        listeners = [_Listener(self.modes[_ % len(self.modes)]) for _ in range(self.listeners)]
+        threads = []
+        start = time.perf_counter()
+        deadline = start + self.duration
+
+        for index, listener in enumerate(listeners):
+            source = shared
+            if source is None:
+                source = self.create_source()
+                sources.append(source)
+            threads.append(threading.Thread(target=self._listen, args=(listener, source, deadline, random.Random(self.seed + index)), daemon=True))
+        with GcMonitor() as monitor:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - start
+
+        return self._report(listeners, sources, elapsed, monitor.get_stats())
+
+    def _listen(self, listener: _Listener, source: DtbSource, deadline: float, rng: random.Random) -> None:
+        """Simulate a listener until the deadline."""
+        # A book per listener : the models are not meant to be shared between threads
+        start = time.perf_counter()
+        try:
+            navigator = BookNavigator(DaisyBook(source))
+        except Exception as error:
+            listener.fail("open", error)
+            return
+        listener.record("open", time.perf_counter() - start)
+
+        ids = [_.id for _ in navigator.book.toc_entries]
+        operation = {"sequential": "play", "jumps": "jump", "skip": "skip"}[listener.mode]
+        if listener.mode == "skip":
+            navigator.toc.set_nav_level(self.skip_level)
+
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if listener.mode == "sequential":
+                    LoadTest._play(navigator)
+                    if not BenchmarkSuite.move(navigator):
+                        navigator.toc.first()
+                else:
+                    if listener.mode == "jumps":
+                        navigator.toc.navigate_to(rng.choice(ids))
+                    elif navigator.toc.next() is None:
+                        navigator.toc.first()
+                    LoadTest._play(navigator)
+                listener.record(operation, time.perf_counter() - start)
+            except Exception as error:
+                listener.fail(operation, error)
+            if self.think_time:
+                time.sleep(self.think_time)
+
+    @staticmethod
+    def _play(navigator: BookNavigator) -> None:
+        """Read the current clip data and section text."""
+        clip = navigator.current_clip
+        if clip is not None:
+            clip.get_clip_bytes()
+        navigator.section_text
+
+    def _report(self, listeners: List[_Listener], sources: List[DtbSource], elapsed: float, pauses: dict) -> dict:
+        """Build the test report."""
+        latencies = {}
+        for operation in ["open", "play", "jump", "skip"]:
+            values = sorted([value for listener in listeners for value in listener.samples.get(operation, [])])
+            errors = sum([listener.errors.get(operation, 0) for listener in listeners])
+            if values or errors:
+                latencies[operation] = {
+                    "count": len(values),
+                    "errors": errors,
+                    **{f"p{p}": percentile(values, p) * 1000 for p in (50, 95, 99)},
+                    "max": values[-1] * 1000 if values else 0.0,
+                }
+
+        operations = sum([_["count"] + _["errors"] for _ in latencies.values()])
+        stats = [_.get_cache_stats()["memory"] for _ in sources]
+        queries, hits = sum([_["total_queries"] for _ in stats]), sum([_["total_hits"] for _ in stats])
+        current, peak = get_rss()
+
+        report = {
+            "settings": {
+                "url": self.url,
+                "listeners": self.listeners,
+                "duration": self.duration,
+                "modes": self.modes,
+                "cache_size": self.cache_size,
+                "shared_source": self.shared_source,
+                "think_time": self.think_time,
+                "skip_level": self.skip_level,
+                "seed": self.seed,
+            },
+            "elapsed": elapsed,
+            "operations": operations,
+            "errors": sum([_["errors"] for _ in latencies.values()]),
+            "throughput": operations / elapsed if elapsed else 0.0,
+            "first_error": next((_.first_error for _ in listeners if _.first_error), ""),
+            "latency_ms": latencies,
+            "cache": {"queries": queries, "hits": hits, "efficiency": hits / queries if queries else 0.0, "evictions": sum([_["evictions"] for _ in stats])},
+            "fetcher": Fetcher.get_metrics()["transports"],
+            "rss": {"current": current, "peak": peak},
+            "gc": pauses,
+        }
+        logger.debug(f"Load test of {self.url} : {operations} operations in {elapsed:.1f}s, {report['errors']} errors.")
+        return report
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        """Format a report as text.
+
+        Args:
+            report (dict): the report (see `run`).
+
+        Returns:
+            str: the text.
+        """
+        settings = report["settings"]
+        lines = [
+            f"{settings['listeners']} listeners ({', '.join(settings['modes'])}), {report['elapsed']:.1f} s, {report['operations']} operations, {report['errors']} errors",
+            f"throughput : {report['throughput']:.1f} operations/s",
+            "",
+            f"{'operation':10s} | {'count':>7s} | {'errors':>6s} | {'p50':>10s} | {'p95':>10s} | {'p99':>10s} | {'max':>10s}",
+        ]
+        for name, item in report["latency_ms"].items():
+            values = [f"{item[_]:.2f} ms" for _ in ("p50", "p95", "p99", "max")]
+            lines.append(f"{name:10s} | {item['count']:7d} | {item['errors']:6d} | {values[0]:>10s} | {values[1]:>10s} | {values[2]:>10s} | {values[3]:>10s}")
+
+        cache = report["cache"]
+        lines.extend(["", f"cache : {cache['hits']}/{cache['queries']} hits ({cache['efficiency']:.1%}), {cache['evictions']} evictions"])
+        for transport, item in report["fetcher"].items():
+            latency = item["latency_ms"]
+            lines.append(
+                f"fetcher ({transport}) : {item['count']} requests, {item['errors']} errors, {item['bytes'] / 1024:.1f} kB, "
+                f"max in flight {item['max_in_flight']}, p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms"
+            )
+        rss = report["rss"]
+        lines.append(f"rss : current {_format_size(rss['current'])}, peak {_format_size(rss['peak'])}")
+        pauses = report["gc"]
+        lines.append(
+            f"gc : {pauses['collections']} collections ({pauses['generations'][2]} full), total {pauses['total'] * 1000:.2f} ms, "
+            f"max {pauses['max'] * 1000:.2f} ms, max full {pauses['max_full'] * 1000:.2f} ms"
+        )
+        if report["first_error"]:
+            lines.append(f"first error : {report['first_error']}")
+        return "\n".join(lines)
+
+
+def _format_size(size: int | None) -> str:
+    return f"{size / 1024 / 1024:.1f} MB" if size is not None else "n/a"
@@ -0,0 +1,180 @@
+"""Performance regression gate"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .generator import BookSpec, generate_book
+from .suite import BenchmarkSuite
+
+
+@dataclass
+class RegressionGate:
+    """This class compares benchmark results with a baseline and flags the significant slowdowns.
+
+    A benchmark has regressed when its median exceeds the baseline median by more than the noise band.
+    The noise band is the largest of :
+    - `tolerance` times the baseline median (the smallest slowdown worth reporting)
+    - `confidence` times the standard error of the difference of the means (the run-to-run noise)
+
+    Attributes:
+        tolerance (float): the minimum relative slowdown.
+        confidence (float): the number of standard errors of the noise band.
+    """
+
+    tolerance: float = 0.10
+    confidence: float = 3.0
+
+    def check(self, baseline: dict, current: dict) -> List[dict]:
+        """Compare the benchmarks run in both results.
+
+        Args:
+            baseline (dict): the reference results.
+            current (dict): the new results.
+
+        Returns:
+            List[dict]: per benchmark, the comparison (see `BenchmarkSuite.compare`) with following additional keys:
+            - "band" : the noise band, in the benchmark unit.
+            - "regressed" : True if the benchmark has regressed.
+            - "stages" : the stages of a regressed benchmark when both results were traced (see `compare_stages`), otherwise [].
+        """
+        rows = BenchmarkSuite.compare(baseline, current)
+        for row in rows:
+            reference, item = baseline["benchmarks"][row["name"]], current["benchmarks"][row["name"]]
+            noise = math.sqrt(reference["stdev"] ** 2 / len(reference["values"]) + item["stdev"] ** 2 / len(item["values"]))
+            row["band"] = max(self.tolerance * row["baseline"], self.confidence * noise)
+            row["regressed"] = row["current"] - row["baseline"] > row["band"]
+            row["stages"] = []
+            if row["regressed"] and "stages" in reference and "stages" in item:
+                row["stages"] = RegressionGate.compare_stages(reference["stages"], item["stages"])
+        return rows
+
+    @staticmethod
+    def compare_stages(baseline: dict, current: dict) -> List[dict]:
+        """Compare the time spent per loading stage.
+
+        Args:
+            baseline (dict): the reference stages.
+            current (dict): the new stages.
+
+        Returns:
+            List[dict]: per stage, a dict with the "name", the "baseline" and "current" total durations and their "ratio", the largest increases first.
+        """
+        rows = []
+        for name in sorted(set(baseline) | set(current)):
+            before = baseline.get(name, {}).get("total", 0.0)
+            after = current.get(name, {}).get("total", 0.0)
+            rows.append({"name": name, "baseline": before, "current": after, "ratio": after / before if before else float("inf")})
+        return sorted(rows, key=lambda x: x["baseline"] - x["current"])
+
+    @staticmethod
+    def get_regressions(rows: List[dict]) -> List[dict]:
+        """Get the regressed benchmarks of a check."""
+        return [_ for _ in rows if _["regressed"]]
+
+    @staticmethod
+    def format_report(rows: List[dict]) -> str:
+        """Format a check (see `check`) as a table, followed by the stages of the regressed benchmarks.
+
+        Args:
+            rows (List[dict]): the check.
+
+        Returns:
+            str: the report.
+        """
+        lines = [f"{'benchmark':20s} | {'baseline':>12s} | {'current':>12s} | {'band':>12s} | ratio | status"]
+        for row in rows:
+            baseline, current, band = [BenchmarkSuite.format_value(row[_], row["unit"]) for _ in ("baseline", "current", "band")]
+            status = "REGRESSED" if row["regressed"] else "ok"
+            lines.append(f"{row['name']:20s} | {baseline:>12s} | {current:>12s} | {band:>12s} | {row['ratio']:.3f} | {status}")
+
+        for row in RegressionGate.get_regressions(rows):
+            if row["stages"]:
+                lines.extend(["", f"{row['name']} stages :"])
+                for stage in row["stages"]:
+                    baseline, current = [BenchmarkSuite.format_value(stage[_], "s") for _ in ("baseline", "current")]
+                    lines.append(f"    {stage['name']:16s} | {baseline:>12s} | {current:>12s} | {stage['ratio']:.3f}")
+        return "\n".join(lines)
+
+
+def create_suite(baseline: dict, folder: str) -> BenchmarkSuite:
+    """Create a suite with the book and the settings of baseline results.
+
+    A synthetic book is generated again (from its description) into the folder, other books are used in place.
+
+    Args:
+        baseline (dict): the reference results.
+        folder (str): the folder of the generated book.
+
+    Returns:
+        BenchmarkSuite: the suite.
+    """
+    settings = baseline["settings"]
+    path, spec = baseline["book"]["path"], baseline["book"]["spec"]
+    if spec is not None:
+        spec = BookSpec(**spec)
+        path = generate_book(os.path.join(folder, "book.zip" if path.lower().endswith(".zip") else "book"), spec)
+    return BenchmarkSuite(
+        path,
+        runs=settings["runs"],
+        cache_size=settings["cache_size"],
+        jumps=settings["jumps"],
+        lookups=settings.get("lookups", 100),
+        seed=settings["seed"],
+        gc_freeze=settings.get("gc_freeze", False),
+        spec=spec,
+    )
+
+
+def save_baseline(suite: BenchmarkSuite, path: str, names: List[str] = None) -> dict:
+    """Run the suite (with tracing) and save the results as a baseline.
+
+    Args:
+        suite (BenchmarkSuite): the suite.
+        path (str): the baseline file.
+        names (List[str], optional): the benchmarks to run. Defaults to None (all).
+
+    Returns:
+        dict: the results.
+    """
+    results = suite.run(names, trace=True)
+    BenchmarkSuite.save(results, path)
+    return results
+
+
+def check_baseline(path: str, folder: str, gate: RegressionGate = None, names: List[str] = None) -> Tuple[dict, List[dict]]:
+    """Run the benchmarks of a baseline again, with the same book and settings, and compare the results.
+
+    Args:
+        path (str): the baseline file.
+        folder (str): the folder of the generated book (see `create_suite`).
+        gate (RegressionGate, optional): the gate. Defaults to RegressionGate().
+        names (List[str], optional): the benchmarks to run. Defaults to None (the benchmarks of the baseline).
+
+    Returns:
+        Tuple[dict, List[dict]]: the new results and the check (see `RegressionGate.check`).
+    """
+    gate = gate if gate is not None else RegressionGate()
+    baseline = BenchmarkSuite.load(path)
+    results = create_suite(baseline, folder).run(names if names is not None else list(baseline["benchmarks"].keys()), trace=True)
+    return (results, gate.check(baseline, results))
+
+
+def assert_no_regression(path: str, folder: str, gate: RegressionGate = None, names: List[str] = None) -> None:
+    """Check a baseline, for use in a test.
+
+    The log level must be the one of the baseline run (logging is disabled by the command line).
+
+    Args:
+        path (str): the baseline file.
+        folder (str): the folder of the generated book (e.g. the `tmp_path` fixture).
+        gate (RegressionGate, optional): the gate. Defaults to RegressionGate().
+        names (List[str], optional): the benchmarks to run. Defaults to None (the benchmarks of the baseline).
+
+    Raises:
+        AssertionError: if a benchmark has regressed (the message is the report).
+    """
+    _, rows = check_baseline(path, folder, gate, names)
+    if RegressionGate.get_regressions(rows):
+        raise AssertionError("Performance regression:\n" + RegressionGate.format_report(rows))
@@ -0,0 +1,131 @@
+"""Local HTTP book server"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+# Size of the chunks written by a throttled response
+CHUNK_SIZE = 16 * 1024
+
+
+class _BookRequestHandler(SimpleHTTPRequestHandler):
+    """A static file handler adding a latency to each response, limiting the bandwidth and supporting single `Range: bytes=start-end` requests.
+
+    It is intended for internal use.
+    """
+
+    def do_GET(self) -> None:
+        server: "_BookHTTPServer" = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match is None:
+            return super().do_GET()
+
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start >= size:
+            self.send_error(416)
+            return
+
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self._write(data)
+
+    def copyfile(self, source, outputfile) -> None:
+        while data := source.read(CHUNK_SIZE):
+            self._write(data)
+
+    def _write(self, data: bytes) -> None:
+        """Write the response body, at the server bandwidth."""
+        bandwidth = self.server.bandwidth
+        for offset in range(0, len(data), CHUNK_SIZE):
+            chunk = data[offset : offset + CHUNK_SIZE]
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+            self.wfile.write(chunk)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _BookHTTPServer(ThreadingHTTPServer):
+    """A threaded HTTP server accepting many simultaneous connections (the default backlog is 5).
+
+    It is intended for internal use.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+    latency: float = 0.0
+    bandwidth: int = 0
+
+
+@dataclass
+class BookServer:
+    """Serve a book folder on a local port, in a background thread.
+
+    It can be used as a context manager : `with BookServer(folder, latency=0.02) as url: ...`.
+
+    Attributes:
+        folder (str): the book folder.
+        latency (float): the delay before each response, in seconds.
+        bandwidth (int): the maximum transfer rate of a response, in bytes per second (0 : no limit).
+    """
+
+    folder: str
+    latency: float = 0.0
+    bandwidth: int = 0
+
+    # Internal attributes
+    _server: _BookHTTPServer = field(init=False, default=None)
+
+    @property
+    def url(self) -> str:
+        """Get the book URL (the server must be started)."""
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def start(self) -> str:
+        """Start the server.
+
+        Returns:
+            str: the book URL.
+        """
+        self._server = _BookHTTPServer(("127.0.0.1", 0), partial(_BookRequestHandler, directory=self.folder))
+        self._server.latency = self.latency
+        self._server.bandwidth = self.bandwidth
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.debug(f"Serving {self.folder} at {self.url} (latency: {self.latency}s, bandwidth: {self.bandwidth} B/s).")
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
@@ -0,0 +1,433 @@
+"""Benchmark suite"""
+
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from loguru import logger
+
+from ..book import DaisyBook, freeze_book_structures
+from ..models import Reference, Smil
+from ..navigators import BookNavigator
+from ..sources import DtbSource, FolderDtbSource, ZipDtbSource
+from ..utilities.tracing import MemoryTraceSink, Tracer
+from .gc_monitor import GcMonitor
+from .generator import BookSpec
+
+# Results file format version
+RESULTS_VERSION = 1
+
+# The memory benchmarks (measured together, in a single run)
+MEMORY_BENCHMARKS = ["memory_peak", "memory_retained"]
+
+
+@dataclass
+class BenchmarkSuite:
+    """A suite of benchmarks run on a book (a folder or a ZIP file).
+
+    The benchmarks are :
+    - "open" : the book opening (NCC parsing), in seconds
+    - "first_text" : the book opening and the text of the first section, in seconds
+    - "traversal" : the book opening and the access to all sections and texts, in seconds
+    - "toc_jumps" : random TOC jumps with a `BookNavigator` (the text of the first section is read), in seconds
+    - "source_get" : `DtbSource.get` of the NCC, SMIL and text files, from a new cache then from the filled cache, in seconds
+    - "smil_parse" : `Smil._parse` of all SMIL files, from a filled cache, in seconds
+    - "element_by_id" : `Document.get_element_by_id` of random text fragments, in seconds
+    - "navigator_moves" : the moves of a `BookNavigator` through all clips of the book (SMIL files already parsed), in seconds
+    - "gc_pause" : the garbage collection pauses of a listening session (the traversal, TOC jumps and a final full collection), in seconds
+    - "memory_peak" : the memory peak of the opening and the traversal, in bytes
+    - "memory_retained" : the memory held by the book after the traversal, in bytes
+
+    Each benchmark is run `runs` times, with a new source (and cache) each time.
+    The garbage collection pauses during the runs of the time benchmarks are reported too (see `GcMonitor.get_stats`).
+
+    Attributes:
+        path (str): the book (a folder or a ZIP file).
+        runs (int): the number of runs of each benchmark.
+        cache_size (int): the resource cache size of the sources.
+        jumps (int): the number of TOC jumps of a "toc_jumps" run.
+        lookups (int): the number of fragments searched by an "element_by_id" run.
+        seed (int): the seed of the TOC jumps.
+        gc_freeze (bool): freeze the objects of the opened book (`freeze_book_structures`) in the "gc_pause" runs.
+        spec (BookSpec): the description of the book if it is a synthetic one (reported with the results).
+    """
+
+    path: str
+    runs: int = 5
+    cache_size: int = 20
+    jumps: int = 50
+    lookups: int = 100
+    seed: int = 0
+    gc_freeze: bool = False
+    spec: BookSpec = None
+
+    # Internal attributes
+    _benchmarks: Dict[str, Callable[[], float]] = field(init=False, default_factory=dict)
+    _resources: Dict[str, List[str]] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._benchmarks = {
+            "open": self._bench_open,
+            "first_text": self._bench_first_text,
+            "traversal": self._bench_traversal,
+            "toc_jumps": self._bench_toc_jumps,
+            "source_get": self._bench_source_get,
+            "smil_parse": self._bench_smil_parse,
+            "element_by_id": self._bench_element_by_id,
+            "navigator_moves": self._bench_navigator_moves,
+            "gc_pause": self._bench_gc_pause,
+        }
+
+    @property
+    def names(self) -> List[str]:
+        """Get the benchmark names."""
+        return list(self._benchmarks.keys()) + MEMORY_BENCHMARKS
+
+    def create_source(self) -> DtbSource:
+        """Create a new source of the book.
+
+        Returns:
+            DtbSource: the source.
+        """
+        if self.path.lower().endswith(".zip"):
+            source = ZipDtbSource(self.path)
+            source.cache_size = self.cache_size
+            return source
+        return FolderDtbSource(self.path, self.cache_size)
+
+    def open_book(self) -> DaisyBook:
+        """Open the book from a new source.
+
+        Returns:
+            DaisyBook: the book.
+        """
+        return DaisyBook(self.create_source())
+
+    @staticmethod
+    def walk(book: DaisyBook) -> int:
+        """Access all sections and texts of a book.
+
+        Args:
+            book (DaisyBook): the book.
+
+        Returns:
+            int: the number of sections.
+        """
+        count = 0
+        for entry in book.toc_entries:
+            for section in entry.sections:
+                section.text.content
+                count += 1
+        return count
+
+    @staticmethod
+    def move(navigator: BookNavigator) -> bool:
+        """Move a navigator to the next clip (of the next section, of the next TOC entry).
+
+        Args:
+            navigator (BookNavigator): the navigator.
+
+        Returns:
+            bool: False at the end of the book.
+        """
+        return navigator.clips.next() is not None or navigator.sections.next() is not None or navigator.toc.next() is not None
+
+    def get_resources(self) -> Dict[str, List[str]]:
+        """Get the book files (read once from the book).
+
+        Returns:
+            Dict[str, List[str]]: the "smil" and "text" files, and the text "fragments" (resource#fragment).
+        """
+        if self._resources is None:
+            book = self.open_book()
+            sections = [section for entry in book.toc_entries for section in entry.sections]
+            self._resources = {
+                "smil": sorted(set([_.smil_reference.resource for _ in book.toc_entries])),
+                "text": sorted(set([_.text.reference.resource for _ in sections])),
+                "fragments": [f"{_.text.reference.resource}#{_.text.reference.fragment}" for _ in sections],
+            }
+        return self._resources
+
+    def _bench_open(self) -> float:
+        start = time.perf_counter()
+        self.open_book()
+        return time.perf_counter() - start
+
+    def _bench_first_text(self) -> float:
+        start = time.perf_counter()
+        book = self.open_book()
+        book.toc_entries[0].sections[0].text.content
+        return time.perf_counter() - start
+
+    def _bench_traversal(self) -> float:
+        start = time.perf_counter()
+        BenchmarkSuite.walk(self.open_book())
+        return time.perf_counter() - start
+
+    def _bench_toc_jumps(self) -> float:
+        navigator = BookNavigator(self.open_book())
+        ids = [_.id for _ in navigator.book.toc_entries]
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        for _ in range(self.jumps):
+            navigator.toc.navigate_to(rng.choice(ids))
+            navigator.section_text
+        return time.perf_counter() - start
+
+    def _bench_source_get(self) -> float:
+        resources = self.get_resources()
+        names = ["ncc.html"] + resources["smil"] + resources["text"]
+        source = self.create_source()
+        start = time.perf_counter()
+        for _ in range(2):
+            for name in names:
+                DtbSource.give_back(source.get(name))
+        return time.perf_counter() - start
+
+    def _bench_smil_parse(self) -> float:
+        names = self.get_resources()["smil"]
+        source = self.create_source()
+        source.cache_size = max(source.cache_size, len(names))
+        for name in names:
+            DtbSource.give_back(source.get(name))
+        start = time.perf_counter()
+        for name in names:
+            Smil(source, Reference(name, ""))._parse()
+        return time.perf_counter() - start
+
+    def _bench_element_by_id(self) -> float:
+        fragments = self.get_resources()["fragments"]
+        rng = random.Random(self.seed)
+        lookups = [rng.choice(fragments).split("#") for _ in range(self.lookups)]
+        source = self.create_source()
+        documents = {name: source.get(name) for name in set([_[0] for _ in lookups])}
+        start = time.perf_counter()
+        for name, fragment in lookups:
+            documents[name].get_element_by_id(fragment)
+        return time.perf_counter() - start
+
+    def _bench_navigator_moves(self) -> float:
+        navigator = BookNavigator(self.open_book())
+        while BenchmarkSuite.move(navigator):
+            pass
+        navigator.toc.first()
+        start = time.perf_counter()
+        while BenchmarkSuite.move(navigator):
+            pass
+        return time.perf_counter() - start
+
+    def _bench_gc_pause(self) -> float:
+        book = self.open_book()
+        navigator = BookNavigator(book)
+        ids = [_.id for _ in book.toc_entries]
+        rng = random.Random(self.seed)
+        # The long-lived objects (the book structures) are not scanned by the collections
+        with freeze_book_structures() if self.gc_freeze else nullcontext():
+            with GcMonitor() as monitor:
+                BenchmarkSuite.walk(book)
+                for _ in range(self.jumps):
+                    navigator.toc.navigate_to(rng.choice(ids))
+                    navigator.section_text
+                # The periodic full collection of a long session
+                gc.collect()
+        return monitor.get_stats()["total"]
+
+    def _measure_memory(self) -> Tuple[int, int]:
+        """Get the memory peak of the opening and the traversal, and the memory held by the book after the traversal."""
+        tracemalloc.start()
+        try:
+            book = self.open_book()
+            BenchmarkSuite.walk(book)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del book
+        return (peak, current)
+
+    def _trace(self, name: str) -> Dict[str, dict]:
+        """Run a benchmark once, with tracing.
+
+        Returns:
+            Dict[str, dict]: per stage name, the "count" and the "total" duration in seconds (see `MemoryTraceSink.get_summary`).
+        """
+        sink = MemoryTraceSink()
+        Tracer.add_sink(sink)
+        try:
+            self._benchmarks[name]()
+        finally:
+            Tracer.remove_sink(sink)
+        return {stage: {"count": item["count"], "total": item["total"]} for stage, item in sink.get_summary().items()}
+
+    def run(self, names: List[str] = None, trace: bool = False) -> dict:
+        """Run the benchmarks.
+
+        Args:
+            names (List[str], optional): the benchmarks to run. Defaults to None (all).
+            trace (bool, optional): add the time spent per loading stage (the "stages" of a benchmark), measured by an additional traced run. Defaults to False.
+
+        Returns:
+            dict: the results (see `BenchmarkSuite.save`).
+        """
+        names = names if names is not None else self.names
+        unknown = [_ for _ in names if _ not in self.names]
+        if unknown:
+            raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}.")
+
+        results = {
+            "version": RESULTS_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(), "platform": platform.platform()},
+            "book": {"path": self.path, "spec": asdict(self.spec) if self.spec is not None else None},
+            "settings": {
+                "runs": self.runs,
+                "cache_size": self.cache_size,
+                "jumps": self.jumps,
+                "lookups": self.lookups,
+                "seed": self.seed,
+                "gc_freeze": self.gc_freeze,
+            },
+            "benchmarks": {},
+        }
+
+        memory = None
+        for name in names:
+            if name in MEMORY_BENCHMARKS:
+                # The memory measures are stable : a single run is enough
+                memory = memory if memory is not None else self._measure_memory()
+                results["benchmarks"][name] = BenchmarkSuite.summarize([memory[MEMORY_BENCHMARKS.index(name)]], "bytes")
+            else:
+                with GcMonitor() as monitor:
+                    values = [self._benchmarks[name]() for _ in range(self.runs)]
+                results["benchmarks"][name] = BenchmarkSuite.summarize(values, "s")
+                results["benchmarks"][name]["gc"] = monitor.get_stats()
+                if trace:
+                    # Not part of the measured runs : the tracing slows them down
+                    results["benchmarks"][name]["stages"] = self._trace(name)
+            logger.debug(f"Benchmark {name} : {results['benchmarks'][name]}.")
+
+        return results
+
+    @staticmethod
+    def summarize(values: List[float], unit: str) -> dict:
+        """Get the statistics of the measured values.
+
+        Args:
+            values (List[float]): the values.
+            unit (str): the unit ("s" or "bytes").
+
+        Returns:
+            dict: a dict with the "unit", the "values" and their "min", "median", "mean" and "stdev".
+        """
+        return {
+            "unit": unit,
+            "values": values,
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.fmean(values),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        }
+
+    @staticmethod
+    def save(results: dict, path: str) -> None:
+        """Save results to a JSON file.
+
+        Args:
+            results (dict): the results.
+            path (str): the file path.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """Load results from a JSON file.
+
+        Args:
+            path (str): the file path.
+
+        Raises:
+            ValueError: if the file format is not supported.
+
+        Returns:
+            dict: the results.
+        """
+        with open(path, encoding="utf-8") as file:
+            results = json.load(file)
+        if results.get("version") != RESULTS_VERSION:
+            raise ValueError(f"Unsupported results file format ({path}).")
+        return results
+
+    @staticmethod
+    def compare(baseline: dict, current: dict) -> List[dict]:
+        """Compare the medians of the benchmarks run in both results.
+
+        Args:
+            baseline (dict): the reference results.
+            current (dict): the new results.
+
+        Returns:
+            List[dict]: per benchmark, a dict with the "name", the "unit", the "baseline" and "current" medians and their "ratio" (current / baseline).
+        """
+        rows = []
+        for name, item in current["benchmarks"].items():
+            reference = baseline["benchmarks"].get(name)
+            if reference is None:
+                continue
+            rows.append(
+                {
+                    "name": name,
+                    "unit": item["unit"],
+                    "baseline": reference["median"],
+                    "current": item["median"],
+                    "ratio": item["median"] / reference["median"] if reference["median"] else float("inf"),
+                }
+            )
+        return rows
+
+    @staticmethod
+    def format_results(results: dict) -> str:
+        """Format results as a table.
+
+        Args:
+            results (dict): the results.
+
+        Returns:
+            str: the table.
+        """
+        lines = [f"{'benchmark':20s} | {'median':>12s} | {'min':>12s} | {'stdev':>12s} | {'gc max pause':>12s} | runs"]
+        for name, item in results["benchmarks"].items():
+            values = [BenchmarkSuite.format_value(item[_], item["unit"]) for _ in ("median", "min", "stdev")]
+            pause = BenchmarkSuite.format_value(item["gc"]["max"], "s") if "gc" in item else ""
+            lines.append(f"{name:20s} | {values[0]:>12s} | {values[1]:>12s} | {values[2]:>12s} | {pause:>12s} | {len(item['values'])}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_comparison(rows: List[dict]) -> str:
+        """Format a comparison (see `compare`) as a table.
+
+        Args:
+            rows (List[dict]): the comparison.
+
+        Returns:
+            str: the table.
+        """
+        lines = [f"{'benchmark':20s} | {'baseline':>12s} | {'current':>12s} | ratio"]
+        for row in rows:
+            baseline, current = [BenchmarkSuite.format_value(row[_], row["unit"]) for _ in ("baseline", "current")]
+            lines.append(f"{row['name']:20s} | {baseline:>12s} | {current:>12s} | {row['ratio']:.3f}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_value(value: float, unit: str) -> str:
+        """Format a measured value (milliseconds or kilobytes)."""
+        if unit == "bytes":
+            return f"{value / 1024:.1f} kB"
+        return f"{value * 1000:.2f} ms"
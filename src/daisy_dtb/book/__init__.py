@@ -1,3 +1,8 @@
+from .audio_index import AudioIndex
+from .book_model import BookModel
 from .daisybook import DaisyBook, DaisyBookException
+from .memory import ReleasePolicy, freeze_book_structures
+from .parse_window import ParseWindow
+from .snapshot import BookSnapshot
 
-__all__ = ["DaisyBook", "DaisyBookException"]
+__all__ = ["AudioIndex", "BookModel", "BookSnapshot", "DaisyBook", "DaisyBookException", "ParseWindow", "ReleasePolicy", "freeze_book_structures"]
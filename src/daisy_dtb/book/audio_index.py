@@ -0,0 +1,83 @@
+"""Reverse index from an audio position to the book context"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Union
+
+from loguru import logger
+
+from ..models import Audio, Section, TocEntry
+
+
+@dataclass
+class AudioIndex:
+    """Reverse index from a position in an audio file to the TOC entry, section and clip being played.
+
+    For each audio file (clip `src`), the clips are sorted by their begin time.
+    A lookup is a binary search, so it is cheap enough to be done on every player position tick.
+
+    Note:
+    - Building the index parses all SMIL files of the book.
+    """
+
+    toc_entries: List[TocEntry]
+
+    # Internal attributes
+    _begins: Dict[str, List[float]] = field(init=False, default_factory=dict)
+    _contexts: Dict[str, List[Tuple[TocEntry, Section, Audio]]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        """Build the index."""
+        contexts: Dict[str, List[Tuple[TocEntry, Section, Audio]]] = {}
+        for entry in self.toc_entries:
+            for section in entry.sections:
+                for clip in section.clips:
+                    contexts.setdefault(clip.src, []).append((entry, section, clip))
+
+        for src, items in contexts.items():
+            items.sort(key=lambda _: _[2].begin)
+            self._contexts[src] = items
+            self._begins[src] = [_[2].begin for _ in items]
+
+        logger.debug(f"Audio index built : {len(self._contexts)} audio file(s), {sum([len(_) for _ in self._begins.values()])} clip(s).")
+
+    @property
+    def sources(self) -> List[str]:
+        """Get the indexed audio files.
+
+        Returns:
+            List[str]: the audio file names.
+        """
+        return list(self._begins.keys())
+
+    def locate(self, src: str, offset: float) -> Union[Tuple[TocEntry, Section, Audio], None]:
+        """Find the context being played at a position in an audio file.
+
+        Notes:
+            - At a boundary between two contiguous clips, the following clip is returned.
+            - If `src` is a path or an URL, its last component is used as a fallback.
+
+        Args:
+            src (str): the audio file name (as in the clip `src` attribute).
+            offset (float): the position in the audio file, in seconds.
+
+        Returns:
+            Union[Tuple[TocEntry, Section, Audio], None]: the TOC entry, section and clip, or None if no clip covers the position.
+        """
+        begins = self._begins.get(src)
+        if begins is None:
+            src = src.replace("\\", "/").rsplit("/", 1)[-1]
+            begins = self._begins.get(src)
+            if begins is None:
+                return None
+
+        index = bisect_right(begins, offset) - 1
+        if index < 0:
+            return None
+
+        context = self._get_context(src, index)
+        return context if context is not None and offset <= context[2].end else None
+
+    def _get_context(self, src: str, index: int) -> Union[Tuple[TocEntry, Section, Audio], None]:
+        """Get the context of a clip of an audio file (the clips being sorted by their begin time)."""
+        return self._contexts[src][index]
@@ -0,0 +1,89 @@
+"""Immutable navigation model of a book"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Tuple, Union
+
+from loguru import logger
+
+from ..models import Audio, Section, TocEntry
+from .daisybook import DaisyBook
+
+
+@dataclass(frozen=True)
+class BookModel:
+    """Immutable navigation model of a book : TOC entries, sections and clips, held in tuples.
+
+    All SMIL files are parsed when the model is created. The model is then never modified :
+    it can be shared by any number of sessions and read from several threads without locks.
+    The navigation state of a session is held by a `BookCursor` (integer indexes only).
+
+    Note:
+    - The immutability is shallow : the tuples hold the objects of the book, whose lazy state is shared and mutable.
+    - The texts of the sections are loaded on first access, and released by `DaisyBook.release` (or a parse window) : they are then loaded again.
+      Two threads reading a text not loaded yet may both load it (the same content).
+    - A released SMIL file gets new sections when parsed again (`TocEntry.sections`) : the model keeps the former ones (and their loaded texts), which stay usable.
+    """
+
+    toc_entries: Tuple[TocEntry, ...]
+    sections: Tuple[Tuple[Section, ...], ...]  # Sections of each TOC entry
+    clips: Tuple[Tuple[Tuple[Audio, ...], ...], ...]  # Clips of each section of each TOC entry
+    navigation_depth: int
+
+    # Internal attributes
+    _entry_indexes: Mapping[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Build the TOC entry id lookup."""
+        object.__setattr__(self, "_entry_indexes", MappingProxyType({entry.id: index for index, entry in enumerate(self.toc_entries)}))
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of TOC entries."""
+        return len(self.toc_entries)
+
+    def index_of(self, entry_id: str) -> Union[int, None]:
+        """Get the index of a TOC entry.
+
+        Args:
+            entry_id (str): the TOC entry id.
+
+        Returns:
+            Union[int, None]: the index or None if the id is not found.
+        """
+        return self._entry_indexes.get(entry_id)
+
+    def get_context(self, toc: int, section: int, clip: int) -> Tuple[TocEntry, Union[Section, None], Union[Audio, None]]:
+        """Get the objects at a position.
+
+        Args:
+            toc (int): the TOC entry index.
+            section (int): the section index in the TOC entry.
+            clip (int): the clip index in the section.
+
+        Returns:
+            Tuple[TocEntry, Union[Section, None], Union[Audio, None]]: the TOC entry, the section and the clip (None if the entry has no section or the section no clip).
+        """
+        sections = self.sections[toc]
+        if section >= len(sections):
+            return (self.toc_entries[toc], None, None)
+
+        clips = self.clips[toc][section]
+        return (self.toc_entries[toc], sections[section], clips[clip] if clip < len(clips) else None)
+
+    @staticmethod
+    def create_from_book(book: DaisyBook) -> "BookModel":
+        """Create the model of a book (all SMIL files are parsed).
+
+        Args:
+            book (DaisyBook): the book.
+
+        Returns:
+            BookModel: the model.
+        """
+        toc_entries = tuple(book.toc_entries)
+        sections = tuple([tuple(entry.sections) for entry in toc_entries])
+        clips = tuple([tuple([tuple(section.clips) for section in entry_sections]) for entry_sections in sections])
+        model = BookModel(toc_entries, sections, clips, book.navigation_depth)
+        logger.debug(f"Book model created : {len(toc_entries)} TOC entries, {sum([len(_) for _ in sections])} sections.")
+        return model
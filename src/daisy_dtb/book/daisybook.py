@@ -1,14 +1,20 @@
 """Daisy Book related classes"""
 
-from dataclasses import dataclass, field
-from typing import List, Union
+from dataclasses import InitVar, dataclass, field
+from typing import Any, Iterable, List, Tuple, Union
 
 from loguru import logger
 
+from ..utilities import logconfig
 from ..utilities.domlib import Document
+from ..utilities.tracing import Tracer
 
-from ..models import MetaData, Reference, Smil, TocEntry
+from ..models import Audio, MetaData, Reference, Section, Smil, TocEntry
 from ..sources import DtbSource
+from .audio_index import AudioIndex
+from .memory import ReleasePolicy, get_memory_report
+from .parse_window import ParseWindow
+from .snapshot import BookSnapshot, CompiledAudioIndex
 
 
 class DaisyBookException(Exception):
@@ -27,6 +33,7 @@ class DaisyBook:
     """
 
     source: DtbSource
+    compiled: InitVar[BookSnapshot] = None
 
     # Internal attributes
     _title: str = field(init=False, default="")
@@ -34,8 +41,11 @@ class DaisyBook:
     _metadata: List[MetaData] = field(init=False, default_factory=list)
     _toc_entries: List[TocEntry] = field(init=False, default_factory=list)
     _smils: List[Smil] = field(init=False, default_factory=list)
+    _audio_index: AudioIndex = field(init=False, default=None)
+    _parse_window: ParseWindow = field(init=False, default=None)
+    _snapshot: BookSnapshot = field(init=False, default=None, repr=False)
 
-    def __post_init__(self):
+    def __post_init__(self, compiled: BookSnapshot = None):
         """DaisyBook instance post-initialization.
 
         The steps are :
@@ -45,35 +55,44 @@ class DaisyBook:
             - Create the SMIL entries
             - Set the books title and the navigation depth
 
+        With a compiled snapshot (see `load_compiled`), the TOC entries and the metadata are read from it instead.
+
+        Args:
+            compiled (BookSnapshot, optional): the snapshot of the book. Defaults to None.
+
         Raises:
             DaisyBookException: this exception is raised when the instance cannot be set up.
         """
-        # Get the ncc.html file content
-        ncc_document = self.source.get("ncc.html")
-
-        # No data, no further processing !
-        if ncc_document is None or not isinstance(ncc_document, Document):
-            message = f"Could not process {self.source.base_path}."
-            logger.critical(message)
-            raise DaisyBookException(f"Could not process {message}.")
-
-        # Populate the entries list
-        self._populate_entries(ncc_document)
-
-        # Populate the metadata list
-        self._populate_metadata(ncc_document)
-
-        # Populate the smils list
-        for entry in self._toc_entries:
-            self._smils.append(entry.smil)
-
-        # Set the title and navigation depth from the metadata
-        for meta in self._metadata:
-            match meta.name:
-                case "dc:title":
-                    self._title = meta.content
-                case "ncc:depth":
-                    self._navigation_depth = int(meta.content)
+        if compiled is not None:
+            self._snapshot = compiled
+            self._metadata = compiled.get_metadata()
+            self._toc_entries = compiled.get_toc_entries()
+            self._populate_smils_and_properties()
+            return
+
+        with Tracer.span("book.build", self.source.base_path):
+            # Get the ncc.html file content
+            ncc_document = self.source.get("ncc.html")
+
+            # No data, no further processing !
+            if ncc_document is None or not isinstance(ncc_document, Document):
+                message = f"Could not process {self.source.base_path}."
+                logger.critical(message)
+                raise DaisyBookException(f"Could not process {message}.")
+
+            with Tracer.span("book.model", "ncc.html"):
+                try:
+                    # Populate the entries list
+                    self._populate_entries(ncc_document)
+
+                    # Populate the metadata list
+                    self._populate_metadata(ncc_document)
+                finally:
+                    # The model holds no element of the document
+                    DtbSource.give_back(ncc_document)
+
+                # Populate the smils list, set the title and navigation depth
+                self._populate_smils_and_properties()
 
     @property
     def cache_stats(self) -> dict:
@@ -176,6 +195,74 @@ class DaisyBook:
         metadata = self.get_metadata("ncc:charset")
         return metadata.content if metadata else ""
 
+    @property
+    def audio_index(self) -> AudioIndex:
+        """Get the reverse index from audio positions to the book context.
+
+        Note:
+        - The index is built on first access (all SMIL files are parsed), or read from the timeline of the snapshot the book was loaded from, while it is mapped.
+
+        Returns:
+            AudioIndex: the audio index.
+        """
+        if self._audio_index is None:
+            if self._snapshot is not None and not self._snapshot.is_closed:
+                self._audio_index = CompiledAudioIndex(self._toc_entries, snapshot=self._snapshot)
+            else:
+                self._audio_index = AudioIndex(self._toc_entries)
+        return self._audio_index
+
+    @property
+    def snapshot(self) -> Union[BookSnapshot, None]:
+        """Get the compiled snapshot the book was loaded from (see `load_compiled`), or None."""
+        return self._snapshot
+
+    @property
+    def parse_window(self) -> Union[ParseWindow, None]:
+        """Get the window of parsed SMIL files (see `set_parse_window`).
+
+        Returns:
+            Union[ParseWindow, None]: the window or None if there is no window.
+        """
+        return self._parse_window
+
+    def set_parse_window(self, size: int = 8, prefetch: int = 2, behind: int = None) -> Union[ParseWindow, None]:
+        """Keep at most `size` parsed SMIL files around the navigation position, so that the memory stays flat during long sessions.
+
+        The navigators of the book move the window (see `ParseWindow`).
+
+        Args:
+            size (int, optional): the maximum number of parsed SMIL files (0 : no window, all parsed SMIL files are kept). Defaults to 8.
+            prefetch (int, optional): the number of upcoming TOC entries whose SMIL resource is fetched in advance. Defaults to 2.
+            behind (int, optional): the number of TOC entries kept before the current one. Defaults to `size // 4`.
+
+        Raises:
+            ValueError: if the window settings are not valid.
+
+        Returns:
+            Union[ParseWindow, None]: the window or None if there is no window.
+        """
+        if self._parse_window is not None:
+            self._parse_window.close()
+            self._parse_window = None
+        if size > 0:
+            self._parse_window = ParseWindow(self, size, prefetch, behind)
+        return self._parse_window
+
+    def locate(self, src: str, offset: float) -> Union[Tuple[TocEntry, Section, Audio], None]:
+        """Find the context being played at a position in an audio file.
+
+        This is typically used to synchronize the text with the position reported by a player.
+
+        Args:
+            src (str): the audio file name.
+            offset (float): the position in the audio file, in seconds.
+
+        Returns:
+            Union[Tuple[TocEntry, Section, Audio], None]: the TOC entry, section and clip, or None.
+        """
+        return self.audio_index.locate(src, offset)
+
     def get_metadata(self, name: str) -> Union[MetaData | None]:
         """Get metadat by name.
 
@@ -194,6 +281,128 @@ class DaisyBook:
             logger.debug(f"Metadata with name '{name}' not found in the metadata list.")
             return None
 
+    def memory_report(self, navigators: Iterable[Any] = ()) -> dict:
+        """Get the approximate memory held by the book, per category.
+
+        The categories are :
+        - "cached_documents" : the parsed documents (NCC, SMIL and text files) in the source cache
+        - "cached_audio" : the other data in the source cache (audio files)
+        - "smil_models" : the parsed SMIL files (sections and clips)
+        - "texts" : the loaded texts of the sections
+        - "toc" : the TOC entries and the metadata
+        - "text_maps" : the texts by element id of the text files, kept by the source
+        - "audio_indexes" : the MP3 frame indexes and estimations kept by the source, and the audio index
+        - "navigators" : the navigation state (the book and its models excluded)
+
+        Notes:
+        - The source data (cache, text maps, audio indexes) is shared by the books of the source.
+        - All the objects are walked through : this is not intended for the hot paths.
+
+        Args:
+            navigators (Iterable[Any], optional): the navigators (or cursors) of the book. Defaults to ().
+
+        Returns:
+            dict: the size of each category in bytes, the "total" and the "counts" of items per category.
+        """
+        return get_memory_report(self, navigators)
+
+    def release(self, policy: ReleasePolicy = None, current: Union[TocEntry, int] = 0) -> dict:
+        """Release the parsed data outside a window of TOC entries around the current one, so that long sessions stay bounded.
+
+        The released data is loaded again on next access.
+
+        Args:
+            policy (ReleasePolicy, optional): what is released. Defaults to ReleasePolicy().
+            current (Union[TocEntry, int], optional): the current TOC entry (or its index). Defaults to 0.
+
+        Returns:
+            dict: the number of released "smils", "texts", "text_maps", "audio_indexes" and "documents".
+        """
+        policy = policy if policy is not None else ReleasePolicy()
+        index = self._toc_entries.index(current) if isinstance(current, TocEntry) else current
+        low, high = index - policy.window, index + (policy.ahead if policy.ahead is not None else policy.window)
+        result = {"smils": 0, "texts": 0, "text_maps": 0, "audio_indexes": 0, "documents": 0}
+
+        kept, kept_audio, released = set(), set(), set()
+        for position, entry in enumerate(self._toc_entries):
+            smil = entry.smil
+            if low <= position <= high:
+                kept.add(entry.smil_reference.resource)
+                if smil.is_parsed:
+                    kept.update([_.text.reference.resource for _ in smil.sections])
+                    kept_audio.update([clip.src for section in smil.sections for clip in section.clips])
+            elif policy.smils:
+                if smil.is_parsed:
+                    released.add(entry.smil_reference.resource)
+                    released.update([_.text.reference.resource for _ in smil.sections])
+                result["smils"] += smil.release()
+            elif policy.texts and smil.is_parsed:
+                result["texts"] += sum([_.text.release() for _ in smil.sections])
+
+        if result["smils"]:
+            # The audio index holds the sections of all SMIL files
+            self._audio_index = None
+        if policy.text_maps:
+            result["text_maps"] = self.source.release_text_maps(kept)
+        if policy.audio_indexes:
+            result["audio_indexes"] = self.source.release_audio_indexes(kept_audio)
+        if policy.documents:
+            # The texts of the window are read from their text maps : the mapped documents are not needed
+            mapped = set([_ for _ in kept if self.source.has_text_map(_)])
+            result["documents"] = self.source.release_documents((released - kept) | mapped)
+
+        if logconfig.debug_enabled:
+            logger.debug(f"Book data released around TOC entry {index} : {result}.")
+        return result
+
+    def compile(self, path: str, version: str = None) -> None:
+        """Compile the book into a snapshot file, for an instant reopening with `DaisyBook.load_compiled()`.
+
+        Note:
+        - All SMIL files are parsed and all texts are loaded.
+        - The changes of a book from a web source cannot be detected : its version (e.g. an ETag) is needed, and must be given again to `load_compiled`.
+
+        Args:
+            path (str): the snapshot file path.
+            version (str, optional): the book version, stored in the snapshot key. Defaults to None.
+
+        Raises:
+            ValueError: if the source is a web source and no book version is given.
+        """
+        BookSnapshot.write(path, self.source, self._metadata, self._toc_entries, version)
+
+    @staticmethod
+    def load_compiled(path: str, source: DtbSource, version: str = None) -> Union["DaisyBook", None]:
+        """Reopen a book from a snapshot file created by `DaisyBook.compile()`.
+
+        Nothing is fetched from the source : the NCC, SMIL and text data are read from the snapshot.
+        The snapshot file stays mapped while the book reads it : `book.snapshot.close()` unmaps it (the SMIL files not read yet are then loaded from the source).
+
+        Args:
+            path (str): the snapshot file path.
+            source (DtbSource): the source of the book (used for the audio, and to check the snapshot).
+            version (str, optional): the book version, as given to `compile` (needed for a web source). Defaults to None.
+
+        Returns:
+            Union[DaisyBook, None]: the book, or None if the snapshot is missing, invalid or stale, or its book version differs (the book must then be loaded from its source).
+        """
+        snapshot = BookSnapshot.load(path, source, version)
+        if snapshot is None:
+            return None
+        return DaisyBook(source, snapshot)
+
+    def _populate_smils_and_properties(self) -> None:
+        """Store the SMILs of the TOC entries, set the title and navigation depth from the metadata."""
+        for entry in self._toc_entries:
+            self._smils.append(entry.smil)
+
+        for meta in self._metadata:
+            match meta.name:
+                case "dc:title":
+                    self._title = meta.content
+                case "ncc:depth":
+                    self._navigation_depth = int(meta.content)
+
     def _populate_entries(self, ncc_document: Document):
         """Process and store the NCC entries (h1 ... h6 tags)."""
         body = ncc_document.get_elements_by_tag_name("body").first()
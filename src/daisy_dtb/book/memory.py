@@ -0,0 +1,119 @@
+"""Memory accounting of a book"""
+
+import gc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from loguru import logger
+
+from ..utilities import logconfig
+from ..utilities.domlib import Document
+from ..utilities.memory import deep_size
+
+if TYPE_CHECKING:
+    from .daisybook import DaisyBook
+
+# The categories of a memory report
+MEMORY_CATEGORIES = ["cached_documents", "cached_audio", "smil_models", "texts", "toc", "text_maps", "audio_indexes", "navigators"]
+
+
+@dataclass
+class ReleasePolicy:
+    """What `DaisyBook.release` drops outside a window of TOC entries around the current one.
+
+    Attributes:
+        window (int): the number of TOC entries kept before the current one (and after it, unless `ahead` is set).
+        ahead (int): the number of TOC entries kept after the current one (None : `window`).
+        smils (bool): release the parsed SMIL files (sections, texts and clips) : they are parsed again on next access.
+        texts (bool): release the loaded texts of the SMIL files which are not released.
+        text_maps (bool): drop the source text maps of the text files not referenced in the window (the maps are shared by the books of the source).
+        audio_indexes (bool): drop the source MP3 frame indexes and estimations of the audio files not referenced in the window (they are shared by the books of the source).
+        documents (bool): remove from the source cache the SMIL and text documents of the released SMIL files, unless referenced in the window, and the text documents whose text map is kept.
+    """
+
+    window: int = 5
+    ahead: int = None
+    smils: bool = True
+    texts: bool = True
+    text_maps: bool = True
+    audio_indexes: bool = True
+    documents: bool = True
+
+
+@contextmanager
+def freeze_book_structures() -> Iterator[int]:
+    """Move the objects created so far, including the structures of the opened books (TOC entries, metadata), out of the garbage collector generations (`gc.freeze()`), for the duration of the context.
+
+    These long-lived objects are not scanned anymore by the full collections : the collection pauses are shorter during the listening session.
+
+    Usage:
+
+        book = DaisyBook(source)
+        with freeze_book_structures():
+            ...  # the listening session
+
+    Note:
+    - It is process wide : all the objects tracked by the garbage collector are frozen, not only the ones of the books. It is intended to be entered once the books are opened.
+    - A collection is run first, so that no garbage is frozen.
+    - The frozen objects which become garbage are not collected until the exit of the context, which unfreezes all objects (`gc.unfreeze()`).
+
+    Yields:
+        int: the number of frozen objects.
+    """
+    gc.collect()
+    gc.freeze()
+    count = gc.get_freeze_count()
+    if logconfig.debug_enabled:
+        logger.debug(f"{count} objects frozen by the garbage collector.")
+    try:
+        yield count
+    finally:
+        gc.unfreeze()
+
+
+def get_memory_report(book: "DaisyBook", navigators: Iterable[Any] = ()) -> dict:
+    """Get the approximate memory held by a book (see `DaisyBook.memory_report`).
+
+    Each object is counted once, in the first category (in following order) reaching it :
+    texts, SMIL models, TOC, text maps, audio indexes, cached documents, other cached data, navigators.
+
+    Args:
+        book (DaisyBook): the book.
+        navigators (Iterable[Any], optional): the navigators of the book. Defaults to ().
+
+    Returns:
+        dict: the size of each category in bytes, the "total" and the "counts" of items per category.
+    """
+    source = book.source
+    seen = {id(source), id(book)}
+    smils = [_.smil for _ in book.toc_entries if _.smil.is_parsed]
+    texts = [section.text for smil in smils for section in smil.sections if section.text.is_loaded]
+    items = source._cache.get_items()
+    documents = [data for _, data in items if isinstance(data, Document)]
+    others = [data for _, data in items if not isinstance(data, Document)]
+    navigators = list(navigators)
+
+    report = {
+        "texts": sum([deep_size(_.content, seen) for _ in texts]),
+        "smil_models": sum([deep_size(_, seen) for _ in smils]),
+        "toc": deep_size(book.toc_entries, seen) + deep_size(book.metadata, seen),
+        "text_maps": deep_size(source._text_maps, seen),
+        "audio_indexes": deep_size(source._frame_indexes, seen) + deep_size(source._estimates, seen) + deep_size(book._audio_index, seen),
+        "cached_documents": sum([deep_size(_, seen) for _ in documents]),
+        "cached_audio": sum([deep_size(_, seen) for _ in others]),
+        "navigators": sum([deep_size(_, seen) for _ in navigators]),
+    }
+    report = {name: report[name] for name in MEMORY_CATEGORIES}
+    report["total"] = sum(report.values())
+    report["counts"] = {
+        "cached_documents": len(documents),
+        "cached_audio": len(others),
+        "smil_models": len(smils),
+        "texts": len(texts),
+        "toc": len(book.toc_entries),
+        "text_maps": len(source._text_maps),
+        "audio_indexes": len(source._frame_indexes) + len(source._estimates),
+        "navigators": len(navigators),
+    }
+    return report
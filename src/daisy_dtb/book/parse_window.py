@@ -0,0 +1,134 @@
+"""Window of parsed SMIL files around the navigation position"""
+
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Union
+
+from loguru import logger
+
+from ..models import TocEntry
+from ..sources import DtbSource
+from ..utilities import logconfig
+from .memory import ReleasePolicy
+
+if TYPE_CHECKING:
+    from .daisybook import DaisyBook
+
+
+class ParseWindow:
+    """
+    This class keeps at most `size` parsed SMIL files around the navigation position of a book (see `DaisyBook.set_parse_window`).
+
+    On each move to another TOC entry :
+    - the SMIL files of the TOC entries outside the window are released (back to their lazy state, with their texts)
+    - the text maps, the MP3 frame indexes and estimations, and the cached documents (SMIL and text resources) which are not referenced in the window are dropped from the source,
+      as are the text documents of the window whose text map is kept
+    - the SMIL resources of the next `prefetch` TOC entries are fetched (and parsed as documents) into the source cache, in a background thread
+
+    The window starts `behind` entries before the current one : most moves are forward.
+
+    Notes:
+        - The navigators (`BookNavigator`, `PlaybackCursor`) move the window of their book. With several navigators, the last move wins.
+        - The prefetched resources may be evicted before use if the source cache is too small.
+        - The audio index of the book is dropped when SMIL files are released (it is built again on next use, parsing all SMIL files).
+    """
+
+    def __init__(self, book: "DaisyBook", size: int = 8, prefetch: int = 2, behind: int = None) -> None:
+        """Create a window.
+
+        Args:
+            book (DaisyBook): the book.
+            size (int, optional): the maximum number of parsed SMIL files. Defaults to 8.
+            prefetch (int, optional): the number of upcoming TOC entries whose SMIL resource is fetched in advance (0 : no prefetch). Defaults to 2.
+            behind (int, optional): the number of TOC entries kept before the current one. Defaults to `size // 4`.
+
+        Raises:
+            ValueError: if the size is less than 1, or `behind` not less than the size.
+        """
+        behind = behind if behind is not None else size // 4
+        if size < 1 or not 0 <= behind < size:
+            raise ValueError("The window needs a size of at least 1, and fewer entries behind the current one than its size.")
+
+        self._book = book
+        self._entries: List[TocEntry] = book.toc_entries
+        self._indexes: Dict[int, int] = {id(entry): index for index, entry in enumerate(self._entries)}
+        self._size = size
+        self._prefetch = max(0, prefetch)
+        self._policy = ReleasePolicy(window=behind, ahead=size - behind - 1, smils=True, texts=False, text_maps=True, audio_indexes=True, documents=True)
+        self._index: Union[int, None] = None
+        self._pending: Union[Future, None] = None
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        if self._prefetch > 0:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daisy-prefetch")
+        self._stats = {"moves": 0, "released": 0, "prefetched": 0}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def index(self) -> Union[int, None]:
+        """Get the index of the current TOC entry (None before the first move)."""
+        return self._index
+
+    def get_stats(self) -> dict:
+        """Get the window statistics.
+
+        Returns:
+            dict: the number of "moves", of "released" SMIL files and of "prefetched" resources.
+        """
+        return dict(self._stats)
+
+    def move(self, current: Union[TocEntry, int]) -> None:
+        """Move the window to a TOC entry.
+
+        Args:
+            current (Union[TocEntry, int]): the TOC entry (or its index).
+        """
+        index = self._indexes.get(id(current)) if isinstance(current, TocEntry) else current
+        if index is None or index == self._index:
+            return
+
+        self._index = index
+        self._stats["moves"] += 1
+        self._stats["released"] += self._book.release(self._policy, index)["smils"]
+        self._prefetch_from(index + 1)
+
+    def wait(self) -> None:
+        """Wait for the end of the running prefetch, if any."""
+        pending = self._pending
+        if pending is not None:
+            try:
+                pending.result()
+            except CancelledError:
+                pass
+
+    def close(self) -> None:
+        """Stop the prefetch worker (waiting for the running prefetch, if any)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _fetch(self, names: List[str]) -> None:
+        """Fetch resources into the source cache (the documents are not held : they are unlinked if evicted before use)."""
+        for data in self._book.source.get_many(names):
+            DtbSource.give_back(data)
+
+    def _prefetch_from(self, start: int) -> None:
+        """Fetch the SMIL resources of the upcoming TOC entries which are not parsed yet."""
+        if self._executor is None:
+            return
+
+        names = []
+        for entry in self._entries[start : start + self._prefetch]:
+            if not entry.smil.is_parsed and entry.smil_reference.resource not in names:
+                names.append(entry.smil_reference.resource)
+        if not names:
+            return
+
+        # The previous prefetch is not needed anymore if it has not started
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._executor.submit(self._fetch, names)
+        self._stats["prefetched"] += len(names)
+        if logconfig.debug_enabled:
+            logger.debug(f"Prefetching {names}.")
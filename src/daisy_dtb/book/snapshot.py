@@ -0,0 +1,478 @@
+"""Compiled book snapshots"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Union
+
+from loguru import logger
+
+from ..models import Audio, MetaData, Reference, Section, Smil, TocEntry
+from ..models.text import Text
+from ..sources import DtbSource
+from .audio_index import AudioIndex
+
+SNAPSHOT_MAGIC = b"DTBSNAP\x00"
+SNAPSHOT_VERSION = 2
+
+# String id of a missing (None) string
+NO_STRING = 0xFFFFFFFF
+
+# Record formats (little endian)
+_HEADER = struct.Struct("<8sHIIIIIIIIII")  # magic, version, base path, book version, string count, resource count, metadata count, entry count, section count, clip count, audio file count, timeline record count
+_RESOURCE = struct.Struct("<Idq")  # name, modification time, size (-1 : unknown)
+_METADATA = struct.Struct("<III")  # name, content, scheme
+_ENTRY = struct.Struct("<IIIIIIdII")  # id, level, SMIL resource, SMIL fragment, text, SMIL title, SMIL duration, first section, section count
+_SECTION = struct.Struct("<IIIIIII")  # id, text id, text resource, text fragment, text content, first clip, clip count
+_CLIP = struct.Struct("<IIdd")  # id, src, begin, end
+_AUDIO = struct.Struct("<III")  # src, first timeline record, timeline record count
+_TIMELINE = struct.Struct("<ddII")  # begin, end, TOC entry index, clip index in the TOC entry
+
+
+@dataclass
+class _StringTable:
+    """Deduplicated strings of a snapshot being written.
+
+    Note:
+    - It is intended for internal use.
+    """
+
+    _ids: Dict[str, int] = field(init=False, default_factory=dict)
+    _data: List[bytes] = field(init=False, default_factory=list)
+
+    def add(self, value: Union[str, None]) -> int:
+        """Add a string.
+
+        Args:
+            value (Union[str, None]): the string.
+
+        Returns:
+            int: the string id (NO_STRING for None).
+        """
+        if value is None:
+            return NO_STRING
+
+        id = self._ids.get(value)
+        if id is None:
+            id = len(self._data)
+            self._ids[value] = id
+            self._data.append(value.encode("utf-8"))
+        return id
+
+    def to_bytes(self) -> Tuple[bytes, bytes]:
+        """Get the string offsets table and the string data.
+
+        Returns:
+            Tuple[bytes, bytes]: the offsets (count + 1 little endian unsigned integers) and the UTF-8 data.
+        """
+        offsets = array("I", [0])
+        for data in self._data:
+            offsets.append(offsets[-1] + len(data))
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return (offsets.tobytes(), b"".join(self._data))
+
+
+@dataclass
+class CompiledSmil(Smil):
+    """A SMIL whose sections are read from a compiled snapshot (on first access) instead of being fetched and parsed."""
+
+    snapshot: "BookSnapshot" = field(default=None, repr=False, compare=False)
+    first_section: int = 0
+    section_count: int = 0
+
+    def _parse(self) -> None:
+        """Load the sections from the snapshot (or from the source, once the snapshot is closed)."""
+        if self._is_parsed:
+            return
+        if self.snapshot.is_closed:
+            super()._parse()
+            return
+
+        self._sections = self.snapshot.get_sections(self.first_section, self.section_count)
+        self._is_parsed = True
+
+
+@dataclass
+class CompiledAudioIndex(AudioIndex):
+    """An audio index read from the timeline of a compiled snapshot : no SMIL file is parsed to build it.
+
+    The TOC entry holding a found clip gets its sections on the lookup (from the snapshot, or from the source once the snapshot is closed).
+    """
+
+    snapshot: "BookSnapshot" = field(default=None, repr=False, compare=False)
+
+    # Internal attributes
+    _clips: Dict[str, array] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        """Read the index from the snapshot."""
+        for src, begins, clips in self.snapshot.get_timeline():
+            self._begins[src] = begins
+            self._clips[src] = clips
+
+        logger.debug(f"Audio index read from the snapshot : {len(self._begins)} audio file(s), {sum([len(_) for _ in self._begins.values()])} clip(s).")
+
+    def _get_context(self, src: str, index: int) -> Union[Tuple[TocEntry, Section, Audio], None]:
+        """Get the context of a clip of an audio file, from its TOC entry index and its index in the TOC entry."""
+        entry = self.toc_entries[self._clips[src][2 * index]]
+        clip_index = self._clips[src][2 * index + 1]
+        for section in entry.sections:
+            if clip_index < len(section.clips):
+                return (entry, section, section.clips[clip_index])
+            clip_index -= len(section.clips)
+        return None
+
+
+@dataclass
+class BookSnapshot:
+    """A compiled book : TOC, metadata, all SMIL sections and clips and their text contents, and the timeline, in a compact binary file.
+
+    File layout (little endian) :
+        - a header (magic, version, record counts)
+        - the string table : offsets, then UTF-8 data (each string is stored once)
+        - fixed size records : resources, metadata, TOC entries, sections, clips, audio files, timeline (strings are referenced by id)
+
+    The timeline holds the clips of each audio file sorted by their begin time : the audio index of the book (see `AudioIndex`) is read from it.
+
+    The file is memory mapped : a record is decoded when needed, the sections of a SMIL on first access.
+
+    The snapshot is keyed by the source base path, by the modification time and size of the resources
+    (NCC, SMIL and text files) and by the book version given by the caller, if any : it is rejected if the book has changed since its compilation.
+    The changes of a web source cannot be detected (the resources have no known modification time) : its snapshots need a book version (e.g. an ETag or a publication date).
+
+    The file stays mapped until `close()` : the SMIL files which are not read yet are then loaded from the source.
+    """
+
+    source: DtbSource
+
+    # Internal attributes
+    _buffer: mmap.mmap = field(init=False, default=None, repr=False)
+    _counts: Tuple[int, ...] = field(init=False, default=())
+    _string_offsets: array = field(init=False, default=None)
+    _string_start: int = field(init=False, default=0)
+    _table_starts: Dict[str, int] = field(init=False, default_factory=dict)
+
+    def __enter__(self) -> "BookSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._buffer is None
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def get_string(self, id: int) -> Union[str, None]:
+        """Get a string by id.
+
+        Args:
+            id (int): the string id.
+
+        Returns:
+            Union[str, None]: the string (None for NO_STRING).
+        """
+        if id == NO_STRING:
+            return None
+        return str(self._buffer[self._string_start + self._string_offsets[id] : self._string_start + self._string_offsets[id + 1]], "utf-8")
+
+    def get_metadata(self) -> List[MetaData]:
+        """Get the book metadata.
+
+        Returns:
+            List[MetaData]: the metadata.
+        """
+        start = self._table_starts["metadata"]
+        result = []
+        for name, content, scheme in _METADATA.iter_unpack(self._buffer[start : start + self._counts[2] * _METADATA.size]):
+            result.append(MetaData(self.get_string(name), self.get_string(content), self.get_string(scheme)))
+        return result
+
+    def get_toc_entries(self) -> List[TocEntry]:
+        """Get the TOC entries. Their SMIL sections are loaded on first access.
+
+        Returns:
+            List[TocEntry]: the TOC entries.
+        """
+        start = self._table_starts["entries"]
+        result = []
+        for id, level, smil_resource, smil_fragment, text, smil_title, smil_duration, first_section, section_count in _ENTRY.iter_unpack(
+            self._buffer[start : start + self._counts[3] * _ENTRY.size]
+        ):
+            reference = self._get_reference(smil_resource, smil_fragment)
+            entry = TocEntry(self.source, self.get_string(id), level, reference, self.get_string(text))
+            entry._smil = CompiledSmil(self.source, reference, snapshot=self, first_section=first_section, section_count=section_count)
+            entry._smil._title = self.get_string(smil_title)
+            entry._smil._total_duration = smil_duration
+            result.append(entry)
+        return result
+
+    def get_sections(self, first: int, count: int) -> List[Section]:
+        """Get sections and their clips.
+
+        Args:
+            first (int): the index of the first section.
+            count (int): the number of sections.
+
+        Returns:
+            List[Section]: the sections.
+        """
+        sections_start, clips_start = self._table_starts["sections"], self._table_starts["clips"]
+        result = []
+        for id, text_id, text_resource, text_fragment, content, first_clip, clip_count in _SECTION.iter_unpack(
+            self._buffer[sections_start + first * _SECTION.size : sections_start + (first + count) * _SECTION.size]
+        ):
+            text = Text(self.source, self.get_string(text_id), self._get_reference(text_resource, text_fragment))
+            text._content = self.get_string(content)
+            section = Section(self.source, self.get_string(id), text)
+            for clip_id, src, begin, end in _CLIP.iter_unpack(
+                self._buffer[clips_start + first_clip * _CLIP.size : clips_start + (first_clip + clip_count) * _CLIP.size]
+            ):
+                section._clips.append(Audio(self.source, self.get_string(clip_id), self.get_string(src), begin, end))
+            result.append(section)
+        return result
+
+    def get_timeline(self) -> List[Tuple[str, array, array]]:
+        """Get the timeline.
+
+        Returns:
+            List[Tuple[str, array, array]]: for each audio file, its name, the begin times of its clips (sorted)
+            and, for each clip, the index of its TOC entry and its index in the TOC entry.
+        """
+        audio_start, timeline_start = self._table_starts["audio"], self._table_starts["timeline"]
+        result = []
+        for src, first, count in _AUDIO.iter_unpack(self._buffer[audio_start : audio_start + self._counts[6] * _AUDIO.size]):
+            begins, clips = array("d"), array("I")
+            for begin, _, entry_index, clip_index in _TIMELINE.iter_unpack(
+                self._buffer[timeline_start + first * _TIMELINE.size : timeline_start + (first + count) * _TIMELINE.size]
+            ):
+                begins.append(begin)
+                clips.extend((entry_index, clip_index))
+            result.append((self.get_string(src), begins, clips))
+        return result
+
+    def _get_reference(self, resource: int, fragment: int) -> Union[Reference, None]:
+        return Reference(self.get_string(resource), self.get_string(fragment)) if resource != NO_STRING else None
+
+    def _is_up_to_date(self, version: Union[str, None]) -> bool:
+        """Check the snapshot key : the source base path, the book version and the resources modification times and sizes."""
+        _, _, base_path, book_version, *_ = _HEADER.unpack_from(self._buffer)
+        base_path = self.get_string(base_path)
+        if base_path != self.source.base_path:
+            logger.debug(f"The snapshot was compiled from another source ({base_path}).")
+            return False
+
+        book_version = self.get_string(book_version)
+        if book_version != version:
+            logger.debug(f"The snapshot was compiled from another version of the book ({book_version}).")
+            return False
+
+        start = self._table_starts["resources"]
+        for name, mtime, size in _RESOURCE.iter_unpack(self._buffer[start : start + self._counts[1] * _RESOURCE.size]):
+            if self.source.stat(self.get_string(name)) != (None if size < 0 else (mtime, size)):
+                logger.debug(f"The resource '{self.get_string(name)}' has changed since the snapshot compilation.")
+                return False
+        return True
+
+    @staticmethod
+    def load(path: str, source: DtbSource, version: str = None) -> Union["BookSnapshot", None]:
+        """Open a snapshot file.
+
+        Args:
+            path (str): the snapshot file path.
+            source (DtbSource): the source of the book.
+            version (str, optional): the book version, as given to `write` (needed for a web source). Defaults to None.
+
+        Returns:
+            Union[BookSnapshot, None]: the snapshot or None if the file is missing, invalid, of another version or stale (or the source is a web source and no book version is given).
+        """
+        if source.is_remote and version is None:
+            logger.debug(f"No snapshot loaded for the web source {source.base_path} : a book version is needed.")
+            return None
+
+        try:
+            with open(path, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            logger.debug(f"No snapshot in '{path}'.")
+            return None
+
+        snapshot = None
+        try:
+            snapshot = BookSnapshot._map(path, source, buffer, version)
+        finally:
+            # Rejected (or failed) : unmap the file
+            if snapshot is None:
+                buffer.close()
+        return snapshot
+
+    @staticmethod
+    def _map(path: str, source: DtbSource, buffer: mmap.mmap, version: Union[str, None]) -> Union["BookSnapshot", None]:
+        """Check a mapped snapshot file and read its layout (see `load`)."""
+        if len(buffer) < _HEADER.size:
+            logger.debug(f"Invalid snapshot '{path}'.")
+            return None
+
+        magic, snapshot_version, _, _, *counts = _HEADER.unpack_from(buffer)
+        if magic != SNAPSHOT_MAGIC or snapshot_version != SNAPSHOT_VERSION:
+            logger.debug(f"Invalid snapshot '{path}' (or version {snapshot_version} instead of {SNAPSHOT_VERSION}).")
+            return None
+
+        snapshot = BookSnapshot(source)
+        snapshot._buffer = buffer
+        snapshot._counts = tuple(counts)
+
+        # String table
+        position = _HEADER.size
+        offsets_size = (counts[0] + 1) * 4
+        snapshot._string_offsets = array("I")
+        snapshot._string_offsets.frombytes(buffer[position : position + offsets_size])
+        if sys.byteorder == "big":
+            snapshot._string_offsets.byteswap()
+        snapshot._string_start = position + offsets_size
+        position = snapshot._string_start + snapshot._string_offsets[-1]
+
+        # Records
+        names = ["resources", "metadata", "entries", "sections", "clips", "audio", "timeline"]
+        for name, record, count in zip(names, [_RESOURCE, _METADATA, _ENTRY, _SECTION, _CLIP, _AUDIO, _TIMELINE], counts[1:]):
+            snapshot._table_starts[name] = position
+            position += record.size * count
+
+        if position != len(buffer):
+            logger.debug(f"Invalid snapshot '{path}' (truncated or corrupted).")
+            return None
+
+        if not snapshot._is_up_to_date(version):
+            return None
+
+        logger.debug(f"Snapshot '{path}' loaded : {counts[3]} TOC entries, {counts[4]} sections, {counts[5]} clips.")
+        return snapshot
+
+    @staticmethod
+    def write(path: str, source: DtbSource, metadata: List[MetaData], toc_entries: List[TocEntry], version: str = None) -> None:
+        """Compile a book into a snapshot file.
+
+        Note:
+        - All SMIL files are parsed and all text contents are loaded (one fetch per text file).
+
+        Args:
+            path (str): the snapshot file path.
+            source (DtbSource): the source of the book.
+            metadata (List[MetaData]): the book metadata.
+            toc_entries (List[TocEntry]): the book TOC entries.
+            version (str, optional): the book version (e.g. an ETag), stored in the snapshot key. Defaults to None.
+
+        Raises:
+            ValueError: if the source is a web source and no book version is given (the changes of the book could not be detected).
+        """
+        if source.is_remote and version is None:
+            raise ValueError(f"A book version is needed to compile a book from the web source {source.base_path}.")
+
+        # Load all texts, grouped by text file
+        texts: Dict[str, List[Text]] = {}
+        for entry in toc_entries:
+            for section in entry.sections:
+                if section.text is not None and section.text.reference is not None and section.text._content is None:
+                    texts.setdefault(section.text.reference.resource, []).append(section.text)
+        for name, document in zip(texts.keys(), source.get_many(list(texts.keys()))):
+            for text in texts[name]:
+                text.load_from_document(document)
+            DtbSource.give_back(document)
+
+        # Key resources
+        resources = ["ncc.html"]
+        for entry in toc_entries:
+            if entry.smil_reference is not None:
+                resources.append(entry.smil_reference.resource)
+            for section in entry.sections:
+                if section.text is not None and section.text.reference is not None:
+                    resources.append(section.text.reference.resource)
+
+        strings = _StringTable()
+        base_path = strings.add(source.base_path)
+        book_version = strings.add(version)
+        resource_records = bytearray()
+        for name in dict.fromkeys(resources):
+            stat = source.stat(name)
+            resource_records += _RESOURCE.pack(strings.add(name), *(stat if stat is not None else (-1.0, -1)))
+
+        metadata_records = bytearray()
+        for meta in metadata:
+            metadata_records += _METADATA.pack(strings.add(meta.name), strings.add(meta.content), strings.add(meta.scheme))
+
+        entry_records, section_records, clip_records = bytearray(), bytearray(), bytearray()
+        section_count, clip_count = 0, 0
+        timeline: Dict[str, List[Tuple[float, float, int, int]]] = {}
+        for entry_index, entry in enumerate(toc_entries):
+            first_clip = clip_count
+            reference = entry.smil_reference
+            entry_records += _ENTRY.pack(
+                strings.add(entry.id),
+                entry.level,
+                strings.add(reference.resource if reference else None),
+                strings.add(reference.fragment if reference else None),
+                strings.add(entry.text),
+                strings.add(entry.smil.title),
+                entry.smil.total_duration,
+                section_count,
+                len(entry.sections),
+            )
+            for section in entry.sections:
+                text = section.text
+                section_records += _SECTION.pack(
+                    strings.add(section.id),
+                    strings.add(text.id if text else None),
+                    strings.add(text.reference.resource if text and text.reference else None),
+                    strings.add(text.reference.fragment if text and text.reference else None),
+                    strings.add(text._content if text else None),
+                    clip_count,
+                    len(section.clips),
+                )
+                for clip in section.clips:
+                    clip_records += _CLIP.pack(strings.add(clip.id), strings.add(clip.src), clip.begin, clip.end)
+                    timeline.setdefault(clip.src, []).append((clip.begin, clip.end, entry_index, clip_count - first_clip))
+                    clip_count += 1
+            section_count += len(entry.sections)
+
+        # Timeline : the clips of each audio file, sorted by begin time (as in `AudioIndex`)
+        audio_records, timeline_records = bytearray(), bytearray()
+        timeline_count = 0
+        for src, items in timeline.items():
+            items.sort(key=lambda _: _[0])
+            audio_records += _AUDIO.pack(strings.add(src), timeline_count, len(items))
+            for item in items:
+                timeline_records += _TIMELINE.pack(*item)
+            timeline_count += len(items)
+
+        offsets, data = strings.to_bytes()
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            base_path,
+            book_version,
+            len(offsets) // 4 - 1,
+            len(resource_records) // _RESOURCE.size,
+            len(metadata),
+            len(toc_entries),
+            section_count,
+            clip_count,
+            len(timeline),
+            timeline_count,
+        )
+
+        # Write a temporary file, then replace the snapshot (no partially written snapshot)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            for chunk in (header, offsets, data, resource_records, metadata_records, entry_records, section_records, clip_records, audio_records, timeline_records):
+                file.write(chunk)
+        os.replace(temporary_path, path)
+        logger.debug(f"Snapshot '{path}' written : {len(toc_entries)} TOC entries, {section_count} sections, {clip_count} clips.")
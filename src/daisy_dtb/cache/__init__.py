@@ -1,4 +1,7 @@
 from .cache import Cache
 from .cachestats import CacheStats
+from .disk_cache import DiskCache
+from .partitioned_cache import PartitionedCache
+from .policies import ArcPolicy, CachePolicy, FifoPolicy, LfuPolicy, LruPolicy, TinyLfuPolicy
 
-__all__ = ["Cache", "CacheStats"]
+__all__ = ["Cache", "CacheStats", "DiskCache", "PartitionedCache", "ArcPolicy", "CachePolicy", "FifoPolicy", "LfuPolicy", "LruPolicy", "TinyLfuPolicy"]
@@ -1,12 +1,16 @@
 """Resource cacheing classes"""
 
-from collections import deque
+import sys
+import threading
+import time
 from dataclasses import InitVar, dataclass, field
-from typing import Any
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 from loguru import logger
 
+from ..utilities import logconfig
 from .cachestats import CacheStats
+from .policies import CachePolicy, FifoPolicy
 
 
 @dataclass
@@ -19,10 +23,12 @@ class _CacheItem:
 
     key: str
     data: Any
+    size: int = 0
 
     def __post_init__(self):
         """Class post initilization."""
-        logger.debug(f"The cache item '{self.key}' has been created. Its type is {type(self.data)}.")
+        if logconfig.debug_enabled:
+            logger.debug(f"The cache item '{self.key}' has been created. Its type is {type(self.data)}.")
 
     @property
     def type(self) -> type:
@@ -36,42 +42,111 @@ class _CacheItem:
 
 @dataclass
 class Cache:
-    """Representation of resource cache"""
+    """Representation of resource cache
+
+    Note:
+    - The cache can be accessed from several threads : the items are protected by a lock, as are the statistics.
+    - The evicted items are chosen by a policy (see the `policies` module). The default policy is FIFO.
+    - Besides the number of items, the total size of the items can be limited (`max_bytes`).
+    - Eviction hooks can be called with the evicted (or replaced) items, e.g. to release their resources (see `add_eviction_hook`).
+    """
 
     max_size: InitVar[int] = 0
     with_stats: InitVar[bool] = False
+    policy: InitVar[Type[CachePolicy]] = FifoPolicy
+    max_bytes: int = 0  # 0 : no limit
 
     # Internal attributes
-    _items: deque[_CacheItem] = field(init=False, default_factory=deque)
+    _items: Dict[str, _CacheItem] = field(init=False, default_factory=dict)
+    _policy: CachePolicy = field(init=False, default=None)
     _with_stats: bool = field(init=False, default=False)
     _stats: CacheStats = field(init=False, default_factory=CacheStats)
+    _lock: threading.RLock = field(init=False, default_factory=threading.RLock)
+    _bytes: int = field(init=False, default=0)
+    _evictions: int = field(init=False, default=0)
+    _hooks: List[Callable[[str, Any], None]] = field(init=False, default_factory=list)
+    _dropped: List[Tuple[str, Any]] = field(init=False, default_factory=list)
 
-    def __post_init__(self, max_size: int, with_stats: bool) -> None:
+    def __post_init__(self, max_size: int, with_stats: bool, policy: Type[CachePolicy]) -> None:
         """Cache post initialize.
 
         Args:
             max_size (int): the cache size.
+            with_stats (bool): enable the statistics collection.
+            policy (Type[CachePolicy]): the eviction policy class.
         """
 
         if max_size < 0:
             logger.warning(f"The cache size must be positive. {max_size} was supplied: cache size set to 0.")
             max_size = 0
 
-        self._items = deque(maxlen=max_size)
+        self._policy = policy(max_size)
         self._with_stats = with_stats
-        logger.debug(f"Cache created. Size: {max_size}. Statistics collection is {'active' if self._with_stats else 'inactive'}.")
+        logger.debug(f"Cache created. Size: {max_size}, {self.max_bytes} bytes. Policy: {policy.__name__}. Statistics collection is {'active' if self._with_stats else 'inactive'}.")
 
     @property
     def maxlen(self) -> int:
-        return self._items.maxlen
+        return self._policy.capacity
+
+    @property
+    def size(self) -> int:
+        """Get the number of cached items."""
+        return len(self._items)
+
+    @property
+    def bytes(self) -> int:
+        """Get the total size of the cached items."""
+        return self._bytes
+
+    def add_eviction_hook(self, hook: Callable[[str, Any], None]) -> None:
+        """Register a function called with the key and the data of each evicted or replaced item.
+
+        Note:
+        - The hooks are called after the cache lock is released, by the thread which caused the eviction.
+
+        Args:
+            hook (Callable[[str, Any], None]): the function.
+        """
+        with self._lock:
+            if hook not in self._hooks:
+                # Copy on write : the hooks are called without the lock
+                self._hooks = self._hooks + [hook]
+
+    def remove_eviction_hook(self, hook: Callable[[str, Any], None]) -> None:
+        """Unregister an eviction hook.
+
+        Args:
+            hook (Callable[[str, Any], None]): the function.
+        """
+        with self._lock:
+            self._hooks = [_ for _ in self._hooks if _ != hook]
 
     def get_stats(self) -> dict:
         """Get the cache statistics.
 
         Returns:
-            dict: a dict with the statistics.
+            dict: a dict with the statistics (see `CacheStats.get_stats`), and with following keys:
+            - "total_misses" : the number of queries of items not in the cache.
+            - "size" : the number of cached items.
+            - "bytes" : the total size of the cached items.
+            - "evictions" : the number of evicted items.
         """
-        return self._stats.get_stats()
+        result = self._stats.get_stats()
+        with self._lock:
+            result.update(total_misses=result["total_queries"] - result["total_hits"], size=len(self._items), bytes=self._bytes, evictions=self._evictions)
+        return result
+
+    @staticmethod
+    def get_size(data: Any) -> int:
+        """Get the size of data (the length of bytes or strings, the shallow size of other objects).
+
+        Args:
+            data (Any): the data.
+
+        Returns:
+            int: the size in bytes.
+        """
+        return len(data) if isinstance(data, (bytes, bytearray, str)) else sys.getsizeof(data)
 
     def enable_stats(self, value: bool) -> None:
         """Enable or disable statistics collection.
@@ -82,56 +157,146 @@ class Cache:
         self._with_stats = value
         logger.debug(f"Cache statistics collection is {'active' if self._with_stats else 'inactive'}.")
 
+    def enable_samples(self, interval: float = 1.0, count: int = 60) -> None:
+        """Enable (or disable) the time series of the statistics (see `CacheStats.enable_samples`).
+
+        Args:
+            interval (float, optional): the length of a sample interval, in seconds (0 : disable). Defaults to 1.0.
+            count (int, optional): the number of kept samples. Defaults to 60.
+        """
+        self._stats.enable_samples(interval, count)
+
+    def get_samples(self) -> List[dict]:
+        """Get the time series of the statistics (see `CacheStats.get_samples`).
+
+        Returns:
+            List[dict]: the hits, misses, efficiency and mean lookup time per interval.
+        """
+        return self._stats.get_samples()
+
     def resize(self, new_size: int) -> None:
-        """Resize the cache.
+        """Resize the cache (the policy chooses the evicted items).
 
         Args:
             new_size (int): the new size
         """
         # Checks
-        if not isinstance(new_size, int) or (new_size < 0) or (new_size == self._items.maxlen):
+        if not isinstance(new_size, int) or (new_size < 0) or (new_size == self.maxlen):
             return
 
-        # Cache migration
-        logger.debug(f"Resizing the cache from {self._items.maxlen} to {new_size}.")
-        new_cache = deque(maxlen=new_size)
-        self._items.reverse()
-        if new_cache.maxlen > 0:
-            for index, item in enumerate(self._items):
-                if index > new_cache.maxlen - 1:
-                    break
-                new_cache.appendleft(item)
+        logger.debug(f"Resizing the cache from {self.maxlen} to {new_size}.")
+        with self._lock:
+            for key in self._policy.resize(new_size):
+                self._remove(key)
+        self._call_hooks()
+        logger.debug(f"The cache size now is {self.maxlen}.")
 
-        self._items = new_cache
-        logger.debug(f"The cache size now is {self._items.maxlen}.")
-
-    def add(self, key: str, data: Any) -> None:
+    def add(self, key: str, data: Any, size: int = None) -> None:
         """Add data into the cache.
 
         Notes :
             - If the cache max. length is 0, nothing is done.
             - If the kex exists in the cache, data is updated.
-            - If the addition would overfill the cache, the oldest item is removed before adding the new one.
+            - If the addition would overfill the cache, the policy evicts an item (or does not admit the new one).
+            - If the addition would exceed the bytes limit, the policy evicts items until the cache fits.
+            - An item larger than the bytes limit is not cached.
 
         Args:
             key (str): the key.
             data (Any): the data.
+            size (int, optional): the data size in bytes (e.g. the size of the resource a Document was parsed from). Defaults to `Cache.get_size(data)`.
         """
 
         # Checks
-        if self._items.maxlen == 0:
+        if self.maxlen == 0:
+            return
+
+        size = Cache.get_size(data) if size is None else size
+        if self.max_bytes and size > self.max_bytes:
+            if logconfig.debug_enabled:
+                logger.debug(f"Item '{key}' ({size} bytes) is larger than the cache ({self.max_bytes} bytes).")
             return
 
-        try:
+        with self._lock:
             # Check if item exists and update the current data
-            item_index = [_.key for _ in self._items].index(key)
-            self._items[item_index].data = data
-            logger.debug(f"Resource '{key}' in the cache (index={item_index}) has been updated.")
+            item = self._items.get(key)
+            if item is not None:
+                if self._hooks and item.data is not data:
+                    self._dropped.append((key, item.data))
+                item.data = data
+                self._bytes += size - item.size
+                item.size = size
+                if logconfig.debug_enabled:
+                    logger.debug(f"Resource '{key}' in the cache has been updated.")
+            else:
+                # Otherwise add the item
+                evicted = self._policy.on_insert(key)
+                for evicted_key in evicted:
+                    if evicted_key != key:
+                        self._remove(evicted_key)
+                if key in evicted:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Item '{key}' not admitted into the cache.")
+                else:
+                    self._items[key] = _CacheItem(key, data, size)
+                    self._bytes += size
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Item '{key}' added into the cache as {type(data)}.")
+
+            # Bytes limit
+            while self.max_bytes and self._bytes > self.max_bytes:
+                self._remove(self._policy.evict())
+
+        self._call_hooks()
+
+    def remove(self, key: str) -> bool:
+        """Remove an item (e.g. a resource not needed anymore). It is not counted as an eviction, but the eviction hooks are called.
+
+        Args:
+            key (str): the key.
+
+        Returns:
+            bool: True if the item was cached.
+        """
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is not None:
+                self._policy.remove(key)
+                self._bytes -= item.size
+                if self._hooks:
+                    self._dropped.append((key, item.data))
+
+        if item is None:
+            return False
+        self._call_hooks()
+        if logconfig.debug_enabled:
+            logger.debug(f"Item '{key}' removed from the cache.")
+        return True
+
+    def _remove(self, key: str) -> None:
+        """Remove an evicted item (the lock must be held)."""
+        item = self._items.pop(key)
+        self._bytes -= item.size
+        self._evictions += 1
+        if self._hooks:
+            self._dropped.append((key, item.data))
+        if logconfig.debug_enabled:
+            logger.debug(f"Item '{key}' evicted from the cache.")
+
+    def _call_hooks(self) -> None:
+        """Call the eviction hooks with the dropped items (the lock must not be held)."""
+        if not self._dropped:
             return
-        except ValueError:
-            # Otherwise append the item
-            self._items.append(_CacheItem(key, data))
-            logger.debug(f"Item '{key}' added into the cache as {type(data)}.")
+        with self._lock:
+            dropped, self._dropped = self._dropped, []
+        hooks = self._hooks
+        while dropped:
+            key, data = dropped.pop(0)
+            for hook in hooks:
+                try:
+                    hook(key, data)
+                except Exception as e:
+                    logger.error(f"Eviction hook failed on item '{key}' : {e}.")
 
     def get(self, key: str) -> Any | None:
         """Get data from the cache.
@@ -143,20 +308,49 @@ class Cache:
             Any | None: the found data or None
         """
         # No cache, no data
-        if self._items.maxlen == 0:
-            logger.debug("There is no cache size defined. Returning 'None'.")
+        if self.maxlen == 0:
+            if logconfig.debug_enabled:
+                logger.debug("There is no cache size defined. Returning 'None'.")
             return None
 
-        try:
+        # The lookup time includes the lock waiting time
+        start = time.perf_counter() if self._with_stats else 0.0
+        with self._lock:
             # Try to find the key
-            item_index = [_.key for _ in self._items].index(key)
-            logger.debug(f"Item '{key}' found in the cache (index={item_index}).")
-            if self._with_stats:
-                self._stats.hit(key)
-            return self._items[item_index].data
-        except ValueError:
+            item = self._items.get(key)
+            if item is not None:
+                if logconfig.debug_enabled:
+                    logger.debug(f"Item '{key}' found in the cache.")
+                self._policy.on_hit(key)
+                if self._with_stats:
+                    self._stats.hit(key, time.perf_counter() - start)
+                return item.data
+
             # Key not found
-            logger.debug(f"Item '{key}' not found in the cache.")
+            if logconfig.debug_enabled:
+                logger.debug(f"Item '{key}' not found in the cache.")
             if self._with_stats:
-                self._stats.miss(key)
+                self._stats.miss(key, time.perf_counter() - start)
             return None
+
+    def peek(self, key: str) -> Any | None:
+        """Get data from the cache, without updating the statistics.
+
+        Args:
+            key (str): the requested resource
+
+        Returns:
+            Any | None: the found data or None
+        """
+        with self._lock:
+            item = self._items.get(key)
+        return item.data if item is not None else None
+
+    def get_items(self) -> List[Tuple[str, Any]]:
+        """Get the cached items, without updating the statistics nor the policy.
+
+        Returns:
+            List[Tuple[str, Any]]: the keys and data.
+        """
+        with self._lock:
+            return [(key, item.data) for key, item in self._items.items()]
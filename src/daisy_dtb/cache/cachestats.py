@@ -1,7 +1,10 @@
 """Cache statistics"""
 
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, cast
+from typing import Dict, List, cast
 
 
 @dataclass
@@ -13,41 +16,128 @@ class _CacheStatItem:
 
     name: str = field(init=True)
     hits: int = field(init=False, default=0)
-    queries: int = field(init=False, default=1)
+    queries: int = field(init=False, default=0)
 
     @property
     def efficiency(self) -> float:
         return self.hits / self.queries
 
 
+@dataclass
+class _CacheStatSample:
+    """This class represents the cache statistics of a time interval.
+
+    It is intended for internal use.
+    """
+
+    start: float
+    hits: int = 0
+    misses: int = 0
+    latency: float = 0.0  # Total lookup time, in seconds
+
+
 @dataclass
 class CacheStats:
+    """Cache statistics (hits and queries per resource).
+
+    Note:
+    - The statistics can be updated from several threads.
+    - The counters are kept in a dict and the totals are maintained on each event : recording an event is O(1).
+    - Optionally, the events are also summed per time interval, in a ring buffer (see `enable_samples`).
+    """
+
     # Private attributs
-    _items: List[_CacheStatItem] = field(init=False, default_factory=list)
+    _items: Dict[str, _CacheStatItem] = field(init=False, default_factory=dict)
+    _hits: int = field(init=False, default=0)
+    _queries: int = field(init=False, default=0)
+    _sample_interval: float = field(init=False, default=0.0)
+    _samples: deque[_CacheStatSample] = field(init=False, default_factory=deque)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def hit(self, resource_name: str, latency: float = 0.0) -> None:
+        """Record a cache hit.
+
+        Args:
+            resource_name (str): the resource.
+            latency (float, optional): the lookup time in seconds. Defaults to 0.0.
+        """
+        with self._lock:
+            item = self._items.get(resource_name)
+            if item is None:
+                item = self._items[resource_name] = _CacheStatItem(resource_name)
+            item.queries += 1
+            item.hits += 1
+            self._queries += 1
+            self._hits += 1
+            if self._sample_interval:
+                sample = self._get_sample()
+                sample.hits += 1
+                sample.latency += latency
+
+    def miss(self, resource_name: str, latency: float = 0.0) -> None:
+        """Record a cache miss.
 
-    def hit(self, resource_name: str) -> None:
-        item = _CacheStatItem(resource_name)
-        item.hits = 1
-        self._add(item)
+        Args:
+            resource_name (str): the resource.
+            latency (float, optional): the lookup time in seconds. Defaults to 0.0.
+        """
+        with self._lock:
+            item = self._items.get(resource_name)
+            if item is None:
+                item = self._items[resource_name] = _CacheStatItem(resource_name)
+            item.queries += 1
+            self._queries += 1
+            if self._sample_interval:
+                sample = self._get_sample()
+                sample.misses += 1
+                sample.latency += latency
 
-    def miss(self, resource_name: str) -> None:
-        item = _CacheStatItem(resource_name)
-        item.hits = 0
-        self._add(item)
+    def _get_sample(self) -> _CacheStatSample:
+        """Get the sample of the current interval (the lock must be held)."""
+        now = time.monotonic()
+        sample = self._samples[-1] if self._samples else None
+        if sample is None or now - sample.start >= self._sample_interval:
+            # New interval (aligned on the interval length), the oldest sample is dropped when the buffer is full
+            start = now if sample is None else sample.start + (now - sample.start) // self._sample_interval * self._sample_interval
+            sample = _CacheStatSample(start)
+            self._samples.append(sample)
+        return sample
 
-    def _add(self, item: _CacheStatItem) -> None:
-        """Add a statistics item to the cache
+    def enable_samples(self, interval: float = 1.0, count: int = 60) -> None:
+        """Enable (or disable) the time series of the statistics.
 
         Args:
-            item (CacheStatItem): the item to add
+            interval (float, optional): the length of a sample interval, in seconds (0 : disable). Defaults to 1.0.
+            count (int, optional): the number of kept samples (the most recent ones). Defaults to 60.
+        """
+        with self._lock:
+            self._sample_interval = max(interval, 0.0)
+            self._samples = deque(maxlen=max(count, 1))
+
+    def get_samples(self) -> List[dict]:
+        """Get the time series of the statistics (the intervals without events are omitted).
+
+        Returns:
+            List[dict]: a dict per interval, oldest first, with following keys:
+            - "start" : the start of the interval (a `time.monotonic()` value).
+            - "hits" : the number of hits.
+            - "misses" : the number of misses.
+            - "efficiency" : the hit rate.
+            - "mean_latency" : the mean lookup time, in seconds.
         """
-        try:
-            item_index = [_.name for _ in self._items].index(item.name)
-            cache_stat_item = self._items[item_index]
-            cache_stat_item.queries += 1
-            cache_stat_item.hits = cache_stat_item.hits + item.hits
-        except ValueError:
-            self._items.append(item)
+        with self._lock:
+            samples = [(_.start, _.hits, _.misses, _.latency) for _ in self._samples]
+
+        return [
+            {
+                "start": start,
+                "hits": hits,
+                "misses": misses,
+                "efficiency": hits / (hits + misses),
+                "mean_latency": latency / (hits + misses),
+            }
+            for start, hits, misses, latency in samples
+        ]
 
     def get_stats(self) -> dict:
         """Get the cache statistics.
@@ -55,23 +145,24 @@ class CacheStats:
         Returns:
             dict: a dictionary holding the global stats and the details
         """
-        hit_count = sum([_.hits for _ in self._items])
-        query_count = sum([_.queries for _ in self._items])
+        with self._lock:
+            items = sorted([(_.name, _.queries, _.hits) for _ in self._items.values()])
+            hit_count, query_count = self._hits, self._queries
+
         result = {
-            "cached_items": len(self._items),
+            "cached_items": len(items),
             "total_queries": query_count,
             "total_hits": hit_count,
             "cache_efficiency": hit_count / query_count if query_count else 0,
             "details": [],
         }
 
-        self._items.sort(key=lambda x: x.name)
-        for item in self._items:
+        for name, queries, hits in items:
             detail = {
-                "item_name": item.name,
-                "queries": item.queries,
-                "hits": item.hits,
-                "efficiency": item.efficiency,
+                "item_name": name,
+                "queries": queries,
+                "hits": hits,
+                "efficiency": hits / queries,
             }
             cast(list, result["details"]).append(detail)
         return result
@@ -0,0 +1,190 @@
+"""Persistent cache of parsed resources"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import InitVar, dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from ..utilities import logconfig
+from .cachestats import CacheStats
+
+# Name of the database file in the cache folder
+DISK_CACHE_FILE_NAME = "daisy_dtb_cache.sqlite3"
+
+# Maximum waiting time for a database lock held by another process, in seconds
+LOCK_TIMEOUT = 30.0
+
+# Default maximum total size of the cached data, in bytes
+DISK_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Columns of the items table (a table with other columns, from a former version, is created again)
+_COLUMNS = ["key", "grp", "data", "size"]
+
+
+@dataclass
+class DiskCache:
+    """Representation of a persistent cache, shared by processes (an sqlite database in a folder).
+
+    It holds data extracted from parsed resources (e.g. the sections of a SMIL file), serialized as JSON.
+    The keys are built by the sources : they include the resource modification time and size, so that a changed resource is never served from the cache.
+
+    Note:
+    - The cache can be accessed from several threads and several processes (the database is in WAL mode).
+    - The database errors are logged and ignored : the cache is then simply bypassed.
+    - An item can belong to a group (e.g. the data of a resource, whatever its modification time) : adding an item removes the other items of its group.
+    - The total size of the data is limited (`max_bytes`) : the oldest items are removed first.
+    """
+
+    path: str
+    with_stats: InitVar[bool] = False
+    max_bytes: int = DISK_CACHE_MAX_BYTES
+
+    # Internal attributes
+    _with_stats: bool = field(init=False, default=False)
+    _stats: CacheStats = field(init=False, default_factory=CacheStats)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+    _connection: sqlite3.Connection = field(init=False, default=None, repr=False)
+
+    def __post_init__(self, with_stats: bool) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            with_stats (bool): enable the statistics collection.
+
+        Raises:
+            OSError: if the cache folder cannot be created.
+            sqlite3.Error: if the database cannot be opened.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self._connection = sqlite3.connect(os.path.join(self.path, DISK_CACHE_FILE_NAME), timeout=LOCK_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        columns = [_[1] for _ in self._connection.execute("PRAGMA table_info(items)")]
+        if columns and columns != _COLUMNS:
+            self._connection.execute("DROP TABLE items")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, grp TEXT, data TEXT NOT NULL, size INTEGER NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS items_grp ON items (grp)")
+        self._with_stats = with_stats
+        if logconfig.debug_enabled:
+            logger.debug(f"Disk cache opened in {self.path}. Statistics collection is {'active' if self._with_stats else 'inactive'}.")
+
+    def get_stats(self) -> dict:
+        """Get the cache statistics.
+
+        Returns:
+            dict: a dict with the statistics.
+        """
+        return self._stats.get_stats()
+
+    def enable_stats(self, value: bool) -> None:
+        """Enable or disable statistics collection.
+
+        Args:
+            value (bool): True -> enable, False -> disable.
+        """
+        self._with_stats = value
+        if logconfig.debug_enabled:
+            logger.debug(f"Disk cache statistics collection is {'active' if self._with_stats else 'inactive'}.")
+
+    @property
+    def bytes(self) -> int:
+        """Get the total size of the cached data."""
+        try:
+            with self._lock:
+                return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM items").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def add(self, key: str, data: Any, group: str = None) -> None:
+        """Add data into the cache (if the key exists, data is updated).
+
+        Args:
+            key (str): the key.
+            data (Any): the data (JSON serializable).
+            group (str, optional): the group of the item : the other items of the group are removed (e.g. the data of a former version of a resource). Defaults to None.
+        """
+        try:
+            value = json.dumps(data)
+            with self._lock:
+                # A single transaction : the other processes never see the group with several items
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    if group is not None:
+                        self._connection.execute("DELETE FROM items WHERE grp = ? AND key <> ?", (group, key))
+                    self._connection.execute("INSERT OR REPLACE INTO items (key, grp, data, size) VALUES (?, ?, ?, ?)", (key, group, value, len(value)))
+                    self._prune()
+                    self._connection.execute("COMMIT")
+                except BaseException:
+                    self._connection.execute("ROLLBACK")
+                    raise
+            if logconfig.debug_enabled:
+                logger.debug(f"Item '{key}' added into the disk cache.")
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            if logconfig.debug_enabled:
+                logger.debug(f"Item '{key}' could not be added into the disk cache ({e}).")
+
+    def _prune(self) -> None:
+        """Remove the oldest items beyond the bytes limit (the lock must be held, in a transaction)."""
+        if not self.max_bytes:
+            return
+
+        excess = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM items").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        # The rows are replaced on update : the row ids follow the insertion order
+        removed = []
+        for rowid, size in self._connection.execute("SELECT rowid, size FROM items ORDER BY rowid"):
+            if excess <= 0:
+                break
+            removed.append((rowid,))
+            excess -= size
+        self._connection.executemany("DELETE FROM items WHERE rowid = ?", removed)
+        if logconfig.debug_enabled:
+            logger.debug(f"{len(removed)} items removed from the disk cache (bytes limit).")
+
+    def get(self, key: str) -> Any | None:
+        """Get data from the cache.
+
+        Args:
+            key (str): the key.
+
+        Returns:
+            Any | None: the found data or None
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute("SELECT data FROM items WHERE key = ?", (key,)).fetchone()
+            data = json.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, ValueError) as e:
+            if logconfig.debug_enabled:
+                logger.debug(f"Item '{key}' could not be read from the disk cache ({e}).")
+            data = None
+
+        if logconfig.debug_enabled:
+            logger.debug(f"Item '{key}' {'not ' if data is None else ''}found in the disk cache.")
+        if self._with_stats:
+            if data is None:
+                self._stats.miss(key)
+            else:
+                self._stats.hit(key)
+        return data
+
+    def clear(self) -> None:
+        """Remove all items from the cache."""
+        try:
+            with self._lock:
+                self._connection.execute("DELETE FROM items")
+            if logconfig.debug_enabled:
+                logger.debug("The disk cache has been cleared.")
+        except sqlite3.Error as e:
+            if logconfig.debug_enabled:
+                logger.debug(f"The disk cache could not be cleared ({e}).")
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._connection.close()
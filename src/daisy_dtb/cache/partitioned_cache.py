@@ -0,0 +1,145 @@
+"""Partitioned resource cache"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from loguru import logger
+
+from .cache import Cache
+
+
+@dataclass
+class PartitionedCache:
+    """A resource cache made of named partitions, each one a `Cache` with its own size, bytes limit and policy.
+
+    The items are routed to a partition by their key : the items of a partition never evict the items of another one.
+    It has the interface of a `Cache`, so that it can replace one.
+
+    Note:
+    - The items routed to a missing partition are not cached.
+    """
+
+    partitions: Dict[str, Cache]
+    router: Callable[[str], str]
+
+    # Internal attributes
+    _no_cache: Cache = field(init=False, default_factory=Cache)
+
+    def __post_init__(self) -> None:
+        logger.debug(f"Partitioned cache created. Partitions: {', '.join(self.partitions.keys())}.")
+
+    @property
+    def maxlen(self) -> int:
+        return sum([_.maxlen for _ in self.partitions.values()])
+
+    def get_partition(self, key: str) -> Cache:
+        """Get the partition of a key.
+
+        Args:
+            key (str): the key.
+
+        Returns:
+            Cache: the partition (a 0 sized cache if the partition does not exist).
+        """
+        return self.partitions.get(self.router(key), self._no_cache)
+
+    def get_stats(self) -> dict:
+        """Get the cache statistics.
+
+        Returns:
+            dict: the totals (the keys of `Cache.get_stats`), and the statistics of each partition ("partitions" key).
+        """
+        partitions = {name: cache.get_stats() for name, cache in self.partitions.items()}
+        result = {}
+        for name in ["cached_items", "total_queries", "total_hits", "total_misses", "size", "bytes", "evictions"]:
+            result[name] = sum([_[name] for _ in partitions.values()])
+        result["cache_efficiency"] = result["total_hits"] / result["total_queries"] if result["total_queries"] else 0
+        result["details"] = sorted([detail for _ in partitions.values() for detail in _["details"]], key=lambda x: x["item_name"])
+        result["partitions"] = partitions
+        return result
+
+    def enable_stats(self, value: bool) -> None:
+        """Enable or disable statistics collection in all partitions.
+
+        Args:
+            value (bool): True -> enable, False -> disable.
+        """
+        for cache in self.partitions.values():
+            cache.enable_stats(value)
+
+    def add_eviction_hook(self, hook: Callable[[str, Any], None]) -> None:
+        """Register an eviction hook in all partitions (see `Cache.add_eviction_hook`).
+
+        Args:
+            hook (Callable[[str, Any], None]): the function.
+        """
+        for cache in self.partitions.values():
+            cache.add_eviction_hook(hook)
+
+    def remove_eviction_hook(self, hook: Callable[[str, Any], None]) -> None:
+        """Unregister an eviction hook from all partitions.
+
+        Args:
+            hook (Callable[[str, Any], None]): the function.
+        """
+        for cache in self.partitions.values():
+            cache.remove_eviction_hook(hook)
+
+    def resize(self, new_size: int) -> None:
+        """Not supported : the partitions are resized individually.
+
+        Args:
+            new_size (int): the new size
+        """
+        logger.warning("A partitioned cache cannot be resized as a whole. Resize its partitions.")
+
+    def add(self, key: str, data: Any, size: int = None) -> None:
+        """Add data into the partition of the key (see `Cache.add`).
+
+        Args:
+            key (str): the key.
+            data (Any): the data.
+            size (int, optional): the data size in bytes. Defaults to `Cache.get_size(data)`.
+        """
+        self.get_partition(key).add(key, data, size)
+
+    def remove(self, key: str) -> bool:
+        """Remove an item from the partition of the key (see `Cache.remove`).
+
+        Args:
+            key (str): the key.
+
+        Returns:
+            bool: True if the item was cached.
+        """
+        return self.get_partition(key).remove(key)
+
+    def get(self, key: str) -> Any | None:
+        """Get data from the partition of the key.
+
+        Args:
+            key (str): the requested resource
+
+        Returns:
+            Any | None: the found data or None
+        """
+        return self.get_partition(key).get(key)
+
+    def peek(self, key: str) -> Any | None:
+        """Get data from the partition of the key, without updating the statistics.
+
+        Args:
+            key (str): the requested resource
+
+        Returns:
+            Any | None: the found data or None
+        """
+        return self.get_partition(key).peek(key)
+
+    def get_items(self) -> List[Tuple[str, Any]]:
+        """Get the cached items of all partitions (see `Cache.get_items`).
+
+        Returns:
+            List[Tuple[str, Any]]: the keys and data.
+        """
+        return [item for cache in self.partitions.values() for item in cache.get_items()]
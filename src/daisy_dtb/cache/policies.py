@@ -0,0 +1,349 @@
+"""Cache eviction policies"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List
+
+
+class CachePolicy(ABC):
+    """Base class of the cache eviction policies.
+
+    A policy tracks the keys of the cached items and decides which ones are evicted. The data is held by the `Cache`.
+
+    Note:
+    - The policies are not thread safe : they are driven by the `Cache`, under its lock.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Creates a new policy.
+
+        Args:
+            capacity (int): the maximum number of cached items.
+        """
+        self._capacity = max(capacity, 0)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Get the number of cached items."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Get the keys of the cached items.
+
+        Returns:
+            List[str]: the keys, the next evicted first.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_hit(self, key: str) -> None:
+        """Record an access to a cached item.
+
+        Args:
+            key (str): the item key.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_insert(self, key: str) -> List[str]:
+        """Record the insertion of a new item.
+
+        Args:
+            key (str): the item key (not cached yet).
+
+        Returns:
+            List[str]: the keys of the evicted items (it holds `key` if the item is not admitted).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """Record the removal of a cached item (not chosen by the policy).
+
+        Args:
+            key (str): the item key.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def evict(self) -> str:
+        """Evict an item.
+
+        Returns:
+            str: the key of the evicted item.
+        """
+        raise NotImplementedError
+
+    def resize(self, capacity: int) -> List[str]:
+        """Change the capacity.
+
+        Args:
+            capacity (int): the new capacity.
+
+        Returns:
+            List[str]: the keys of the evicted items.
+        """
+        self._capacity = max(capacity, 0)
+        evicted = []
+        while len(self) > self._capacity:
+            evicted.append(self.evict())
+        return evicted
+
+
+class FifoPolicy(CachePolicy):
+    """First in, first out : the oldest item is evicted (the accesses are not taken into account)."""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._keys: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def on_hit(self, key: str) -> None:
+        pass
+
+    def on_insert(self, key: str) -> List[str]:
+        if self._capacity == 0:
+            return [key]
+
+        evicted = [self.evict()] if len(self._keys) >= self._capacity else []
+        self._keys[key] = None
+        return evicted
+
+    def remove(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+    def evict(self) -> str:
+        return self._keys.popitem(last=False)[0]
+
+
+class LruPolicy(FifoPolicy):
+    """Least recently used : the item not accessed for the longest time is evicted."""
+
+    def on_hit(self, key: str) -> None:
+        self._keys.move_to_end(key)
+
+
+class LfuPolicy(CachePolicy):
+    """Least frequently used : the item with the fewest accesses is evicted (the least recently used one in case of a tie).
+
+    All operations are O(1) : the keys are grouped by access count.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._counts: Dict[str, int] = {}
+        self._groups: Dict[int, OrderedDict[str, None]] = {}
+        self._min_count = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def keys(self) -> List[str]:
+        return [key for count in sorted(self._groups) for key in self._groups[count]]
+
+    def on_hit(self, key: str) -> None:
+        count = self._counts[key]
+        group = self._groups[count]
+        del group[key]
+        if not group:
+            del self._groups[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._groups.setdefault(count + 1, OrderedDict())[key] = None
+
+    def on_insert(self, key: str) -> List[str]:
+        if self._capacity == 0:
+            return [key]
+
+        evicted = [self.evict()] if len(self._counts) >= self._capacity else []
+        self._counts[key] = 1
+        self._groups.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+        return evicted
+
+    def remove(self, key: str) -> None:
+        count = self._counts.pop(key, None)
+        if count is None:
+            return
+        group = self._groups[count]
+        del group[key]
+        if not group:
+            del self._groups[count]
+
+    def evict(self) -> str:
+        if self._min_count not in self._groups:
+            self._min_count = min(self._groups)
+        group = self._groups[self._min_count]
+        key = group.popitem(last=False)[0]
+        if not group:
+            del self._groups[self._min_count]
+        del self._counts[key]
+        return key
+
+
+class ArcPolicy(CachePolicy):
+    """Adaptive replacement cache (Megiddo and Modha).
+
+    The items accessed once (T1) and the items accessed several times (T2) are kept in two LRU lists.
+    The keys recently evicted from each list (the ghosts B1 and B2) adapt the target size of T1 :
+    a scan only goes through T1 and cannot evict the frequently used items.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._t1: OrderedDict[str, None] = OrderedDict()
+        self._t2: OrderedDict[str, None] = OrderedDict()
+        self._b1: OrderedDict[str, None] = OrderedDict()
+        self._b2: OrderedDict[str, None] = OrderedDict()
+        self._target = 0.0
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+    def keys(self) -> List[str]:
+        return list(self._t1) + list(self._t2)
+
+    def on_hit(self, key: str) -> None:
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = None
+        else:
+            self._t2.move_to_end(key)
+
+    def on_insert(self, key: str) -> List[str]:
+        capacity = self._capacity
+        if capacity == 0:
+            return [key]
+
+        evicted = []
+        if key in self._b1:
+            # Recently evicted from T1 : favor recency
+            self._target = min(capacity, self._target + max(len(self._b2) / len(self._b1), 1))
+            del self._b1[key]
+            evicted += self._replace(False)
+            self._t2[key] = None
+        elif key in self._b2:
+            # Recently evicted from T2 : favor frequency
+            self._target = max(0.0, self._target - max(len(self._b1) / len(self._b2), 1))
+            del self._b2[key]
+            evicted += self._replace(True)
+            self._t2[key] = None
+        else:
+            if len(self._t1) + len(self._b1) >= capacity:
+                if len(self._t1) < capacity:
+                    self._b1.popitem(last=False)
+                    evicted += self._replace(False)
+                else:
+                    evicted.append(self._t1.popitem(last=False)[0])
+            elif len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) >= capacity:
+                if len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) >= 2 * capacity:
+                    self._b2.popitem(last=False)
+                evicted += self._replace(False)
+            self._t1[key] = None
+        return evicted
+
+    def remove(self, key: str) -> None:
+        # Not a ghost : the item was not evicted
+        self._t1.pop(key, None)
+        self._t2.pop(key, None)
+
+    def _replace(self, in_b2: bool) -> List[str]:
+        """Evict an item from T1 or T2 (to the ghost lists) if the cache is full."""
+        if len(self._t1) + len(self._t2) < self._capacity:
+            return []
+        return [self.evict(in_b2)]
+
+    def evict(self, in_b2: bool = False) -> str:
+        if self._t1 and (len(self._t1) > self._target or (in_b2 and len(self._t1) == self._target) or not self._t2):
+            key = self._t1.popitem(last=False)[0]
+            self._b1[key] = None
+        else:
+            key = self._t2.popitem(last=False)[0]
+            self._b2[key] = None
+        return key
+
+    def resize(self, capacity: int) -> List[str]:
+        evicted = super().resize(capacity)
+        self._target = min(self._target, self._capacity)
+        for ghosts in (self._b1, self._b2):
+            while len(ghosts) > self._capacity:
+                ghosts.popitem(last=False)
+        return evicted
+
+
+class _FrequencySketch:
+    """Approximate access counts (count-min sketch with 4 rows of 4-bit counters), halved periodically to forget the old accesses.
+
+    It is intended for internal use.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._width = 16
+        while self._width < capacity * 4:
+            self._width *= 2
+        self._rows = [bytearray(self._width) for _ in range(4)]
+        self._sample_size = max(capacity, 1) * 10
+        self._additions = 0
+
+    def _indexes(self, key: str) -> List[int]:
+        return [hash((seed, key)) & (self._width - 1) for seed in range(4)]
+
+    def increment(self, key: str) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            # Aging
+            for row in self._rows:
+                for index in range(self._width):
+                    row[index] >>= 1
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        return min([row[index] for row, index in zip(self._rows, self._indexes(key))])
+
+
+class TinyLfuPolicy(LruPolicy):
+    """LRU with a TinyLFU admission filter (Einziger, Friedman and Manes).
+
+    The access frequencies (hits and misses) are estimated with a compact sketch. When the cache is full,
+    a new item is admitted only if it is more frequently requested than the LRU item : a one-pass scan does not evict the hot items.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._sketch = _FrequencySketch(capacity)
+
+    def on_hit(self, key: str) -> None:
+        self._sketch.increment(key)
+        super().on_hit(key)
+
+    def on_insert(self, key: str) -> List[str]:
+        self._sketch.increment(key)
+        if self._capacity == 0:
+            return [key]
+
+        if len(self._keys) >= self._capacity:
+            victim = next(iter(self._keys))
+            if self._sketch.estimate(key) <= self._sketch.estimate(victim):
+                # Not admitted
+                return [key]
+        return super().on_insert(key)
+
+    def resize(self, capacity: int) -> List[str]:
+        evicted = super().resize(capacity)
+        self._sketch = _FrequencySketch(self._capacity)
+        return evicted
@@ -3,6 +3,7 @@ from .metadata import MetaData
 from .reference import Reference
 from .section import Section
 from .smil import Smil
+from .span import PlaybackSpan
 from .toc_entry import TocEntry
 
-__all__ = ["Audio", "MetaData", "Reference", "Section", "Smil", "TocEntry"]
+__all__ = ["Audio", "MetaData", "Reference", "Section", "Smil", "PlaybackSpan", "TocEntry"]
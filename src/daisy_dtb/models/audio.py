@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from io import BytesIO
+from typing import BinaryIO, Iterator, Union
 
 from ..sources.source import DtbSource
+from ..utilities.fetcher import CHUNK_SIZE
 
 
 @dataclass
@@ -25,3 +27,59 @@ class Audio:
     def get_sound(self, as_bytes_io: bool = False) -> bytes:
         """Get the actual sound data (.wav, .mp3, ...)"""
         return BytesIO(self.source.get(self.src)) if as_bytes_io is True else self.source.get(self.src)
+
+    def get_sound_path(self) -> Union[str, None]:
+        """Get the filesystem path of the sound file, if it is a local file.
+
+        Returns:
+            Union[str, None]: the file path or None (e.g. web or ZIP source).
+        """
+        return self.source.resolve_path(self.src)
+
+    def open_sound(self) -> Union[BinaryIO, None]:
+        """Open the sound file as a seekable binary file object, without reading it whole when possible.
+
+        The caller must close the file object.
+
+        Returns:
+            Union[BinaryIO, None]: the file object or None if the sound file was not found.
+        """
+        return self.source.open(self.src)
+
+    def stream_sound(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Get the sound data by chunks, with a constant memory usage.
+
+        Args:
+            chunk_size (int, optional): the maximum size of the chunks. Defaults to CHUNK_SIZE.
+
+        Yields:
+            Iterator[bytes]: the data chunks.
+        """
+        return self.source.stream(self.src, chunk_size)
+
+    def get_clip_bytes(self, as_bytes_io: bool = False) -> Union[bytes, BytesIO, None]:
+        """Get the sound data of the clip only (MP3 files).
+
+        The data is made of the MP3 frames covering [begin, end] : it can be played as a standalone MP3 file.
+        Its first frame may start up to one frame duration (about 26 ms) before `begin`. It is preceded by the frames holding its bit reservoir (layer III),
+        whose own audio is played with artifacts or muted by the decoders (see `Mp3FrameIndex`).
+
+        Only the byte range of the clip is read from the source :
+            - with the frame index of the audio file, if available (always built for a local source)
+            - otherwise (remote source), with an estimation made from the head of the audio file (bitrate or VBR seek table)
+
+        Returns:
+            Union[bytes, BytesIO, None]: the clip data or None if the audio file is not a valid MP3 file.
+        """
+        index = self.source.get_frame_index(self.src, build=not self.source.is_remote)
+        if index is not None:
+            start, stop = index.byte_range(self.begin, self.end)
+            data = self.source.get_range(self.src, start, stop - start) if stop > start else b""
+        else:
+            estimate = self.source.get_mp3_estimate(self.src)
+            if estimate is None:
+                return None
+            start, stop = estimate.byte_range(self.begin, self.end)
+            data = estimate.extract(self.source.get_range(self.src, start, stop - start), start, self.begin, self.end)
+
+        return BytesIO(data) if as_bytes_io is True else data
@@ -1,12 +1,15 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Union
 
 from loguru import logger
 
+from ..utilities import logconfig
 from ..utilities.domlib import Document
+from ..utilities.tracing import Tracer
 from .audio import Audio
 from .reference import Reference
 from .section import Section
+from .span import PlaybackSpan
 from .text import Text
 from ..sources.source import DtbSource
 
@@ -44,6 +47,15 @@ class Smil:
             self._parse()
         return self._sections
 
+    @property
+    def spans(self) -> List[PlaybackSpan]:
+        """Get the playback spans (the contiguous clips of the same audio file, merged).
+
+        Returns:
+            List[PlaybackSpan]: the spans.
+        """
+        return PlaybackSpan.coalesce(self.sections)
+
     def get_full_text(self) -> str:
         result = []
         if self._is_parsed is False:
@@ -53,36 +65,92 @@ class Smil:
 
         return "\n".join(result)
 
+    @property
+    def is_parsed(self) -> bool:
+        return self._is_parsed
+
+    def release(self) -> bool:
+        """Release the parsed data (sections, texts and clips) : the SMIL file will be parsed again on next access.
+
+        Note:
+        - The sections list is replaced, not emptied : the holders of the former list (like a navigator) are not affected.
+
+        Returns:
+            bool: True if parsed data was released.
+        """
+        if not self._is_parsed:
+            return False
+        self._is_parsed = False
+        self._title = ""
+        self._total_duration = 0.0
+        self._sections = []
+        return True
+
     def _parse(self) -> None:
         """Load a the SMIL file (if not already loaded) and parse it."""
         if self._is_parsed:
-            logger.debug(f"SMIL '{self.reference.resource}' is already loaded.")
+            if logconfig.debug_enabled:
+                logger.debug(f"SMIL '{self.reference.resource}' is already loaded.")
             return
 
-        # Get the resource data
-        data = self.source.get(self.reference.resource)
+        with Tracer.span("smil.parse", self.reference.resource):
+            # Get the SMIL data (from the disk cache, if any, or extracted from the resource)
+            data = self.source.get_parsed(self.reference.resource, "smil", Smil.extract)
+
+            if data is None:
+                if logconfig.debug_enabled:
+                    logger.debug(f"Could not get SMIL '{self.reference.resource}'.")
+                return
+
+            # Build the model (assigned once : concurrent first accesses may both parse, but never mix their sections)
+            with Tracer.span("smil.build", self.reference.resource):
+                sections = []
+                for par_id, text_id, text_src, clips in data["sections"]:
+                    current_par = Section(self.source, par_id, Text(self.source, text_id, Reference.create_href_or_src(text_src)))
+                    for id, src, begin, end in clips:
+                        current_par._clips.append(Audio(self.source, id, src, begin, end))
+                    sections.append(current_par)
 
-        if data is None:
-            logger.debug(f"Could not get SMIL '{self.reference.resource}'.")
-            return
+        self._title = data["title"]
+        self._total_duration = data["duration"]
+        self._sections = sections
+        self._is_parsed = True
+        if logconfig.debug_enabled:
+            logger.debug(f"SMIL {self.reference.resource} contains {len(self._sections)} pars.")
+            logger.debug(f"SMIL {self.reference.resource} sucessfully loaded.")
+
+    @staticmethod
+    def extract(data: Union[bytes, Document, None]) -> Union[dict, None]:
+        """Extract the SMIL data from a SMIL document.
+
+        Args:
+            data (Union[bytes, Document, None]): the resource data.
 
+        Returns:
+            Union[dict, None]: the title, the duration and the sections (par id, text id, text src, clips), or None if the data is not a Document.
+        """
         if not isinstance(data, Document):
-            logger.debug(f"No Document to process ({self.reference.resource}).")
-            return
+            if logconfig.debug_enabled:
+                logger.debug("No Document to process.")
+            return None
+
+        result = {"title": "", "duration": 0.0, "sections": []}
 
         # Title
         elt = data.get_elements_by_tag_name("meta", {"name": "dc:title"}).first()
         if elt:
-            self._title = elt.get_attr("content")
-            logger.debug(f"SMIL '{self.reference.resource}' title set : '{self._title}'.")
+            result["title"] = elt.get_attr("content")
+            if logconfig.debug_enabled:
+                logger.debug(f"SMIL title set : '{result['title']}'.")
 
         # Total duration
         elt = data.get_elements_by_tag_name("meta", {"name": "ncc:timeInThisSmil"}).first()
         if elt:
             duration = elt.get_attr("content")
             h, m, s = duration.split(":")
-            self._total_duration = float(h) * 3600 + float(m) * 60 + float(s)
-            logger.debug(f"SMIL {self.reference.resource} duration set : {self._total_duration}s.")
+            result["duration"] = float(h) * 3600 + float(m) * 60 + float(s)
+            if logconfig.debug_enabled:
+                logger.debug(f"SMIL duration set : {result['duration']}s.")
 
         # Process sequences in body
         for body_seq in data.get_elements_by_tag_name("seq", having_parent_tag_name="body").all():
@@ -92,24 +160,18 @@ class Smil:
 
                 # Handle the <text/>
                 text = par.get_children_by_tag_name("text").first()
-                id = text.get_attr("id")
-                reference = Reference.create_href_or_src(text.get_attr("src"))
-                current_text = Text(self.source, id, reference)
-                current_par = Section(self.source, par_id, current_text)
+                clips = []
 
                 # Handle the <audio/> clip
                 for par_seq in par.get_children_by_tag_name("seq").all():
                     for audio in par_seq.get_children_by_tag_name("audio").all():
-                        id = audio.get_attr("id")
-                        src = audio.get_attr("src")
                         begin = float(audio.get_attr("clip-begin")[4:-1])
                         end = float(audio.get_attr("clip-end")[4:-1])
-                        current_par._clips.append(Audio(self.source, id, src, begin, end))
-                    logger.debug(f"SMIL {self.reference.resource}, par: {current_par.id} contains {len(current_par._clips)} clip(s).")
+                        clips.append([audio.get_attr("id"), audio.get_attr("src"), begin, end])
+                    if logconfig.debug_enabled:
+                        logger.debug(f"SMIL par: {par_id} contains {len(clips)} clip(s).")
 
                 # Add to the list of Parallel
-                self._sections.append(current_par)
+                result["sections"].append([par_id, text.get_attr("id"), text.get_attr("src"), clips])
 
-        self._is_parsed = True
-        logger.debug(f"SMIL {self.reference.resource} contains {len(self._sections)} pars.")
-        logger.debug(f"SMIL {self.reference.resource} sucessfully loaded.")
+        return result
@@ -0,0 +1,124 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple, Union
+
+from .audio import Audio
+from .section import Section
+
+# Maximum gap (in seconds) between the end of a clip and the beginning of the next one to consider them contiguous
+CONTIGUITY_TOLERANCE = 0.001
+
+
+@dataclass
+class PlaybackSpan:
+    """
+    Representation of a continuous range of an audio file, merged from contiguous clips.
+
+    A player can play a span with a single seek, and use the section boundaries for the text synchronization.
+    """
+
+    src: str
+    begin: float
+    end: float
+
+    # Internal attributes
+    _boundaries: List[Tuple[float, Section]] = field(init=False, default_factory=list)
+    _clips: List[Audio] = field(init=False, default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Get the duration of the span, in seconds."""
+        return self.end - self.begin
+
+    @property
+    def boundaries(self) -> List[Tuple[float, Section]]:
+        """Get the section boundaries inside the span.
+
+        Returns:
+            List[Tuple[float, Section]]: a list of (offset in the audio file, section), in playing order.
+        """
+        return self._boundaries
+
+    @property
+    def clips(self) -> List[Audio]:
+        """Get the merged clips.
+
+        Returns:
+            List[Audio]: the clips.
+        """
+        return self._clips
+
+    def section_at(self, offset: float) -> Union[Section, None]:
+        """Get the section being played at a given offset in the audio file.
+
+        Args:
+            offset (float): the offset in the audio file, in seconds.
+
+        Returns:
+            Union[Section, None]: the section or None if the offset is outside the span.
+        """
+        if offset < self.begin or offset > self.end:
+            return None
+
+        index = bisect_right(self._boundaries, offset, key=lambda _: _[0]) - 1
+        return self._boundaries[max(index, 0)][1]
+
+    def can_extend(self, clip: Audio, tolerance: float = CONTIGUITY_TOLERANCE) -> bool:
+        """Test if a clip continues the span (same audio file, no gap).
+
+        Args:
+            clip (Audio): the clip.
+            tolerance (float, optional): the maximum gap, in seconds. Defaults to CONTIGUITY_TOLERANCE.
+
+        Returns:
+            bool: True if the clip is contiguous, False otherwise.
+        """
+        return clip.src == self.src and abs(clip.begin - self.end) <= tolerance
+
+    def extend(self, clip: Audio, section: Section) -> None:
+        """Add a contiguous clip to the span.
+
+        Args:
+            clip (Audio): the clip.
+            section (Section): the section holding the clip.
+        """
+        if len(self._boundaries) == 0 or self._boundaries[-1][1] is not section:
+            self._boundaries.append((clip.begin, section))
+        self._clips.append(clip)
+        self.end = clip.end
+
+    @staticmethod
+    def create_from_clip(clip: Audio, section: Section) -> "PlaybackSpan":
+        """Create a span starting with a clip.
+
+        Args:
+            clip (Audio): the clip.
+            section (Section): the section holding the clip.
+
+        Returns:
+            PlaybackSpan: the span.
+        """
+        span = PlaybackSpan(clip.src, clip.begin, clip.end)
+        span.extend(clip, section)
+        return span
+
+    @staticmethod
+    def coalesce(sections: Iterable[Section], tolerance: float = CONTIGUITY_TOLERANCE) -> List["PlaybackSpan"]:
+        """Merge the contiguous clips of sections into spans.
+
+        Args:
+            sections (Iterable[Section]): the sections, in playing order.
+            tolerance (float, optional): the maximum gap between contiguous clips, in seconds. Defaults to CONTIGUITY_TOLERANCE.
+
+        Returns:
+            List[PlaybackSpan]: the spans.
+        """
+        spans: List[PlaybackSpan] = []
+        for section in sections:
+            for clip in section.clips:
+                if len(spans) > 0 and spans[-1].can_extend(clip, tolerance):
+                    spans[-1].extend(clip, section)
+                else:
+                    spans.append(PlaybackSpan.create_from_clip(clip, section))
+
+        return spans
@@ -2,7 +2,9 @@ from dataclasses import dataclass, field
 
 from loguru import logger
 
+from ..utilities import logconfig
 from ..utilities.domlib import Document
+from ..utilities.tracing import Tracer
 
 from ..models.reference import Reference
 from ..sources.source import DtbSource
@@ -33,6 +35,21 @@ class Text:
             self._parse()
         return self._content
 
+    @property
+    def is_loaded(self) -> bool:
+        return self._content is not None
+
+    def release(self) -> bool:
+        """Release the loaded text : it will be loaded again on next access.
+
+        Returns:
+            bool: True if a text was released.
+        """
+        if self._content is None:
+            return False
+        self._content = None
+        return True
+
     def _parse(self) -> None:
         """Get the text from a resource.
 
@@ -45,13 +62,24 @@ class Text:
         """
         # Check if text already here
         if self._content is not None:
-            logger.debug(f"Content {self.reference.resource}/{self.reference.fragment} is already present.")
+            if logconfig.debug_enabled:
+                logger.debug(f"Content {self.reference.resource}/{self.reference.fragment} is already present.")
             return self._content
 
-        # Get it from the source
-        logger.debug(f"Loading text from {self.reference.resource}, fragment id is {self.reference.fragment}.")
-        data = self.source.get(self.reference.resource)
+        # Get it from the text map of the resource (the resource is parsed once for all its fragments)
+        if logconfig.debug_enabled:
+            logger.debug(f"Loading text from {self.reference.resource}, fragment id is {self.reference.fragment}.")
+        with Tracer.span("text.parse", self.reference.resource):
+            self._content = self.source.get_text(self.reference.resource, self.reference.fragment)
+
+    def load_from_document(self, data: Document) -> None:
+        """Set the text from the already fetched text source document.
 
+        This allows to load the texts of many sections with a single fetch of their document.
+
+        Args:
+            data (Document): the document identified by the reference resource.
+        """
         # The fetched data must be a Document
         if isinstance(data, Document) is False:
             logger.error(f"The retrieval attempt of {self.reference.resource} as Document failed.")
@@ -62,7 +90,8 @@ class Text:
         element = data.get_element_by_id(self.reference.fragment)
         if element is not None:
             self._content = element.text
-            logger.debug(f"Text with id {self.reference.fragment} found in {self.reference.resource}.")
+            if logconfig.debug_enabled:
+                logger.debug(f"Text with id {self.reference.fragment} found in {self.reference.resource}.")
             return
         else:
             logger.error(f"Could not retrieve element {self.reference.fragment} in the {self.reference.resource} Document.")
@@ -3,6 +3,7 @@ from typing import List
 
 from loguru import logger
 
+from ..utilities import logconfig
 from .reference import Reference
 from .section import Section
 from .smil import Smil
@@ -25,7 +26,8 @@ class TocEntry:
     def __post_init__(self):
         # Build the SMIL from its reference
         self._smil = Smil(self.source, self.smil_reference)
-        logger.debug(f"Smil set from {self.smil_reference}")
+        if logconfig.debug_enabled:
+            logger.debug(f"Smil set from {self.smil_reference}")
 
     @property
     def smil(self) -> "Smil":
@@ -1,7 +1,9 @@
 from .base_navigator import BaseNavigator
+from .book_cursor import BookCursor
 from .book_navigator import BookNavigator, BookNavigatorException
 from .clip_navigator import ClipNavigator
+from .playback_cursor import PlaybackCursor
 from .section_navigator import SectionNavigator
 from .toc_navigator import TocNavigator
 
-__all__ = ["BaseNavigator", "BookNavigator", "BookNavigatorException", "ClipNavigator", "SectionNavigator", "TocNavigator"]
+__all__ = ["BaseNavigator", "BookCursor", "BookNavigator", "BookNavigatorException", "ClipNavigator", "PlaybackCursor", "SectionNavigator", "TocNavigator"]
@@ -2,6 +2,8 @@ from typing import Any, Callable, List, Union
 
 from loguru import logger
 
+from ..utilities import logconfig
+
 
 class BaseNavigator:
     """
@@ -66,7 +68,8 @@ class BaseNavigator:
         self._max_index: int = len(self._items) - 1
         self._on_navigate: Callable[[Any], None] = callback
 
-        logger.debug(f"{type(self)} instance created with {len(self._items)} element(s) of type {items_type}.")
+        if logconfig.debug_enabled:
+            logger.debug(f"{type(self)} instance created with {len(self._items)} element(s) of type {items_type}.")
 
         # Populate the list of ids if the attribute exists
         is_id_attribute_present = "id" in dict(items[0]).keys() if hasattr(items_type, "keys") else hasattr(items[0], "id")
@@ -205,15 +208,18 @@ class BaseNavigator:
         """
         # Can we search by id ?
         if self._id_list is None:
-            logger.debug("There is no id attribute present in the list items")
+            if logconfig.debug_enabled:
+                logger.debug("There is no id attribute present in the list items")
             return None
 
         try:
             item = self._items[self._id_list.index(item_id)]
-            logger.debug(f"Item with id {item_id} of type {type(item)} found.")
+            if logconfig.debug_enabled:
+                logger.debug(f"Item with id {item_id} of type {type(item)} found.")
             if self._on_navigate is not None:
                 self._on_navigate(item)
             return item
         except ValueError:
-            logger.debug(f"Item with id {item_id} not found.")
+            if logconfig.debug_enabled:
+                logger.debug(f"Item with id {item_id} not found.")
             return None
@@ -0,0 +1,213 @@
+from typing import Tuple, Union
+
+from ..book.book_model import BookModel
+from ..models import Audio, Section, TocEntry
+
+# A position in a book : (TOC entry index, section index, clip index)
+Position = Tuple[int, int, int]
+
+
+class BookCursor:
+    """Lightweight navigation state in a shared `BookModel` : TOC entry, section and clip indexes, and the navigation level.
+
+    It provides the navigation features of `BookNavigator`, without any per-session navigator object.
+    A cursor takes a few dozen bytes : thousands of sessions can share the same model.
+
+    Notes:
+        - On creation, the cursor points to the first clip of the book.
+        - On TOC navigation, the section and clip indexes are reset to the first section and clip.
+        - On section navigation, the clip index is reset to the first clip.
+        - The navigation methods return the new item, or None (the cursor does not move) if there is no such item.
+        - A cursor must not be shared between threads (the model can).
+    """
+
+    __slots__ = ("model", "toc", "section", "clip", "level")
+
+    def __init__(self, model: BookModel, position: Position = (0, 0, 0), level: int = 0) -> None:
+        """Create a cursor.
+
+        Args:
+            model (BookModel): the book model.
+            position (Position, optional): the initial position. Defaults to (0, 0, 0).
+            level (int, optional): the navigation level (0 : no level filter). Defaults to 0.
+
+        Raises:
+            ValueError: if the position or the level is not valid.
+        """
+        self.model = model
+        self.toc, self.section, self.clip = 0, 0, 0
+        self.level = 0
+        self.set_nav_level(level)
+        if self.seek(position) is False:
+            raise ValueError(f"Invalid position {position}.")
+
+    def __repr__(self) -> str:
+        return f"BookCursor(toc={self.toc}, section={self.section}, clip={self.clip}, level={self.level})"
+
+    @property
+    def position(self) -> Position:
+        """Get the position of the cursor.
+
+        Returns:
+            Position: the (TOC entry index, section index, clip index) tuple.
+        """
+        return (self.toc, self.section, self.clip)
+
+    @property
+    def context(self) -> Tuple[TocEntry, Union[Section, None], Union[Audio, None]]:
+        """Get the current context.
+
+        Returns:
+            Tuple[TocEntry, Section, Audio]: the current TOC entry, section and clip.
+        """
+        return self.model.get_context(self.toc, self.section, self.clip)
+
+    @property
+    def current_toc_entry(self) -> TocEntry:
+        return self.model.toc_entries[self.toc]
+
+    @property
+    def current_section(self) -> Union[Section, None]:
+        return self.context[1]
+
+    @property
+    def current_clip(self) -> Union[Audio, None]:
+        return self.context[2]
+
+    def copy(self) -> "BookCursor":
+        """Get a copy of the cursor (e.g. to explore without moving).
+
+        Returns:
+            BookCursor: the copy.
+        """
+        return BookCursor(self.model, self.position, self.level)
+
+    def seek(self, position: Position) -> bool:
+        """Move to a position.
+
+        Args:
+            position (Position): the (TOC entry index, section index, clip index) tuple.
+
+        Returns:
+            bool: True if the position is valid, False otherwise (the cursor does not move).
+        """
+        toc, section, clip = position
+        if not 0 <= toc < self.model.entry_count:
+            return False
+
+        sections = self.model.sections[toc]
+        if section != 0 and not 0 <= section < len(sections):
+            return False
+
+        if clip != 0 and (len(sections) == 0 or not 0 <= clip < len(self.model.clips[toc][section])):
+            return False
+
+        self.toc, self.section, self.clip = toc, section, clip
+        return True
+
+    # Navigation level
+
+    def set_nav_level(self, level: int) -> int:
+        """Set the navigation level (0 : no filter, otherwise only the TOC entries of this level are navigated).
+
+        Args:
+            level (int): the requested navigation level
+
+        Returns:
+            int: the actual navigation level
+        """
+        if 0 <= level <= self.model.navigation_depth:
+            self.level = level
+        return self.level
+
+    def _matches_level(self, toc: int) -> bool:
+        return self.level == 0 or self.model.toc_entries[toc].level == self.level
+
+    # TOC navigation
+
+    def _go_to_entry(self, toc: int) -> TocEntry:
+        self.toc, self.section, self.clip = toc, 0, 0
+        return self.model.toc_entries[toc]
+
+    def first_entry(self) -> Union[TocEntry, None]:
+        """Go to the first TOC entry (of the navigation level)."""
+        for toc in range(self.model.entry_count):
+            if self._matches_level(toc):
+                return self._go_to_entry(toc)
+        return None
+
+    def last_entry(self) -> Union[TocEntry, None]:
+        """Go to the last TOC entry (of the navigation level)."""
+        for toc in range(self.model.entry_count - 1, -1, -1):
+            if self._matches_level(toc):
+                return self._go_to_entry(toc)
+        return None
+
+    def next_entry(self) -> Union[TocEntry, None]:
+        """Go to the next TOC entry (of the navigation level)."""
+        for toc in range(self.toc + 1, self.model.entry_count):
+            if self._matches_level(toc):
+                return self._go_to_entry(toc)
+        return None
+
+    def prev_entry(self) -> Union[TocEntry, None]:
+        """Go to the previous TOC entry (of the navigation level)."""
+        for toc in range(self.toc - 1, -1, -1):
+            if self._matches_level(toc):
+                return self._go_to_entry(toc)
+        return None
+
+    def navigate_to(self, entry_id: str) -> Union[TocEntry, None]:
+        """Go to a TOC entry by its id (the navigation level is not taken into account).
+
+        Args:
+            entry_id (str): the TOC entry id.
+
+        Returns:
+            Union[TocEntry, None]: the TOC entry or None if not found.
+        """
+        toc = self.model.index_of(entry_id)
+        return self._go_to_entry(toc) if toc is not None else None
+
+    # Section navigation (in the current TOC entry)
+
+    def _go_to_section(self, section: int) -> Union[Section, None]:
+        sections = self.model.sections[self.toc]
+        if not 0 <= section < len(sections):
+            return None
+        self.section, self.clip = section, 0
+        return sections[section]
+
+    def first_section(self) -> Union[Section, None]:
+        return self._go_to_section(0)
+
+    def last_section(self) -> Union[Section, None]:
+        return self._go_to_section(len(self.model.sections[self.toc]) - 1)
+
+    def next_section(self) -> Union[Section, None]:
+        return self._go_to_section(self.section + 1)
+
+    def prev_section(self) -> Union[Section, None]:
+        return self._go_to_section(self.section - 1)
+
+    # Clip navigation (in the current section)
+
+    def _go_to_clip(self, clip: int) -> Union[Audio, None]:
+        sections = self.model.clips[self.toc]
+        if self.section >= len(sections) or not 0 <= clip < len(sections[self.section]):
+            return None
+        self.clip = clip
+        return sections[self.section][clip]
+
+    def first_clip(self) -> Union[Audio, None]:
+        return self._go_to_clip(0)
+
+    def last_clip(self) -> Union[Audio, None]:
+        sections = self.model.clips[self.toc]
+        return self._go_to_clip(len(sections[self.section]) - 1) if self.section < len(sections) else None
+
+    def next_clip(self) -> Union[Audio, None]:
+        return self._go_to_clip(self.clip + 1)
+
+    def prev_clip(self) -> Union[Audio, None]:
+        return self._go_to_clip(self.clip - 1)
@@ -4,6 +4,7 @@ from typing import Tuple
 from ..book.daisybook import DaisyBook
 from ..models import Audio, Section, TocEntry
 from .clip_navigator import ClipNavigator
+from .playback_cursor import PlaybackCursor
 from .section_navigator import SectionNavigator
 from .toc_navigator import TocNavigator
 
@@ -116,8 +117,30 @@ class BookNavigator:
         self.toc.set_callback(self.on_toc_navigation)
         self._current_entry = self.toc.first()
 
+    def get_playback_cursor(self, lookahead: int = 5) -> PlaybackCursor:
+        """Get a book-wide playback cursor, starting at the current clip.
+
+        Note:
+            - The cursor is independent: moving it does not change the navigators.
+
+        Args:
+            lookahead (int, optional): the number of upcoming clips to resolve in advance. Defaults to 5.
+
+        Returns:
+            PlaybackCursor: the playback cursor.
+        """
+        cursor = PlaybackCursor(self.book, lookahead)
+        if self._current_clip is not None:
+            toc_index = self.book.toc_entries.index(self._current_entry)
+            section_index = self._current_entry.sections.index(self._current_section)
+            clip_index = self._current_section.clips.index(self._current_clip)
+            cursor.seek((toc_index, section_index, clip_index))
+        return cursor
+
     def on_toc_navigation(self, toc_entry: TocEntry) -> None:
         self._current_entry = toc_entry
+        if self.book.parse_window is not None:
+            self.book.parse_window.move(toc_entry)
         self.sections = SectionNavigator(toc_entry.sections, self.on_section_navigation)
         self._current_section = self.sections.first()
 
@@ -0,0 +1,397 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple, Union
+
+from loguru import logger
+
+from ..book.daisybook import DaisyBook
+from ..models import Audio, PlaybackSpan, Section, TocEntry
+from ..utilities import logconfig
+
+# A position in the book : (TOC entry index, section index, clip index)
+Position = Tuple[int, int, int]
+
+
+class PlaybackCursor:
+    """
+    This class implements a book-wide cursor on the audio clips, for continuous playback.
+
+    The clips of all TOC entries and sections are seen as a single flat sequence.
+
+    A lookahead window keeps the audio resources of the next clips resolved (fetched in a background thread),
+    so that the player does not have to wait at section or SMIL boundaries.
+
+    Methods:
+        - first() : go to the first clip of the book.
+        - next() : go to the next clip (crossing section and TOC entry boundaries).
+        - prev() : go to the previous clip (crossing section and TOC entry boundaries).
+        - last() : go to the last clip of the book.
+        - current() : returns the current clip.
+        - navigate_to(entry) : go to the first clip of a TOC entry.
+        - current_span() : returns the playback span starting at the current clip.
+        - next_span() : go to the first clip after the current span and returns its span.
+        - get_sound(clip) : get the sound data of a clip (from the lookahead window if possible).
+        - close() : stop the lookahead worker.
+
+    Notes:
+        - TOC entries and sections without clips are skipped.
+        - Walking ahead to fill the window parses the upcoming SMIL files on the calling thread.
+        - With a lookahead of 0, no worker thread is created and sounds are fetched on demand.
+    """
+
+    def __init__(self, book: DaisyBook, lookahead: int = 5, callback: Callable[[Audio], None] = None) -> None:
+        """Instanciate a `PlaybackCursor` class.
+
+        Args:
+            book (DaisyBook): the book to play.
+            lookahead (int, optional): the number of upcoming clips to resolve in advance. Defaults to 5.
+            callback (Callable[[Audio], None], optional): a function to be called on navigation events.
+
+        Raises:
+            ValueError: if the supplied book is not a `DaisyBook` instance.
+        """
+        if not isinstance(book, DaisyBook):
+            error_message = "The supplied book is not valid."
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+        # Internal attributes
+        self._book: DaisyBook = book
+        self._entries: List[TocEntry] = book.toc_entries
+        self._lookahead: int = max(0, lookahead)
+        self._on_navigate: Callable[[Audio], None] = callback
+        self._position: Union[Position, None] = None
+        self._window: Dict[str, Future] = {}
+        self._executor: Union[ThreadPoolExecutor, None] = None
+        if self._lookahead > 0:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daisy-lookahead")
+
+        self._move_to(self._forward((0, 0, -1)), notify=False)
+        if logconfig.debug_enabled:
+            logger.debug(f"{type(self)} instance created with a lookahead of {self._lookahead} clip(s).")
+
+    def __enter__(self) -> "PlaybackCursor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def position(self) -> Union[Position, None]:
+        """Get the current position.
+
+        Returns:
+            Union[Position, None]: a tuple (TOC entry index, section index, clip index) or None if the book has no clips.
+        """
+        return self._position
+
+    @property
+    def context(self) -> Tuple[TocEntry, Section, Audio]:
+        """Get the current context.
+
+        Returns:
+            Tuple[TocEntry, Section, Audio]: the current TOC entry, section and clip.
+        """
+        if self._position is None:
+            return (None, None, None)
+
+        toc_index, section_index, clip_index = self._position
+        entry = self._entries[toc_index]
+        section = entry.sections[section_index]
+        return (entry, section, section.clips[clip_index])
+
+    @property
+    def window(self) -> List[str]:
+        """Get the audio resources held in the lookahead window.
+
+        Returns:
+            List[str]: the resource names (clip sources).
+        """
+        return list(self._window.keys())
+
+    def set_callback(self, callback: Callable[[Audio], None]) -> None:
+        """Sets a navigation callback function.
+
+        Args:
+            callback (Callable[[Audio], None]): a callback function which can handle the current clip as a parameter.
+        """
+        self._on_navigate = callback
+
+    def current(self) -> Union[Audio, None]:
+        """Get the current clip.
+
+        Returns:
+            Union[Audio, None]: the current clip.
+        """
+        return self.context[2]
+
+    def first(self) -> Union[Audio, None]:
+        """Go to the first clip of the book.
+
+        Returns:
+            Union[Audio, None]: the first clip.
+        """
+        return self._move_to(self._forward((0, 0, -1)))
+
+    def last(self) -> Union[Audio, None]:
+        """Go to the last clip of the book.
+
+        Returns:
+            Union[Audio, None]: the last clip.
+        """
+        return self._move_to(self._backward((len(self._entries), 0, 0)))
+
+    def next(self) -> Union[Audio, None]:
+        """Go to the next clip.
+
+        Returns:
+            Union[Audio, None]: the next clip or None if the end of the book is reached.
+        """
+        if self._position is None:
+            return None
+        return self._move_to(self._forward(self._position))
+
+    def prev(self) -> Union[Audio, None]:
+        """Go to the previous clip.
+
+        Returns:
+            Union[Audio, None]: the previous clip or None if the beginning of the book is reached.
+        """
+        if self._position is None:
+            return None
+        return self._move_to(self._backward(self._position))
+
+    def navigate_to(self, entry: Union[TocEntry, str]) -> Union[Audio, None]:
+        """Go to the first clip of a TOC entry.
+
+        Note:
+            - If the entry has no clips, the cursor goes to the first clip of the following entries.
+
+        Args:
+            entry (Union[TocEntry, str]): the TOC entry or its id.
+
+        Returns:
+            Union[Audio, None]: the clip or None if the entry was not found.
+        """
+        entry_id = entry.id if isinstance(entry, TocEntry) else entry
+        for toc_index, toc_entry in enumerate(self._entries):
+            if toc_entry.id == entry_id:
+                return self._move_to(self._forward((toc_index, 0, -1)))
+
+        if logconfig.debug_enabled:
+            logger.debug(f"TOC entry with id {entry_id} not found.")
+        return None
+
+    def seek(self, position: Position) -> Union[Audio, None]:
+        """Go to a given position.
+
+        Args:
+            position (Position): a tuple (TOC entry index, section index, clip index).
+
+        Returns:
+            Union[Audio, None]: the clip or None if the position is not valid.
+        """
+        toc_index, section_index, clip_index = position
+        try:
+            if min(position) < 0:
+                raise IndexError
+            self._entries[toc_index].sections[section_index].clips[clip_index]
+        except IndexError:
+            if logconfig.debug_enabled:
+                logger.debug(f"Invalid position {position}.")
+            return None
+
+        return self._move_to(position)
+
+    def current_span(self) -> Union[PlaybackSpan, None]:
+        """Get the playback span starting at the current clip.
+
+        The span merges the following clips as long as they are contiguous in the same audio file,
+        across section and TOC entry boundaries.
+
+        Returns:
+            Union[PlaybackSpan, None]: the span or None if the book has no clips.
+        """
+        if self._position is None:
+            return None
+
+        _, section, clip = self.context
+        span = PlaybackSpan.create_from_clip(clip, section)
+        position = self._forward(self._position)
+        while position is not None:
+            toc_index, section_index, clip_index = position
+            section = self._entries[toc_index].sections[section_index]
+            clip = section.clips[clip_index]
+            if not span.can_extend(clip):
+                break
+            span.extend(clip, section)
+            position = self._forward(position)
+
+        return span
+
+    def next_span(self) -> Union[PlaybackSpan, None]:
+        """Go to the first clip following the current span.
+
+        Returns:
+            Union[PlaybackSpan, None]: the span starting at the new position or None if the end of the book is reached.
+        """
+        span = self.current_span()
+        if span is None:
+            return None
+
+        # Skip the clips of the current span
+        position = self._position
+        for _ in range(len(span.clips)):
+            position = self._forward(position)
+
+        if self._move_to(position) is None:
+            return None
+        return self.current_span()
+
+    def get_sound(self, clip: Audio = None, as_bytes_io: bool = False) -> Union[bytes, BytesIO, None]:
+        """Get the sound data of a clip.
+
+        If the clip source is in the lookahead window, the prefetched data is returned (waiting for the fetch to complete if needed).
+
+        Args:
+            clip (Audio, optional): the clip. Defaults to the current clip.
+            as_bytes_io (bool, optional): return the data as a BytesIO. Defaults to False.
+
+        Returns:
+            Union[bytes, BytesIO, None]: the sound data.
+        """
+        clip = clip if clip is not None else self.current()
+        if clip is None:
+            return None
+
+        future = self._window.get(clip.src)
+        data = future.result() if future is not None else clip.get_sound()
+        return BytesIO(data) if as_bytes_io is True and data is not None else data
+
+    def close(self) -> None:
+        """Stop the lookahead worker (waiting for the running fetch, if any) and clear the window."""
+        for future in self._window.values():
+            future.cancel()
+        self._window.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _clip_count(self, toc_index: int, section_index: int) -> int:
+        """Get the number of clips in a section.
+
+        Args:
+            toc_index (int): the TOC entry index.
+            section_index (int): the section index.
+
+        Returns:
+            int: the number of clips.
+        """
+        return len(self._entries[toc_index].sections[section_index].clips)
+
+    def _forward(self, position: Position) -> Union[Position, None]:
+        """Compute the position of the clip following a given position.
+
+        Returns:
+            Union[Position, None]: the next position or None.
+        """
+        toc_index, section_index, clip_index = position
+
+        # Same section (a clip index of -1 means "before the first clip of the section")
+        if clip_index >= 0:
+            if clip_index + 1 < self._clip_count(toc_index, section_index):
+                return (toc_index, section_index, clip_index + 1)
+            section_index += 1
+
+        # Following sections, then following TOC entries
+        while toc_index < len(self._entries):
+            sections = self._entries[toc_index].sections
+            while section_index < len(sections):
+                if len(sections[section_index].clips) > 0:
+                    return (toc_index, section_index, 0)
+                section_index += 1
+            toc_index, section_index = toc_index + 1, 0
+
+        return None
+
+    def _backward(self, position: Position) -> Union[Position, None]:
+        """Compute the position of the clip preceding a given position.
+
+        Returns:
+            Union[Position, None]: the previous position or None.
+        """
+        toc_index, section_index, clip_index = position
+
+        # Same section
+        if clip_index > 0:
+            return (toc_index, section_index, clip_index - 1)
+
+        # Previous sections, then previous TOC entries
+        section_index -= 1
+        while toc_index >= 0:
+            sections = self._entries[toc_index].sections if toc_index < len(self._entries) else []
+            while section_index >= 0 and section_index < len(sections):
+                clip_count = len(sections[section_index].clips)
+                if clip_count > 0:
+                    return (toc_index, section_index, clip_count - 1)
+                section_index -= 1
+            toc_index -= 1
+            section_index = len(self._entries[toc_index].sections) - 1 if toc_index >= 0 else -1
+
+        return None
+
+    def _move_to(self, position: Union[Position, None], notify: bool = True) -> Union[Audio, None]:
+        """Move the cursor and refresh the lookahead window.
+
+        Args:
+            position (Union[Position, None]): the new position. If None, the cursor does not move.
+            notify (bool, optional): trigger the navigation callback. Defaults to True.
+
+        Returns:
+            Union[Audio, None]: the current clip or None if the cursor did not move.
+        """
+        if position is None:
+            return None
+
+        self._position = position
+        if self._book.parse_window is not None:
+            self._book.parse_window.move(position[0])
+        clip = self.current()
+        self._fill_window()
+
+        # Perform a callback if required
+        if notify and self._on_navigate is not None:
+            self._on_navigate(clip)
+
+        return clip
+
+    def _fill_window(self) -> None:
+        """Resolve the audio resources of the current clip and of the next `lookahead` clips.
+
+        Resources leaving the window are dropped.
+        """
+        if self._executor is None:
+            return
+
+        # Collect the wanted clip sources (in playing order)
+        wanted: Dict[str, Audio] = {}
+        position = self._position
+        for _ in range(self._lookahead + 1):
+            if position is None:
+                break
+            toc_index, section_index, clip_index = position
+            clip = self._entries[toc_index].sections[section_index].clips[clip_index]
+            wanted.setdefault(clip.src, clip)
+            position = self._forward(position)
+
+        # Drop the resources that left the window
+        for src in [_ for _ in self._window.keys() if _ not in wanted]:
+            self._window.pop(src).cancel()
+
+        # Submit the new ones
+        for src, clip in wanted.items():
+            if src not in self._window:
+                self._window[src] = self._executor.submit(clip.get_sound)
+                if logconfig.debug_enabled:
+                    logger.debug(f"Lookahead: resolving '{src}'.")
@@ -4,6 +4,7 @@ from typing import List, override
 from loguru import logger
 
 from ..models.toc_entry import TocEntry
+from ..utilities import logconfig
 from .base_navigator import BaseNavigator
 
 
@@ -34,7 +35,8 @@ class TocNavigator(BaseNavigator):
         """
         super().__init__(self.toc_entries)
         self._max_nav_level = self.navigation_depth
-        logger.debug(f"Initialization of class {type(self)} done. Max. naigation level is {self._max_nav_level}.")
+        if logconfig.debug_enabled:
+            logger.debug(f"Initialization of class {type(self)} done. Max. naigation level is {self._max_nav_level}.")
 
     @property
     def filter_is_active(self) -> bool:
@@ -1,34 +1,128 @@
-from typing import Union
+import asyncio
+import os
+from typing import BinaryIO, Iterator, Tuple, Type, Union
 
+from ..cache.policies import CachePolicy, FifoPolicy
+from ..utilities.async_fetcher import AsyncFetcher
 from ..utilities.domlib import Document
-from ..utilities.fetcher import Fetcher
+from ..utilities.fetcher import CHUNK_SIZE, Fetcher
+from ..utilities.tracing import Tracer
 from .source import DtbSource
 
 
 class FolderDtbSource(DtbSource):
     """This class gets data from a filesystem folder or a web location"""
 
-    def __init__(self, base_path: str, initial_cache_size=0) -> None:
+    def __init__(self, base_path: str, initial_cache_size=0, cache_policy: Type[CachePolicy] = FifoPolicy) -> None:
         base_path = base_path if base_path.endswith("/") else f"{base_path}/"
-        super().__init__(base_path, initial_cache_size)
+        super().__init__(base_path, initial_cache_size, cache_policy)
 
         if Fetcher.is_available(base_path) is False:
             raise FileNotFoundError
 
+    @property
+    def is_remote(self) -> bool:
+        return Fetcher.is_on_web(self._base_path)
+
     def get(self, resource_name: str) -> Union[bytes, Document, None]:
-        path = f"{self._base_path}{resource_name}"
+        with Tracer.span("source.get", resource_name):
+            while True:
+                # Try to get data from the cached resources (concurrent misses are loaded once)
+                data = self._cache.get(resource_name)
+                if data is None:
+                    data = self._load_once(resource_name, lambda: self._load(resource_name))
 
-        # Try to get data from the cached resources
-        cached_data = self._cache.get(resource_name)
+                # Held by the caller, unless unlinked meanwhile (evicted from the cache) : loaded again
+                if DtbSource.hold_document(data):
+                    return data
+
+    def _load(self, resource_name: str) -> Union[bytes, Document, None]:
+        # Loaded by another thread since the cache lookup
+        cached_data = self._cache.peek(resource_name)
         if cached_data is not None:
             return cached_data
 
-        data = Fetcher.fetch(path)
+        with Tracer.span("source.fetch", resource_name) as span:
+            data = Fetcher.fetch(f"{self._base_path}{resource_name}")
+            span.size = len(data)
 
         # Try to create a Document
         doc = DtbSource.convert_to_document(data)
 
         # Eventualy cache the resource
-        self.do_cache(resource_name, doc)
+        self.do_cache(resource_name, doc, len(data))
 
         return doc
+
+    async def aget(self, resource_name: str) -> Union[bytes, Document, None]:
+        while True:
+            # Try to get data from the cached resources (concurrent misses are loaded once)
+            data = self._cache.get(resource_name)
+            if data is None:
+                data = await self._aload_once(resource_name, lambda: self._aload(resource_name))
+
+            # Held by the caller, unless unlinked meanwhile (evicted from the cache) : loaded again
+            if DtbSource.hold_document(data):
+                return data
+
+    async def _aload(self, resource_name: str) -> Union[bytes, Document, None]:
+        # Loaded by another task since the cache lookup
+        cached_data = self._cache.peek(resource_name)
+        if cached_data is not None:
+            return cached_data
+
+        data = await AsyncFetcher.fetch(f"{self._base_path}{resource_name}")
+
+        # Try to create a Document (the parsing is offloaded to the default executor)
+        doc = await asyncio.get_running_loop().run_in_executor(None, DtbSource.convert_to_document, data)
+
+        # Eventualy cache the resource
+        self.do_cache(resource_name, doc, len(data))
+
+        return doc
+
+    def get_range(self, resource_name: str, offset: int, length: int) -> bytes:
+        # Slice the cached resource, if any (the lookup is neither a cache query nor an access for the policy)
+        cached_data = self._cache.peek(resource_name)
+        if isinstance(cached_data, bytes):
+            return cached_data[offset : offset + length] if offset >= 0 and length > 0 else b""
+
+        return Fetcher.fetch_range(f"{self._base_path}{resource_name}", offset, length)
+
+    def stat(self, resource_name: str) -> Union[Tuple[float, int], None]:
+        # Web resources : unknown (a request per resource would be needed)
+        path = self.resolve_path(resource_name)
+        if path is None:
+            return None
+
+        try:
+            result = os.stat(path)
+        except OSError:
+            return None
+        return (result.st_mtime, result.st_size)
+
+    def resolve_path(self, resource_name: str) -> Union[str, None]:
+        if self.is_remote:
+            return None
+
+        path = f"{self._base_path}{resource_name}"
+        return path if os.path.isfile(path) else None
+
+    def open(self, resource_name: str) -> Union[BinaryIO, None]:
+        # Local file : open it, nothing is read
+        path = self.resolve_path(resource_name)
+        if path is not None:
+            return open(path, "rb")
+
+        return super().open(resource_name)
+
+    def stream(self, resource_name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        # Use the cached resource, if any (the lookup is neither a cache query nor an access for the policy)
+        cached_data = self._cache.peek(resource_name)
+        if isinstance(cached_data, bytes):
+            for offset in range(0, len(cached_data), chunk_size):
+                yield cached_data[offset : offset + chunk_size]
+            return
+
+        # Local file or HTTP response
+        yield from Fetcher.stream(f"{self._base_path}{resource_name}", chunk_size)
@@ -1,19 +1,58 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple, Type, Union
 
 from loguru import logger
 
 from ..cache.cache import Cache
+from ..cache.disk_cache import DiskCache
+from ..cache.partitioned_cache import PartitionedCache
+from ..cache.policies import CachePolicy, FifoPolicy
+from ..utilities import logconfig
 from ..utilities.domlib import Document, DomFactory
+from ..utilities.fetcher import CHUNK_SIZE
+from ..utilities.mp3 import Mp3Estimate, Mp3FrameIndex
+
+# Number of bytes read to get the MP3 frame and VBR headers
+HEAD_SIZE = 4096
+
+# Default number of text maps kept by a source
+TEXT_MAPS_SIZE = 8
+
+# Default number of MP3 frame indexes (and of MP3 estimations) kept by a source
+AUDIO_INDEXES_SIZE = 16
+
+# Extensions of the audio resources (cache partition routing)
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg", ".mp2", ".mp4", ".m4a")
+
+# Marker of a frame index or estimation not kept (None is kept : the resource is not an MP3 file)
+_NOT_KEPT = object()
+
+# Lock of the documents holders (see `DtbSource.hold_document`)
+_holders_lock = threading.Lock()
 
 
 class DtbSource(ABC):
-    def __init__(self, base_path: str, initial_cache_size=0) -> None:
+    """Base class of the DTB resource sources.
+
+    Note:
+    - A source can be shared by several threads : the cache is thread safe, and concurrent loads of the same
+      resource (cache misses, frame indexes, MP3 estimations, text maps) are done once, the other threads waiting for the result.
+    - The asynchronous methods (`aget`, `aget_many`) are intended for one event loop : the concurrent misses of its tasks are loaded once too.
+    - The documents evicted from the resource cache are unlinked, unless held by a caller (see `hold_document`, `give_back` and `release_document`).
+    """
+
+    def __init__(self, base_path: str, initial_cache_size=0, cache_policy: Type[CachePolicy] = FifoPolicy) -> None:
         """Creates a new `DtbSource`.
 
         Args:
             base_path (str): a filesystem folder or a web site
             initial_cache_size (int, optional): the size of the resource cache. Defaults to 0.
+            cache_policy (Type[CachePolicy], optional): the eviction policy of the resource cache. Defaults to FifoPolicy.
 
         Raises:
             ValueError: if the requested cache size is less than 0.
@@ -22,12 +61,33 @@ class DtbSource(ABC):
             raise ValueError("The cache size cannot be negative.")
 
         self._base_path = base_path
-        self._cache = Cache(max_size=initial_cache_size)
+        self._cache: Union[Cache, PartitionedCache] = Cache(max_size=initial_cache_size, policy=cache_policy)
+        self._cache.add_eviction_hook(DtbSource.release_document)
+        self._disk_cache: DiskCache = None
+        self._text_maps: OrderedDict[str, Dict[str, str]] = OrderedDict()
+        self._text_maps_size = TEXT_MAPS_SIZE
+        self._text_maps_lock = threading.Lock()
+        self._frame_indexes: OrderedDict[str, Mp3FrameIndex] = OrderedDict()
+        self._estimates: OrderedDict[str, Mp3Estimate] = OrderedDict()
+        self._audio_indexes_size = AUDIO_INDEXES_SIZE
+        self._audio_indexes_lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._async_in_flight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._in_flight_lock = threading.Lock()
 
     @property
     def base_path(self) -> str:
         return self._base_path
 
+    @property
+    def is_remote(self) -> bool:
+        """Test if reading a whole resource is expensive (e.g. a web location).
+
+        Returns:
+            bool: True if the resources should be read by ranges, False otherwise.
+        """
+        return False
+
     @property
     def cache_size(self) -> int:
         return self._cache.maxlen
@@ -41,6 +101,135 @@ class DtbSource(ABC):
         """
         self._cache.resize(size)
 
+    def set_cache_partitions(self, partitions: Dict[str, Cache]) -> None:
+        """Replace the resource cache by partitions with independent budgets (the cached resources are dropped).
+
+        The resources are routed by `get_partition_name` into the "documents" (NCC and SMIL files), "text" (text content files)
+        and "audio" partitions : e.g. the audio resources never evict the NCC.
+
+        Args:
+            partitions (Dict[str, Cache]): the partitions by name (the resources of a missing partition are not cached).
+        """
+        self._cache = PartitionedCache(partitions, DtbSource.get_partition_name)
+        self._cache.add_eviction_hook(DtbSource.release_document)
+
+    @staticmethod
+    def hold_document(data: Any) -> bool:
+        """Record a holder of a document : a held document is not unlinked when evicted from the resource cache.
+
+        The sources hold each document they return (see `get`) : the caller owns it, until it gives it back (see `give_back`).
+
+        Args:
+            data (Any): the data got from the source.
+
+        Returns:
+            bool: False if the document has been unlinked meanwhile (evicted from the cache) : it has to be loaded again.
+        """
+        if not isinstance(data, Document):
+            return True
+        with _holders_lock:
+            if data._holders < 0:
+                return False
+            data._holders += 1
+        return True
+
+    @staticmethod
+    def give_back(data: Any) -> None:
+        """Give back a document got from the source (with `get`, `aget`, ...) : it is not used by the caller anymore, nor its elements.
+
+        Once evicted from the resource cache, a document which is held by nobody is unlinked (see `release_document`).
+        The documents which are not given back are left to the garbage collector.
+
+        Args:
+            data (Any): the data got from the source.
+        """
+        if isinstance(data, Document):
+            with _holders_lock:
+                data._holders = max(data._holders - 1, 0)
+
+    @staticmethod
+    def release_document(key: str, data: Any) -> None:
+        """Unlink a document evicted from the resource cache (eviction hook), so that it is freed at once instead of by the garbage collector.
+
+        A document held by a caller (see `hold_document`) is left to the garbage collector.
+
+        Args:
+            key (str): the resource name.
+            data (Any): the evicted data.
+        """
+        if not isinstance(data, Document):
+            return
+        with _holders_lock:
+            if data._holders != 0:
+                return
+            data._holders = -1
+        data.unlink()
+        if logconfig.debug_enabled:
+            logger.debug(f"Document '{key}' unlinked.")
+
+    @staticmethod
+    def get_partition_name(resource_name: str) -> str:
+        """Get the cache partition of a resource.
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+
+        Returns:
+            str: "audio", "documents" (NCC and SMIL files) or "text" (other resources, mainly text content files).
+        """
+        name = resource_name.lower()
+        if name.endswith(AUDIO_EXTENSIONS):
+            return "audio"
+        if name.endswith(".smil") or name.endswith("ncc.html"):
+            return "documents"
+        return "text"
+
+    @property
+    def text_maps_size(self) -> int:
+        return self._text_maps_size
+
+    @text_maps_size.setter
+    def text_maps_size(self, size: int) -> None:
+        """Set the maximum number of text maps kept by the source (see `get_text`).
+
+        Args:
+            size (int): the number of text maps (0 : the maps are not kept).
+        """
+        with self._text_maps_lock:
+            self._text_maps_size = max(0, size)
+            while len(self._text_maps) > self._text_maps_size:
+                self._text_maps.popitem(last=False)
+
+    @property
+    def audio_indexes_size(self) -> int:
+        return self._audio_indexes_size
+
+    @audio_indexes_size.setter
+    def audio_indexes_size(self, size: int) -> None:
+        """Set the maximum number of MP3 frame indexes, and of MP3 estimations, kept by the source (see `get_frame_index` and `get_mp3_estimate`).
+
+        Args:
+            size (int): the number of frame indexes and of estimations (0 : they are not kept).
+        """
+        with self._audio_indexes_lock:
+            self._audio_indexes_size = max(0, size)
+            for kept in (self._frame_indexes, self._estimates):
+                while len(kept) > self._audio_indexes_size:
+                    kept.popitem(last=False)
+
+    @property
+    def disk_cache(self) -> Union[DiskCache, None]:
+        return self._disk_cache
+
+    @disk_cache.setter
+    def disk_cache(self, disk_cache: Union[DiskCache, None]) -> None:
+        """Set the persistent cache of the parsed resources (second tier, behind the resource cache).
+
+        Args:
+            disk_cache (Union[DiskCache, None]): the disk cache (None : no disk cache).
+        """
+        self._disk_cache = disk_cache
+
     @abstractmethod
     def get(self, resource_name: str) -> Union[bytes, str, Document, None]:
         """Get data and return it as a byte array or a string, or None in case of an error.
@@ -49,6 +238,8 @@ class DtbSource(ABC):
             - the method gets it from the buffer
             - if not found in the buffer, it is added to it
 
+        A returned document is held by the caller (see `hold_document`) : a caller which is done with it gives it back (see `give_back`).
+
         Args:
             resource_name (str): the resource to get (typically a file name)
 
@@ -57,6 +248,136 @@ class DtbSource(ABC):
         """
         raise NotImplementedError
 
+    def get_many(self, resource_names: List[str], max_workers: int = 8) -> List[Union[bytes, str, Document, None]]:
+        """Get several resources with a thread pool.
+
+        The socket I/O and the ZIP decompression release the GIL : the fetches run in parallel.
+        The resources are cached as with `get`, and a resource requested several times is fetched once.
+
+        Args:
+            resource_names (List[str]): the resources to get.
+            max_workers (int, optional): the number of threads. Defaults to 8.
+
+        Returns:
+            List[Union[bytes, str, Document, None]]: the data, in the order of the requested resources.
+        """
+        names = list(dict.fromkeys(resource_names))
+        with ThreadPoolExecutor(max_workers=max(min(max_workers, len(names)), 1), thread_name_prefix="daisy-get") as executor:
+            results = dict(zip(names, executor.map(self.get, names)))
+
+        return [results[_] for _ in resource_names]
+
+    async def aget(self, resource_name: str) -> Union[bytes, str, Document, None]:
+        """Asynchronous counterpart of `get`.
+
+        This default implementation runs `get` in the default executor : subclasses use non-blocking I/O when possible.
+
+        Args:
+            resource_name (str): the resource to get (typically a file name)
+
+        Returns:
+            bytes | str | None: returned data (str or bytes or None if the resource was not found)
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, resource_name)
+
+    async def aget_many(self, resource_names: List[str], max_concurrency: int = 16) -> List[Union[bytes, str, Document, None]]:
+        """Get several resources concurrently.
+
+        The resources are cached as with `aget`, and a resource requested several times is fetched once.
+
+        Args:
+            resource_names (List[str]): the resources to get.
+            max_concurrency (int, optional): the maximum number of concurrent fetches. Defaults to 16.
+
+        Returns:
+            List[Union[bytes, str, Document, None]]: the data, in the order of the requested resources.
+        """
+        names = list(dict.fromkeys(resource_names))
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def limited_get(resource_name: str):
+            async with semaphore:
+                return await self.aget(resource_name)
+
+        results = dict(zip(names, await asyncio.gather(*[limited_get(_) for _ in names])))
+        return [results[_] for _ in resource_names]
+
+    def get_range(self, resource_name: str, offset: int, length: int) -> bytes:
+        """Get a byte range of a resource (the data is neither converted nor cached).
+
+        This default implementation slices the whole resource: subclasses read the range only.
+
+        Args:
+            resource_name (str): the resource to get (typically a file name)
+            offset (int): the position of the first byte.
+            length (int): the number of bytes.
+
+        Returns:
+            bytes: the data (may be shorter than `length` at the end of the resource, or b'').
+        """
+        data = self.get(resource_name)
+        return data[offset : offset + length] if isinstance(data, bytes) and offset >= 0 and length > 0 else b""
+
+    def stat(self, resource_name: str) -> Union[Tuple[float, int], None]:
+        """Get the modification time and the size of a resource, without reading it.
+
+        This is used to detect the changes of a book (e.g. to invalidate a compiled snapshot).
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+
+        Returns:
+            Union[Tuple[float, int], None]: the modification time (a timestamp) and the size in bytes, or None if unknown.
+        """
+        return None
+
+    def resolve_path(self, resource_name: str) -> Union[str, None]:
+        """Get the filesystem path of a resource, if it exists as a file.
+
+        This allows a consumer needing a path (e.g. an audio backend) to use the file without reading it.
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+
+        Returns:
+            Union[str, None]: the file path or None if the resource is not a local file.
+        """
+        return None
+
+    def open(self, resource_name: str) -> Union[BinaryIO, None]:
+        """Open a resource as a seekable binary file object (the caller must close it).
+
+        This default implementation wraps the resource data in a `BytesIO`: subclasses avoid reading the whole resource when possible.
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+
+        Returns:
+            Union[BinaryIO, None]: the file object or None if the resource was not found.
+        """
+        data = self.get(resource_name)
+        return BytesIO(data) if isinstance(data, bytes) and len(data) > 0 else None
+
+    def stream(self, resource_name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Get a resource by chunks (the data is neither converted nor cached).
+
+        The memory usage does not depend on the resource size : the data can be piped to a player or a socket.
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+            chunk_size (int, optional): the maximum size of the chunks. Defaults to CHUNK_SIZE.
+
+        Yields:
+            Iterator[bytes]: the data chunks (nothing if the resource was not found).
+        """
+        file = self.open(resource_name)
+        if file is None:
+            return
+
+        with file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
     @staticmethod
     def convert_to_document(data: bytes) -> Union[Document | bytes]:
         """Try a conversion of the data to a Document.
@@ -68,23 +389,377 @@ class DtbSource(ABC):
             Union[Document | bytes]: a document or the original bytes.
         """
         doc = DomFactory.create_document_from_bytes(data)
-        if type(doc) is not type(data):
-            logger.debug(f"Converted {type(data)} to {type(doc)}.")
-        else:
-            logger.debug("No conversion happened.")
+        if logconfig.debug_enabled:
+            if type(doc) is not type(data):
+                logger.debug(f"Converted {type(data)} to {type(doc)}.")
+            else:
+                logger.debug("No conversion happened.")
 
         return doc
 
-    def do_cache(self, key: str, data: Any) -> None:
+    def get_parsed(self, resource_name: str, kind: str, extract: Callable[[Union[bytes, Document, None]], Any]) -> Any:
+        """Get data extracted from a resource (e.g. the sections of a SMIL file), through the cache tiers.
+
+        The tiers are :
+        - the resource cache (in memory) : the data is extracted from the cached resource
+        - the disk cache (if set) : the data was extracted by a previous run or by another process
+        - the resource itself (the extracted data is then stored into the disk cache, replacing the data of a former version of the resource)
+
+        Args:
+            resource_name (str): the resource (typically a file name)
+            kind (str): the kind of extracted data (part of the disk cache key).
+            extract (Callable[[Union[bytes, Document, None]], Any]): the extraction function (returns JSON serializable data or None).
+
+        Returns:
+            Any: the extracted data.
+        """
+        key = self._get_disk_key(kind, resource_name) if self._disk_cache is not None and self._cache.peek(resource_name) is None else None
+        if key is not None:
+            data = self._disk_cache.get(key)
+            if data is not None:
+                return data
+
+        document = self.get(resource_name)
+        try:
+            data = extract(document)
+        finally:
+            DtbSource.give_back(document)
+        if key is not None and data is not None:
+            self._disk_cache.add(key, data, group=key.rsplit("|", 2)[0])
+        return data
+
+    def get_text(self, resource_name: str, fragment: str) -> str:
+        """Get a text fragment of a text content resource.
+
+        The text map (element id -> text) of the resource is built on first request and kept by the source : the resource is fetched
+        and parsed once for all its fragments. The least recently used maps are dropped beyond `text_maps_size` (or by `release_text_maps`).
+        A failed build is not kept : it is tried again on next request.
+
+        Args:
+            resource_name (str): the text content resource (typically an HTML file name).
+            fragment (str): the element id.
+
+        Returns:
+            str: the text (empty if the resource or the element is not found).
+        """
+        texts = self._get_text_map(resource_name)
+        if texts is None:
+            texts = self._load_once(("text_map", resource_name), lambda: self._build_text_map(resource_name))
+        if texts is None:
+            logger.error(f"Could not build the text map of {resource_name}.")
+            return ""
+
+        text = texts.get(fragment)
+        if text is None:
+            logger.error(f"Could not retrieve element {fragment} in the {resource_name} Document.")
+            return ""
+        return text
+
+    def has_text_map(self, resource_name: str) -> bool:
+        """Check whether the text map of a resource is kept : its texts are then read without the resource.
+
+        Args:
+            resource_name (str): the text content resource.
+
+        Returns:
+            bool: True if the map is kept.
+        """
+        with self._text_maps_lock:
+            return resource_name in self._text_maps
+
+    def _get_text_map(self, resource_name: str) -> Union[Dict[str, str], None]:
+        """Get a kept text map (it becomes the most recently used one)."""
+        with self._text_maps_lock:
+            texts = self._text_maps.get(resource_name)
+            if texts is not None:
+                self._text_maps.move_to_end(resource_name)
+            return texts
+
+    def _build_text_map(self, resource_name: str) -> Union[Dict[str, str], None]:
+        # Built by another thread since the lookup
+        texts = self._get_text_map(resource_name)
+        if texts is not None:
+            return texts
+
+        texts = self.get_parsed(resource_name, "text_map", DtbSource.extract_text_map)
+        if texts is None:
+            return None
+
+        with self._text_maps_lock:
+            if self._text_maps_size > 0:
+                self._text_maps[resource_name] = texts
+                while len(self._text_maps) > self._text_maps_size:
+                    self._text_maps.popitem(last=False)
+        return texts
+
+    def release_text_maps(self, keep: Iterable[str] = ()) -> int:
+        """Drop the text maps : they will be built again on next request.
+
+        Args:
+            keep (Iterable[str], optional): the text content resources whose maps are kept. Defaults to ().
+
+        Returns:
+            int: the number of dropped text maps.
+        """
+        keep = set(keep)
+        with self._text_maps_lock:
+            names = [_ for _ in self._text_maps.keys() if _ not in keep]
+            for name in names:
+                del self._text_maps[name]
+        return len(names)
+
+    def release_documents(self, names: Iterable[str]) -> int:
+        """Remove resources from the resource cache (e.g. the documents of released SMIL files) : they will be fetched again on next request.
+
+        Args:
+            names (Iterable[str]): the resources.
+
+        Returns:
+            int: the number of removed resources.
+        """
+        return sum([self._cache.remove(_) for _ in names])
+
+    @staticmethod
+    def extract_text_map(data: Union[bytes, Document, None]) -> Union[Dict[str, str], None]:
+        """Extract the texts of the elements having an id.
+
+        Args:
+            data (Union[bytes, Document, None]): the resource data.
+
+        Returns:
+            Union[Dict[str, str], None]: the texts by element id, or None if the data is not a Document.
+        """
+        if not isinstance(data, Document):
+            logger.error("The text map extraction failed (no Document).")
+            return None
+        return {id: element.text for id, element in data.get_elements_with_id().items()}
+
+    def _get_disk_key(self, kind: str, resource_name: str) -> Union[str, None]:
+        """Get the disk cache key of data extracted from a resource.
+
+        Args:
+            kind (str): the kind of extracted data.
+            resource_name (str): the resource.
+
+        Returns:
+            Union[str, None]: the key (the kind, the resource, then its size and modification time), or None if the resource modification time and size are unknown (the disk cache is then not used).
+        """
+        stat = self.stat(resource_name)
+        if stat is None:
+            return None
+        return f"{kind}|{self._base_path}|{resource_name}|{stat[1]}|{stat[0]!r}"
+
+    def get_frame_index(self, resource_name: str, build: bool = True) -> Union[Mp3FrameIndex, None]:
+        """Get the frame index of an MP3 resource.
+
+        The index is built on first request and kept by the source : the least recently used indexes are dropped beyond `audio_indexes_size` (or by `release_audio_indexes`).
+
+        Args:
+            resource_name (str): the MP3 resource (typically a clip `src`).
+            build (bool, optional): build the index if needed (the whole resource is read). Defaults to True.
+
+        Returns:
+            Union[Mp3FrameIndex, None]: the frame index or None if the resource is not an MP3 file (or the index is not built).
+        """
+        index = self._get_audio_index(self._frame_indexes, resource_name)
+        if index is not _NOT_KEPT:
+            return index
+
+        if build is False:
+            return None
+
+        return self._load_once(("frame_index", resource_name), lambda: self._build_frame_index(resource_name))
+
+    def _build_frame_index(self, resource_name: str) -> Union[Mp3FrameIndex, None]:
+        # Built by another thread since the lookup
+        index = self._get_audio_index(self._frame_indexes, resource_name)
+        if index is not _NOT_KEPT:
+            return index
+
+        index = Mp3FrameIndex.create_from_bytes(self.get(resource_name))
+        self._keep_audio_index(self._frame_indexes, resource_name, index)
+        return index
+
+    def get_mp3_estimate(self, resource_name: str) -> Union[Mp3Estimate, None]:
+        """Get the byte position estimation of an MP3 resource.
+
+        Only the head of the resource is read. The estimation is kept by the source, as the frame indexes (see `get_frame_index`).
+
+        Args:
+            resource_name (str): the MP3 resource (typically a clip `src`).
+
+        Returns:
+            Union[Mp3Estimate, None]: the estimation or None if the resource is not an MP3 file.
+        """
+        estimate = self._get_audio_index(self._estimates, resource_name)
+        if estimate is not _NOT_KEPT:
+            return estimate
+
+        return self._load_once(("estimate", resource_name), lambda: self._build_mp3_estimate(resource_name))
+
+    def _build_mp3_estimate(self, resource_name: str) -> Union[Mp3Estimate, None]:
+        # Built by another thread since the lookup
+        estimate = self._get_audio_index(self._estimates, resource_name)
+        if estimate is not _NOT_KEPT:
+            return estimate
+
+        head = self.get_range(resource_name, 0, HEAD_SIZE)
+        offset = Mp3FrameIndex.skip_id3v2(head)
+        if offset > 0:
+            # Skip the ID3v2 tag
+            head = self.get_range(resource_name, offset, HEAD_SIZE)
+
+        estimate = Mp3Estimate.create_from_head(head, offset)
+        self._keep_audio_index(self._estimates, resource_name, estimate)
+        return estimate
+
+    def _get_audio_index(self, kept: OrderedDict, resource_name: str) -> Any:
+        """Get a kept frame index or estimation (it becomes the most recently used one), or `_NOT_KEPT`."""
+        with self._audio_indexes_lock:
+            if resource_name not in kept:
+                return _NOT_KEPT
+            kept.move_to_end(resource_name)
+            return kept[resource_name]
+
+    def _keep_audio_index(self, kept: OrderedDict, resource_name: str, value: Any) -> None:
+        """Keep a frame index or estimation, the least recently used ones being dropped beyond `audio_indexes_size`."""
+        with self._audio_indexes_lock:
+            if self._audio_indexes_size > 0:
+                kept[resource_name] = value
+                while len(kept) > self._audio_indexes_size:
+                    kept.popitem(last=False)
+
+    def release_audio_indexes(self, keep: Iterable[str] = ()) -> int:
+        """Drop the MP3 frame indexes and estimations : they will be built again on next request.
+
+        Args:
+            keep (Iterable[str], optional): the audio resources whose frame index and estimation are kept. Defaults to ().
+
+        Returns:
+            int: the number of dropped frame indexes and estimations.
+        """
+        keep = set(keep)
+        count = 0
+        with self._audio_indexes_lock:
+            for kept in (self._frame_indexes, self._estimates):
+                names = [_ for _ in kept.keys() if _ not in keep]
+                for name in names:
+                    del kept[name]
+                count += len(names)
+        return count
+
+    def _load_once(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Run a load once for concurrent callers (single-flight).
+
+        The first caller runs `load`, the callers arriving while it runs wait for its result (or exception).
+        Since a new load may start once the previous one is finished, `load` must first check if its result is already available.
+
+        Args:
+            key (Hashable): the load key (typically a resource name).
+            load (Callable[[], Any]): the load function.
+
+        Returns:
+            Any: the load result.
+        """
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            if logconfig.debug_enabled:
+                logger.debug(f"Waiting for the concurrent load of {key}.")
+            return future.result()
+
+        try:
+            result = load()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    async def _aload_once(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Asynchronous counterpart of `_load_once` : the concurrent tasks of an event loop share a single load.
+
+        Args:
+            key (Hashable): the load key (typically a resource name).
+            load (Callable[[], Awaitable[Any]]): the load coroutine function.
+
+        Returns:
+            Any: the load result.
+        """
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        with self._in_flight_lock:
+            future = self._async_in_flight.get(flight)
+            owner = future is None
+            if owner:
+                future = loop.create_future()
+                self._async_in_flight[flight] = future
+
+        if not owner:
+            if logconfig.debug_enabled:
+                logger.debug(f"Waiting for the concurrent load of {key}.")
+            try:
+                # Shielded : the cancellation of a waiting task does not cancel the load
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # The loading task was cancelled : load again
+            return await self._aload_once(key, load)
+
+        try:
+            result = await load()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved : no warning if no other task waits for it
+            future.exception()
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._async_in_flight[flight]
+
+    def do_cache(self, key: str, data: Any, size: int = None) -> None:
         """Store the data into the cache.
 
         If the cache size is 0, nothing is done.
+        Failed loads (no data) are not cached : they are tried again on next request.
 
         Args:
             key (str): the key.
             data (Any): the data to cache.
+            size (int, optional): the size of the resource in bytes (a Document is accounted for the size of its source). Defaults to None.
         """
-        self._cache.add(key, data)
+        if data is None or (isinstance(data, bytes) and len(data) == 0):
+            return
+        self._cache.add(key, data, size)
 
     def enable_stats(self, value: bool) -> None:
         self._cache.enable_stats(value)
+        if self._disk_cache is not None:
+            self._disk_cache.enable_stats(value)
+
+    def get_cache_stats(self) -> dict:
+        """Get the statistics of each cache tier.
+
+        Returns:
+            dict: a dict with following keys:
+            - "memory" : the resource cache statistics.
+            - "disk" : the disk cache statistics (None if there is no disk cache).
+        """
+        return {
+            "memory": self._cache.get_stats(),
+            "disk": self._disk_cache.get_stats() if self._disk_cache is not None else None,
+        }
@@ -1,11 +1,13 @@
+import time
 import zipfile
 from io import BytesIO
-from typing import Union
+from typing import BinaryIO, Tuple, Union
 
 from loguru import logger
 
 from ..utilities.domlib import Document
 from ..utilities.fetcher import Fetcher
+from ..utilities.tracing import Tracer
 from .source import DtbSource
 
 
@@ -15,6 +17,7 @@ class ZipDtbSource(DtbSource):
     def __init__(self, base_path) -> None:
         super().__init__(base_path, 0)
         self.bytes_io: BytesIO = None
+        self._archive: zipfile.ZipFile = None
 
         if Fetcher.is_available(base_path) is False:
             raise FileNotFoundError
@@ -28,34 +31,90 @@ class ZipDtbSource(DtbSource):
         else:
             raise FileNotFoundError
 
+        # Keep the archive open: `zipfile` serializes the member reads, so the source can be used from several threads
+        self._archive = zipfile.ZipFile(self.bytes_io, mode="r")
+
     def get(self, resource_name: str) -> Union[bytes, Document, None]:
-        # Try to get data from the cached resources
-        cached_data = self._cache.get(resource_name)
+        with Tracer.span("source.get", resource_name):
+            while True:
+                # Try to get data from the cached resources (concurrent misses are loaded once)
+                data = self._cache.get(resource_name)
+                if data is None:
+                    data = self._load_once(resource_name, lambda: self._load(resource_name))
+
+                # Held by the caller, unless unlinked meanwhile (evicted from the cache) : loaded again
+                if DtbSource.hold_document(data):
+                    return data
+
+    def _load(self, resource_name: str) -> Union[bytes, Document, None]:
+        # Loaded by another thread since the cache lookup
+        cached_data = self._cache.peek(resource_name)
         if cached_data is not None:
             return cached_data
 
-        # Retrieve the resource fron the ZIP file
-        resource_path = ""
-        with zipfile.ZipFile(self.bytes_io, mode="r") as archive:
-            # Build a search path list from the ZIP directories
-            for info in archive.infolist():
-                if info.is_dir():
-                    continue
-                if resource_name in info.filename:
-                    resource_path = info.filename
-                    break
-
-            # Search the resource
+        # Search the resource
+        with Tracer.span("source.fetch", resource_name) as span, Fetcher.observe("zip", f"{self._base_path}/{resource_name}", "fetch") as event:
             try:
-                data = archive.read(resource_path)
+                data = self._archive.read(self._find_member(resource_name))
+                event.size = span.size = len(data)
             except KeyError:
                 logger.error(f"Error: archive {self._base_path} does not contain resource '{resource_name}'.")
+                event.error = True
                 return None
 
         # Try to create a Document
         doc = DtbSource.convert_to_document(data)
 
         # Eventualy cache the resource
-        self.do_cache(resource_name, doc)
+        self.do_cache(resource_name, doc, len(data))
 
         return doc
+
+    def get_range(self, resource_name: str, offset: int, length: int) -> bytes:
+        if offset < 0 or length <= 0:
+            return b""
+
+        # Read the member from the offset (a compressed member is decompressed up to the offset)
+        with Fetcher.observe("zip", f"{self._base_path}/{resource_name}", "range") as event:
+            try:
+                with self._archive.open(self._find_member(resource_name)) as member:
+                    member.seek(offset)
+                    data = member.read(length)
+                    event.size = len(data)
+                    return data
+            except KeyError:
+                logger.error(f"Error: archive {self._base_path} does not contain resource '{resource_name}'.")
+                event.error = True
+                return b""
+
+    def stat(self, resource_name: str) -> Union[Tuple[float, int], None]:
+        try:
+            info = self._archive.getinfo(self._find_member(resource_name))
+        except KeyError:
+            return None
+        return (time.mktime(info.date_time + (0, 0, -1)), info.file_size)
+
+    def open(self, resource_name: str) -> Union[BinaryIO, None]:
+        # Stream the member (seekable, decompressed on the fly)
+        try:
+            return self._archive.open(self._find_member(resource_name))
+        except KeyError:
+            logger.error(f"Error: archive {self._base_path} does not contain resource '{resource_name}'.")
+            return None
+
+    def _find_member(self, resource_name: str) -> str:
+        """Find the archive member name of a resource.
+
+        Args:
+            resource_name (str): the resource name.
+
+        Returns:
+            str: the member name ('' if not found).
+        """
+        # Search the ZIP directories
+        for info in self._archive.infolist():
+            if info.is_dir():
+                continue
+            if resource_name in info.filename:
+                return info.filename
+        return ""
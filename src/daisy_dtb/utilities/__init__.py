@@ -1,5 +1,10 @@
+from .async_fetcher import AsyncFetcher
 from .domlib import Document, DomFactory, Element, ElementList
+from .fetch_metrics import FetchEvent, FetchMetrics, FetchObserver
 from .fetcher import Fetcher
 from .logconfig import LogLevel
+from .memory import deep_size
+from .mp3 import Mp3Estimate, Mp3FrameHeader, Mp3FrameIndex, Mp3VbrHeader
+from .tracing import CallbackTraceSink, ChromeTraceSink, MemoryTraceSink, TraceSink, TraceSpan, Tracer
 
-__all__ = ["Document", "DomFactory", "Element", "ElementList", "Fetcher", "LogLevel"]
+__all__ = ["AsyncFetcher", "Document", "DomFactory", "Element", "ElementList", "FetchEvent", "FetchMetrics", "FetchObserver", "Fetcher", "LogLevel", "deep_size", "Mp3Estimate", "Mp3FrameHeader", "Mp3FrameIndex", "Mp3VbrHeader", "CallbackTraceSink", "ChromeTraceSink", "MemoryTraceSink", "TraceSink", "TraceSpan", "Tracer"]
@@ -0,0 +1,199 @@
+"""Asynchronous resources operations"""
+
+import asyncio
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Awaitable, ClassVar, Dict, Tuple
+
+from loguru import logger
+
+from . import logconfig
+from .fetcher import CHUNK_SIZE, Fetcher
+
+# Maximum number of followed HTTP redirections
+MAX_REDIRECTS = 5
+
+# HTTP redirection status codes
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Default timeout of the connection and of each read, in seconds
+DEFAULT_TIMEOUT = 30.0
+
+
+@dataclass
+class AsyncFetcher:
+    """This class provides static coroutines to fetch resources without blocking the event loop.
+    - web resources are fetched with asyncio streams (HTTP/1.1)
+    - file system resources are read in the default executor
+
+    The statistics are the `Fetcher` ones.
+
+    A web fetch fails when the connection or a read takes more than `timeout` seconds (a stalled server).
+    The body is read in chunks of at most `CHUNK_SIZE` bytes : a slow download does not fail as long as data keeps coming.
+    """
+
+    # Timeout of the connection and of each read, in seconds
+    timeout: ClassVar[float] = DEFAULT_TIMEOUT
+
+    @staticmethod
+    async def fetch(resource_path: str, timeout: float = None) -> bytes:
+        """Fetch a given resource
+
+        Args:
+            resource_path (str): the resource to fetch (full path).
+            timeout (float, optional): the timeout of the connection and of each read, in seconds. Defaults to `AsyncFetcher.timeout`.
+
+        Returns:
+            bytes: the fetched bytes (or b'').
+        """
+        Fetcher.update_stats(access_count=1)
+
+        if logconfig.debug_enabled:
+            logger.debug(f"Fetching '{resource_path}' (async).")
+        # Check
+        if not isinstance(resource_path, str):
+            if logconfig.debug_enabled:
+                logger.debug("No valid data supplied.")
+            return b""
+
+        if Fetcher.is_on_web(resource_path):
+            # Get data from web
+            with Fetcher.observe("http", resource_path, "fetch") as event:
+                try:
+                    status, _, data = await AsyncFetcher._request(resource_path, timeout=timeout if timeout is not None else AsyncFetcher.timeout)
+                except asyncio.TimeoutError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Timeout error: {resource_path}.")
+                    event.error = True
+                    return b""
+                except (OSError, ValueError, asyncio.IncompleteReadError):
+                    if logconfig.debug_enabled:
+                        logger.debug(f"URL error: {resource_path}.")
+                    event.error = True
+                    return b""
+                if status != 200:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Nothing fetched from {resource_path} (HTTP status {status}).")
+                    event.error = True
+                    return b""
+                event.size = len(data)
+        else:
+            # Get data from file system
+            with Fetcher.observe("file", resource_path, "fetch") as event:
+                data = await asyncio.get_running_loop().run_in_executor(None, AsyncFetcher._read_file, resource_path)
+                event.error = data is None
+                data = data or b""
+                event.size = len(data)
+
+        Fetcher.update_stats(fetched_bytes=len(data))
+        if logconfig.debug_enabled:
+            logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
+        return data
+
+    @staticmethod
+    def _read_file(resource_path: str) -> bytes | None:
+        """Read a file (blocking, run in an executor).
+
+        Args:
+            resource_path (str): the file path.
+
+        Returns:
+            bytes | None: the file content (or None if it cannot be read).
+        """
+        try:
+            with open(resource_path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            if logconfig.debug_enabled:
+                logger.debug(f"Nothing fetched from {resource_path} (not found).")
+        except IsADirectoryError:
+            if logconfig.debug_enabled:
+                logger.debug(f"Nothing fetched from {resource_path} (the resource is a folder).")
+        return None
+
+    @staticmethod
+    async def _request(url: str, redirects: int = MAX_REDIRECTS, timeout: float = DEFAULT_TIMEOUT) -> Tuple[int, Dict[str, str], bytes]:
+        """Issue an HTTP GET request, following the redirections.
+
+        Args:
+            url (str): the URL.
+            redirects (int, optional): the maximum number of followed redirections. Defaults to MAX_REDIRECTS.
+            timeout (float, optional): the timeout of the connection and of each read, in seconds. Defaults to DEFAULT_TIMEOUT.
+
+        Raises:
+            ValueError: if the URL scheme is not supported or the response is malformed.
+            OSError: in case of a connection error.
+            asyncio.TimeoutError: if the connection or a read takes more than `timeout` seconds.
+
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: the status code, the headers (lowercase names) and the body.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme '{parts.scheme}'.")
+
+        secure = parts.scheme == "https"
+
+        def wait(operation: Awaitable[Any]) -> Awaitable[Any]:
+            return asyncio.wait_for(operation, timeout)
+
+        async def read(size: int = None) -> bytes:
+            """Read `size` bytes (None : up to the end of the stream). Each read returns the available data : the timeout detects a stall, not a slow transfer."""
+            chunks = []
+            remaining = size
+            while remaining is None or remaining > 0:
+                chunk = await wait(reader.read(CHUNK_SIZE if remaining is None else min(remaining, CHUNK_SIZE)))
+                if not chunk:
+                    if remaining is not None:
+                        raise asyncio.IncompleteReadError(b"".join(chunks), size)
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        reader, writer = await wait(asyncio.open_connection(parts.hostname, parts.port or (443 if secure else 80), ssl=True if secure else None))
+        try:
+            target = urllib.parse.quote(parts.path or "/", safe="/%:@!$&'()*+,;=-._~")
+            if parts.query:
+                target = f"{target}?{parts.query}"
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nAccept-Encoding: identity\r\nConnection: close\r\n\r\n".encode("latin-1"))
+            await wait(writer.drain())
+
+            # Status line and headers
+            status_line = (await wait(reader.readline())).decode("latin-1").split(" ", 2)
+            if len(status_line) < 2 or not status_line[0].startswith("HTTP/"):
+                raise ValueError("Malformed HTTP response.")
+            status = int(status_line[1])
+            headers: Dict[str, str] = {}
+            while (line := await wait(reader.readline())) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            # Body
+            if status in REDIRECT_CODES and "location" in headers:
+                data = b""
+            elif headers.get("transfer-encoding", "").lower() == "chunked":
+                chunks = []
+                while (size := int((await wait(reader.readline())).split(b";")[0], 16)) > 0:
+                    chunks.append(await read(size))
+                    await wait(reader.readexactly(2))
+                data = b"".join(chunks)
+            elif "content-length" in headers:
+                data = await read(int(headers["content-length"]))
+            else:
+                data = await read()
+        finally:
+            writer.close()
+            try:
+                await wait(writer.wait_closed())
+            except OSError:
+                pass
+
+        if status in REDIRECT_CODES and "location" in headers and redirects > 0:
+            location = urllib.parse.urljoin(url, headers["location"])
+            if logconfig.debug_enabled:
+                logger.debug(f"Redirected to {location}.")
+            return await AsyncFetcher._request(location, redirects - 1, timeout)
+
+        return (status, headers, data)
@@ -1,5 +1,6 @@
 """Classes to encapsulate and simplify the usage of the xml.dom.minidom library."""
 
+import codecs
 import re
 import urllib.request
 import xml.dom.minidom
@@ -12,6 +13,12 @@ from xml.parsers.expat import ExpatError
 import chardet
 from loguru import logger
 
+from . import logconfig
+from .tracing import Tracer
+
+# Encoding declared in the XML declaration or in an HTML meta element
+DECLARED_ENCODING_PATTERN = re.compile(rb"""<\?xml[^>]*encoding\s*=\s*["']([\w.:-]+)["']|<meta[^>]*charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+
 
 @dataclass
 class Element:
@@ -171,6 +178,7 @@ class Document:
 
     # Internal attributes
     _xml_node: xml.dom.minidom.Element = field(init=False, default=None)
+    _holders: int = field(init=False, default=0, repr=False, compare=False)  # Holders of a document got from a source (-1 : unlinked by the source)
 
     def __post_init__(self, xml_node: xml.dom.minidom.Document):
         """Post initialization of the Document instance."""
@@ -178,13 +186,55 @@ class Document:
             return
         self._xml_node = xml_node
 
+    def __enter__(self) -> "Document":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._xml_node is None
+
+    def unlink(self) -> None:
+        """
+        Break the reference cycles of the underlying DOM tree (see `xml.dom.minidom.Node.unlink`).
+
+        The tree is then freed at once by reference counting, instead of waiting for a full collection of the garbage collector.
+
+        Note:
+        - The document behaves as an empty one afterwards, and the elements got from it must not be used anymore.
+        """
+        if self._xml_node is not None:
+            self._xml_node.unlink()
+            self._xml_node = None
+
+    def close(self) -> None:
+        """Release the document (see `unlink`)."""
+        self.unlink()
+
     def get_element_by_id(self, id: str) -> Union[Element, None]:
         """Get an element by its id"""
+        if self._xml_node is None:
+            return None
+
         for elt in self._xml_node.getElementsByTagName("*"):
             if elt.getAttribute("id") == id:
                 return Element(xml_node=elt)
         return None
 
+    def get_elements_with_id(self) -> Dict[str, Element]:
+        """Get all elements having an id (the first one for a duplicated id)"""
+        result = {}
+        if self._xml_node is None:
+            return result
+
+        for elt in self._xml_node.getElementsByTagName("*"):
+            id = elt.getAttribute("id")
+            if id and id not in result:
+                result[id] = Element(xml_node=elt)
+        return result
+
     def get_elements_by_tag_name(self, tag_name: str, filter: Dict = {}, having_parent_tag_name: str = None) -> ElementList:
         """
         Get elements by tag name.
@@ -204,7 +254,8 @@ class Document:
         if self._xml_node is None:
             return ElementList()
 
-        logger.debug(f"tag_name: {tag_name}, filter: {filter}, parent_tag_name: {having_parent_tag_name}")
+        if logconfig.debug_enabled:
+            logger.debug(f"tag_name: {tag_name}, filter: {filter}, parent_tag_name: {having_parent_tag_name}")
         xdm_nodes = self._xml_node.getElementsByTagName(tag_name)
 
         # Filter data
@@ -247,11 +298,12 @@ class DomFactory:
         if not isinstance(string, str) or len(string) == 0:
             return None
 
-        try:
-            xdm_document = xdm_parse_string(string)
-        except ExpatError as e:
-            logger.error(f"An xml.minidom parsing error occurred. The code is {e.code}.")
-            return None
+        with Tracer.span("dom.parse", size=len(string)):
+            try:
+                xdm_document = xdm_parse_string(string)
+            except ExpatError as e:
+                logger.error(f"An xml.minidom parsing error occurred. The code is {e.code}.")
+                return None
         return Document(xml_node=xdm_document)
 
     @staticmethod
@@ -278,23 +330,71 @@ class DomFactory:
         if not isinstance(data, bytes):
             return data
 
-        # Try to get the data encoding
-        detector = chardet.universaldetector.UniversalDetector()
-        detector.feed(data)
-        detector.close()
+        # Binary data (e.g. audio) is returned as is : the encoding detection would scan all of it
+        if len(data) and not DomFactory.is_markup(data):
+            return data
 
-        # Set the correct encoding
-        encoding = detector.result["encoding"]
-        encoding = encoding.lower() if encoding else "utf-8"
+        # A declared UTF-8 encoding is trusted if the data is valid UTF-8 : the (slow) encoding detection is skipped
+        if DomFactory.get_declared_encoding(data) in ("utf-8", "utf8"):
+            try:
+                with Tracer.span("dom.decode", size=len(data)):
+                    string = data.decode("utf-8-sig")
+                return DomFactory.create_document_from_string(string)
+            except UnicodeDecodeError:
+                if logconfig.debug_enabled:
+                    logger.debug("The data is not encoded as declared (UTF-8).")
 
         try:
-            string = data.decode(encoding)
+            with Tracer.span("dom.decode", size=len(data)):
+                # Try to get the data encoding
+                detector = chardet.universaldetector.UniversalDetector()
+                detector.feed(data)
+                detector.close()
+
+                # Set the correct encoding
+                encoding = detector.result["encoding"]
+                encoding = encoding.lower() if encoding else "utf-8"
+
+                string = data.decode(encoding)
             return DomFactory.create_document_from_string(string)
         except UnicodeDecodeError:
             ...
 
         return data
 
+    @staticmethod
+    def get_declared_encoding(data: bytes) -> Union[str, None]:
+        """Get the encoding declared in the head of an xml or html document.
+
+        Args:
+            data (bytes): the data.
+
+        Returns:
+            Union[str, None]: the declared encoding (lowercase) or None.
+        """
+        match = DECLARED_ENCODING_PATTERN.search(data[:1024])
+        if match is None:
+            return None
+        return (match.group(1) or match.group(2)).decode("ascii").lower()
+
+    @staticmethod
+    def is_markup(data: bytes) -> bool:
+        """Test if the data looks like an xml or html document.
+
+        Only the first bytes are checked : after an optional BOM and whitespaces, the data must start with '<'.
+
+        Args:
+            data (bytes): the data.
+
+        Returns:
+            bool: True if the data may be markup, False otherwise.
+        """
+        head = data[:64]
+        for bom in (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            if head.startswith(bom):
+                return True
+        return head.lstrip().startswith(b"<")
+
     @staticmethod
     def create_element_list(xml_nodes: List[xml.dom.minidom.Element]) -> ElementList:
         """Create an Element list from a list of xml.minidom nodes.
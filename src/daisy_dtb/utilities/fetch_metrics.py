@@ -0,0 +1,171 @@
+"""Resources operations instrumentation"""
+
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Upper bounds of the latency histogram buckets, in seconds (10 µs, doubling, up to about 168 s; then an overflow bucket)
+LATENCY_BOUNDS = [0.00001 * 2**_ for _ in range(25)]
+
+
+@dataclass
+class FetchEvent:
+    """This class represents a resource operation (a fetch, a range or stream read, an availability check).
+
+    Attributes:
+        transport (str): "file", "http" or "zip".
+        resource_type (str): the resource type (the lowercase file extension, like "mp3", "smil" or "html").
+        operation (str): "fetch", "range", "stream" or "check".
+        resource_path (str): the resource (full path).
+        size (int): the number of transferred bytes.
+        duration (float): the duration in seconds (set when the operation ends).
+        error (bool): True if the operation failed.
+    """
+
+    transport: str
+    resource_type: str
+    operation: str
+    resource_path: str
+    size: int = 0
+    duration: float = 0.0
+    error: bool = False
+
+
+class FetchObserver(ABC):
+    """Base class of the resource operations observers (see `Fetcher.add_observer`).
+
+    Note:
+    - The observers are called from the fetching threads : they must be thread safe, and fast.
+    """
+
+    def on_start(self, event: FetchEvent) -> None:
+        """Called when an operation starts.
+
+        Args:
+            event (FetchEvent): the operation (size and duration not set yet).
+        """
+        pass
+
+    @abstractmethod
+    def on_end(self, event: FetchEvent) -> None:
+        """Called when an operation ends.
+
+        Args:
+            event (FetchEvent): the operation.
+        """
+        raise NotImplementedError
+
+
+@dataclass
+class _FetchStats:
+    """The statistics of a group of operations (a transport or a resource type).
+
+    It is intended for internal use.
+    """
+
+    count: int = 0
+    errors: int = 0
+    bytes: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BOUNDS) + 1))
+
+    def add(self, event: FetchEvent) -> None:
+        self.count += 1
+        self.errors += event.error
+        self.bytes += event.size
+        self.total_duration += event.duration
+        self.max_duration = max(self.max_duration, event.duration)
+        bucket = 0
+        while bucket < len(LATENCY_BOUNDS) and event.duration > LATENCY_BOUNDS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def percentile(self, value: float) -> float:
+        """Get a latency percentile (the upper bound of its histogram bucket, capped at the maximum), in seconds."""
+        rank = value * self.count
+        total = 0
+        for bucket, count in enumerate(self.histogram):
+            total += count
+            if count and total >= rank:
+                return min(LATENCY_BOUNDS[bucket], self.max_duration) if bucket < len(LATENCY_BOUNDS) else self.max_duration
+        return 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "latency_ms": {
+                "mean": self.total_duration / self.count * 1000 if self.count else 0.0,
+                "p50": self.percentile(0.50) * 1000,
+                "p95": self.percentile(0.95) * 1000,
+                "p99": self.percentile(0.99) * 1000,
+                "max": self.max_duration * 1000,
+            },
+        }
+
+
+@dataclass
+class FetchMetrics(FetchObserver):
+    """Resource operations statistics, per transport and per resource type :
+    counts, errors, bytes, in-flight gauges and latency histograms (mean, p50, p95, p99, max).
+
+    A `FetchMetrics` instance is registered in the `Fetcher` (see `Fetcher.get_metrics`).
+    """
+
+    # Internal attributes
+    _transports: Dict[str, _FetchStats] = field(init=False, default_factory=dict)
+    _resource_types: Dict[str, _FetchStats] = field(init=False, default_factory=dict)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def _get_groups(self, event: FetchEvent) -> List[_FetchStats]:
+        """Get the statistics of the event transport and resource type (the lock must be held)."""
+        groups = []
+        for items, name in ((self._transports, event.transport), (self._resource_types, event.resource_type)):
+            item = items.get(name)
+            if item is None:
+                item = items[name] = _FetchStats()
+            groups.append(item)
+        return groups
+
+    def on_start(self, event: FetchEvent) -> None:
+        with self._lock:
+            for item in self._get_groups(event):
+                item.in_flight += 1
+                item.max_in_flight = max(item.max_in_flight, item.in_flight)
+
+    def on_end(self, event: FetchEvent) -> None:
+        with self._lock:
+            for item in self._get_groups(event):
+                item.in_flight -= 1
+                item.add(event)
+
+    def snapshot(self) -> dict:
+        """Get the statistics.
+
+        Returns:
+            dict: a dict with following keys:
+            - "transports" : the statistics per transport ("file", "http", "zip").
+            - "resource_types" : the statistics per resource type ("mp3", "smil", "html"...).
+
+            The statistics of a group are a dict with following keys : "count", "errors", "bytes", "in_flight", "max_in_flight"
+            and "latency_ms" (a dict with the "mean", "p50", "p95", "p99" and "max" latencies in milliseconds).
+        """
+        with self._lock:
+            return {
+                "transports": {name: item.to_dict() for name, item in sorted(self._transports.items())},
+                "resource_types": {name: item.to_dict() for name, item in sorted(self._resource_types.items())},
+            }
+
+    def reset(self) -> None:
+        """Reset the statistics (the in-flight gauges are kept)."""
+        with self._lock:
+            for items in (self._transports, self._resource_types):
+                for name, item in items.items():
+                    items[name] = _FetchStats(in_flight=item.in_flight, max_in_flight=item.in_flight)
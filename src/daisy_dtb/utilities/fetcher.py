@@ -1,13 +1,24 @@
 """Resources operations"""
 
+import os
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from http.client import HTTPResponse
 from pathlib import Path
+from typing import ClassVar, Iterator, List
 from urllib.error import HTTPError, URLError
 import urllib.request
 from loguru import logger
 import urllib
 
+from . import logconfig
+from .fetch_metrics import FetchEvent, FetchMetrics, FetchObserver
+
+# Default size of the chunks of a streamed resource
+CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class Fetcher:
@@ -16,11 +27,20 @@ class Fetcher:
     - fetch resources
 
     It automatically handles the location of the resource (file system or web).
+
+    Note:
+    - The fetcher can be used from several threads : the statistics are updated under a lock.
+    - The operations are reported to observers (see `add_observer`). The metrics observer is always registered (see `get_metrics`).
     """
 
     fetched_bytes: int = field(init=False, default=0)
     access_count: int = field(init=False, default=0)
 
+    # Internal attributes
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _metrics: ClassVar[FetchMetrics] = FetchMetrics()
+    _observers: ClassVar[List[FetchObserver]] = [_metrics]
+
     @staticmethod
     def get_stats() -> dict:
         """Get the fetcher statistics.
@@ -30,10 +50,106 @@ class Fetcher:
             - "access_count" : the number of times the fetcher was used.
             - "fetched_bytes" : the number of retrieved bytes.
         """
-        return {
-            "access_count": Fetcher.access_count,
-            "fetched_bytes": Fetcher.fetched_bytes,
-        }
+        with Fetcher._lock:
+            return {
+                "access_count": Fetcher.access_count,
+                "fetched_bytes": Fetcher.fetched_bytes,
+            }
+
+    @staticmethod
+    def update_stats(access_count: int = 0, fetched_bytes: int = 0) -> None:
+        """Update the fetcher statistics (thread safe).
+
+        Args:
+            access_count (int, optional): the number of accesses to add. Defaults to 0.
+            fetched_bytes (int, optional): the number of retrieved bytes to add. Defaults to 0.
+        """
+        with Fetcher._lock:
+            Fetcher.access_count += access_count
+            Fetcher.fetched_bytes += fetched_bytes
+
+    @staticmethod
+    def reset_stats() -> None:
+        """Reset the fetcher statistics and metrics."""
+        with Fetcher._lock:
+            Fetcher.access_count = 0
+            Fetcher.fetched_bytes = 0
+        Fetcher._metrics.reset()
+
+    @staticmethod
+    def get_metrics() -> dict:
+        """Get the fetcher metrics : counts, errors, bytes, in-flight gauges and latencies, per transport and per resource type.
+
+        Returns:
+            dict: the metrics (see `FetchMetrics.snapshot`).
+        """
+        return Fetcher._metrics.snapshot()
+
+    @staticmethod
+    def add_observer(observer: FetchObserver) -> None:
+        """Register an observer of the resource operations.
+
+        Args:
+            observer (FetchObserver): the observer.
+        """
+        with Fetcher._lock:
+            # Copy on write : the list is iterated without lock
+            Fetcher._observers = Fetcher._observers + [observer]
+
+    @staticmethod
+    def remove_observer(observer: FetchObserver) -> None:
+        """Unregister an observer of the resource operations.
+
+        Args:
+            observer (FetchObserver): the observer.
+        """
+        with Fetcher._lock:
+            Fetcher._observers = [_ for _ in Fetcher._observers if _ is not observer]
+
+    @staticmethod
+    def get_resource_type(resource_path: str) -> str:
+        """Get the type of a resource : its lowercase file extension (without query nor fragment).
+
+        Args:
+            resource_path (str): the resource (full path).
+
+        Returns:
+            str: the type (like "mp3", "smil", "html"), or "other" if the resource has no extension.
+        """
+        path = resource_path.split("?")[0].split("#")[0].rstrip("/")
+        extension = os.path.splitext(path.rsplit("/", 1)[-1])[1]
+        return extension[1:].lower() if extension else "other"
+
+    @staticmethod
+    @contextmanager
+    def observe(transport: str, resource_path: str, operation: str) -> Iterator[FetchEvent]:
+        """Report an operation to the observers.
+
+        The caller sets the `size` (and `error`) of the yielded event. An exception also sets `error`.
+
+        Args:
+            transport (str): "file", "http" or "zip".
+            resource_path (str): the resource (full path).
+            operation (str): "fetch", "range", "stream" or "check".
+
+        Yields:
+            Iterator[FetchEvent]: the event.
+        """
+        event = FetchEvent(transport, Fetcher.get_resource_type(resource_path), operation, resource_path)
+        observers = Fetcher._observers
+        for observer in observers:
+            observer.on_start(event)
+
+        start = time.perf_counter()
+        try:
+            yield event
+        except BaseException:
+            event.error = True
+            raise
+        finally:
+            event.duration = time.perf_counter() - start
+            for observer in observers:
+                observer.on_end(event)
 
     @staticmethod
     def is_on_web(resource_path: str) -> bool:
@@ -64,35 +180,178 @@ class Fetcher:
             logger.debug("No valid data supplied.")
             return False
 
-        Fetcher.access_count += 1
+        Fetcher.update_stats(access_count=1)
         if Fetcher.is_on_web(resource_path):
             # Check web availability
-            try:
-                response = urllib.request.urlopen(resource_path)
-                if isinstance(response, HTTPResponse) and response.getcode() == 200:
-                    logger.debug("Web check success. Error code is 200.")
+            with Fetcher.observe("http", resource_path, "check") as event:
+                try:
+                    response = urllib.request.urlopen(resource_path)
+                    if isinstance(response, HTTPResponse) and response.getcode() == 200:
+                        logger.debug("Web check success. Error code is 200.")
+                        return True
+                    else:
+                        logger.debug("Web check failed. Response is not of type HTTPResponse or error code is not 200.")
+                        event.error = True
+                        return False
+                except HTTPError as e:
+                    error_code = e.getcode()
+                    if error_code in (200, 403):  # Code 403 is not necessarily an error !
+                        logger.debug(f"Web check success. Error code is {error_code}. Codes 200 and 403 are OK.")
+                        return True
+                    logger.debug(f"Web check fails. Error code is {error_code}.")
+                    event.error = True
+                    return False
+                except URLError:
+                    logger.debug(f"Web check fails wit an URL error. The failing URL is {resource_path}.")
+                    event.error = True
+                    return False
+        else:
+            # Check file system availability
+            with Fetcher.observe("file", resource_path, "check") as event:
+                if Path(resource_path).exists():
+                    logger.debug("File check success.")
                     return True
                 else:
-                    logger.debug("Web check failed. Response is not of type HTTPResponse or error code is not 200.")
+                    logger.debug(f"File check fails. The Path is {resource_path}")
+                    event.error = True
                     return False
-            except HTTPError as e:
-                error_code = e.getcode()
-                if error_code in (200, 403):  # Code 403 is not necessarily an error !
-                    logger.debug(f"Web check success. Error code is {error_code}. Codes 200 and 403 are OK.")
-                    return True
-                logger.debug(f"Web check fails. Error code is {error_code}.")
-                return False
-            except URLError:
-                logger.debug(f"Web check fails wit an URL error. The failing URL is {resource_path}.")
-                return False
+
+    @staticmethod
+    def fetch_range(resource_path: str, offset: int, length: int) -> bytes:
+        """Fetch a byte range of a given resource.
+
+        Notes:
+            - On the file system, the file is read from the offset (no full read).
+            - On the web, an HTTP `Range` request is issued. If the server ignores it, the range is extracted from the full response.
+
+        Args:
+            resource_path (str): the resource to fetch (full path).
+            offset (int): the position of the first byte.
+            length (int): the number of bytes.
+
+        Returns:
+            bytes: the fetched bytes (may be shorter than `length` at the end of the resource, or b'').
+        """
+        Fetcher.update_stats(access_count=1)
+
+        if logconfig.debug_enabled:
+            logger.debug(f"Fetching {length} bytes at offset {offset} of '{resource_path}'.")
+        # Check
+        if not isinstance(resource_path, str) or offset < 0 or length <= 0:
+            if logconfig.debug_enabled:
+                logger.debug("No valid data supplied.")
+            return b""
+
+        if Fetcher.is_on_web(resource_path):
+            # Get data from web
+            request = urllib.request.Request(resource_path, headers={"Range": f"bytes={offset}-{offset + length - 1}"})
+            with Fetcher.observe("http", resource_path, "range") as event:
+                try:
+                    response = urllib.request.urlopen(request)
+                    match response.getcode():
+                        case 206:
+                            data = response.read()
+                        case 200:
+                            if logconfig.debug_enabled:
+                                logger.debug(f"The server ignored the range request ({resource_path}).")
+                            data = response.read()[offset : offset + length]
+                        case _:
+                            data = b""
+                    Fetcher.update_stats(fetched_bytes=len(data))
+                    event.size = len(data)
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
+                    return data
+                except HTTPError as e:
+                    # Code 416 : the range is beyond the end of the resource
+                    if logconfig.debug_enabled:
+                        logger.debug(f"HTTP error {e.code}: {resource_path}.")
+                    event.error = True
+                    return b""
+                except URLError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"URL error: {resource_path}.")
+                    event.error = True
+                    return b""
         else:
-            # Check file system availability
-            if Path(resource_path).exists():
-                logger.debug("File check success.")
-                return True
-            else:
-                logger.debug(f"File check fails. The Path is {resource_path}")
-                return False
+            # Get data from file system
+            with Fetcher.observe("file", resource_path, "range") as event:
+                try:
+                    with open(resource_path, "rb") as file:
+                        file.seek(offset)
+                        buffer = bytearray(length)
+                        count = file.readinto(buffer)
+                        data = bytes(buffer) if count == length else bytes(memoryview(buffer)[:count])
+                        Fetcher.update_stats(fetched_bytes=len(data))
+                        event.size = len(data)
+                        if logconfig.debug_enabled:
+                            logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
+                        return data
+                except FileNotFoundError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Nothing fetched from {resource_path} (not found).")
+                except IsADirectoryError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Nothing fetched from {resource_path} (the resource is a folder).")
+
+                event.error = True
+                return b""
+
+    @staticmethod
+    def stream(resource_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Fetch a given resource by chunks, with a constant memory usage.
+
+        Args:
+            resource_path (str): the resource to fetch (full path).
+            chunk_size (int, optional): the maximum size of the chunks. Defaults to CHUNK_SIZE.
+
+        Yields:
+            Iterator[bytes]: the data chunks (nothing if the resource is not found).
+        """
+        Fetcher.update_stats(access_count=1)
+
+        if logconfig.debug_enabled:
+            logger.debug(f"Streaming '{resource_path}'.")
+        # Check
+        if not isinstance(resource_path, str) or chunk_size <= 0:
+            if logconfig.debug_enabled:
+                logger.debug("No valid data supplied.")
+            return
+
+        with Fetcher.observe("http" if Fetcher.is_on_web(resource_path) else "file", resource_path, "stream") as event:
+            try:
+                if Fetcher.is_on_web(resource_path):
+                    # Get data from web
+                    response = urllib.request.urlopen(resource_path)
+                    if not isinstance(response, HTTPResponse) or response.getcode() != 200:
+                        if logconfig.debug_enabled:
+                            logger.debug(f"Nothing fetched from {resource_path}.")
+                        event.error = True
+                        return
+                else:
+                    # Get data from file system
+                    response = open(resource_path, "rb")
+            except URLError:
+                if logconfig.debug_enabled:
+                    logger.debug(f"URL error: {resource_path}.")
+                event.error = True
+                return
+            except FileNotFoundError:
+                if logconfig.debug_enabled:
+                    logger.debug(f"Nothing fetched from {resource_path} (not found).")
+                event.error = True
+                return
+            except IsADirectoryError:
+                if logconfig.debug_enabled:
+                    logger.debug(f"Nothing fetched from {resource_path} (the resource is a folder).")
+                event.error = True
+                return
+
+            with response:
+                while chunk := response.read(chunk_size):
+                    Fetcher.update_stats(fetched_bytes=len(chunk))
+                    event.size += len(chunk)
+                    yield chunk
 
     @staticmethod
     def fetch(resource_path: str) -> bytes:
@@ -104,40 +363,55 @@ class Fetcher:
         Returns:
             bytes: the fetched bytes (or b'').
         """
-        Fetcher.access_count += 1
+        Fetcher.update_stats(access_count=1)
 
-        logger.debug(f"Fetching '{resource_path}'.")
+        if logconfig.debug_enabled:
+            logger.debug(f"Fetching '{resource_path}'.")
         # Check
         if not isinstance(resource_path, str):
-            logger.debug("No valid data supplied.")
+            if logconfig.debug_enabled:
+                logger.debug("No valid data supplied.")
             return b""
 
         if Fetcher.is_on_web(resource_path):
             # Get data from web
-            try:
-                response = urllib.request.urlopen(resource_path)
-                if isinstance(response, HTTPResponse) and response.getcode() == 200:
-                    data = response.read()
-                    Fetcher.fetched_bytes += len(data)
-                    logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
-                    return data
-                else:
-                    logger.debug(f"Nothing fetched from {resource_path}.")
+            with Fetcher.observe("http", resource_path, "fetch") as event:
+                try:
+                    response = urllib.request.urlopen(resource_path)
+                    if isinstance(response, HTTPResponse) and response.getcode() == 200:
+                        data = response.read()
+                        Fetcher.update_stats(fetched_bytes=len(data))
+                        event.size = len(data)
+                        if logconfig.debug_enabled:
+                            logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
+                        return data
+                    else:
+                        if logconfig.debug_enabled:
+                            logger.debug(f"Nothing fetched from {resource_path}.")
+                        event.error = True
+                        return b""
+                except URLError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"URL error: {resource_path}.")
+                    event.error = True
                     return b""
-            except URLError:
-                logger.debug(f"URL error: {resource_path}.")
-                return b""
         else:
             # Get data from file system
-            try:
-                with open(resource_path, "rb") as file:
-                    data = file.read()
-                    Fetcher.fetched_bytes += len(data)
-                    logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
-                    return data
-            except FileNotFoundError:
-                logger.debug(f"Nothing fetched from {resource_path} (not found).")
-            except IsADirectoryError:
-                logger.debug(f"Nothing fetched from {resource_path} (the resource is a folder).")
+            with Fetcher.observe("file", resource_path, "fetch") as event:
+                try:
+                    with open(resource_path, "rb") as file:
+                        data = file.read()
+                        Fetcher.update_stats(fetched_bytes=len(data))
+                        event.size = len(data)
+                        if logconfig.debug_enabled:
+                            logger.debug(f"Fetched {len(data)} bytes from {resource_path}.")
+                        return data
+                except FileNotFoundError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Nothing fetched from {resource_path} (not found).")
+                except IsADirectoryError:
+                    if logconfig.debug_enabled:
+                        logger.debug(f"Nothing fetched from {resource_path} (the resource is a folder).")
 
-            return b""
+                event.error = True
+                return b""
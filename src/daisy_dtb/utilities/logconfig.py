@@ -3,6 +3,10 @@ from enum import StrEnum
 
 from loguru import logger
 
+# True if the debug messages are emitted (updated by `LogLevel.set`).
+# On the hot paths, it is checked before a debug message is formatted : `if logconfig.debug_enabled: logger.debug(f"...")`.
+debug_enabled = True
+
 
 class LogLevel(StrEnum):
     """A simple class to handle the logging level."""
@@ -23,6 +27,9 @@ class LogLevel(StrEnum):
         Args:
             level (LogLevel): the wanted logging level.
         """
+        global debug_enabled
+        debug_enabled = level in (LogLevel.TRACE, LogLevel.DEBUG)
+
         logger.remove()
         if level != LogLevel.NONE:
             logger.add(sys.stderr, level=level.value)
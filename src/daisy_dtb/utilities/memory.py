@@ -0,0 +1,67 @@
+"""Approximate memory size of objects"""
+
+import sys
+from collections import deque
+from functools import lru_cache
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Set, Tuple
+
+# Never followed : the classes, modules and functions are shared, the bound methods would lead to their instance
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+# Not containing other objects
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def _get_slots(cls: type) -> Tuple[str, ...]:
+    """Get the slots of a class and of its base classes."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__"):
+                names.append(name)
+    return tuple(names)
+
+
+def deep_size(obj: Any, seen: Set[int] = None) -> int:
+    """Get the approximate deep size of an object : its size and the size of the objects it references.
+
+    The items of the containers (dict, list, tuple, set, deque) and the attributes of the instances (`__dict__` and `__slots__`) are followed.
+    An object whose id is in `seen` is neither counted nor followed : a set shared by several calls counts each object once,
+    and the ids of shared objects (like a source) can be added to it beforehand.
+
+    Args:
+        obj (Any): the object.
+        seen (Set[int], optional): the ids of the objects already counted (updated). Defaults to None.
+
+    Returns:
+        int: the size in bytes.
+    """
+    seen = seen if seen is not None else set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SKIPPED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, _ATOMIC_TYPES):
+            continue
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+
+        attributes = getattr(item, "__dict__", None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+        for name in _get_slots(type(item)):
+            value = getattr(item, name, None)
+            if value is not None:
+                stack.append(value)
+    return size
@@ -0,0 +1,583 @@
+"""MP3 frame parsing and indexing"""
+
+import struct
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+from loguru import logger
+
+from . import logconfig
+
+# Bitrates (kbps), indexed by [version is MPEG 1][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates (Hz), indexed by version
+_SAMPLE_RATES = {1.0: (44100, 48000, 32000), 2.0: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+# Version and layer bits
+_VERSIONS = {0b00: 2.5, 0b10: 2.0, 0b11: 1.0}
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+# Maximum size of the layer III bit reservoir (`main_data_begin` field), in bytes
+MAX_RESERVOIR_SIZE = 511
+
+
+@dataclass
+class Mp3FrameHeader:
+    """Representation of an MPEG audio frame header."""
+
+    version: float  # 1.0, 2.0 or 2.5
+    layer: int  # 1, 2 or 3
+    bitrate: int  # in bits per second
+    sample_rate: int  # in Hz
+    padding: bool
+    protected: bool  # A CRC follows the header
+    mono: bool
+
+    @property
+    def samples(self) -> int:
+        """Get the number of samples per frame."""
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != 1.0:
+            return 576
+        return 1152
+
+    @property
+    def frame_length(self) -> int:
+        """Get the frame length, in bytes (header included)."""
+        if self.layer == 1:
+            return (12 * self.bitrate // self.sample_rate + self.padding) * 4
+        return self.samples // 8 * self.bitrate // self.sample_rate + self.padding
+
+    @property
+    def duration(self) -> float:
+        """Get the frame duration, in seconds."""
+        return self.samples / self.sample_rate
+
+    @property
+    def side_info_size(self) -> int:
+        """Get the size of the layer III side information, in bytes."""
+        if self.version == 1.0:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    @property
+    def main_data_position(self) -> int:
+        """Get the position of the main data (layer III), relative to the frame position : after the header, the CRC and the side information."""
+        return 4 + (2 if self.protected else 0) + self.side_info_size
+
+    def get_main_data_begin(self, data: bytes, offset: int) -> int:
+        """Get the size of the bit reservoir used by a frame : its main data starts that many bytes before its side information end, in the preceding frames.
+
+        Args:
+            data (bytes): the data.
+            offset (int): the frame position in the data.
+
+        Returns:
+            int: the `main_data_begin` field of the side information, in bytes (0 for layers I and II).
+        """
+        position = offset + 4 + (2 if self.protected else 0)
+        if self.layer != 3 or position + 2 > len(data):
+            return 0
+        if self.version == 1.0:
+            return (data[position] << 1) | (data[position + 1] >> 7)
+        return data[position]
+
+    @staticmethod
+    def parse(data: bytes, offset: int = 0) -> Union["Mp3FrameHeader", None]:
+        """Parse a frame header.
+
+        Args:
+            data (bytes): the data.
+            offset (int, optional): the header position in the data. Defaults to 0.
+
+        Returns:
+            Union[Mp3FrameHeader, None]: the header or None if there is no valid header at the position.
+        """
+        if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+            return None
+
+        b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+        version = _VERSIONS.get((b1 >> 3) & 0b11)
+        layer = _LAYERS.get((b1 >> 1) & 0b11)
+        bitrate_index = b2 >> 4
+        sample_rate_index = (b2 >> 2) & 0b11
+        if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+            return None
+
+        return Mp3FrameHeader(
+            version=version,
+            layer=layer,
+            bitrate=_BITRATES[version == 1.0][layer][bitrate_index] * 1000,
+            sample_rate=_SAMPLE_RATES[version][sample_rate_index],
+            padding=bool((b2 >> 1) & 1),
+            protected=not (b1 & 1),
+            mono=(b3 >> 6) == 0b11,
+        )
+
+
+@dataclass
+class Mp3VbrHeader:
+    """Representation of a Xing/Info or VBRI header (stored in the first frame of a file, which holds no audio)."""
+
+    kind: str  # "Xing", "Info" or "VBRI"
+    frames: int = 0  # Number of audio frames (0 if unknown)
+    bytes: int = 0  # Number of audio bytes (0 if unknown)
+    toc: List[int] = field(default_factory=list)  # Xing : 100 entries (0..255) / VBRI : byte sizes of equal time chunks
+
+    def estimate_offset(self, time: float, duration: float) -> Union[int, None]:
+        """Estimate the byte offset (relative to the first audio frame) of a time position, using the seek table.
+
+        Args:
+            time (float): the time position, in seconds.
+            duration (float): the total duration, in seconds.
+
+        Returns:
+            Union[int, None]: the byte offset or None if no estimation is possible.
+        """
+        if self.bytes == 0 or len(self.toc) == 0 or duration <= 0:
+            return None
+
+        ratio = min(max(time / duration, 0.0), 1.0)
+        if self.kind == "VBRI":
+            position = ratio * len(self.toc)
+            index = int(position)
+            offset = sum(self.toc[:index])
+            if index < len(self.toc):
+                offset += int((position - index) * self.toc[index])
+            return min(offset, self.bytes)
+
+        # Xing : linear interpolation between the percent entries
+        percent = ratio * 100
+        index = min(int(percent), 99)
+        lower = self.toc[index]
+        upper = self.toc[index + 1] if index < 99 else 256
+        return int((lower + (upper - lower) * (percent - index)) / 256 * self.bytes)
+
+    @staticmethod
+    def parse(data: bytes, offset: int, header: Mp3FrameHeader) -> Union["Mp3VbrHeader", None]:
+        """Parse a Xing/Info or VBRI header in a frame.
+
+        Args:
+            data (bytes): the data.
+            offset (int): the frame position in the data.
+            header (Mp3FrameHeader): the frame header.
+
+        Returns:
+            Union[Mp3VbrHeader, None]: the VBR header or None if the frame is an audio frame.
+        """
+        try:
+            return Mp3VbrHeader._parse(data, offset, header)
+        except struct.error:
+            # Truncated frame
+            return None
+
+    @staticmethod
+    def _parse(data: bytes, offset: int, header: Mp3FrameHeader) -> Union["Mp3VbrHeader", None]:
+        # Xing / Info : after the side information
+        position = offset + header.main_data_position
+        tag = data[position : position + 4]
+        if tag in (b"Xing", b"Info"):
+            result = Mp3VbrHeader(tag.decode())
+            (flags,) = struct.unpack_from(">I", data, position + 4)
+            position += 8
+            if flags & 0x1:
+                (result.frames,) = struct.unpack_from(">I", data, position)
+                position += 4
+            if flags & 0x2:
+                (result.bytes,) = struct.unpack_from(">I", data, position)
+                position += 4
+            if flags & 0x4:
+                result.toc = list(data[position : position + 100])
+            return result
+
+        # VBRI : 32 bytes after the header
+        position = offset + 4 + 32
+        if data[position : position + 4] == b"VBRI":
+            _, _, _, byte_count, frames, entries, scale, entry_size, _ = struct.unpack_from(">HHHIIHHHH", data, position + 4)
+            result = Mp3VbrHeader("VBRI", frames=frames, bytes=byte_count)
+            position += 26
+            for _ in range(entries):
+                result.toc.append(int.from_bytes(data[position : position + entry_size], "big") * scale)
+                position += entry_size
+            return result
+
+        return None
+
+
+@dataclass
+class Mp3FrameIndex:
+    """Index of the audio frames of an MP3 file : byte offsets and start times.
+
+    It allows to extract the frame-aligned bytes of a time range, which can be played as a standalone MP3 segment.
+
+    Note:
+    - A layer III frame may store part of its audio data in the preceding frames (the bit reservoir) : a range starts with these frames,
+      so that its first frame is decoded. Their own audio (a few frames before the range, about 26 ms each) is incomplete :
+      the decoders play it with artifacts or mute it.
+    """
+
+    # Internal attributes
+    _offsets: array = field(init=False, default_factory=lambda: array("q"))
+    _times: array = field(init=False, default_factory=lambda: array("d"))
+    _reservoirs: array = field(init=False, default_factory=lambda: array("H"))
+    _end_offset: int = field(init=False, default=0)
+    _duration: float = field(init=False, default=0.0)
+    _first_header: Mp3FrameHeader = field(init=False, default=None)
+    _vbr_header: Mp3VbrHeader = field(init=False, default=None)
+
+    @property
+    def frame_count(self) -> int:
+        """Get the number of audio frames."""
+        return len(self._offsets)
+
+    @property
+    def duration(self) -> float:
+        """Get the audio duration, in seconds."""
+        return self._duration
+
+    @property
+    def audio_start(self) -> int:
+        """Get the byte offset of the first audio frame."""
+        return self._offsets[0] if len(self._offsets) else self._end_offset
+
+    @property
+    def audio_end(self) -> int:
+        """Get the byte offset following the last audio frame."""
+        return self._end_offset
+
+    @property
+    def first_header(self) -> Union[Mp3FrameHeader, None]:
+        """Get the header of the first audio frame."""
+        return self._first_header
+
+    @property
+    def vbr_header(self) -> Union[Mp3VbrHeader, None]:
+        """Get the Xing/Info or VBRI header, if any."""
+        return self._vbr_header
+
+    def frame_at(self, time: float) -> int:
+        """Get the index of the frame playing at a time position.
+
+        Args:
+            time (float): the time position, in seconds.
+
+        Returns:
+            int: the frame index (clamped to the valid frame indexes).
+        """
+        index = bisect_right(self._times, time) - 1
+        return min(max(index, 0), len(self._offsets) - 1)
+
+    def frame_range(self, begin: float, end: float) -> Tuple[int, int]:
+        """Get the frames covering a time range.
+
+        Args:
+            begin (float): the range begin, in seconds.
+            end (float): the range end, in seconds.
+
+        Returns:
+            Tuple[int, int]: the first frame index and the index following the last frame.
+        """
+        if len(self._offsets) == 0:
+            return (0, 0)
+
+        first = self.frame_at(begin)
+        last = self.frame_at(end)
+
+        # The end position is on a frame boundary : the frame starting there is not needed
+        if last > first and self._times[last] >= end:
+            last -= 1
+        return (first, last + 1)
+
+    def reservoir_start(self, frame: int) -> int:
+        """Get the first of the frames holding the bit reservoir used by a frame (see the class note).
+
+        Args:
+            frame (int): the frame index.
+
+        Returns:
+            int: the index of the first frame needed to decode the frame (the frame itself if it uses no reservoir).
+        """
+        needed = self._reservoirs[frame] if frame < len(self._reservoirs) else 0
+        overhead = self._first_header.main_data_position if self._first_header is not None else 0
+        while needed > 0 and frame > 0:
+            frame -= 1
+            needed -= self._offsets[frame + 1] - self._offsets[frame] - overhead
+        return frame
+
+    def byte_range(self, begin: float, end: float) -> Tuple[int, int]:
+        """Get the frame-aligned byte range covering a time range.
+
+        The range starts with the frames holding the bit reservoir of its first frame (see the class note).
+
+        Args:
+            begin (float): the range begin, in seconds.
+            end (float): the range end, in seconds.
+
+        Returns:
+            Tuple[int, int]: the start offset and the end offset (excluded).
+        """
+        first, stop = self.frame_range(begin, end)
+        if first == stop:
+            return (self.audio_start, self.audio_start)
+
+        end_offset = self._offsets[stop] if stop < len(self._offsets) else self._end_offset
+        return (self._offsets[self.reservoir_start(first)], end_offset)
+
+    def time_of(self, frame: int) -> float:
+        """Get the start time of a frame.
+
+        Args:
+            frame (int): the frame index.
+
+        Returns:
+            float: the start time, in seconds.
+        """
+        return self._times[frame] if frame < len(self._times) else self._duration
+
+    @staticmethod
+    def skip_id3v2(data: bytes) -> int:
+        """Get the size of the ID3v2 tag at the beginning of the data.
+
+        Args:
+            data (bytes): the data.
+
+        Returns:
+            int: the tag size (0 if there is no tag).
+        """
+        if len(data) < 10 or data[:3] != b"ID3":
+            return 0
+
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+
+    @staticmethod
+    def _resync(data: bytes, offset: int) -> Union[Tuple[int, Mp3FrameHeader], None]:
+        """Find the next valid frame, confirmed by the header of the following frame.
+
+        Args:
+            data (bytes): the data.
+            offset (int): the search start position.
+
+        Returns:
+            Union[Tuple[int, Mp3FrameHeader], None]: the frame position and header or None.
+        """
+        position = data.find(b"\xff", offset)
+        while position >= 0:
+            header = Mp3FrameHeader.parse(data, position)
+            if header is not None:
+                following = position + header.frame_length
+                if following >= len(data) or Mp3FrameHeader.parse(data, following) is not None:
+                    return (position, header)
+            position = data.find(b"\xff", position + 1)
+        return None
+
+    @staticmethod
+    def create_from_bytes(data: bytes) -> Union["Mp3FrameIndex", None]:
+        """Build the frame index of MP3 data.
+
+        Args:
+            data (bytes): the MP3 file content.
+
+        Returns:
+            Union[Mp3FrameIndex, None]: the index or None if no MP3 frame was found.
+        """
+        if not isinstance(data, bytes):
+            return None
+
+        index = Mp3FrameIndex()
+        offsets, times, reservoirs = index._offsets, index._times, index._reservoirs
+        position = Mp3FrameIndex.skip_id3v2(data)
+        size = len(data)
+        time = 0.0
+        end_offset = position
+        while position + 4 <= size:
+            header = Mp3FrameHeader.parse(data, position)
+            if header is None:
+                # Trailing tags (ID3v1, APE) or garbage
+                if data[position : position + 3] == b"TAG" or data[position : position + 8] == b"APETAGEX":
+                    break
+                found = Mp3FrameIndex._resync(data, position + 1)
+                if found is None:
+                    break
+                position, header = found
+
+            length = header.frame_length
+            if position + length > size:
+                break
+
+            # The first frame may be a VBR header frame (no audio)
+            if index._first_header is None and index._vbr_header is None:
+                index._vbr_header = Mp3VbrHeader.parse(data, position, header)
+                if index._vbr_header is not None:
+                    position += length
+                    continue
+
+            if index._first_header is None:
+                index._first_header = header
+            offsets.append(position)
+            times.append(time)
+            reservoirs.append(header.get_main_data_begin(data, position))
+            time += header.duration
+            position += length
+            end_offset = position
+
+        if len(offsets) == 0:
+            if logconfig.debug_enabled:
+                logger.debug("No MP3 frame found.")
+            return None
+
+        index._end_offset = end_offset
+        index._duration = time
+        if logconfig.debug_enabled:
+            logger.debug(f"MP3 frame index built : {len(offsets)} frame(s), {time:.3f}s.")
+        return index
+
+
+@dataclass
+class Mp3Estimate:
+    """Estimation of the byte positions in an MP3 file, made from the head of the file only.
+
+    It allows to fetch the bytes of a time range without reading the whole file (e.g. with an HTTP range request).
+    For a CBR file, the estimation is exact up to the frame alignment. For a VBR file, it relies on the Xing/VBRI seek table.
+    """
+
+    audio_start: int  # Byte offset of the first audio frame
+    header: Mp3FrameHeader  # Header of the first frame
+    vbr_header: Union[Mp3VbrHeader, None] = None
+
+    @property
+    def is_vbr(self) -> bool:
+        """Test if the estimation relies on a VBR seek table."""
+        return self.vbr_header is not None and self.vbr_header.kind != "Info" and self.duration is not None
+
+    @property
+    def duration(self) -> Union[float, None]:
+        """Get the audio duration, in seconds (only known from a VBR header)."""
+        if self.vbr_header is None or self.vbr_header.frames == 0:
+            return None
+        return self.vbr_header.frames * self.header.duration
+
+    @property
+    def margin(self) -> int:
+        """Get the number of bytes added on both sides of an estimated range (the bit reservoir of the first frame included)."""
+        margin = 2 * self.header.frame_length + MAX_RESERVOIR_SIZE
+        if self.is_vbr and self.vbr_header.bytes > 0:
+            # The seek table has a 1% resolution
+            margin = max(margin, self.vbr_header.bytes // 100)
+        return margin
+
+    def offset_of(self, time: float) -> int:
+        """Estimate the byte offset of a time position.
+
+        Args:
+            time (float): the time position, in seconds.
+
+        Returns:
+            int: the byte offset in the file.
+        """
+        if self.is_vbr:
+            offset = self.vbr_header.estimate_offset(time, self.duration)
+            if offset is not None:
+                return self.audio_start + offset
+        return self.audio_start + int(max(time, 0.0) * self.header.bitrate / 8)
+
+    def time_of(self, offset: int) -> float:
+        """Estimate the time position of a byte offset (inverse of `offset_of`).
+
+        Args:
+            offset (int): the byte offset in the file.
+
+        Returns:
+            float: the time position, in seconds.
+        """
+        if self.is_vbr:
+            low, high = 0.0, self.duration
+            for _ in range(32):
+                middle = (low + high) / 2
+                if self.offset_of(middle) < offset:
+                    low = middle
+                else:
+                    high = middle
+            return low
+        return max(offset - self.audio_start, 0) * 8 / self.header.bitrate
+
+    def byte_range(self, begin: float, end: float) -> Tuple[int, int]:
+        """Estimate a byte range covering a time range, margins included.
+
+        The range must be aligned on the frames with `extract` once fetched.
+
+        Args:
+            begin (float): the range begin, in seconds.
+            end (float): the range end, in seconds.
+
+        Returns:
+            Tuple[int, int]: the start offset and the end offset (excluded).
+        """
+        start = max(self.offset_of(begin) - self.margin, self.audio_start)
+        stop = self.offset_of(end) + self.margin
+        if self.vbr_header is not None and self.vbr_header.bytes > 0:
+            stop = min(stop, self.audio_start + self.vbr_header.bytes)
+        return (start, max(stop, start))
+
+    def extract(self, data: bytes, offset: int, begin: float, end: float) -> bytes:
+        """Extract the frames covering a time range from fetched data.
+
+        Args:
+            data (bytes): the data fetched from the range given by `byte_range`.
+            offset (int): the position of the data in the file.
+            begin (float): the range begin, in seconds.
+            end (float): the range end, in seconds.
+
+        Returns:
+            bytes: the frame-aligned data (b'' if no frame was found).
+        """
+        index = Mp3FrameIndex.create_from_bytes(data)
+        if index is None:
+            return b""
+
+        # Time of the first complete frame in the data
+        start_time = self.time_of(offset + index.audio_start)
+        start, stop = index.byte_range(begin - start_time, end - start_time)
+        return data[start:stop]
+
+    @staticmethod
+    def create_from_head(data: bytes, offset: int = 0) -> Union["Mp3Estimate", None]:
+        """Create an estimation from the head of a file (the ID3v2 tag, if any, must be skipped).
+
+        Args:
+            data (bytes): the first bytes of the audio frames (a few kilobytes).
+            offset (int, optional): the position of the data in the file. Defaults to 0.
+
+        Returns:
+            Union[Mp3Estimate, None]: the estimation or None if no MP3 frame was found.
+        """
+        if not isinstance(data, bytes):
+            return None
+
+        found = Mp3FrameIndex._resync(data, 0)
+        if found is None:
+            if logconfig.debug_enabled:
+                logger.debug("No MP3 frame found.")
+            return None
+
+        position, header = found
+        vbr_header = Mp3VbrHeader.parse(data, position, header)
+        if vbr_header is not None:
+            position += header.frame_length
+        return Mp3Estimate(audio_start=offset + position, header=header, vbr_header=vbr_header)
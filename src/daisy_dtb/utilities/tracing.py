@@ -0,0 +1,284 @@
+"""Tracing of the loading stages (fetch, decode, parse, model build)"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Dict, List, Union
+
+from loguru import logger
+
+
+@dataclass
+class TraceSpan:
+    """This class represents a traced stage.
+
+    Attributes:
+        name (str): the stage name (like "source.fetch", "dom.decode", "dom.parse", "smil.parse").
+        resource (str): the processed resource name.
+        size (int): the number of processed bytes (if known).
+        start (float): the start time (a `time.perf_counter()` value).
+        duration (float): the duration in seconds.
+        thread_id (int): the identifier of the thread.
+        span_id (int): the span identifier.
+        parent_id (int): the identifier of the enclosing span of the same thread (0 : none).
+        error (bool): True if the stage raised an exception.
+    """
+
+    name: str
+    resource: str = ""
+    size: int = 0
+    start: float = 0.0
+    duration: float = 0.0
+    thread_id: int = 0
+    span_id: int = 0
+    parent_id: int = 0
+    error: bool = False
+
+    def __enter__(self) -> "TraceSpan":
+        stack = Tracer._get_stack()
+        self.parent_id = stack[-1] if stack else 0
+        self.span_id = next(Tracer._ids)
+        self.thread_id = threading.get_ident()
+        stack.append(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.duration = time.perf_counter() - self.start
+        self.error = exc_type is not None
+        Tracer._get_stack().pop()
+        for sink in Tracer._sinks:
+            try:
+                sink.on_span(self)
+            except Exception as e:
+                logger.error(f"Trace sink {type(sink).__name__} failed: {e}")
+
+
+class _NullSpan:
+    """The span returned when tracing is disabled : it does nothing.
+
+    It is intended for internal use.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    @property
+    def size(self) -> int:
+        return 0
+
+    @size.setter
+    def size(self, value: int) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class TraceSink(ABC):
+    """Base class of the trace sinks (see `Tracer.add_sink`).
+
+    Note:
+    - The sinks are called from the traced threads, when a span ends : they must be thread safe, and fast.
+    """
+
+    @abstractmethod
+    def on_span(self, span: TraceSpan) -> None:
+        """Called when a span ends.
+
+        Args:
+            span (TraceSpan): the span.
+        """
+        raise NotImplementedError
+
+
+@dataclass
+class MemoryTraceSink(TraceSink):
+    """A sink keeping the spans in memory.
+
+    Args:
+        max_spans (int, optional): the maximum number of kept spans (the following ones are dropped, 0 : no limit). Defaults to 100000.
+    """
+
+    max_spans: int = 100000
+
+    # Internal attributes
+    _spans: List[TraceSpan] = field(init=False, default_factory=list)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def on_span(self, span: TraceSpan) -> None:
+        with self._lock:
+            if self.max_spans == 0 or len(self._spans) < self.max_spans:
+                self._spans.append(span)
+
+    def get_spans(self, name: str = None) -> List[TraceSpan]:
+        """Get the recorded spans, in order of completion.
+
+        Args:
+            name (str, optional): keep the spans of this stage only. Defaults to None (all spans).
+
+        Returns:
+            List[TraceSpan]: the spans.
+        """
+        with self._lock:
+            return [_ for _ in self._spans if name is None or _.name == name]
+
+    def get_summary(self) -> Dict[str, dict]:
+        """Get the time spent per stage.
+
+        Returns:
+            Dict[str, dict]: per stage name, a dict with the "count", the "bytes", the "total" and the "max" duration (in seconds).
+        """
+        result: Dict[str, dict] = {}
+        for span in self.get_spans():
+            item = result.setdefault(span.name, {"count": 0, "bytes": 0, "total": 0.0, "max": 0.0})
+            item["count"] += 1
+            item["bytes"] += span.size
+            item["total"] += span.duration
+            item["max"] = max(item["max"], span.duration)
+        return result
+
+    def clear(self) -> None:
+        """Remove the recorded spans."""
+        with self._lock:
+            self._spans.clear()
+
+
+@dataclass
+class ChromeTraceSink(MemoryTraceSink):
+    """A sink exporting the spans in the Chrome trace event format (chrome://tracing, Perfetto, speedscope)."""
+
+    def get_events(self) -> List[dict]:
+        """Get the spans as trace events ("complete" events, with the times in microseconds).
+
+        Returns:
+            List[dict]: the events.
+        """
+        pid = os.getpid()
+        return [
+            {
+                "name": span.name,
+                "cat": "daisy_dtb",
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {"resource": span.resource, "size": span.size, "error": span.error},
+            }
+            for span in self.get_spans()
+        ]
+
+    def to_json(self) -> str:
+        """Get the trace as a JSON string.
+
+        Returns:
+            str: the trace.
+        """
+        return json.dumps({"traceEvents": self.get_events(), "displayTimeUnit": "ms"})
+
+    def export(self, path: str) -> None:
+        """Write the trace to a JSON file.
+
+        Args:
+            path (str): the file path.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+        logger.debug(f"Trace exported to {path}.")
+
+
+@dataclass
+class CallbackTraceSink(TraceSink):
+    """A sink calling a function for each span.
+
+    Args:
+        callback (Callable[[TraceSpan], None]): the function.
+    """
+
+    callback: Callable[[TraceSpan], None]
+
+    def on_span(self, span: TraceSpan) -> None:
+        self.callback(span)
+
+
+class Tracer:
+    """This class traces the loading stages of the resources and of the book.
+
+    The traced code opens spans : `with Tracer.span("dom.parse", resource_name) as span: ...`.
+    The ended spans are sent to the sinks.
+
+    Note:
+    - Tracing is enabled when at least one sink is registered. Otherwise, the spans do nothing (no allocation, no clock reading).
+    - The spans of a thread are nested : `parent_id` is the enclosing span.
+    """
+
+    _sinks: ClassVar[List[TraceSink]] = []
+    _ids: ClassVar[itertools.count] = itertools.count(1)
+    _local: ClassVar[threading.local] = threading.local()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def span(name: str, resource: str = "", size: int = 0) -> Union[TraceSpan, _NullSpan]:
+        """Create a span (to be used as a context manager).
+
+        Args:
+            name (str): the stage name.
+            resource (str, optional): the processed resource. Defaults to "".
+            size (int, optional): the number of processed bytes (it can be set in the `with` block). Defaults to 0.
+
+        Returns:
+            Union[TraceSpan, _NullSpan]: the span (a no-op span if tracing is disabled).
+        """
+        if not Tracer._sinks:
+            return _NULL_SPAN
+        return TraceSpan(name, resource, size)
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Check if tracing is enabled.
+
+        Returns:
+            bool: True if at least one sink is registered.
+        """
+        return len(Tracer._sinks) > 0
+
+    @staticmethod
+    def add_sink(sink: TraceSink) -> None:
+        """Register a sink (this enables tracing).
+
+        Args:
+            sink (TraceSink): the sink.
+        """
+        with Tracer._lock:
+            # Copy on write : the list is iterated without lock
+            Tracer._sinks = Tracer._sinks + [sink]
+        logger.debug(f"Trace sink {type(sink).__name__} added.")
+
+    @staticmethod
+    def remove_sink(sink: TraceSink) -> None:
+        """Unregister a sink (tracing is disabled when no sink is left).
+
+        Args:
+            sink (TraceSink): the sink.
+        """
+        with Tracer._lock:
+            Tracer._sinks = [_ for _ in Tracer._sinks if _ is not sink]
+        logger.debug(f"Trace sink {type(sink).__name__} removed.")
+
+    @staticmethod
+    def _get_stack() -> List[int]:
+        """Get the open spans of the current thread."""
+        stack = getattr(Tracer._local, "stack", None)
+        if stack is None:
+            stack = Tracer._local.stack = []
+        return stack
@@ -0,0 +1,35 @@
+import os
+
+SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../samples/valentin_hauy")
+SAMPLE_MP3_PATH = os.path.join(os.path.dirname(__file__), "../samples/valentin_hauy/hauy_0002.mp3")
+
+# MPEG 1 layer III, 128 kbps, 44100 Hz, joint stereo : 417 bytes per frame
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x44])
+FRAME_LENGTH = 417
+
+
+def get_sample_mp3() -> bytes:
+    "Get an MP3 file for the tests"
+    with open(SAMPLE_MP3_PATH, "rb") as file:
+        return file.read()
+
+
+def make_frames(count: int) -> bytes:
+    "Create silent MP3 frames"
+    return (FRAME_HEADER + bytes(FRAME_LENGTH - 4)) * count
+
+
+def make_xing_frame(frames: int, toc: bytes) -> bytes:
+    "Create a Xing header frame (frames, bytes and TOC fields)"
+    payload = b"Xing" + (0x7).to_bytes(4, "big") + frames.to_bytes(4, "big") + (frames * FRAME_LENGTH).to_bytes(4, "big") + toc
+    data = FRAME_HEADER + bytes(32) + payload
+    return data + bytes(FRAME_LENGTH - len(data))
+
+
+def make_vbri_frame(frames: int, table: list) -> bytes:
+    "Create a VBRI header frame (2 bytes table entries, scale 1)"
+    payload = b"VBRI" + bytes(6) + (frames * FRAME_LENGTH).to_bytes(4, "big") + frames.to_bytes(4, "big")
+    payload += len(table).to_bytes(2, "big") + (1).to_bytes(2, "big") + (2).to_bytes(2, "big") + (1).to_bytes(2, "big")
+    payload += b"".join([_.to_bytes(2, "big") for _ in table])
+    data = FRAME_HEADER + bytes(32) + payload
+    return data + bytes(FRAME_LENGTH - len(data))
@@ -0,0 +1,199 @@
+"""MP3 frame index tests"""
+
+import pytest
+from audio_test_context import FRAME_LENGTH, SAMPLE_DTB_PROJECT_PATH, get_sample_mp3, make_frames, make_vbri_frame, make_xing_frame
+
+from daisy_dtb import DaisyBook, FolderDtbSource, Mp3FrameIndex
+from daisy_dtb.utilities import Mp3Estimate, Mp3FrameHeader
+
+
+def test_frame_header():
+    header = Mp3FrameHeader.parse(get_sample_mp3())
+    assert header.version == 1.0
+    assert header.layer == 3
+    assert header.bitrate == 96000
+    assert header.sample_rate == 44100
+    assert header.mono is True
+    assert header.frame_length in (313, 314)
+    assert header.duration == pytest.approx(0.026122, abs=1e-6)
+
+    assert Mp3FrameHeader.parse(b"\xff\xff\xff\xff") is None
+    assert Mp3FrameHeader.parse(b"<smil>") is None
+
+
+def test_sample_index():
+    data = get_sample_mp3()
+    index = Mp3FrameIndex.create_from_bytes(data)
+    assert index.frame_count == 3811
+    assert index.duration == pytest.approx(99.553, abs=0.001)
+    assert index.audio_start == 0
+    assert index.audio_end == len(data)
+    assert index.vbr_header is None
+
+    for frame in range(index.frame_count):
+        assert Mp3FrameHeader.parse(data, index._offsets[frame]) is not None
+
+
+def test_byte_range():
+    data = get_sample_mp3()
+    index = Mp3FrameIndex.create_from_bytes(data)
+
+    # Frame-aligned ranges, covering the requested time range
+    start, stop = index.byte_range(22.036, 28.931)
+    segment = Mp3FrameIndex.create_from_bytes(data[start:stop])
+    assert segment.audio_start == 0
+    assert segment.audio_end == stop - start
+    first, last = index.frame_range(22.036, 28.931)
+    assert index.time_of(first) <= 22.036 < index.time_of(first + 1)
+    assert index.time_of(last - 1) < 28.931 <= index.time_of(last)
+
+    # Contiguous time ranges share (at most) the frame holding the boundary, and the frames holding its bit reservoir
+    first, _ = index.frame_range(6.334, 15.390)
+    start = index.byte_range(6.334, 15.390)[0]
+    overlap = index.byte_range(0.0, 6.334)[1] - start
+    assert 0 <= overlap <= index._offsets[first + 1] - start
+
+    # Out of range
+    assert index.byte_range(500.0, 600.0)[1] == len(data)
+    assert Mp3FrameIndex.create_from_bytes(b"<html/>") is None
+    assert Mp3FrameIndex.create_from_bytes(None) is None
+
+
+def test_bit_reservoir():
+    data = get_sample_mp3()
+    index = Mp3FrameIndex.create_from_bytes(data)
+    overhead = index.first_header.main_data_position
+
+    # The preceding frames hold the main data of the frame
+    first, _ = index.frame_range(22.036, 28.931)
+    needed = index.first_header.get_main_data_begin(data, index._offsets[first])
+    start = index.reservoir_start(first)
+    assert needed > 0 and start < first
+    assert index._offsets[first] - index._offsets[start] - (first - start) * overhead >= needed
+    assert index._offsets[first] - index._offsets[start + 1] - (first - start - 1) * overhead < needed
+    assert index.byte_range(22.036, 28.931)[0] == index._offsets[start]
+
+    # No reservoir
+    assert index.reservoir_start(0) == 0
+    silent = Mp3FrameIndex.create_from_bytes(make_frames(10))
+    assert silent.reservoir_start(5) == 5
+
+
+def test_tags_and_garbage():
+    frames = make_frames(20)
+
+    # ID3v2 tag (syncsafe size 0x100), garbage between frames and an ID3v1 tag at the end
+    id3v2 = b"ID3\x03\x00\x00\x00\x00\x02\x00" + bytes(0x100)
+    data = id3v2 + frames[: 10 * FRAME_LENGTH] + b"\x00\xff\x12garbage" + frames[10 * FRAME_LENGTH :] + b"TAG" + bytes(125)
+
+    index = Mp3FrameIndex.create_from_bytes(data)
+    assert index.frame_count == 20
+    assert index.audio_start == len(id3v2)
+    assert index.audio_end == len(data) - 128
+
+
+def test_xing_header():
+    toc = bytes(range(0, 200, 2))
+    data = make_xing_frame(100, toc) + make_frames(100)
+
+    index = Mp3FrameIndex.create_from_bytes(data)
+    assert index.frame_count == 100
+    assert index.audio_start == FRAME_LENGTH
+    assert index.vbr_header.kind == "Xing"
+    assert index.vbr_header.frames == 100
+    assert index.vbr_header.bytes == 100 * FRAME_LENGTH
+    assert index.vbr_header.toc == list(toc)
+    assert index.vbr_header.estimate_offset(index.duration / 2, index.duration) == int(100 / 256 * 100 * FRAME_LENGTH)
+
+
+def test_vbri_header():
+    data = make_vbri_frame(100, [FRAME_LENGTH * 25] * 4) + make_frames(100)
+
+    index = Mp3FrameIndex.create_from_bytes(data)
+    assert index.frame_count == 100
+    assert index.vbr_header.kind == "VBRI"
+    assert index.vbr_header.frames == 100
+    assert index.vbr_header.toc == [FRAME_LENGTH * 25] * 4
+    assert index.vbr_header.estimate_offset(index.duration / 2, index.duration) == 50 * FRAME_LENGTH
+
+
+def test_estimate():
+    # CBR : the estimation from the head gives the frames of the index
+    data = get_sample_mp3()
+    index = Mp3FrameIndex.create_from_bytes(data)
+    estimate = Mp3Estimate.create_from_head(data[:4096])
+    assert estimate.is_vbr is False
+    assert estimate.audio_start == index.audio_start
+    for begin, end in [(0.0, 1.5), (10.2, 12.9), (98.0, 99.553)]:
+        start, stop = estimate.byte_range(begin, end)
+        first, last = index.byte_range(begin, end)
+        assert estimate.extract(data[start:stop], start, begin, end) == data[first:last]
+
+    # VBR : the Xing seek table is used
+    toc = bytes([int(_ * 2.56) for _ in range(100)])
+    data = make_xing_frame(100, toc) + make_frames(100)
+    estimate = Mp3Estimate.create_from_head(data[:4096])
+    assert estimate.is_vbr is True
+    assert estimate.audio_start == FRAME_LENGTH
+    assert estimate.duration == pytest.approx(100 * 0.026122, abs=1e-4)
+    start, stop = estimate.byte_range(1.0, 2.0)
+    segment = estimate.extract(data[start:stop], start, 1.0, 2.0)
+    assert len(segment) % FRAME_LENGTH == 0
+    assert 38 <= len(segment) // FRAME_LENGTH <= 40
+
+    assert Mp3Estimate.create_from_head(b"no frame here") is None
+
+
+def test_clip_bytes():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    dtb = DaisyBook(source)
+
+    total_file_bytes, total_clip_bytes = 0, 0
+    for section in dtb.toc_entries[1].sections:
+        for clip in section.clips:
+            data = clip.get_clip_bytes()
+            segment = Mp3FrameIndex.create_from_bytes(data)
+            assert segment.audio_end == len(data)
+            # The frames holding the bit reservoir of the first frame are included
+            index = source.get_frame_index(clip.src)
+            first, _ = index.frame_range(clip.begin, clip.end)
+            reservoir = (first - index.reservoir_start(first)) * index.first_header.duration
+            assert clip.duration <= segment.duration < clip.duration + reservoir + 0.06
+            total_file_bytes += len(clip.get_sound())
+            total_clip_bytes += len(data)
+
+    # Each clip only holds a fraction of the file
+    assert total_clip_bytes < total_file_bytes / 10
+
+    # The frame index is built once per resource
+    assert source.get_frame_index("hauy_0002.mp3") is source.get_frame_index("hauy_0002.mp3")
+
+    # Missing audio file
+    clip = dtb.toc_entries[6].sections[0].clips[0]
+    assert clip.src == "hauy_0007.mp3"
+    assert clip.get_clip_bytes() is None
+
+
+def test_audio_indexes_bound():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    source.audio_indexes_size = 2
+    indexes = [source.get_frame_index(name) for name in ["hauy_0001.mp3", "hauy_0002.mp3"]]
+    assert source.get_frame_index("hauy_0001.mp3") is indexes[0]
+    assert source.get_frame_index("hauy_0003.mp3") is not None
+    assert list(source._frame_indexes.keys()) == ["hauy_0001.mp3", "hauy_0003.mp3"]
+
+    # The dropped index is built again
+    assert source.get_frame_index("hauy_0002.mp3", build=False) is None
+    assert source.get_frame_index("hauy_0002.mp3").frame_count == indexes[1].frame_count
+
+    # A missing resource is kept as such
+    assert source.get_mp3_estimate("hauy_0007.mp3") is None
+    assert list(source._estimates.keys()) == ["hauy_0007.mp3"]
+
+    assert source.release_audio_indexes(["hauy_0002.mp3"]) == 2
+    assert list(source._frame_indexes.keys()) == ["hauy_0002.mp3"] and len(source._estimates) == 0
+
+    source.audio_indexes_size = 0
+    assert len(source._frame_indexes) == 0
+    assert source.get_frame_index("hauy_0001.mp3") is not None
+    assert len(source._frame_indexes) == 0
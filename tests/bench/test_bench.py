@@ -0,0 +1,113 @@
+"""Synthetic book generator and benchmark suite tests"""
+
+import gc
+import os
+
+import pytest
+
+from daisy_dtb import DaisyBook, FolderDtbSource, ZipDtbSource
+from daisy_dtb.bench import BenchmarkSuite, BookSpec, GcMonitor, generate_book
+
+
+def test_generated_folder(tmp_path):
+    spec = BookSpec(headings=12, depth=3, smils=4, pars_per_smil=5, clips_per_par=2, clip_duration=2.0, text_files=2)
+    path = generate_book(str(tmp_path / "book"), spec)
+    assert sorted(os.listdir(path))[:3] == ["book_0001.mp3", "book_0001.smil", "book_0002.mp3"]
+
+    book = DaisyBook(FolderDtbSource(path, 10))
+    assert book.title == spec.title
+    assert book.navigation_depth == 3
+    assert [_.level for _ in book.toc_entries] == [1, 2, 3] * 4
+    assert len(set([_.reference.resource for _ in book.smils])) == 4
+
+    entry = book.toc_entries[-1]
+    assert entry.smil_reference.resource == "book_0004.smil"
+    assert entry.smil.total_duration == 20.0
+    assert len(entry.sections) == 5
+    section = entry.sections[-1]
+    assert section.text.reference.resource == "text_0002.html"
+    assert 0 < len(section.text.content) <= spec.text_size
+    clip = section.clips[-1]
+    assert (clip.begin, clip.end) == (18.0, 20.0)
+
+    # The audio files are valid MP3 files of the SMIL duration
+    index = book.source.get_frame_index(clip.src)
+    assert index is not None
+    assert abs(index.duration - 20.0) < 0.1
+
+
+def test_generated_zip(tmp_path):
+    path = generate_book(str(tmp_path / "book.zip"), BookSpec(headings=5, audio=False))
+    book = DaisyBook(ZipDtbSource(path))
+    assert len(book.toc_entries) == 5
+    assert book.get_metadata("ncc:multimediaType").content == "textNCC"
+    assert len(book.toc_entries[4].sections) == 10
+
+
+def test_spec_check(tmp_path):
+    for spec in [BookSpec(headings=0), BookSpec(depth=7), BookSpec(headings=5, smils=6), BookSpec(headings=30, smils=2, pars_per_smil=10), BookSpec(headings=5, text_files=6)]:
+        with pytest.raises(ValueError):
+            generate_book(str(tmp_path / "book"), spec)
+
+
+def test_suite(tmp_path):
+    spec = BookSpec(headings=6, pars_per_smil=3)
+    path = generate_book(str(tmp_path / "book"), spec)
+    suite = BenchmarkSuite(path, runs=2, jumps=5, spec=spec)
+    results = suite.run()
+    assert list(results["benchmarks"].keys()) == suite.names
+    assert results["book"]["spec"]["headings"] == 6
+    traversal = results["benchmarks"]["traversal"]
+    assert traversal["unit"] == "s"
+    assert len(traversal["values"]) == 2
+    assert traversal["min"] <= traversal["median"]
+    assert results["benchmarks"]["memory_peak"]["median"] >= results["benchmarks"]["memory_retained"]["median"] > 0
+    assert traversal["gc"]["collections"] == sum(traversal["gc"]["generations"])
+    assert results["benchmarks"]["gc_pause"]["median"] > 0
+    assert "gc max pause" in BenchmarkSuite.format_results(results)
+
+    output = str(tmp_path / "results.json")
+    BenchmarkSuite.save(results, output)
+    baseline = BenchmarkSuite.load(output)
+    rows = BenchmarkSuite.compare(baseline, suite.run(["open"]))
+    assert [_["name"] for _ in rows] == ["open"]
+    assert rows[0]["ratio"] > 0
+    assert "open" in BenchmarkSuite.format_comparison(rows)
+
+    with pytest.raises(ValueError):
+        suite.run(["unknown"])
+
+
+def test_gc_monitor():
+    with GcMonitor() as monitor:
+        assert monitor.is_running
+        gc.collect()
+        gc.collect(0)
+    assert not monitor.is_running
+    gc.collect()
+
+    stats = monitor.get_stats()
+    assert stats["collections"] >= 2
+    assert stats["generations"][2] >= 1 and stats["generations"][0] >= 1
+    assert 0 < stats["max_full"] <= stats["max"] <= stats["total"]
+
+    monitor.reset()
+    assert monitor.get_stats()["collections"] == 0
+
+
+def test_suite_gc_freeze(tmp_path, monkeypatch):
+    path = generate_book(str(tmp_path / "book"), BookSpec(headings=4, pars_per_smil=3, audio=False))
+    counts = []
+    freeze = gc.freeze
+
+    def recording_freeze():
+        freeze()
+        counts.append(gc.get_freeze_count())
+
+    monkeypatch.setattr(gc, "freeze", recording_freeze)
+    results = BenchmarkSuite(path, runs=1, jumps=5, gc_freeze=True).run(["gc_pause"])
+    assert results["settings"]["gc_freeze"] is True
+    # Frozen during the run only
+    assert len(counts) == 1 and counts[0] > 0
+    assert results["benchmarks"]["gc_pause"]["gc"]["generations"][2] >= 1
+    assert gc.get_freeze_count() == 0
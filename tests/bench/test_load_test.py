@@ -0,0 +1,78 @@
+"""Book server and load test tests"""
+
+import time
+import urllib.request
+
+import pytest
+
+from daisy_dtb.bench import BookServer, BookSpec, LoadTest, generate_book
+from daisy_dtb.bench.load_test import percentile
+
+
+@pytest.fixture(scope="module")
+def book_folder(tmp_path_factory):
+    spec = BookSpec(headings=9, depth=3, smils=3, pars_per_smil=4, clip_duration=1.0)
+    return generate_book(str(tmp_path_factory.mktemp("load") / "book"), spec)
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_server(book_folder):
+    with BookServer(book_folder, latency=0.05) as url:
+        start = time.perf_counter()
+        with urllib.request.urlopen(f"{url}ncc.html") as response:
+            assert response.read().startswith(b"<?xml")
+        assert time.perf_counter() - start >= 0.05
+
+        request = urllib.request.Request(f"{url}book_0001.mp3", headers={"Range": "bytes=4-9"})
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 206
+            assert response.headers["Content-Range"].startswith("bytes 4-9/")
+            assert response.read() == bytes(6)
+
+
+def test_server_bandwidth(book_folder):
+    with BookServer(book_folder, bandwidth=20000) as url:
+        request = urllib.request.Request(f"{url}book_0001.mp3", headers={"Range": "bytes=0-3999"})
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            assert len(response.read()) == 4000
+        assert time.perf_counter() - start >= 0.2
+
+
+def test_load_test(book_folder):
+    with BookServer(book_folder, latency=0.001) as url:
+        report = LoadTest(url, listeners=3, duration=1.0, cache_size=10).run()
+
+    assert report["errors"] == 0, report["first_error"]
+    assert report["latency_ms"]["open"]["count"] == 3
+    for operation in ["play", "jump", "skip"]:
+        item = report["latency_ms"][operation]
+        assert item["count"] > 0
+        assert 0 < item["p50"] <= item["p95"] <= item["p99"] <= item["max"]
+    assert report["operations"] == sum([_["count"] for _ in report["latency_ms"].values()])
+    assert report["throughput"] > 0
+    assert report["cache"]["queries"] > 0
+    assert report["fetcher"]["http"]["count"] > 0
+    assert report["gc"]["collections"] == sum(report["gc"]["generations"])
+    assert "throughput" in LoadTest.format_report(report)
+
+
+def test_load_test_separate_sources(book_folder):
+    report = LoadTest(book_folder, listeners=2, duration=0.3, modes=["sequential"], shared_source=False).run()
+    assert report["errors"] == 0, report["first_error"]
+    assert list(report["latency_ms"].keys()) == ["open", "play"]
+
+
+def test_load_test_settings():
+    with pytest.raises(ValueError):
+        LoadTest("book", modes=["random"])
+    with pytest.raises(ValueError):
+        LoadTest("book", listeners=0)
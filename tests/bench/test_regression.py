@@ -0,0 +1,78 @@
+"""Performance regression gate tests"""
+
+import os
+
+import pytest
+
+from daisy_dtb import LogLevel
+from daisy_dtb.bench import BenchmarkSuite, BookSpec, RegressionGate, assert_no_regression, check_baseline, generate_book, save_baseline
+
+
+def make_results(values: dict, stages: dict = None) -> dict:
+    benchmarks = {name: BenchmarkSuite.summarize(items, "s") for name, items in values.items()}
+    for name, item in (stages or {}).items():
+        benchmarks[name]["stages"] = item
+    return {"benchmarks": benchmarks}
+
+
+def test_gate_noise_band():
+    baseline = make_results({"stable": [1.0, 1.0, 1.0], "noisy": [1.0, 2.0, 3.0], "faster": [1.0, 1.1, 1.2]})
+    current = make_results({"stable": [1.2, 1.2, 1.2], "noisy": [2.5, 2.6, 2.7], "faster": [0.5, 0.5, 0.5]})
+    rows = {_["name"]: _ for _ in RegressionGate(tolerance=0.1, confidence=3.0).check(baseline, current)}
+
+    # 20 % slower, without noise
+    assert rows["stable"]["regressed"]
+    assert rows["stable"]["band"] == pytest.approx(0.1)
+    # 30 % slower, within the noise
+    assert not rows["noisy"]["regressed"]
+    assert rows["noisy"]["band"] > 0.5
+    assert not rows["faster"]["regressed"]
+
+    assert not RegressionGate(tolerance=0.25).check(baseline, current)[0]["regressed"]
+
+
+def test_gate_stages():
+    stages = {"smil.parse": {"count": 4, "total": 0.1}, "dom.parse": {"count": 4, "total": 0.2}}
+    slower = {"smil.parse": {"count": 4, "total": 0.5}, "dom.parse": {"count": 4, "total": 0.2}}
+    baseline = make_results({"traversal": [1.0, 1.0]}, {"traversal": stages})
+    rows = RegressionGate().check(baseline, make_results({"traversal": [2.0, 2.0]}, {"traversal": slower}))
+
+    assert [_["name"] for _ in RegressionGate.get_regressions(rows)] == ["traversal"]
+    assert rows[0]["stages"][0]["name"] == "smil.parse"
+    assert rows[0]["stages"][0]["ratio"] == pytest.approx(5.0)
+    report = RegressionGate.format_report(rows)
+    assert "REGRESSED" in report and "traversal stages" in report
+
+    # Not regressed : no stages
+    assert RegressionGate().check(baseline, baseline)[0]["stages"] == []
+
+
+def test_baseline(tmp_path):
+    spec = BookSpec(headings=6, smils=3, pars_per_smil=2, audio=False)
+    suite = BenchmarkSuite(generate_book(str(tmp_path / "book"), spec), runs=3, jumps=5, lookups=5, spec=spec)
+    path = str(tmp_path / "baseline.json")
+    baseline = save_baseline(suite, path, ["traversal", "smil_parse", "element_by_id", "navigator_moves", "source_get"])
+    assert "smil.parse" in baseline["benchmarks"]["traversal"]["stages"]
+
+    # The book is generated again from its description
+    results, rows = check_baseline(path, str(tmp_path / "check"), RegressionGate(tolerance=100.0))
+    assert results["book"]["spec"] == baseline["book"]["spec"]
+    assert list(results["benchmarks"].keys()) == list(baseline["benchmarks"].keys())
+    assert RegressionGate.get_regressions(rows) == []
+
+    # A slower baseline run cannot regress, a much faster one does
+    results = BenchmarkSuite.load(path)
+    for item in results["benchmarks"].values():
+        item["values"] = [_ / 1000 for _ in item["values"]]
+        item["median"] /= 1000
+        item["stdev"] /= 1000
+    BenchmarkSuite.save(results, path)
+    with pytest.raises(AssertionError, match="Performance regression"):
+        assert_no_regression(path, str(tmp_path / "check2"), names=["smil_parse"])
+
+
+@pytest.mark.skipif("DAISY_DTB_BENCH_BASELINE" not in os.environ, reason="no baseline (set DAISY_DTB_BENCH_BASELINE)")
+def test_no_regression(tmp_path):
+    # As the baseline run from the command line
+    LogLevel.set(LogLevel.NONE)
+    assert_no_regression(os.environ["DAISY_DTB_BENCH_BASELINE"], str(tmp_path))
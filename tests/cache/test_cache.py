@@ -1,5 +1,7 @@
 """Test the cache module."""
 
+import threading
+
 from daisy_dtb import Cache
 
 
@@ -116,3 +118,63 @@ def test_stats():
         cache.get("last")
 
     print(cache.get_stats())
+
+
+def test_concurrent_access():
+    cache = Cache(max_size=10, with_stats=True)
+    thread_count, loops = 16, 500
+    barrier = threading.Barrier(thread_count)
+
+    def worker(index: int):
+        barrier.wait()
+        for loop in range(loops):
+            key = f"key{(index + loop) % 20}"
+            if cache.get(key) is None:
+                cache.add(key, loop)
+            if loop % 100 == 0:
+                cache.resize(10)
+                cache.get_stats()
+
+    threads = [threading.Thread(target=worker, args=(_,)) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # No lost update in the statistics, no duplicate key in the cache
+    stats = cache.get_stats()
+    assert stats["total_queries"] == thread_count * loops
+    keys = [_.key for _ in cache._items.values()]
+    assert len(keys) == len(set(keys)) == 10
+
+
+def test_eviction_hooks():
+    evicted = []
+    cache = Cache(max_size=2)
+    cache.add_eviction_hook(lambda key, data: evicted.append((key, data)))
+    cache.add_eviction_hook(lambda key, data: 1 / 0)
+
+    cache.add("a", 1)
+    cache.add("b", 2)
+    cache.add("b", 2)
+    assert evicted == []
+
+    # Eviction (a failing hook does not prevent the other ones)
+    cache.add("c", 3)
+    assert evicted == [("a", 1)]
+
+    # Replacement
+    cache.add("c", 4)
+    assert evicted == [("a", 1), ("c", 3)]
+
+    # Resize
+    cache.resize(1)
+    assert evicted == [("a", 1), ("c", 3), ("b", 2)]
+
+    def hook(key, data):
+        evicted.clear()
+
+    cache.add_eviction_hook(hook)
+    cache.remove_eviction_hook(hook)
+    cache.add("d", 5)
+    assert evicted[-1] == ("c", 4)
@@ -0,0 +1,65 @@
+"""Test the cache statistics."""
+
+import time
+
+from daisy_dtb import Cache, CacheStats
+
+
+def test_counters():
+    stats = CacheStats()
+    for _ in range(3):
+        stats.hit("b")
+    stats.miss("b")
+    stats.miss("a")
+
+    result = stats.get_stats()
+    assert result["cached_items"] == 2
+    assert result["total_queries"] == 5
+    assert result["total_hits"] == 3
+    assert result["cache_efficiency"] == 3 / 5
+    assert result["details"] == [
+        {"item_name": "a", "queries": 1, "hits": 0, "efficiency": 0.0},
+        {"item_name": "b", "queries": 4, "hits": 3, "efficiency": 0.75},
+    ]
+
+
+def test_samples():
+    stats = CacheStats()
+    stats.hit("a", 0.5)
+    assert stats.get_samples() == []
+
+    stats.enable_samples(interval=0.05, count=3)
+    stats.hit("a", 0.5)
+    stats.miss("b", 0.1)
+    samples = stats.get_samples()
+    assert len(samples) == 1
+    assert samples[0]["hits"] == 1
+    assert samples[0]["misses"] == 1
+    assert samples[0]["efficiency"] == 0.5
+    assert abs(samples[0]["mean_latency"] - 0.3) < 1e-9
+
+    # The ring buffer keeps the last samples
+    for _ in range(5):
+        time.sleep(0.06)
+        stats.hit("a")
+    samples = stats.get_samples()
+    assert len(samples) == 3
+    assert all([_["hits"] == 1 and _["misses"] == 0 for _ in samples])
+    assert samples[0]["start"] < samples[1]["start"] < samples[2]["start"]
+
+    # The totals include all events
+    assert stats.get_stats()["total_queries"] == 8
+
+
+def test_cache_samples():
+    cache = Cache(max_size=2, with_stats=True)
+    cache.enable_samples(interval=60.0)
+    cache.add("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    samples = cache.get_samples()
+    assert len(samples) == 1
+    assert samples[0]["hits"] == 1
+    assert samples[0]["misses"] == 1
+    assert samples[0]["mean_latency"] > 0
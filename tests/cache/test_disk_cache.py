@@ -0,0 +1,109 @@
+"""Test the disk cache module."""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+
+from daisy_dtb import DiskCache
+
+
+def test_add_get(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), with_stats=True)
+    assert cache.get("key") is None
+
+    cache.add("key", {"title": "Title", "sections": [["id", 1.5]]})
+    assert cache.get("key") == {"title": "Title", "sections": [["id", 1.5]]}
+
+    # Update
+    cache.add("key", [1, 2, 3])
+    assert cache.get("key") == [1, 2, 3]
+
+    # Not serializable : ignored
+    cache.add("other", object())
+    assert cache.get("other") is None
+
+    stats = cache.get_stats()
+    assert stats["total_queries"] == 4
+    assert stats["total_hits"] == 2
+
+    cache.clear()
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = DiskCache(path)
+    cache.add("key", "value")
+    cache.close()
+
+    # Another process reads and writes the same cache
+    src_path = os.path.join(os.path.dirname(__file__), "../../src")
+    code = f"import sys; sys.path.insert(0, {src_path!r}); from daisy_dtb import DiskCache; cache = DiskCache({path!r}); assert cache.get('key') == 'value'; cache.add('child', 1)"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    assert DiskCache(path).get("child") == 1
+
+
+def test_concurrent_access(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+
+    def worker(index: int):
+        for _ in range(50):
+            cache.add(f"key_{index}_{_}", _)
+            assert cache.get(f"key_{index}_{_}") == _
+
+    threads = [threading.Thread(target=worker, args=(_,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.get("key_3_49") == 49
+
+
+def test_group(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    cache.add("smil|a.smil|10|1.0", "old", group="smil|a.smil")
+    cache.add("smil|b.smil|10|1.0", "other", group="smil|b.smil")
+
+    # A new version of the resource replaces the former one
+    cache.add("smil|a.smil|12|2.0", "new", group="smil|a.smil")
+    assert cache.get("smil|a.smil|10|1.0") is None
+    assert cache.get("smil|a.smil|12|2.0") == "new"
+    assert cache.get("smil|b.smil|10|1.0") == "other"
+
+
+def test_max_bytes(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=100)
+    for index in range(10):
+        cache.add(f"key_{index}", "x" * 18)  # 20 bytes once serialized
+
+    # The oldest items are removed
+    assert cache.bytes == 100
+    assert [cache.get(f"key_{index}") is not None for index in range(10)] == [False] * 5 + [True] * 5
+
+    # An updated item is the most recent one
+    cache.add("key_5", "y" * 18)
+    cache.add("key_10", "z" * 18)
+    assert cache.get("key_5") is not None
+    assert cache.get("key_6") is None
+    cache.close()
+
+
+def test_former_table(tmp_path):
+    path = tmp_path / "cache"
+    path.mkdir()
+    connection = sqlite3.connect(str(path / "daisy_dtb_cache.sqlite3"))
+    connection.execute("CREATE TABLE items (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+    connection.execute("INSERT INTO items VALUES ('key', '1')")
+    connection.commit()
+    connection.close()
+
+    # The table is created again
+    cache = DiskCache(str(path))
+    assert cache.get("key") is None
+    cache.add("key", 2)
+    assert cache.get("key") == 2
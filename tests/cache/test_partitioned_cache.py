@@ -0,0 +1,70 @@
+"""Test the cache bytes limit and the partitioned cache."""
+
+from daisy_dtb import Cache, LruPolicy, PartitionedCache
+
+
+def test_bytes_limit():
+    cache = Cache(max_size=10, with_stats=True, max_bytes=100)
+    cache.add("a", b"x" * 40)
+    cache.add("b", b"x" * 40)
+    assert cache.bytes == 80
+
+    # The oldest item is evicted to make room
+    cache.add("c", b"x" * 40)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.bytes == 80
+
+    # Explicit size (e.g. the source size of a parsed document)
+    cache.add("d", object(), size=60)
+    assert cache.get("b") is None
+    assert cache.size == 2
+    assert cache.bytes == 100
+
+    # Too large
+    cache.add("e", b"x" * 101)
+    assert cache.get("e") is None
+
+    # Update
+    cache.add("d", b"x" * 10)
+    assert cache.bytes == 50
+
+    stats = cache.get_stats()
+    assert stats["size"] == 2
+    assert stats["bytes"] == 50
+    assert stats["evictions"] == 2
+    assert stats["total_hits"] == 1
+    assert stats["total_misses"] == 3
+
+
+def test_partitions():
+    partitions = {"small": Cache(max_size=1, with_stats=True), "large": Cache(max_size=10, with_stats=True, policy=LruPolicy)}
+    cache = PartitionedCache(partitions, lambda key: key.split(":")[0])
+    assert cache.maxlen == 11
+
+    cache.add("large:keep", 1)
+    for index in range(5):
+        cache.add(f"small:{index}", index)
+    cache.add("unknown:item", 1)
+
+    assert cache.get("large:keep") == 1
+    assert cache.get("small:4") == 4
+    assert cache.get("small:3") is None
+    assert cache.peek("unknown:item") is None
+
+    stats = cache.get_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 4
+    assert stats["total_queries"] == 3
+    assert stats["total_hits"] == 2
+    assert stats["partitions"]["small"]["evictions"] == 4
+    assert stats["partitions"]["large"]["cache_efficiency"] == 1.0
+
+
+def test_eviction_hooks():
+    evicted = []
+    cache = PartitionedCache({"html": Cache(max_size=1), "mp3": Cache(max_size=1)}, lambda x: x.split(".")[-1])
+    cache.add_eviction_hook(lambda key, data: evicted.append(key))
+    for key in ["a.html", "b.mp3", "c.html", "d.mp3"]:
+        cache.add(key, key)
+    assert evicted == ["a.html", "b.mp3"]
@@ -0,0 +1,100 @@
+"""Test the cache eviction policies."""
+
+import pytest
+
+from daisy_dtb import ArcPolicy, Cache, FifoPolicy, LfuPolicy, LruPolicy, TinyLfuPolicy
+
+POLICIES = [FifoPolicy, LruPolicy, LfuPolicy, ArcPolicy, TinyLfuPolicy]
+
+
+def replay(cache: Cache, keys: list) -> int:
+    """Replay requests (get, then add on a miss), return the hit count."""
+    hits = 0
+    for key in keys:
+        if cache.get(key) is None:
+            cache.add(key, key)
+        else:
+            hits += 1
+    return hits
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_capacity(policy):
+    cache = Cache(max_size=3, policy=policy)
+    replay(cache, [f"key{_ % 7}" for _ in range(100)])
+    assert len(cache._items) <= 3
+    assert sorted(cache._items) == sorted(cache._policy.keys())
+
+    # Resize
+    cache.resize(1)
+    assert len(cache._items) <= 1
+    assert sorted(cache._items) == sorted(cache._policy.keys())
+    cache.resize(0)
+    assert cache.get("key1") is None
+    cache.add("key1", 1)
+    assert cache.get("key1") is None
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_remove(policy):
+    cache = Cache(max_size=3, policy=policy)
+    replay(cache, ["a", "b", "a", "c"])
+    assert cache.remove("a") is True
+    assert cache.remove("a") is False
+    assert cache.get("a") is None
+    assert sorted(cache._items) == sorted(cache._policy.keys()) == ["b", "c"]
+    assert cache.bytes == cache.get_size("b") + cache.get_size("c")
+    assert cache.get_stats()["evictions"] == 0
+
+    # The freed place is used
+    replay(cache, ["d", "e", "d", "e"])
+    assert len(cache._items) <= 3
+    assert sorted(cache._items) == sorted(cache._policy.keys())
+
+
+def test_lru():
+    cache = Cache(max_size=2, policy=LruPolicy)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    cache.get("a")
+    cache.add("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    # FIFO evicts "a" (the accesses are not taken into account)
+    cache = Cache(max_size=2, policy=FifoPolicy)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    cache.get("a")
+    cache.add("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_lfu():
+    cache = Cache(max_size=2, policy=LfuPolicy)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    for _ in range(3):
+        cache.get("b")
+    cache.get("a")
+    cache.add("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+@pytest.mark.parametrize("policy", [LfuPolicy, ArcPolicy, TinyLfuPolicy])
+def test_scan_resistance(policy):
+    # A hot set, accessed twice between one-pass scans
+    hot = ["ncc.html", "content.html"]
+    trace = []
+    for index in range(200):
+        trace += hot + hot + [f"scan_{index}_{_}.mp3" for _ in range(4)]
+
+    lru_hits = replay(Cache(max_size=4, policy=LruPolicy), trace)
+    hits = replay(Cache(max_size=4, policy=policy), trace)
+
+    # LRU loses the hot set at each scan, the other policies keep it
+    assert lru_hits == 2 * 200
+    assert hits >= lru_hits + 2 * 190
@@ -0,0 +1,36 @@
+"""Audio index tests"""
+
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, FolderDtbSource
+
+
+def test_locate():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    assert len(dtb.audio_index.sources) == 30
+
+    # Every clip is found at its begin time and in its middle
+    for entry in dtb.toc_entries:
+        for section in entry.sections:
+            for clip in section.clips:
+                assert dtb.locate(clip.src, clip.begin) == (entry, section, clip)
+                assert dtb.locate(clip.src, clip.begin + clip.duration / 2) == (entry, section, clip)
+
+
+def test_locate_boundaries():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    entry = dtb.toc_entries[1]
+    first, second = entry.sections[0], entry.sections[1]
+
+    # At a boundary, the following clip is returned
+    assert dtb.locate("hauy_0002.mp3", first.clips[-1].end) == (entry, second, second.clips[0])
+
+    # Beyond the last clip
+    last_clip = entry.sections[-1].clips[-1]
+    assert dtb.locate("hauy_0002.mp3", last_clip.end) == (entry, entry.sections[-1], last_clip)
+    assert dtb.locate("hauy_0002.mp3", last_clip.end + 0.5) is None
+
+    # Unknown file, paths
+    assert dtb.locate("unknown.mp3", 1.0) is None
+    assert dtb.locate("/tmp/books/hauy_0002.mp3", 0.0) == (entry, first, first.clips[0])
+    assert dtb.locate("hauy_0002.mp3", -1.0) is None
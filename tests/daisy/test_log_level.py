@@ -0,0 +1,43 @@
+"""Log level and hot path logging tests"""
+
+from loguru import logger
+
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, FolderDtbSource, LogLevel
+from daisy_dtb.utilities import logconfig
+
+
+def test_debug_flag():
+    try:
+        LogLevel.set(LogLevel.NONE)
+        assert logconfig.debug_enabled is False
+        LogLevel.set(LogLevel.INFO)
+        assert logconfig.debug_enabled is False
+        LogLevel.set(LogLevel.TRACE)
+        assert logconfig.debug_enabled is True
+    finally:
+        LogLevel.set(LogLevel.DEBUG)
+    assert logconfig.debug_enabled is True
+
+
+def test_hot_path_messages():
+    messages = []
+    try:
+        LogLevel.set(LogLevel.NONE)
+        logger.add(messages.append, level="DEBUG")
+        logconfig.debug_enabled = False
+        book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 5))
+        book.toc_entries[0].sections
+        assert not [_ for _ in messages if "SMIL" in _ or "in the cache" in _]
+
+        # Same walk with the debug messages
+        LogLevel.set(LogLevel.NONE)
+        logger.add(messages.append, level="DEBUG")
+        logconfig.debug_enabled = True
+        book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 5))
+        book.toc_entries[0].sections
+        assert [_ for _ in messages if "SMIL" in _]
+        assert [_ for _ in messages if "in the cache" in _]
+    finally:
+        LogLevel.set(LogLevel.DEBUG)
@@ -0,0 +1,115 @@
+"""Memory accounting and release tests"""
+
+import gc
+import sys
+
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import BookNavigator, Cache, DaisyBook, FolderDtbSource, PartitionedCache, ReleasePolicy, freeze_book_structures
+from daisy_dtb.utilities import deep_size
+
+
+def test_deep_size():
+    assert deep_size("abc") == sys.getsizeof("abc")
+
+    text = "x" * 1000
+    shared = [text, text]
+    assert deep_size(shared) == sys.getsizeof(shared) + sys.getsizeof(text)
+
+    # An object already seen is not counted again
+    seen = set()
+    assert deep_size(text, seen) > 1000
+    assert deep_size({"key": text}, seen) < 1000
+
+    # Cycles
+    loop = []
+    loop.append(loop)
+    assert deep_size(loop) == sys.getsizeof(loop)
+
+
+def test_cache_items():
+    cache = Cache(max_size=5)
+    cache.add("a.html", b"1")
+    cache.add("b.mp3", b"22")
+    assert cache.get_items() == [("a.html", b"1"), ("b.mp3", b"22")]
+
+    cache = PartitionedCache({"html": Cache(max_size=5), "mp3": Cache(max_size=5)}, lambda x: x.split(".")[-1])
+    cache.add("a.html", b"1")
+    cache.add("b.mp3", b"22")
+    assert sorted(cache.get_items()) == [("a.html", b"1"), ("b.mp3", b"22")]
+
+
+def test_memory_report():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    navigator = BookNavigator(book)
+    report = book.memory_report([navigator])
+    assert report["total"] == sum([report[_] for _ in report["counts"].keys()])
+    assert report["counts"]["smil_models"] == 1
+    assert report["counts"]["texts"] == 0
+    assert report["cached_documents"] > 0
+    assert 0 < report["navigators"] < report["smil_models"]
+
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+    loaded = book.memory_report([navigator])
+    assert loaded["counts"]["smil_models"] == len(book.toc_entries)
+    assert loaded["counts"]["texts"] > 0
+    assert loaded["smil_models"] > report["smil_models"]
+    assert loaded["texts"] > 0 and loaded["text_maps"] > 0
+
+
+def test_release():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    navigator = BookNavigator(book)
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+    before = book.memory_report([navigator])
+    count = len(book.toc_entries)
+
+    navigator.toc.navigate_to(book.toc_entries[10].id)
+    text = navigator.section_text
+    for entry in book.toc_entries[:12]:
+        entry.sections[0].clips[0].get_clip_bytes()
+    kept_audio = set([clip.src for entry in book.toc_entries[8:13] for section in entry.sections for clip in section.clips])
+    result = book.release(ReleasePolicy(window=2, text_maps=True), navigator.current_toc_entry)
+    assert result["smils"] == count - 5
+    assert result["documents"] > 0
+    assert result["audio_indexes"] > 0
+    assert set(book.source._frame_indexes.keys()) <= kept_audio
+    assert [_.smil.is_parsed for _ in book.toc_entries].count(True) == 5
+
+    after = book.memory_report([navigator])
+    assert after["counts"]["smil_models"] == 5
+    assert after["smil_models"] < before["smil_models"]
+    assert after["texts"] < before["texts"]
+
+    # The navigation goes on, the released data is loaded again
+    assert navigator.section_text == text
+    navigator.toc.first()
+    assert navigator.current_section is not None
+    assert book.toc_entries[0].smil.is_parsed
+    assert book.locate(navigator.current_clip.src, navigator.current_clip.begin) is not None
+
+
+def test_release_texts():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+
+    result = book.release(ReleasePolicy(window=0, smils=False), 0)
+    assert result["smils"] == 0 and result["texts"] > 0
+    assert all([_.smil.is_parsed for _ in book.toc_entries])
+    assert all([section.text.is_loaded for section in book.toc_entries[0].sections])
+    assert not any([section.text.is_loaded for section in book.toc_entries[-1].sections])
+    assert book.toc_entries[-1].sections[0].text.content != ""
+
+
+def test_freeze_book_structures():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    with freeze_book_structures() as count:
+        assert count > 0 and gc.get_freeze_count() > 0
+        assert book.toc_entries[0].sections
+    assert gc.get_freeze_count() == 0
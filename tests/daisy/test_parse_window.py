@@ -0,0 +1,112 @@
+"""Parse window tests"""
+
+import pytest
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import BookNavigator, DaisyBook, FolderDtbSource, PlaybackCursor
+from daisy_dtb.bench import BookSpec, generate_book
+
+
+def parsed(book: DaisyBook) -> list:
+    return [index for index, entry in enumerate(book.toc_entries) if entry.smil.is_parsed]
+
+
+def test_settings():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    assert book.parse_window is None
+    with pytest.raises(ValueError):
+        book.set_parse_window(4, behind=4)
+
+    window = book.set_parse_window(4, prefetch=0)
+    assert book.parse_window is window
+    assert window.size == 4 and window.index is None
+    assert book.set_parse_window(0) is None
+    assert book.parse_window is None
+
+
+def test_book_navigator():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    window = book.set_parse_window(4, prefetch=2)
+    navigator = BookNavigator(book)
+    assert window.index == 0
+
+    texts = []
+    while True:
+        texts.append(navigator.section_text)
+        assert len(parsed(book)) <= 4
+        if navigator.toc.next() is None:
+            break
+    window.wait()
+
+    count = len(book.toc_entries)
+    assert window.index == count - 1
+    # One entry behind the current one
+    assert parsed(book) == [count - 2, count - 1]
+    stats = window.get_stats()
+    assert stats["moves"] == count
+    assert stats["released"] > 0 and stats["prefetched"] > 0
+
+    # The released SMIL files are parsed again
+    navigator.toc.first()
+    assert navigator.section_text == texts[0]
+    assert parsed(book) == [0]
+    book.set_parse_window(0)
+
+
+def test_prefetch():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50)
+    book = DaisyBook(source)
+    window = book.set_parse_window(4, prefetch=2)
+    window.move(0)
+    window.wait()
+    upcoming = [_.smil_reference.resource for _ in book.toc_entries[1:3]]
+    assert all([source._cache.peek(_) is not None for _ in upcoming])
+    book.set_parse_window(0)
+
+
+def test_playback_cursor():
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    window = book.set_parse_window(3, prefetch=0)
+    with PlaybackCursor(book, lookahead=0) as cursor:
+        clips = 1
+        while cursor.next() is not None:
+            clips += 1
+            assert len(parsed(book)) <= 3
+        assert window.index == cursor.position[0]
+
+        assert cursor.first() is not None
+        assert cursor.position == (0, 0, 0)
+        assert window.index == 0
+    assert clips > len(book.toc_entries)
+
+
+def retained(path: str) -> dict:
+    """Read a book with a parse window, return the memory held by the source at the end."""
+    source = FolderDtbSource(path, 1000)
+    source.text_maps_size = 1000
+    book = DaisyBook(source)
+    book.set_parse_window(4, prefetch=0)
+    navigator = BookNavigator(book)
+    while True:
+        navigator.section_text
+        if navigator.toc.next() is None:
+            break
+    report = book.memory_report([navigator])
+    report["cached"] = sorted([key for key, _ in source._cache.get_items()])
+    book.set_parse_window(0)
+    return report
+
+
+def test_retained_memory(tmp_path):
+    files = 10
+    # One SMIL file and one text file per TOC entry : the book is read through N, then 4N files
+    small = retained(generate_book(str(tmp_path / "small"), BookSpec(headings=files, text_files=files, audio=False)))
+    large = retained(generate_book(str(tmp_path / "large"), BookSpec(headings=4 * files, text_files=4 * files, audio=False)))
+
+    for name in ["text_maps", "smil_models", "texts"]:
+        assert large["counts"][name] == small["counts"][name], name
+        assert large[name] <= small[name] * 1.1, name
+
+    # The NCC (its size follows the TOC), the SMIL files of the window, and the text file read since the last move (the others are mapped)
+    assert large["counts"]["cached_documents"] == small["counts"]["cached_documents"]
+    assert large["cached"] == ["book_0039.smil", "book_0040.smil", "ncc.html", "text_0040.html"]
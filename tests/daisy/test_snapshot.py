@@ -0,0 +1,190 @@
+"""Compiled book snapshot tests"""
+
+import mmap
+import os
+import shutil
+
+import pytest
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, FolderDtbSource, Fetcher
+from daisy_dtb.book.snapshot import CompiledAudioIndex
+
+
+def get_content(book: DaisyBook) -> list:
+    """Get all the book data as comparable values."""
+    result = [book.title, book.navigation_depth, [(_.name, _.content, _.scheme) for _ in book.metadata]]
+    for entry in book.toc_entries:
+        reference = (entry.smil_reference.resource, entry.smil_reference.fragment)
+        result.append((entry.id, entry.level, reference, entry.text, entry.smil.title, entry.smil.total_duration))
+        for section in entry.sections:
+            text = (section.text.id, section.text.reference.resource, section.text.reference.fragment, section.text.content)
+            result.append((section.id, text, [(_.id, _.src, _.begin, _.end) for _ in section.clips]))
+    return result
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "book.snapshot")
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    book.compile(path)
+
+    compiled = DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    assert compiled is not None
+    assert len(compiled.toc_entries) == 30
+    assert len(compiled.smils) == 30
+    assert sum([len(_.clips) for entry in compiled.toc_entries for _ in entry.sections]) == 544
+    assert get_content(compiled) == get_content(book)
+
+    # Audio features still work
+    clip = compiled.toc_entries[1].sections[0].clips[0]
+    assert compiled.locate(clip.src, clip.begin) == (compiled.toc_entries[1], compiled.toc_entries[1].sections[0], clip)
+
+
+def test_no_fetch(tmp_path):
+    path = str(tmp_path / "book.snapshot")
+    DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)).compile(path)
+
+    # Reopening and walking the whole book (with the texts) does not access the source
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    access_count = Fetcher.get_stats()["access_count"]
+    compiled = DaisyBook.load_compiled(path, source)
+    get_content(compiled)
+    assert Fetcher.get_stats()["access_count"] == access_count
+
+
+def test_stale_snapshot(tmp_path):
+    book_path = str(tmp_path / "book")
+    shutil.copytree(SAMPLE_DTB_PROJECT_PATH, book_path)
+    path = str(tmp_path / "book.snapshot")
+    DaisyBook(FolderDtbSource(book_path)).compile(path)
+    assert DaisyBook.load_compiled(path, FolderDtbSource(book_path)) is not None
+
+    # A modified SMIL file invalidates the snapshot
+    smil_path = os.path.join(book_path, "hauy_0002.smil")
+    os.utime(smil_path, (0, 0))
+    assert DaisyBook.load_compiled(path, FolderDtbSource(book_path)) is None
+
+    # Compiling again
+    DaisyBook(FolderDtbSource(book_path)).compile(path)
+    assert DaisyBook.load_compiled(path, FolderDtbSource(book_path)) is not None
+
+    # Another book
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)) is None
+
+
+def test_invalid_snapshot(tmp_path):
+    path = str(tmp_path / "book.snapshot")
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+
+    # Missing file
+    assert DaisyBook.load_compiled(path, source) is None
+
+    # Not a snapshot, empty
+    with open(path, "wb") as file:
+        file.write(b"not a snapshot at all, but long enough to hold a header")
+    assert DaisyBook.load_compiled(path, source) is None
+    open(path, "wb").close()
+    assert DaisyBook.load_compiled(path, source) is None
+
+    # Truncated
+    DaisyBook(source).compile(path)
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(data[:-10])
+    assert DaisyBook.load_compiled(path, source) is None
+
+
+
+def test_rejected_snapshot_unmapped(tmp_path, monkeypatch):
+    book_path = str(tmp_path / "book")
+    shutil.copytree(SAMPLE_DTB_PROJECT_PATH, book_path)
+    path = str(tmp_path / "book.snapshot")
+    DaisyBook(FolderDtbSource(book_path)).compile(path)
+
+    buffers = []
+    original = mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        buffers.append(original(*args, **kwargs))
+        return buffers[-1]
+
+    monkeypatch.setattr(mmap, "mmap", recording_mmap)
+
+    # Stale, another version, truncated
+    os.utime(os.path.join(book_path, "hauy_0002.smil"), (0, 0))
+    assert DaisyBook.load_compiled(path, FolderDtbSource(book_path)) is None
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(b"XXXX" + data[4:])
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)) is None
+    with open(path, "wb") as file:
+        file.write(data[:-10])
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)) is None
+    assert len(buffers) == 3 and all([_.closed for _ in buffers])
+
+
+def test_close_snapshot(tmp_path):
+    path = str(tmp_path / "book.snapshot")
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    book.compile(path)
+
+    compiled = DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 5))
+    assert book.snapshot is None
+    with compiled.snapshot as snapshot:
+        assert not snapshot.is_closed
+        assert len(compiled.toc_entries[0].sections) > 0
+    assert snapshot.is_closed
+
+    # The SMIL files not read yet are loaded from the source
+    assert get_content(compiled) == get_content(book)
+
+    # The book was built through its constructor
+    assert compiled.set_parse_window(4, prefetch=0) is not None
+    compiled.set_parse_window(0)
+
+
+def test_snapshot_timeline(tmp_path):
+    path = str(tmp_path / "book.snapshot")
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    book.compile(path)
+
+    # The audio index is read from the snapshot : only the SMIL of the found clip is read
+    compiled = DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    assert isinstance(compiled.audio_index, CompiledAudioIndex)
+    assert compiled.audio_index.sources == book.audio_index.sources
+    entry, section, clip = compiled.locate("hauy_0002.mp3", 10.0)
+    assert entry is compiled.toc_entries[1] and clip in section.clips and section in entry.sections
+    assert [_.smil.is_parsed for _ in compiled.toc_entries].count(True) == 1
+
+    # Same contexts as the index built from the SMIL files
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            for clip in section.clips:
+                found = compiled.locate(clip.src, clip.begin + clip.duration / 2)
+                assert (found[0].id, found[1].id, found[2].id) == (entry.id, section.id, clip.id)
+    assert compiled.locate("hauy_0002.mp3", 500.0) is None
+
+    # Closed snapshot : the index is built from the SMIL files
+    compiled.snapshot.close()
+    compiled._audio_index = None
+    assert not isinstance(compiled.audio_index, CompiledAudioIndex)
+
+
+def test_book_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "book.snapshot")
+    book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    book.compile(path, version="1")
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)) is None
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH), version="2") is None
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH), version="1") is not None
+
+    # The changes of a web source cannot be detected : a book version is needed
+    monkeypatch.setattr(FolderDtbSource, "is_remote", property(lambda self: True))
+    with pytest.raises(ValueError):
+        book.compile(path)
+    book.compile(path, version="etag-1")
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)) is None
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH), version="etag-2") is None
+    assert DaisyBook.load_compiled(path, FolderDtbSource(SAMPLE_DTB_PROJECT_PATH), version="etag-1") is not None
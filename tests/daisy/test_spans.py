@@ -0,0 +1,70 @@
+"""Playback spans tests"""
+
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import Audio, DaisyBook, FolderDtbSource, PlaybackCursor, PlaybackSpan, Section
+
+
+def test_smil_spans():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+
+    # In the sample book, all clips of a SMIL are contiguous in a single MP3 file
+    clip_count = 0
+    for smil in dtb.smils:
+        spans = smil.spans
+        assert len(spans) == 1
+        assert spans[0].src == smil.sections[0].clips[0].src
+        assert spans[0].begin == smil.sections[0].clips[0].begin
+        assert spans[0].end == smil.sections[-1].clips[-1].end
+        assert [_[1] for _ in spans[0].boundaries] == smil.sections
+        clip_count += len(spans[0].clips)
+
+    assert clip_count == 544
+
+    # SMIL 'hauy_0002.smil' : 11 sections, 17 clips
+    spans = dtb.smils[1].spans
+    assert len(spans[0].boundaries) == 11
+    assert len(spans[0].clips) == 17
+
+
+def test_book_spans():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+
+    with PlaybackCursor(dtb, lookahead=0) as cursor:
+        spans = []
+        span = cursor.current_span()
+        while span is not None:
+            spans.append(span)
+            span = cursor.next_span()
+
+    # One span per MP3 file : 544 clips, 30 seeks
+    assert len(spans) == 30
+    assert sum([len(_.clips) for _ in spans]) == 544
+    assert [_.src for _ in spans] == [f"hauy_{_:04d}.mp3" for _ in range(1, 31)]
+
+
+def test_section_at():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    smil = dtb.smils[1]
+    span = smil.spans[0]
+
+    assert span.section_at(0.0) is smil.sections[0]
+    assert span.section_at(6.334) is smil.sections[1]
+    assert span.section_at(10.0) is smil.sections[1]
+    assert span.section_at(span.end) is smil.sections[-1]
+    assert span.section_at(span.end + 1) is None
+
+
+def test_coalesce_gaps():
+    first = Section(None, "s1", None)
+    first.clips.extend([Audio(None, "a1", "a.mp3", 0.0, 1.0), Audio(None, "a2", "a.mp3", 1.0, 2.0)])
+    second = Section(None, "s2", None)
+    second.clips.extend([Audio(None, "a3", "a.mp3", 2.5, 3.0), Audio(None, "a4", "b.mp3", 3.0, 4.0)])
+
+    spans = PlaybackSpan.coalesce([first, second])
+    assert [(_.src, _.begin, _.end) for _ in spans] == [("a.mp3", 0.0, 2.0), ("a.mp3", 2.5, 3.0), ("b.mp3", 3.0, 4.0)]
+    assert [_[1] for _ in spans[1].boundaries] == [second]
+
+    # With a larger tolerance, the gap is ignored
+    spans = PlaybackSpan.coalesce([first, second], tolerance=0.5)
+    assert len(spans) == 2
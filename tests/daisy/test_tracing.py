@@ -0,0 +1,93 @@
+"""Loading stages tracing tests"""
+
+import json
+
+from daisy_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import CallbackTraceSink, ChromeTraceSink, DaisyBook, FolderDtbSource, MemoryTraceSink, Tracer
+
+
+def test_disabled():
+    assert not Tracer.is_enabled()
+    with Tracer.span("test", "resource") as span:
+        span.size = 10
+    assert span.size == 0
+
+
+def test_book_stages():
+    sink = MemoryTraceSink()
+    Tracer.add_sink(sink)
+    try:
+        book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+        entry = book.toc_entries[0]
+        section = entry.sections[0]
+        assert section.text.content != ""
+    finally:
+        Tracer.remove_sink(sink)
+
+    assert not Tracer.is_enabled()
+    summary = sink.get_summary()
+    for name in ["book.build", "book.model", "source.get", "source.fetch", "dom.decode", "dom.parse", "smil.parse", "smil.build", "text.parse"]:
+        assert summary[name]["count"] >= 1, name
+
+    # The stages are nested
+    spans = {_.span_id: _ for _ in sink.get_spans()}
+    build = sink.get_spans("book.build")[0]
+    assert build.parent_id == 0
+    ncc_get = [_ for _ in sink.get_spans("source.get") if _.resource == "ncc.html"][0]
+    assert ncc_get.parent_id == build.span_id
+    fetch = [_ for _ in sink.get_spans("source.fetch") if _.resource == "ncc.html"][0]
+    assert spans[fetch.parent_id] is ncc_get
+    assert fetch.size > 0
+    assert build.duration >= ncc_get.duration >= fetch.duration
+
+    smil = sink.get_spans("smil.parse")[0]
+    assert smil.resource == entry.smil_reference.resource
+    assert spans[sink.get_spans("smil.build")[0].parent_id] is smil
+
+    # No more spans
+    sink.clear()
+    book.toc_entries[1].sections
+    assert sink.get_spans() == []
+
+
+def test_chrome_trace(tmp_path):
+    sink = ChromeTraceSink()
+    Tracer.add_sink(sink)
+    try:
+        DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    finally:
+        Tracer.remove_sink(sink)
+
+    path = tmp_path / "trace.json"
+    sink.export(str(path))
+    with open(path, encoding="utf-8") as file:
+        trace = json.load(file)
+
+    events = trace["traceEvents"]
+    assert len(events) == len(sink.get_spans())
+    event = [_ for _ in events if _["name"] == "book.build"][0]
+    assert event["ph"] == "X"
+    assert event["dur"] > 0
+    assert event["args"]["error"] is False
+
+
+def test_callback_and_errors():
+    spans = []
+    sink = CallbackTraceSink(spans.append)
+    Tracer.add_sink(sink)
+    try:
+        try:
+            with Tracer.span("outer"):
+                with Tracer.span("inner", "resource", 5):
+                    raise ValueError
+        except ValueError:
+            pass
+    finally:
+        Tracer.remove_sink(sink)
+
+    assert [_.name for _ in spans] == ["inner", "outer"]
+    inner, outer = spans
+    assert inner.error and outer.error
+    assert (inner.resource, inner.size) == ("resource", 5)
+    assert inner.parent_id == outer.span_id
@@ -1,7 +1,7 @@
 import pytest
-from domlib_test_context import get_ncc_document, get_smil_document
+from domlib_test_context import get_ncc_document, get_ncc_string, get_smil_document
 
-from daisy_dtb import Document, Element
+from daisy_dtb import Document, DomFactory, Element
 
 ncc_document = get_ncc_document()
 smil_document = get_smil_document()
@@ -100,3 +100,16 @@ def test_void_element():
 def test_get_parent():
     for element in ncc_document.get_elements_by_tag_name("h1").all():
         assert element.parent.name == "body"
+
+
+def test_unlink():
+    """Release a document."""
+    with DomFactory.create_document_from_string(get_ncc_string()) as document:
+        assert not document.is_closed
+        assert document.get_element_by_id("dijn0198") is not None
+    assert document.is_closed
+
+    # A released document behaves as an empty one
+    assert document.get_element_by_id("dijn0198") is None
+    assert len(document.get_elements_by_tag_name("h1").all()) == 0
+    document.unlink()
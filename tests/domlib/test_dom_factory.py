@@ -44,3 +44,44 @@ def test_create_document_from_non_utf_bytes():
     bytes = get_other_ncc_string()
     document = DomFactory.create_document_from_bytes(bytes)
     assert type(document) is Document
+
+
+def test_declared_encoding():
+    assert DomFactory.get_declared_encoding(get_other_ncc_string()) == "windows-1252"
+    assert DomFactory.get_declared_encoding(b'<html><head><meta charset="UTF-8"/></head></html>') == "utf-8"
+    assert DomFactory.get_declared_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1" />') == "iso-8859-1"
+    assert DomFactory.get_declared_encoding(b"<html></html>") is None
+
+    # Declared and valid UTF-8
+    document = DomFactory.create_document_from_bytes('<?xml version="1.0" encoding="utf-8"?><p>Valentin Haüy</p>'.encode("utf-8"))
+    assert document.get_elements_by_tag_name("p").first().text == "Valentin Haüy"
+
+    # Wrongly declared UTF-8 : the encoding is detected
+    document = DomFactory.create_document_from_bytes('<?xml version="1.0" encoding="utf-8"?><p>Valentin Haüy, né à Saint-Just-en-Chaussée</p>'.encode("cp1252"))
+    assert type(document) is Document
+
+
+def test_is_markup():
+    assert DomFactory.is_markup(b'<?xml version="1.0"?><smil/>')
+    assert DomFactory.is_markup(b"\r\n  <html></html>")
+    assert DomFactory.is_markup(b"\xef\xbb\xbf<html></html>")
+    assert DomFactory.is_markup("<html></html>".encode("utf-16"))
+    assert not DomFactory.is_markup(b"ID3\x04\x00\x00\x00\x00\x00\x00")
+    assert not DomFactory.is_markup(b"\xff\xfb\x90\x00" + bytes(1000))
+
+    # Binary data is returned as is, without encoding detection
+    data = b"\xff\xfb\x90\x00" + bytes(1_000_000)
+    assert DomFactory.create_document_from_bytes(data) is data
+
+
+def test_declared_non_utf8_encoding():
+    # Only a declared UTF-8 takes the fast path : other encodings are detected
+    text = "Valentin Haüy, né à Saint-Just-en-Chaussée, fonda l'Institution des jeunes aveugles"
+    for encoding in ("iso-8859-1", "windows-1252"):
+        data = f'<?xml version="1.0" encoding="{encoding}"?><p>{text}</p>'.encode(encoding)
+        assert DomFactory.get_declared_encoding(data) == encoding
+        document = DomFactory.create_document_from_bytes(data)
+        assert document.get_elements_by_tag_name("p").first().text == text
+
+    document = DomFactory.create_document_from_bytes(get_other_ncc_string())
+    assert "é" in "".join([_.text for _ in document.get_elements_by_tag_name("h1").all()])
@@ -0,0 +1,72 @@
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import Cache, DaisyBook, Document, DtbSource, FolderDtbSource
+
+
+def test_partition_names():
+    assert DtbSource.get_partition_name("ncc.html") == "documents"
+    assert DtbSource.get_partition_name("NCC.HTML") == "documents"
+    assert DtbSource.get_partition_name("hauy_0002.smil") == "documents"
+    assert DtbSource.get_partition_name("valentinhauy.html") == "text"
+    assert DtbSource.get_partition_name("hauy_0002.mp3") == "audio"
+
+
+def test_audio_churn():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    source.set_cache_partitions(
+        {
+            "documents": Cache(max_size=40),
+            "text": Cache(max_size=1),
+            "audio": Cache(max_size=2, max_bytes=3_000_000),
+        }
+    )
+    source.enable_stats(True)
+    book = DaisyBook(source)
+
+    # Play the whole book
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            section.text.content
+            for clip in section.clips:
+                clip.get_sound()
+
+    # The audio churn did not evict the NCC
+    assert isinstance(source._cache.peek("ncc.html"), Document)
+
+    stats = source._cache.get_stats()
+    audio = stats["partitions"]["audio"]
+    assert audio["size"] <= 2
+    assert 0 < audio["bytes"] <= 3_000_000
+    assert audio["evictions"] > 0
+    assert audio["total_hits"] > 0
+    assert stats["partitions"]["documents"]["evictions"] == 0
+    assert stats["partitions"]["text"]["evictions"] == 0
+    assert book.cache_stats["total_queries"] == sum([_["total_queries"] for _ in stats["partitions"].values()])
+
+
+
+def test_evicted_documents_unlinked():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 1)
+    evicted = []
+    source._cache.add_eviction_hook(lambda key, data: evicted.append(data))
+
+    held = source.get("hauy_0002.smil")
+    DtbSource.give_back(source.get("hauy_0003.smil"))
+    source.get("hauy_0004.smil")
+
+    # The evicted documents are unlinked, unless held
+    assert [_.is_closed for _ in evicted] == [False, True]
+    assert held.get_elements_by_tag_name("par").first() is not None
+
+    # A document given back after its eviction is left to the garbage collector
+    DtbSource.give_back(held)
+    assert not held.is_closed
+
+    # A document got again is held again
+    document = source.get("hauy_0004.smil")
+    assert source.get("hauy_0005.smil") is not None
+    assert not document.is_closed
+
+    # The book is read as with a large cache
+    texts = [section.text.content for entry in DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50)).toc_entries for section in entry.sections]
+    assert [section.text.content for entry in DaisyBook(source).toc_entries for section in entry.sections] == texts
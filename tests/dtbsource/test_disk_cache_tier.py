@@ -0,0 +1,109 @@
+import os
+import shutil
+
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, DiskCache, Fetcher, FolderDtbSource
+
+
+def get_sections(book: DaisyBook) -> list:
+    result = []
+    for entry in book.toc_entries:
+        for section in entry.sections:
+            result.append((section.id, section.text.content, [(_.id, _.src, _.begin, _.end) for _ in section.clips]))
+    return result
+
+
+def test_disk_cache_tier(tmp_path):
+    cache_path = str(tmp_path / "cache")
+
+    # First run : the SMIL and text files are parsed, the results are stored
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    source.disk_cache = DiskCache(cache_path)
+    expected = get_sections(DaisyBook(source))
+    assert expected == get_sections(DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)))
+
+    # Next run (e.g. another process) : only the NCC is fetched
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    source.disk_cache = DiskCache(cache_path)
+    source.enable_stats(True)
+    book = DaisyBook(source)
+    access_count = Fetcher.get_stats()["access_count"]
+    assert get_sections(book) == expected
+    assert Fetcher.get_stats()["access_count"] == access_count
+
+    # Hit rates per tier
+    stats = source.get_cache_stats()
+    assert stats["memory"]["total_queries"] == 0
+    assert stats["disk"]["total_queries"] == 31
+    assert stats["disk"]["cache_efficiency"] == 1.0
+
+
+def test_changed_resource(tmp_path):
+    book_path = str(tmp_path / "book")
+    shutil.copytree(SAMPLE_DTB_PROJECT_PATH, book_path)
+    cache_path = str(tmp_path / "cache")
+
+    source = FolderDtbSource(book_path)
+    source.disk_cache = DiskCache(cache_path)
+    assert len(DaisyBook(source).toc_entries[1].sections) == 11
+
+    # The cached data of a modified SMIL file is not used
+    smil_path = os.path.join(book_path, "hauy_0002.smil")
+    with open(smil_path, encoding="utf-8") as file:
+        smil = file.read()
+    start = smil.index('<par endsync="last" id="rgn_par_0002_0002">')
+    with open(smil_path, "w", encoding="utf-8") as file:
+        file.write(smil[:start] + smil[smil.index("</par>", start) + 6 :])
+
+    source = FolderDtbSource(book_path)
+    source.disk_cache = DiskCache(cache_path, with_stats=True)
+    assert len(DaisyBook(source).toc_entries[1].sections) == 10
+    assert source.disk_cache.get_stats()["total_hits"] == 0
+
+    # The data of the former version is replaced
+    count = source.disk_cache._connection.execute("SELECT COUNT(*) FROM items WHERE key LIKE '%|hauy_0002.smil|%'").fetchone()[0]
+    assert count == 1
+
+
+def test_no_disk_cache():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    assert source.disk_cache is None
+    assert source.get_cache_stats()["disk"] is None
+    assert source.get_text("valentinhauy.html", "rgn_cnt_0005") != ""
+    assert source.get_text("valentinhauy.html", "unknown") == ""
+    assert source.get_text("missing.html", "rgn_cnt_0005") == ""
+
+
+def test_text_map_failure_not_kept(tmp_path):
+    book_path = str(tmp_path / "book")
+    shutil.copytree(SAMPLE_DTB_PROJECT_PATH, book_path)
+    text_path = os.path.join(book_path, "valentinhauy.html")
+    os.rename(text_path, text_path + ".tmp")
+
+    # The first fetch fails
+    source = FolderDtbSource(book_path, 10)
+    assert source.get_text("valentinhauy.html", "rgn_cnt_0005") == ""
+    assert len(source._text_maps) == 0
+
+    # The resource is back : the text is found
+    os.rename(text_path + ".tmp", text_path)
+    assert source.get_text("valentinhauy.html", "rgn_cnt_0005") != ""
+    assert len(source._text_maps) == 1
+
+
+def test_text_maps_bound():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 10)
+    source.text_maps_size = 1
+    text = source.get_text("valentinhauy.html", "rgn_cnt_0005")
+    assert source.get_text("ncc.html", "rgn_ncc_0001") != ""
+    assert list(source._text_maps.keys()) == ["ncc.html"]
+
+    # The dropped map is built again
+    assert source.get_text("valentinhauy.html", "rgn_cnt_0005") == text
+    assert list(source._text_maps.keys()) == ["valentinhauy.html"]
+
+    source.text_maps_size = 0
+    assert len(source._text_maps) == 0
+    assert source.get_text("valentinhauy.html", "rgn_cnt_0005") == text
+    assert len(source._text_maps) == 0
@@ -0,0 +1,41 @@
+import os
+import zipfile
+
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import Document, FolderDtbSource, ZipDtbSource
+
+SMIL_NAMES = [f"hauy_{_:04d}.smil" for _ in range(1, 31)]
+
+
+def test_folder_get_many():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, initial_cache_size=40)
+    names = ["ncc.html"] + SMIL_NAMES + ["missing.smil", "ncc.html"]
+    results = source.get_many(names, max_workers=4)
+
+    assert len(results) == len(names)
+    assert all([isinstance(_, Document) for _ in results[:-2]])
+    assert results[-2] is None
+    assert results[-1] is results[0]
+
+    # Request order
+    for name, result in zip(SMIL_NAMES, results[1:]):
+        assert result.get_elements_by_tag_name("audio").first().get_attr("src") == name.replace(".smil", ".mp3")
+
+    # The cache was filled
+    assert source.get("hauy_0005.smil") is results[5]
+    assert source.get_many([]) == []
+
+
+def test_zip_get_many(tmp_path):
+    zip_path = tmp_path / "book.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in ["ncc.html"] + SMIL_NAMES:
+            archive.write(os.path.join(SAMPLE_DTB_PROJECT_PATH, name), name)
+
+    source = ZipDtbSource(str(zip_path))
+    results = source.get_many(SMIL_NAMES, max_workers=8)
+    expected = [source.get(_) for _ in SMIL_NAMES]
+    assert [_.get_elements_by_tag_name("audio").first().get_attr("src") for _ in results] == [
+        _.get_elements_by_tag_name("audio").first().get_attr("src") for _ in expected
+    ]
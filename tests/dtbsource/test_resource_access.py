@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, Fetcher, FolderDtbSource, ZipDtbSource
+
+SAMPLE_MP3 = "hauy_0002.mp3"
+
+
+def get_sample_mp3() -> bytes:
+    with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+        return file.read()
+
+
+def test_folder_resolve_path():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    path = source.resolve_path(SAMPLE_MP3)
+    assert os.path.samefile(path, os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3))
+    assert source.resolve_path("hauy_0007.mp3") is None
+    assert source.resolve_path("") is None
+
+
+def test_folder_open():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    fetched_bytes = Fetcher.get_stats()["fetched_bytes"]
+    with source.open(SAMPLE_MP3) as file:
+        file.seek(1000)
+        assert file.read(10) == get_sample_mp3()[1000:1010]
+
+    # Nothing was read by the fetcher
+    assert Fetcher.get_stats()["fetched_bytes"] == fetched_bytes
+    assert source.open("hauy_0007.mp3") is None
+
+
+def test_zip_open(tmp_path):
+    zip_path = tmp_path / "book.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.write(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), f"book/{SAMPLE_MP3}")
+
+    source = ZipDtbSource(str(zip_path))
+    assert source.resolve_path(SAMPLE_MP3) is None
+    with source.open(SAMPLE_MP3) as file:
+        assert file.seekable()
+        file.seek(1000)
+        assert file.read(10) == get_sample_mp3()[1000:1010]
+    assert source.open("hauy_0007.mp3") is None
+
+
+def test_audio_helpers():
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    clip = dtb.smils[1].sections[0].clips[0]
+    assert clip.src == SAMPLE_MP3
+    assert os.path.samefile(clip.get_sound_path(), os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3))
+    with clip.open_sound() as file:
+        assert file.read() == get_sample_mp3()
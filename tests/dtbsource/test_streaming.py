@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import zipfile
+
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, FolderDtbSource
+
+SAMPLE_MP3 = "hauy_0002.mp3"
+LARGE_SIZE = 100 * 1024 * 1024
+
+# Streams a resource in a fresh interpreter and prints the size and the peak RSS increase (in MB)
+STREAM_SCRIPT = """
+import resource, sys
+from daisy_dtb import FolderDtbSource, LogLevel, ZipDtbSource
+LogLevel.set(LogLevel.NONE)
+kind, base_path, resource_name = sys.argv[1:4]
+source = FolderDtbSource(base_path) if kind == "folder" else ZipDtbSource(base_path)
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+size = sum([len(chunk) for chunk in source.stream(resource_name)])
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(size, (after - before) // 1024)
+"""
+
+
+def stream_in_subprocess(kind: str, base_path: str, resource_name: str) -> tuple:
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), "../../src"))
+    result = subprocess.run([sys.executable, "-c", STREAM_SCRIPT, kind, base_path, resource_name], env=env, capture_output=True, text=True, check=True)
+    size, peak = result.stdout.split()
+    return int(size), int(peak)
+
+
+def test_stream_sample():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+        expected = file.read()
+
+    chunks = list(source.stream(SAMPLE_MP3, chunk_size=100_000))
+    assert b"".join(chunks) == expected
+    assert max([len(_) for _ in chunks]) == 100_000
+    assert list(source.stream("hauy_0007.mp3")) == []
+
+    # Audio helper
+    dtb = DaisyBook(source)
+    assert b"".join(dtb.smils[1].sections[0].clips[0].stream_sound()) == expected
+
+
+def test_stream_cache_lookup():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 10)
+    source.enable_stats(True)
+    expected = b"".join(source.stream(SAMPLE_MP3))
+
+    # The streams are not cache queries
+    assert source._cache.get_stats()["total_queries"] == 0
+
+    # A cached resource is streamed from the cache
+    source.get(SAMPLE_MP3)
+    assert b"".join(source.stream(SAMPLE_MP3)) == expected
+    assert source._cache.get_stats()["total_queries"] == 1
+
+
+def test_stream_large_file(tmp_path):
+    with open(tmp_path / "large.mp3", "wb") as file:
+        file.truncate(LARGE_SIZE)
+
+    size, peak = stream_in_subprocess("folder", str(tmp_path), "large.mp3")
+    assert size == LARGE_SIZE
+    assert peak < 20
+
+
+def test_stream_large_zip_member(tmp_path):
+    zip_path = tmp_path / "book.zip"
+    chunk = bytes(1024 * 1024)
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("book/large.mp3", "w") as member:
+            for _ in range(LARGE_SIZE // len(chunk)):
+                member.write(chunk)
+
+    size, peak = stream_in_subprocess("zip", str(zip_path), "large.mp3")
+    assert size == LARGE_SIZE
+    assert peak < 20
@@ -0,0 +1,158 @@
+import os
+import random
+import threading
+import time
+import zipfile
+
+from dtbsource_test_context import SAMPLE_DTB_PROJECT_PATH
+
+from daisy_dtb import DaisyBook, DtbSource, Fetcher, FolderDtbSource, ZipDtbSource
+
+THREAD_COUNT = 32
+RESOURCE_NAMES = ["ncc.html"] + [f"hauy_{_:04d}.smil" for _ in range(1, 11)]
+
+
+class CountingFolderDtbSource(FolderDtbSource):
+    """A `FolderDtbSource` counting (and slowing down) the resource loads."""
+
+    def __init__(self, base_path: str, initial_cache_size=0) -> None:
+        super().__init__(base_path, initial_cache_size)
+        self.loads = {}
+        self.loads_lock = threading.Lock()
+
+    def _load(self, resource_name: str):
+        with self.loads_lock:
+            self.loads[resource_name] = self.loads.get(resource_name, 0) + 1
+        time.sleep(0.01)
+        return super()._load(resource_name)
+
+
+def run_threads(target) -> None:
+    barrier = threading.Barrier(THREAD_COUNT)
+
+    def worker(index: int):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=worker, args=(_,)) for _ in range(THREAD_COUNT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_single_flight():
+    source = CountingFolderDtbSource(SAMPLE_DTB_PROJECT_PATH, initial_cache_size=len(RESOURCE_NAMES))
+    source.enable_stats(True)
+    results = {}
+    results_lock = threading.Lock()
+
+    def target(index: int):
+        names = RESOURCE_NAMES.copy()
+        random.Random(index).shuffle(names)
+        for name in names:
+            document = source.get(name)
+            with results_lock:
+                results.setdefault(name, set()).add(id(document))
+
+    run_threads(target)
+
+    # Each resource was fetched and parsed once, and all threads got the same document
+    assert source.loads == {_: 1 for _ in RESOURCE_NAMES}
+    assert all([len(_) == 1 for _ in results.values()])
+    assert source.cache_size == len(RESOURCE_NAMES)
+    assert source._cache.get_stats()["total_queries"] == THREAD_COUNT * len(RESOURCE_NAMES)
+
+
+def test_single_flight_frame_index():
+    source = CountingFolderDtbSource(SAMPLE_DTB_PROJECT_PATH)
+    indexes = set()
+
+    def target(index: int):
+        indexes.add(id(source.get_frame_index("hauy_0002.mp3")))
+
+    run_threads(target)
+    assert source.loads == {"hauy_0002.mp3": 1}
+    assert len(indexes) == 1
+
+
+def test_fetcher_stats():
+    path = os.path.join(SAMPLE_DTB_PROJECT_PATH, "hauy_0002.smil")
+    size = os.path.getsize(path)
+    loops = 50
+    before = Fetcher.get_stats()
+
+    run_threads(lambda _: [Fetcher.fetch(path) for _ in range(loops)])
+
+    after = Fetcher.get_stats()
+    assert after["access_count"] - before["access_count"] == THREAD_COUNT * loops
+    assert after["fetched_bytes"] - before["fetched_bytes"] == THREAD_COUNT * loops * size
+
+
+def test_zip_concurrent_reads(tmp_path):
+    names = [f"hauy_{_:04d}.mp3" for _ in range(1, 5)] + RESOURCE_NAMES
+    zip_path = tmp_path / "book.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            archive.write(os.path.join(SAMPLE_DTB_PROJECT_PATH, name), name)
+    expected = {}
+    for name in names[:4]:
+        with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, name), "rb") as file:
+            expected[name] = file.read()
+
+    # The threads share the archive kept open by the source
+    source = ZipDtbSource(str(zip_path))
+    errors = []
+
+    def worker(index: int):
+        rng = random.Random(index)
+        for _ in range(10):
+            name = rng.choice(names)
+            data = source.get(name)
+            if name in expected and data != expected[name]:
+                errors.append(name)
+            elif name not in expected and data is None:
+                errors.append(name)
+            if name in expected and source.get_range(name, 100, 50) != expected[name][100:150]:
+                errors.append(name)
+
+    run_threads(worker)
+    assert errors == []
+
+
+def test_concurrent_smil_parse():
+    expected = [[_.id for _ in entry.sections] for entry in DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH)).toc_entries]
+    book = DaisyBook(CountingFolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 50))
+    results = {}
+
+    def worker(index: int):
+        results[index] = [[_.id for _ in entry.sections] for entry in book.toc_entries]
+
+    # The first accesses of the SMIL files are concurrent : no duplicated sections
+    run_threads(worker)
+    assert all([_ == expected for _ in results.values()])
+
+
+def test_held_documents_not_unlinked():
+    # A tiny cache : the documents are evicted while other threads get them
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 2)
+    closed = []
+
+    def target(index: int):
+        names = RESOURCE_NAMES[1:] * 3
+        random.Random(index).shuffle(names)
+        for name in names:
+            document = source.get(name)
+            if document.is_closed or document.get_elements_by_tag_name("par").first() is None:
+                closed.append(name)
+            DtbSource.give_back(document)
+
+    run_threads(target)
+    assert closed == []
+
+    # The documents given back are unlinked once evicted
+    evicted = []
+    source._cache.add_eviction_hook(lambda key, data: evicted.append(data))
+    for name in RESOURCE_NAMES[1:]:
+        DtbSource.give_back(source.get(name))
+    assert evicted and all([_.is_closed for _ in evicted])
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+
+from daisy_dtb import AsyncFetcher, DaisyBook, Document, Fetcher, FolderDtbSource
+from fetcher_test_context import SAMPLE_DTB_PROJECT_PATH, UNEXISTING_PATH, RangeRequestHandler, start_range_server
+
+SAMPLE_MP3 = "hauy_0002.mp3"
+
+
+def get_sample_mp3() -> bytes:
+    with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+        return file.read()
+
+
+def test_async_fetch_file():
+    assert asyncio.run(AsyncFetcher.fetch(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3))) == get_sample_mp3()
+    assert asyncio.run(AsyncFetcher.fetch(UNEXISTING_PATH)) == b""
+    assert asyncio.run(AsyncFetcher.fetch(SAMPLE_DTB_PROJECT_PATH)) == b""
+
+
+def test_async_fetch_http():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        fetched_bytes = Fetcher.get_stats()["fetched_bytes"]
+        assert asyncio.run(AsyncFetcher.fetch(f"{base_url}/{SAMPLE_MP3}")) == get_sample_mp3()
+        assert Fetcher.get_stats()["fetched_bytes"] == fetched_bytes + len(get_sample_mp3())
+        assert asyncio.run(AsyncFetcher.fetch(f"{base_url}/missing.mp3")) == b""
+        assert asyncio.run(AsyncFetcher.fetch("http://127.0.0.1:1/ncc.html")) == b""
+    finally:
+        server.shutdown()
+
+
+
+def test_async_fetch_timeout():
+    # A server accepting the connections, but never answering
+    stalled = socket.socket()
+    stalled.bind(("127.0.0.1", 0))
+    stalled.listen(8)
+    url = f"http://127.0.0.1:{stalled.getsockname()[1]}/ncc.html"
+    try:
+        start = time.perf_counter()
+        assert asyncio.run(AsyncFetcher.fetch(url, timeout=0.2)) == b""
+        assert time.perf_counter() - start < 1.0
+
+        timeout = AsyncFetcher.timeout
+        AsyncFetcher.timeout = 0.2
+        try:
+            errors = Fetcher.get_metrics()["transports"]["http"]["errors"]
+            assert asyncio.run(AsyncFetcher.fetch(url)) == b""
+            assert Fetcher.get_metrics()["transports"]["http"]["errors"] == errors + 1
+        finally:
+            AsyncFetcher.timeout = timeout
+    finally:
+        stalled.close()
+
+
+def start_slow_server(body: bytes, piece: int, delay: float, content_length: bool) -> socket.socket:
+    """A server sending the body slowly (a piece every `delay` seconds), then closing the connection."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    def serve():
+        try:
+            connection, _ = server.accept()
+        except OSError:
+            return
+        with connection:
+            connection.recv(4096)
+            headers = f"Content-Length: {len(body)}\r\n" if content_length else ""
+            connection.sendall(f"HTTP/1.1 200 OK\r\n{headers}Connection: close\r\n\r\n".encode("latin-1"))
+            for offset in range(0, len(body), piece):
+                time.sleep(delay)
+                connection.sendall(body[offset : offset + piece])
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+
+def test_async_fetch_slow_download():
+    # The whole download takes about 1s, but data keeps coming : the timeout only detects the stalls
+    body = os.urandom(200_000)
+    for content_length in (True, False):
+        server = start_slow_server(body, 10_000, 0.05, content_length)
+        try:
+            url = f"http://127.0.0.1:{server.getsockname()[1]}/slow.mp3"
+            start = time.perf_counter()
+            assert asyncio.run(AsyncFetcher.fetch(url, timeout=0.3)) == body
+            assert time.perf_counter() - start > 0.3
+        finally:
+            server.close()
+
+
+def test_aget_many():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        source = FolderDtbSource(f"http://127.0.0.1:{server.server_port}", initial_cache_size=50)
+        names = ["ncc.html"] + [f"hauy_{_:04d}.smil" for _ in range(1, 11)] + ["missing.smil"]
+
+        RangeRequestHandler.latency = 0.2
+        start = time.perf_counter()
+        results = asyncio.run(source.aget_many(names))
+        elapsed = time.perf_counter() - start
+
+        # Concurrent fetches : much less than 12 x 0.2s
+        assert elapsed < 1.0
+        assert all([isinstance(_, Document) for _ in results[:-1]])
+        assert results[-1] is None
+        assert results[1].get_elements_by_tag_name("audio").first().get_attr("src") == "hauy_0001.mp3"
+
+        # The resources were cached
+        start = time.perf_counter()
+        assert asyncio.run(source.aget("hauy_0003.smil")) is results[3]
+        assert time.perf_counter() - start < 0.2
+    finally:
+        RangeRequestHandler.latency = 0.0
+        server.shutdown()
+
+
+def test_aget_local():
+    # Local folder : the file reads and the parsing run in the executor
+    dtb = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    results = asyncio.run(dtb.source.aget_many(["ncc.html", "hauy_0002.smil", SAMPLE_MP3]))
+    assert isinstance(results[0], Document)
+    assert isinstance(results[1], Document)
+    assert results[2] == get_sample_mp3()
+
+
+def test_aget_single_flight():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        source = FolderDtbSource(f"http://127.0.0.1:{server.server_port}", initial_cache_size=50)
+        RangeRequestHandler.latency = 0.1
+        RangeRequestHandler.requests = []
+
+        async def concurrent_gets():
+            return await asyncio.gather(*[source.aget("hauy_0001.smil") for _ in range(8)])
+
+        results = asyncio.run(concurrent_gets())
+        assert all([_ is results[0] for _ in results])
+        assert isinstance(results[0], Document)
+        assert [_[0] for _ in RangeRequestHandler.requests] == ["/hauy_0001.smil"]
+
+        # Duplicated names
+        RangeRequestHandler.requests = []
+        results = asyncio.run(source.aget_many(["hauy_0002.smil", "hauy_0003.smil", "hauy_0002.smil"]))
+        assert results[0] is results[2]
+        assert sorted([_[0] for _ in RangeRequestHandler.requests]) == ["/hauy_0002.smil", "/hauy_0003.smil"]
+    finally:
+        RangeRequestHandler.latency = 0.0
+        server.shutdown()
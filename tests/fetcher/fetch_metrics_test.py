@@ -0,0 +1,194 @@
+import os
+import threading
+import zipfile
+
+from daisy_dtb import FetchEvent, FetchMetrics, FetchObserver, Fetcher, ZipDtbSource
+from fetcher_test_context import SAMPLE_DTB_PROJECT_PATH, UNEXISTING_PATH, RangeRequestHandler, start_range_server
+
+SAMPLE_MP3 = "hauy_0002.mp3"
+SAMPLE_SMIL = "hauy_0002.smil"
+
+
+class RecordingObserver(FetchObserver):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, event: FetchEvent) -> None:
+        self.started.append(event)
+
+    def on_end(self, event: FetchEvent) -> None:
+        self.ended.append(event)
+
+
+def test_resource_type():
+    assert Fetcher.get_resource_type("/a/b/hauy_0002.MP3") == "mp3"
+    assert Fetcher.get_resource_type("http://host/book/ncc.html?x=1#frag") == "html"
+    assert Fetcher.get_resource_type("http://host/book/") == "other"
+    assert Fetcher.get_resource_type("/a/b.c/README") == "other"
+
+
+def test_file_metrics():
+    Fetcher.reset_stats()
+    path = os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3)
+    data = Fetcher.fetch(path)
+    assert Fetcher.fetch_range(path, 100, 50) == data[100:150]
+    assert Fetcher.fetch(UNEXISTING_PATH + ".mp3") == b""
+
+    metrics = Fetcher.get_metrics()
+    file = metrics["transports"]["file"]
+    assert file["count"] == 3
+    assert file["errors"] == 1
+    assert file["bytes"] == len(data) + 50
+    assert file["in_flight"] == 0
+    assert file["max_in_flight"] >= 1
+    latency = file["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert metrics["resource_types"]["mp3"]["count"] == 3
+
+    assert Fetcher.access_count == 3
+    assert Fetcher.fetched_bytes == len(data) + 50
+
+
+def test_http_latency_is_separated():
+    Fetcher.reset_stats()
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    RangeRequestHandler.latency = 0.05
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        data = Fetcher.fetch(f"{url}/{SAMPLE_SMIL}")
+        assert len(data) > 0
+        assert Fetcher.fetch_range(f"{url}/{SAMPLE_MP3}", 0, 100) != b""
+        assert Fetcher.fetch_range(f"{url}/missing.mp3", 0, 100) == b""
+        Fetcher.fetch(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_SMIL))
+    finally:
+        RangeRequestHandler.latency = 0.0
+        server.shutdown()
+
+    metrics = Fetcher.get_metrics()
+    http = metrics["transports"]["http"]
+    assert http["count"] == 3
+    assert http["errors"] == 1
+    assert http["bytes"] == len(data) + 100
+    assert http["latency_ms"]["p50"] >= 50
+    assert metrics["transports"]["file"]["latency_ms"]["max"] < 50
+    assert metrics["resource_types"]["smil"]["count"] == 2
+    assert metrics["resource_types"]["mp3"]["count"] == 2
+
+
+def test_stream_and_check_metrics():
+    Fetcher.reset_stats()
+    path = os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3)
+    size = sum([len(_) for _ in Fetcher.stream(path, 4096)])
+    assert Fetcher.is_available(path)
+    assert not Fetcher.is_available(UNEXISTING_PATH)
+
+    file = Fetcher.get_metrics()["transports"]["file"]
+    assert file["count"] == 3
+    assert file["bytes"] == size
+    assert file["errors"] == 1
+
+
+def test_in_flight_gauge():
+    Fetcher.reset_stats()
+    release = threading.Event()
+    gauges = []
+
+    class BlockingObserver(FetchObserver):
+        def on_end(self, event: FetchEvent) -> None:
+            pass
+
+        def on_start(self, event: FetchEvent) -> None:
+            release.wait(5)
+
+    observer = BlockingObserver()
+    Fetcher.add_observer(observer)
+    try:
+        path = os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3)
+        threads = [threading.Thread(target=Fetcher.fetch, args=(path,)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while len(gauges) == 0 or gauges[-1] < 3:
+            gauges.append(Fetcher.get_metrics()["transports"].get("file", {}).get("in_flight", 0))
+        release.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        Fetcher.remove_observer(observer)
+
+    file = Fetcher.get_metrics()["transports"]["file"]
+    assert file["in_flight"] == 0
+    assert file["max_in_flight"] == 3
+
+
+def test_custom_observer():
+    observer = RecordingObserver()
+    Fetcher.add_observer(observer)
+    try:
+        path = os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_SMIL)
+        data = Fetcher.fetch(path)
+        Fetcher.fetch(UNEXISTING_PATH)
+    finally:
+        Fetcher.remove_observer(observer)
+    Fetcher.fetch(path)
+
+    assert len(observer.started) == 2
+    assert len(observer.ended) == 2
+    event = observer.ended[0]
+    assert (event.transport, event.resource_type, event.operation, event.resource_path) == ("file", "smil", "fetch", path)
+    assert event.size == len(data)
+    assert event.duration > 0
+    assert not event.error
+    assert observer.ended[1].error
+
+
+def test_zip_metrics(tmp_path):
+    archive = tmp_path / "book.zip"
+    with zipfile.ZipFile(archive, "w") as file:
+        file.write(os.path.join(SAMPLE_DTB_PROJECT_PATH, "ncc.html"), "ncc.html")
+        file.write(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), SAMPLE_MP3)
+
+    source = ZipDtbSource(str(archive))
+    Fetcher.reset_stats()
+    assert source.get("ncc.html") is not None
+    assert source.get_range(SAMPLE_MP3, 0, 100) != b""
+    assert source.get("missing.smil") is None
+
+    metrics = Fetcher.get_metrics()
+    assert metrics["transports"].get("file", {}).get("count", 0) == 0
+    zip = metrics["transports"]["zip"]
+    assert zip["count"] == 3
+    assert zip["errors"] == 1
+    assert zip["bytes"] == os.path.getsize(os.path.join(SAMPLE_DTB_PROJECT_PATH, "ncc.html")) + 100
+    assert metrics["resource_types"]["html"]["count"] == 1
+
+    # The reads from the archive do not count as accesses
+    assert Fetcher.access_count == 0
+
+
+def test_metrics_reset():
+    Fetcher.fetch(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_SMIL))
+    assert Fetcher.get_metrics()["transports"] != {}
+
+    Fetcher.reset_stats()
+    assert Fetcher.access_count == 0
+    assert Fetcher.fetched_bytes == 0
+    file = Fetcher.get_metrics()["transports"]["file"]
+    assert file["count"] == 0
+    assert file["latency_ms"]["p99"] == 0
+
+
+def test_standalone_metrics():
+    metrics = FetchMetrics()
+    for duration in [0.001] * 98 + [0.1, 0.5]:
+        event = FetchEvent("http", "mp3", "fetch", "http://host/a.mp3", 10, duration)
+        metrics.on_start(event)
+        metrics.on_end(event)
+
+    http = metrics.snapshot()["transports"]["http"]
+    assert http["count"] == 100
+    assert http["bytes"] == 1000
+    assert 1 <= http["latency_ms"]["p50"] <= 2
+    assert 1 <= http["latency_ms"]["p95"] <= 2
+    assert 100 <= http["latency_ms"]["p99"] <= 200
+    assert http["latency_ms"]["max"] == 500
@@ -0,0 +1,92 @@
+import os
+
+from daisy_dtb import DaisyBook, Fetcher, FolderDtbSource
+from fetcher_test_context import SAMPLE_DTB_PROJECT_PATH, UNEXISTING_PATH, RangeRequestHandler, start_range_server
+
+SAMPLE_MP3 = "hauy_0002.mp3"
+
+
+def test_fetch_range_file():
+    path = os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3)
+    with open(path, "rb") as file:
+        expected = file.read()
+
+    assert Fetcher.fetch_range(path, 1000, 500) == expected[1000:1500]
+    assert Fetcher.fetch_range(path, len(expected) - 10, 500) == expected[-10:]
+    assert Fetcher.fetch_range(path, len(expected) + 10, 500) == b""
+    assert Fetcher.fetch_range(path, 0, 0) == b""
+    assert Fetcher.fetch_range(UNEXISTING_PATH, 0, 10) == b""
+
+
+def test_fetch_range_http():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/{SAMPLE_MP3}"
+        with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+            expected = file.read()
+
+        RangeRequestHandler.requests.clear()
+        assert Fetcher.fetch_range(url, 1000, 500) == expected[1000:1500]
+        assert RangeRequestHandler.requests == [(f"/{SAMPLE_MP3}", "bytes=1000-1499")]
+        assert Fetcher.fetch_range(url, len(expected) - 10, 500) == expected[-10:]
+        assert Fetcher.fetch_range(url, len(expected) + 10, 500) == b""
+        assert Fetcher.fetch_range(f"http://127.0.0.1:{server.server_port}/missing.mp3", 0, 10) == b""
+    finally:
+        server.shutdown()
+
+
+def test_clip_bytes_over_http():
+    local_book = DaisyBook(FolderDtbSource(SAMPLE_DTB_PROJECT_PATH))
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        web_book = DaisyBook(FolderDtbSource(f"http://127.0.0.1:{server.server_port}"))
+        assert web_book.source.is_remote is True
+
+        local_clips = local_book.smils[1].sections[3].clips + local_book.smils[1].sections[-1].clips
+        web_clips = web_book.smils[1].sections[3].clips + web_book.smils[1].sections[-1].clips
+        file_size = os.path.getsize(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3))
+
+        for local_clip, web_clip in zip(local_clips, web_clips):
+            RangeRequestHandler.requests.clear()
+            data = web_clip.get_clip_bytes()
+
+            # Only ranges are requested, never the whole file
+            assert all([_[1] is not None for _ in RangeRequestHandler.requests])
+
+            # The CBR estimation gives the same frames as the frame index of the local file
+            expected = local_clip.get_clip_bytes()
+            assert data == expected
+            assert len(data) < file_size / 4
+    finally:
+        server.shutdown()
+
+
+def test_stream_http():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        source = FolderDtbSource(f"http://127.0.0.1:{server.server_port}")
+        with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+            expected = file.read()
+
+        chunks = list(source.stream(SAMPLE_MP3, chunk_size=100_000))
+        assert b"".join(chunks) == expected
+        assert max([len(_) for _ in chunks]) <= 100_000
+        assert list(source.stream("missing.mp3")) == []
+    finally:
+        server.shutdown()
+
+
+def test_range_cache_lookup():
+    source = FolderDtbSource(SAMPLE_DTB_PROJECT_PATH, 10)
+    source.enable_stats(True)
+    with open(os.path.join(SAMPLE_DTB_PROJECT_PATH, SAMPLE_MP3), "rb") as file:
+        expected = file.read()
+
+    # The ranged reads are not cache queries
+    assert source.get_range(SAMPLE_MP3, 100, 50) == expected[100:150]
+    assert source._cache.get_stats()["total_queries"] == 0
+
+    # A cached resource is sliced
+    source.get(SAMPLE_MP3)
+    assert source.get_range(SAMPLE_MP3, 100, 50) == expected[100:150]
+    assert source._cache.get_stats()["total_queries"] == 1
@@ -1,4 +1,9 @@
 import os
+import re
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 SAMPLE_DTB_PROJECT_PATH = os.path.join(os.path.dirname(__file__), "../samples/valentin_hauy")
 SAMPLE_DTB_ZIP_PATH = os.path.join(os.path.dirname(__file__), "../samples/rec-2024-04.zip")
@@ -7,3 +12,58 @@ SAMPLE_DTB_PROJECT_URL = "https://www.daisyplayer.ch/aba-data/GuidePratique"
 UNEXISTING_URL = "https://an.unexisting.site"
 UNEXISTING_PATH = "/an/unexistiong/path"
 UNEXISTING_ZIP = "/an/unexistiong/path/nofile.zip"
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """A static file handler supporting single `Range: bytes=start-end` requests."""
+
+    # The served requests : (path, range header or None)
+    requests = []
+
+    # The delay before each response, in seconds
+    latency = 0.0
+
+    def do_GET(self):
+        RangeRequestHandler.requests.append((self.path, self.headers.get("Range")))
+        time.sleep(RangeRequestHandler.latency)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match is None:
+            return super().do_GET()
+
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start >= size:
+            self.send_error(416)
+            return
+
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RangeServer(ThreadingHTTPServer):
+    """A threaded HTTP server accepting many simultaneous connections (the default backlog is 5)."""
+
+    request_queue_size = 128
+
+
+def start_range_server(directory: str) -> ThreadingHTTPServer:
+    """Serve a directory on a local port, in a background thread. The caller must call `shutdown()`."""
+    server = RangeServer(("127.0.0.1", 0), partial(RangeRequestHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
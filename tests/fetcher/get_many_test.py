@@ -0,0 +1,24 @@
+import time
+
+from daisy_dtb import Document, FolderDtbSource
+from fetcher_test_context import SAMPLE_DTB_PROJECT_PATH, RangeRequestHandler, start_range_server
+
+
+def test_web_get_many():
+    server = start_range_server(SAMPLE_DTB_PROJECT_PATH)
+    try:
+        source = FolderDtbSource(f"http://127.0.0.1:{server.server_port}")
+        names = [f"hauy_{_:04d}.smil" for _ in range(1, 17)]
+
+        RangeRequestHandler.latency = 0.2
+        start = time.perf_counter()
+        results = source.get_many(names, max_workers=16)
+        elapsed = time.perf_counter() - start
+
+        # Parallel fetches : much less than 16 x 0.2s
+        assert elapsed < 1.6
+        assert all([isinstance(_, Document) for _ in results])
+        assert [_.get_elements_by_tag_name("audio").first().get_attr("src") for _ in results] == [_.replace(".smil", ".mp3") for _ in names]
+    finally:
+        RangeRequestHandler.latency = 0.0
+        server.shutdown()
@@ -0,0 +1,122 @@
+"""Book model and cursor tests"""
+
+import dataclasses
+import sys
+import threading
+
+import pytest
+from navigator_test_context import folder_book
+
+from daisy_dtb import BookCursor, BookModel, BookNavigator
+
+model = BookModel.create_from_book(folder_book)
+
+
+def test_model():
+    assert model.entry_count == 30
+    assert sum([len(_) for _ in model.sections]) == sum([len(_.sections) for _ in folder_book.toc_entries])
+    assert model.index_of("rgn_ncc_0004") == 3
+    assert model.index_of("unknown") is None
+
+    # The model is immutable
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        model.toc_entries = ()
+    assert isinstance(model.sections[0], tuple)
+    assert isinstance(model.clips[0][0], tuple)
+
+
+def test_cursor_size():
+    cursor = BookCursor(model)
+    assert not hasattr(cursor, "__dict__")
+    assert sys.getsizeof(cursor) < 100
+
+
+def test_cursor_navigation():
+    cursor = BookCursor(model)
+    navigator = BookNavigator(folder_book)
+    assert cursor.context == navigator.context
+
+    # Same moves as the navigators
+    assert cursor.next_entry() is navigator.toc.next()
+    assert cursor.context == navigator.context
+    assert cursor.next_section() is navigator.sections.next()
+    assert cursor.next_clip() is navigator.clips.next()
+    assert cursor.context == navigator.context
+    assert cursor.last_section() is navigator.sections.last()
+    assert cursor.next_section() is None
+    assert cursor.prev_section() is navigator.sections.prev()
+    assert cursor.position == (1, 9, 0)
+
+    assert cursor.last_entry().id == "rgn_ncc_0057"
+    assert cursor.next_entry() is None
+    assert cursor.first_entry().id == "rgn_ncc_0001"
+    assert cursor.prev_entry() is None
+    assert cursor.navigate_to("rgn_ncc_0042").id == "rgn_ncc_0042"
+    assert cursor.position == (22, 0, 0)
+    assert cursor.navigate_to("unknown") is None
+
+    # Clips
+    assert cursor.first_clip() is cursor.current_clip
+    assert cursor.prev_clip() is None
+    last = cursor.last_clip()
+    assert last is cursor.current_section.clips[-1]
+    assert cursor.next_clip() is None
+
+
+def test_cursor_levels():
+    cursor = BookCursor(model)
+    assert cursor.set_nav_level(1) == 1
+    assert cursor.set_nav_level(9) == 1
+    levels = [cursor.first_entry().level]
+    while (entry := cursor.next_entry()) is not None:
+        levels.append(entry.level)
+    assert levels == [1] * 8
+
+    cursor.set_nav_level(3)
+    assert cursor.last_entry().id == "rgn_ncc_0040"
+    assert cursor.prev_entry().id == "rgn_ncc_0038"
+
+
+def test_cursor_seek():
+    cursor = BookCursor(model, (3, 10, 0))
+    assert cursor.current_section is model.sections[3][10]
+    assert cursor.seek((3, 1000, 0)) is False
+    assert cursor.seek((30, 0, 0)) is False
+    assert cursor.position == (3, 10, 0)
+    with pytest.raises(ValueError):
+        BookCursor(model, (-1, 0, 0))
+
+    copy = cursor.copy()
+    copy.next_entry()
+    assert cursor.position == (3, 10, 0)
+    assert copy.position == (4, 0, 0)
+
+
+def test_concurrent_sessions():
+    # Expected clip sequence of a full walk
+    expected = []
+    cursor = BookCursor(model)
+    while True:
+        expected.append(cursor.position)
+        if cursor.next_clip() is None and cursor.next_section() is None and cursor.next_entry() is None:
+            break
+
+    results = []
+
+    def walk():
+        cursor = BookCursor(model)
+        positions = []
+        while True:
+            positions.append(cursor.position)
+            if cursor.next_clip() is None and cursor.next_section() is None and cursor.next_entry() is None:
+                break
+        results.append(positions)
+
+    threads = [threading.Thread(target=walk) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(expected) == 544
+    assert all([_ == expected for _ in results])
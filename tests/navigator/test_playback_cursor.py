@@ -0,0 +1,92 @@
+from navigator_test_context import folder_book
+
+from daisy_dtb import BookNavigator, PlaybackCursor
+
+
+def get_all_clips() -> list:
+    """Get all clips of the book, with the nested navigation."""
+    return [clip for entry in folder_book.toc_entries for section in entry.sections for clip in section.clips]
+
+
+def test_flat_iteration() -> None:
+    with PlaybackCursor(folder_book, lookahead=0) as cursor:
+        clips = []
+        clip = cursor.first()
+        while clip is not None:
+            clips.append(clip)
+            clip = cursor.next()
+
+    assert clips == get_all_clips()
+
+
+def test_reverse_iteration() -> None:
+    with PlaybackCursor(folder_book, lookahead=0) as cursor:
+        clips = []
+        clip = cursor.last()
+        while clip is not None:
+            clips.append(clip)
+            clip = cursor.prev()
+
+    assert clips == list(reversed(get_all_clips()))
+    assert cursor.position is not None
+
+
+def test_boundaries() -> None:
+    with PlaybackCursor(folder_book, lookahead=0) as cursor:
+        assert cursor.first() is not None
+        assert cursor.prev() is None
+        assert cursor.position == (0, 0, 0)
+
+        last = cursor.last()
+        assert cursor.next() is None
+        assert cursor.current() is last
+
+
+def test_navigate_to() -> None:
+    with PlaybackCursor(folder_book, lookahead=0) as cursor:
+        entry = folder_book.toc_entries[3]
+        clip = cursor.navigate_to(entry.id)
+        assert cursor.context[0] is entry
+        assert clip is entry.sections[0].clips[0]
+
+        assert cursor.navigate_to("unexisting_id") is None
+        assert cursor.context[0] is entry
+
+        assert cursor.seek((3, 0, -1)) is None
+        assert cursor.seek((3, 1000, 0)) is None
+
+
+def test_lookahead_window() -> None:
+    with PlaybackCursor(folder_book, lookahead=4) as cursor:
+        # The first SMIL holds 4 clips : the window spans the SMIL boundary
+        cursor.first()
+        assert cursor.window == ["hauy_0001.mp3", "hauy_0002.mp3"]
+
+        # Prefetched data is the actual resource data
+        assert cursor.get_sound() == cursor.current().get_sound()
+
+        # Resources leaving the window are dropped
+        cursor.navigate_to(folder_book.toc_entries[2])
+        assert "hauy_0001.mp3" not in cursor.window
+
+    assert cursor.window == []
+
+
+def test_callback() -> None:
+    visited = []
+    with PlaybackCursor(folder_book, lookahead=0, callback=visited.append) as cursor:
+        cursor.next()
+        cursor.next()
+        cursor.prev()
+
+    assert len(visited) == 3
+    assert visited[0] is visited[2]
+
+
+def test_book_navigator_cursor() -> None:
+    nav = BookNavigator(folder_book)
+    nav.toc.navigate_to(folder_book.toc_entries[2].id)
+    nav.sections.next()
+
+    with nav.get_playback_cursor(lookahead=0) as cursor:
+        assert cursor.context == nav.context